@@ -13,6 +13,7 @@ from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
 from analytics.performance_metrics import summarize_equity
 from utils.event_bus import EventTypes, get_event_bus
 from utils.helpers import schedule_coro_safely
+from utils.indicators import compute as compute_indicator
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +27,9 @@ class AIBotDataProvider:
     every subsystem directly.
     """
 
+    # Interwał świec publikowanych w migawce (``snapshot["candle_timeframe"]``)
+    CANDLE_TIMEFRAME = "1m"
+
     def __init__(self, integrated_data_manager=None):
         self.integrated_data_manager = integrated_data_manager
         self.market_data_manager = getattr(integrated_data_manager, "market_data_manager", None)
@@ -178,6 +182,7 @@ class AIBotDataProvider:
                     symbol: [self._serialise_candle(c) for c in self._select_candles(symbol, candles)]
                     for symbol in resolved_symbols
                 },
+                "candle_timeframe": self.CANDLE_TIMEFRAME,
                 "risk_metrics": risk_metrics,
                 "strategy_recommendations": recommendations,
                 "learning": learning_summary,
@@ -261,7 +266,7 @@ class AIBotDataProvider:
         candle_symbols = symbols[: min(4, len(symbols))]
         for symbol in candle_symbols:
             try:
-                candles = await self.market_data_manager.fetch_candles(symbol, timeframe="1m", limit=90)
+                candles = await self.market_data_manager.fetch_candles(symbol, timeframe=self.CANDLE_TIMEFRAME, limit=90)
             except Exception as exc:
                 logger.debug("Candle fetch failed for %s: %s", symbol, exc)
                 candles = []
@@ -722,11 +727,15 @@ class AIBotDataProvider:
         lows = [float(c.get("low", c.get("close", 0.0))) for c in candles]
         volumes = [float(c.get("volume", 0.0)) for c in candles]
 
-        ema_fast = self._ema_last(closes, 12)
-        ema_slow = self._ema_last(closes, 26)
-        macd_line, macd_signal, macd_hist = self._compute_macd(closes)
-        rsi = self._compute_rsi(closes)
-        atr = self._compute_atr(highs, lows, closes)
+        # Jedno przejście strumieniowe na wskaźnik (wspólna implementacja z utils.indicators)
+        ema_fast = compute_indicator("ema", closes, period=12).value
+        ema_slow = compute_indicator("ema", closes, period=26).value
+        macd = compute_indicator("macd", closes, fast=12, slow=26, signal=9)
+        macd_line, macd_signal, macd_hist = macd.value, macd.signal, macd.histogram
+        rsi = compute_indicator("rsi", closes, period=14).value
+        atr = None
+        if len(highs) == len(closes) == len(lows):
+            atr = compute_indicator("atr", closes, highs, lows, period=14).value
         volatility = pstdev(closes[-30:]) if len(closes) >= 2 else 0.0
 
         trend_strength = trend_info.get("change_percent", 0.0)
@@ -744,74 +753,6 @@ class AIBotDataProvider:
             "volume": self._safe_float(volumes[-1] if volumes else None),
         }
 
-    def _ema_last(self, values: List[float], period: int) -> Optional[float]:
-        if len(values) < period or period <= 0:
-            return None
-        multiplier = 2 / (period + 1)
-        ema = sum(values[:period]) / period
-        for price in values[period:]:
-            ema = (price - ema) * multiplier + ema
-        return ema
-
-    def _compute_macd(
-        self, values: List[float], fast: int = 12, slow: int = 26, signal_period: int = 9
-    ) -> Tuple[Optional[float], Optional[float], Optional[float]]:
-        if len(values) < slow:
-            return None, None, None
-        ema_fast = self._ema_last(values, fast)
-        ema_slow = self._ema_last(values, slow)
-        if ema_fast is None or ema_slow is None:
-            return None, None, None
-        macd_line = ema_fast - ema_slow
-        macd_series: List[float] = []
-        for idx in range(slow - 1, len(values)):
-            window = values[: idx + 1]
-            fast_val = self._ema_last(window, fast)
-            slow_val = self._ema_last(window, slow)
-            if fast_val is None or slow_val is None:
-                continue
-            macd_series.append(fast_val - slow_val)
-        macd_signal = self._ema_last(macd_series, signal_period) if macd_series else None
-        macd_hist = macd_line - macd_signal if macd_signal is not None else None
-        return macd_line, macd_signal, macd_hist
-
-    def _compute_rsi(self, values: List[float], period: int = 14) -> Optional[float]:
-        if len(values) <= period:
-            return None
-        gains: List[float] = []
-        losses: List[float] = []
-        for prev, current in zip(values[:-1], values[1:]):
-            change = current - prev
-            if change >= 0:
-                gains.append(change)
-                losses.append(0.0)
-            else:
-                gains.append(0.0)
-                losses.append(abs(change))
-        avg_gain = mean(gains[-period:]) if len(gains) >= period else mean(gains) if gains else 0.0
-        avg_loss = mean(losses[-period:]) if len(losses) >= period else mean(losses) if losses else 0.0
-        if avg_loss == 0:
-            return 100.0
-        rs = avg_gain / avg_loss if avg_loss else 0.0
-        return 100 - (100 / (1 + rs))
-
-    def _compute_atr(
-        self, highs: List[float], lows: List[float], closes: List[float], period: int = 14
-    ) -> Optional[float]:
-        if len(highs) < period + 1:
-            return None
-        true_ranges: List[float] = []
-        for idx in range(1, len(highs)):
-            tr = max(
-                highs[idx] - lows[idx],
-                abs(highs[idx] - closes[idx - 1]),
-                abs(lows[idx] - closes[idx - 1]),
-            )
-            true_ranges.append(tr)
-        if len(true_ranges) < period:
-            return None
-        return mean(true_ranges[-period:])
-
     def _safe_float(self, value: Any) -> Optional[float]:
         try:
             if value is None:
@@ -7,8 +7,15 @@ from datetime import datetime
 from typing import Dict, List, Optional, Any, Tuple, Union
 from pathlib import Path
 import logging
+from contextlib import asynccontextmanager
 from utils.db_migrations import apply_migrations
-from utils.db_utils import validate_identifiers, build_where_clause, build_set_clause
+from app.db_write_behind import WriteBehindBuffer
+from app.db_retention import RetentionManager, resolve_policies
+from app.sqlite_profile import ReadConnectionPool, apply_pragmas, pragma_mismatches, read_pragmas, resolve_pragmas
+from utils.db_utils import (
+    validate_identifiers, build_where_clause, build_set_clause,
+    build_keyset_clause, encode_cursor, decode_cursor,
+)
 logger = logging.getLogger(__name__)
 
 try:  # pragma: no cover - zależne od środowiska uruchomieniowego
@@ -38,8 +45,18 @@ POSITIONS_ALLOWED_COLUMNS = {
     'closed_at', 'status'
 }
 
+# Paginacja keyset: tabela -> (kolumna sortowania, malejąco?, dozwolone filtry)
+KEYSET_TABLES = {
+    'logs': ('timestamp', True, {'bot_id', 'user_id', 'type', 'level'}),
+    'orders': ('timestamp', True, {'bot_id', 'status'}),
+    'risk_events': ('timestamp', True, {'bot_id'}),
+    'bot_statistics': ('date', False, {'bot_id'}),
+}
+MAX_PAGE_SIZE = 1000
+
 class DatabaseManager:
-    def __init__(self, db_path: Union[str, Path] = "data/database.db"):
+    def __init__(self, db_path: Union[str, Path] = "data/database.db",
+                 pragmas: Optional[Dict[str, Any]] = None, read_pool_size: int = 2):
         # Normalizuj ścieżkę tak, aby obsługiwała zarówno Path jak i str
         if isinstance(db_path, Path):
             resolved_path = db_path
@@ -52,6 +69,18 @@ class DatabaseManager:
 
         self.db_path = str(resolved_path)
         self._conn = None
+        # Opcjonalny bufor write-behind (enable_write_behind)
+        self._write_behind: Optional[WriteBehindBuffer] = None
+        # Opcjonalna retencja tabel historycznych (enable_retention)
+        self._retention: Optional[RetentionManager] = None
+        # Profil wydajności SQLite (WAL, synchronous, mmap, cache, busy_timeout)
+        self.pragmas = resolve_pragmas(pragmas)
+        # Pula połączeń tylko do odczytu dla zapytań dashboardu (nie dla :memory:)
+        self._read_pool = ReadConnectionPool(
+            self.db_path,
+            size=read_pool_size if self.db_path != ":memory:" else 0,
+            pragmas=self.pragmas,
+        )
 
     def _row_to_bot_dict(self, row) -> Dict[str, Any]:
         """Konwertuje rekord bota na słownik z deserializacją JSON."""
@@ -99,25 +128,166 @@ class DatabaseManager:
         }
 
     async def get_connection(self):
-        """Pobiera połączenie z bazy danych"""
+        """Pobiera połączenie z bazy danych.
+
+        Przy włączonym write-behind najpierw zatwierdza oczekujące zapisy, żeby
+        każde dalsze zapytanie widziało wcześniejsze zapisy wywołującego.
+        """
+        conn = await self._open_connection()
+        if self._write_behind is not None and self._write_behind.pending:
+            await self._write_behind.flush()
+        return conn
+
+    async def _open_connection(self):
         try:
             import sqlite3
             import aiosqlite
             
             if self._conn is None:
-                self._conn = await aiosqlite.connect(self.db_path)
-                self._conn.row_factory = sqlite3.Row
-                # Enable foreign keys for cascade operations
-                await self._conn.execute('PRAGMA foreign_keys = ON')
+                conn = await aiosqlite.connect(self.db_path)
+                conn.row_factory = sqlite3.Row
+                # Profil wydajności; foreign_keys = ON dla kaskad
+                await apply_pragmas(conn, self.pragmas)
+                self._conn = conn
+                self._read_pool.reopen()
             
         
             return self._conn
         except Exception as e:
             logger.info(f"Błąd podczas połączenia: {e}")
 
+    @asynccontextmanager
+    async def read_connection(self):
+        """Połączenie do zapytań tylko do odczytu - z puli lub główne, gdy pula jest wyłączona.
+
+        Oczekujące zapisy write-behind są najpierw zatwierdzane, żeby odczyt
+        widział wcześniejsze zapisy wywołującego.
+        """
+        if self._write_behind is not None and self._write_behind.pending:
+            await self._write_behind.flush()
+        if not self._read_pool.enabled:
+            yield await self.get_connection()
+            return
+        if self._conn is None:
+            # Schemat i tryb WAL ustawia połączenie główne
+            await self._open_connection()
+        async with self._read_pool.acquire() as conn:
+            yield conn
+
+    async def check_pragmas(self) -> Dict[str, Any]:
+        """Raportuje aktywne pragmy głównego połączenia i ostrzega o odstępstwach od profilu."""
+        conn = await self._open_connection()
+        active = await read_pragmas(conn, list(self.pragmas))
+        logger.info("SQLite pragmas (%s): %s", self.db_path, active)
+        mismatches = pragma_mismatches(self.pragmas, active)
+        if self.db_path == ":memory:":
+            mismatches.pop('journal_mode', None)
+            mismatches.pop('mmap_size', None)
+        for name, (wanted, have) in mismatches.items():
+            logger.warning("SQLite PRAGMA %s: requested %s, active %s", name, wanted, have)
+        return active
+
+    def enable_write_behind(self, max_batch: int = 200, max_delay: float = 0.05) -> WriteBehindBuffer:
+        """Włącza grupowanie zapisów zleceń, statystyk i logów w mikro-paczki.
+
+        ``save_order`` nadal zwraca ID dopiero po commicie paczki; pozostałe
+        zapisy wracają od razu. ``flush_writes`` wymusza zatwierdzenie.
+        """
+        if self._write_behind is None:
+            self._write_behind = WriteBehindBuffer(self._open_connection, max_batch=max_batch, max_delay=max_delay)
+        else:
+            self._write_behind.max_batch = max(1, int(max_batch))
+            self._write_behind.max_delay = max(0.0, float(max_delay))
+        return self._write_behind
+
+    async def disable_write_behind(self) -> None:
+        """Zatwierdza oczekujące zapisy i wraca do commitu po każdym zapisie."""
+        buffer, self._write_behind = self._write_behind, None
+        if buffer is not None:
+            await buffer.close()
+
+    async def flush_writes(self) -> int:
+        """Zatwierdza oczekujące zapisy write-behind (dla operacji wymagających trwałości)."""
+        if self._write_behind is None:
+            return 0
+        return await self._write_behind.flush()
+
+    def get_write_stats(self) -> Dict[str, Any]:
+        """Metryki write-behind (głębokość kolejki, rozmiary paczek); pusty słownik gdy wyłączony."""
+        return self._write_behind.stats() if self._write_behind is not None else {}
+
+    def enable_retention(self, policies: Optional[Dict[str, Any]] = None, archive_dir: Union[str, Path] = 'data/archive',
+                         interval: Optional[float] = 3600.0, batch_size: int = 500) -> Optional[RetentionManager]:
+        """Włącza retencję logów, zleceń, metryk ryzyka i historii powiadomień.
+
+        ``policies`` nadpisuje domyślne polityki (zob. ``resolve_policies``).
+        Przy działającej pętli i ``interval`` retencja rusza cyklicznie w tle;
+        ``run_retention`` wykonuje pojedyncze przejście.
+        """
+        if self.db_path == ":memory:":
+            logger.info("Retencja pominięta dla bazy w pamięci")
+            return None
+        self._retention = RetentionManager(self.db_path, archive_dir, resolve_policies(policies),
+                                           batch_size=batch_size)
+        if interval:
+            try:
+                self._retention.start(interval)
+            except RuntimeError:
+                pass  # brak działającej pętli - tylko ręczne run_retention
+        return self._retention
+
+    async def run_retention(self, max_batches: Optional[int] = None) -> Dict[str, Dict[str, int]]:
+        """Jedno przejście retencji; pusty wynik, gdy retencja jest wyłączona."""
+        if self._retention is None:
+            return {}
+        await self.flush_writes()
+        return await self._retention.run_once(max_batches=max_batches)
+
+    async def get_history_rollups(self, source: str, granularity: str = None, start: str = None,
+                                  end: str = None) -> List[Dict]:
+        """Agregaty wierszy usuniętych przez retencję (rosnąco po kubełku czasu)"""
+        try:
+            async with self.read_connection() as conn:
+                filters = {'source': source}
+                if granularity:
+                    filters['granularity'] = granularity
+                where_clause, params = build_where_clause(filters, allowed_columns={'source', 'granularity'})
+                if start:
+                    where_clause = where_clause + ' AND bucket >= ?'
+                    params.append(start)
+                if end:
+                    where_clause = where_clause + ' AND bucket <= ?'
+                    params.append(end)
+                sql = ''.join(['SELECT * FROM history_rollups WHERE ', where_clause, ' ORDER BY bucket ASC'])
+                cursor = await conn.execute(sql, params)
+                rollups = []
+                async for row in cursor:
+                    rollup = dict(row)
+                    rollup['dimensions'] = json.loads(rollup['dimensions'])
+                    rollups.append(rollup)
+                return rollups
+        except Exception as e:
+            logger.info(f"Błąd podczas pobierania agregatów historii: {e}")
+            return []
+
+    async def _write(self, sql: str, params: Tuple = (), *, wait: bool = False) -> Optional[int]:
+        """Zapis przez bufor write-behind lub bezpośrednio z commitem; zwraca ``lastrowid`` gdy znany."""
+        if self._write_behind is not None:
+            future = self._write_behind.submit(sql, params, wait=wait)
+            return await future if future is not None else None
+        conn = await self.get_connection()
+        cursor = await conn.execute(sql, params)
+        await conn.commit()
+        return cursor.lastrowid
+
     async def close(self):
         """Zamyka połączenie z bazą danych"""
         try:
+            if self._retention is not None:
+                await self._retention.close()
+            if self._write_behind is not None:
+                await self._write_behind.close()
+            await self._read_pool.close()
             if self._conn is not None:
                 await self._conn.close()
                 self._conn = None
@@ -141,6 +311,10 @@ class DatabaseManager:
         except Exception as e:
             # Migracje są opcjonalne - jeśli się nie powiodą, kontynuujemy z utworzonym schematem
             logger.info(f"Błąd migracji w initialize: {e}")
+        try:
+            await self.check_pragmas()
+        except Exception as e:
+            logger.info(f"Błąd odczytu pragm SQLite: {e}")
 
     async def create_tables(self):
         """Utworzenie wszystkich tabel w bazie danych"""
@@ -469,16 +643,45 @@ class DatabaseManager:
             )
         ''')
 
+        # Agregaty wierszy usuniętych przez retencję (app/db_retention.py)
+        await conn.execute('''
+            CREATE TABLE IF NOT EXISTS history_rollups (
+                source TEXT NOT NULL,
+                granularity TEXT NOT NULL CHECK (granularity IN ('hour', 'day')),
+                bucket TEXT NOT NULL,
+                dimensions JSON NOT NULL,
+                row_count INTEGER NOT NULL DEFAULT 0,
+                amount_sum REAL NOT NULL DEFAULT 0.0,
+                volume_sum REAL NOT NULL DEFAULT 0.0,
+                fee_sum REAL NOT NULL DEFAULT 0.0,
+                pnl_sum REAL NOT NULL DEFAULT 0.0,
+                PRIMARY KEY (source, granularity, bucket, dimensions)
+            )
+        ''')
+
         # Indeksy dla wydajności
         await conn.execute('CREATE INDEX IF NOT EXISTS idx_bots_user_id ON bots(user_id)')
         await conn.execute('CREATE INDEX IF NOT EXISTS idx_bots_status ON bots(status)')
-        await conn.execute('CREATE INDEX IF NOT EXISTS idx_orders_bot_id ON orders(bot_id)')
         await conn.execute('CREATE INDEX IF NOT EXISTS idx_orders_status ON orders(status)')
-        await conn.execute('CREATE INDEX IF NOT EXISTS idx_logs_bot_id ON logs(bot_id)')
         await conn.execute('CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON logs(timestamp)')
         await conn.execute('CREATE INDEX IF NOT EXISTS idx_api_keys_user_id ON api_keys(user_id)')
-        await conn.execute('CREATE INDEX IF NOT EXISTS idx_risk_events_bot_id ON risk_events(bot_id)')
         await conn.execute('CREATE INDEX IF NOT EXISTS idx_risk_events_timestamp ON risk_events(timestamp)')
+        # Indeksy złożone pod historię "najnowsze najpierw" i paginację keyset:
+        # filtr + timestamp (+ niejawny rowid = id) - bez sortowania w temp B-tree.
+        # Zastępują jednokolumnowe indeksy po bot_id (są ich prefiksem).
+        await conn.execute('CREATE INDEX IF NOT EXISTS idx_orders_bot_timestamp ON orders(bot_id, timestamp)')
+        await conn.execute('CREATE INDEX IF NOT EXISTS idx_orders_bot_status_timestamp ON orders(bot_id, status, timestamp)')
+        await conn.execute('CREATE INDEX IF NOT EXISTS idx_logs_bot_timestamp ON logs(bot_id, timestamp)')
+        await conn.execute('CREATE INDEX IF NOT EXISTS idx_logs_level_timestamp ON logs(level, timestamp)')
+        await conn.execute('CREATE INDEX IF NOT EXISTS idx_logs_type_timestamp ON logs(type, timestamp)')
+        await conn.execute('CREATE INDEX IF NOT EXISTS idx_risk_events_bot_timestamp ON risk_events(bot_id, timestamp)')
+        # Wybór wierszy do retencji po czasie
+        await conn.execute('CREATE INDEX IF NOT EXISTS idx_orders_timestamp ON orders(timestamp)')
+        await conn.execute('CREATE INDEX IF NOT EXISTS idx_strategy_orders_updated_at ON strategy_orders(updated_at)')
+        await conn.execute('CREATE INDEX IF NOT EXISTS idx_risk_metrics_date ON risk_metrics(date)')
+        await conn.execute('DROP INDEX IF EXISTS idx_orders_bot_id')
+        await conn.execute('DROP INDEX IF EXISTS idx_logs_bot_id')
+        await conn.execute('DROP INDEX IF EXISTS idx_risk_events_bot_id')
         await conn.execute('CREATE INDEX IF NOT EXISTS idx_risk_metrics_bot_id ON risk_metrics(bot_id)')
         await conn.execute('CREATE INDEX IF NOT EXISTS idx_notification_history_user_id ON notification_history(user_id)')
         await conn.execute('CREATE INDEX IF NOT EXISTS idx_notification_history_created_at ON notification_history(created_at)')
@@ -842,8 +1045,6 @@ class DatabaseManager:
                                    max_drawdown: float = None):
         """Aktualizacja statystyk bota"""
         try:
-            conn = await self.get_connection()
-            
             updates_dict = {}
             if total_profit is not None:
                 updates_dict['total_profit'] = total_profit
@@ -860,8 +1061,7 @@ class DatabaseManager:
                 set_clause, params = build_set_clause(updates_dict, allowed_columns=allowed)
                 query = ''.join(['UPDATE bots SET ', set_clause, ' WHERE id = ?'])
                 params.append(bot_id)
-                await conn.execute(query, params)
-                await conn.commit()
+                await self._write(query, tuple(params))
             
         except Exception as e:
             
@@ -874,17 +1074,13 @@ class DatabaseManager:
                         price: float = None, raw_data: Dict = None) -> Optional[int]:
         """Zapisanie zlecenia"""
         try:
-            conn = await self.get_connection()
-            
-            cursor = await conn.execute('''
+            # Z write-behind czeka na commit paczki - ID zlecenia jest trwałe
+            return await self._write('''
                 INSERT INTO orders (bot_id, exchange_order_id, client_order_id, symbol, 
                                   side, type, amount, price, raw_data)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', (bot_id, exchange_order_id, client_order_id, symbol, side, 
-                  order_type, amount, price, json.dumps(raw_data) if raw_data else None))
-            
-            await conn.commit()
-            return cursor.lastrowid
+                  order_type, amount, price, json.dumps(raw_data) if raw_data else None), wait=True)
             
         except Exception as e:
             logger.info(f"Błąd podczas zapisywania zlecenia: {e}")
@@ -895,8 +1091,6 @@ class DatabaseManager:
                                  fee_asset: str = None, error_message: str = None):
         """Aktualizacja statusu zlecenia"""
         try:
-            conn = await self.get_connection()
-            
             updates_dict = { 'status': status }
             if filled_amount is not None:
                 updates_dict['filled_amount'] = filled_amount
@@ -921,8 +1115,7 @@ class DatabaseManager:
             
             query = ''.join(['UPDATE orders SET ', set_clause, ' WHERE id = ?'])
             params.append(order_id)
-            await conn.execute(query, params)
-            await conn.commit()
+            await self._write(query, tuple(params))
             
         except Exception as e:
             
@@ -931,49 +1124,99 @@ class DatabaseManager:
     async def get_bot_orders(self, bot_id: int, status: str = None, limit: int = 100) -> List[Dict]:
         """Pobranie zleceń bota"""
         try:
-            conn = await self.get_connection()
+            async with self.read_connection() as conn:
             
-            if status:
-                cursor = await conn.execute('''
-                    SELECT * FROM orders WHERE bot_id = ? AND status = ?
-                    ORDER BY timestamp DESC LIMIT ?
-                ''', (bot_id, status, limit))
-            else:
-                cursor = await conn.execute('''
-                    SELECT * FROM orders WHERE bot_id = ?
-                    ORDER BY timestamp DESC LIMIT ?
-                ''', (bot_id, limit))
-            
-            orders = []
-            async for order in cursor:
-                orders.append({
-                    'id': order['id'],
-                    'bot_id': order['bot_id'],
-                    'exchange_order_id': order['exchange_order_id'],
-                    'client_order_id': order['client_order_id'],
-                    'symbol': order['symbol'],
-                    'side': order['side'],
-                    'type': order['type'],
-                    'amount': order['amount'],
-                    'price': order['price'],
-                    'filled_amount': order['filled_amount'],
-                    'average_price': order['average_price'],
-                    'status': order['status'],
-                    'fee': order['fee'],
-                    'fee_asset': order['fee_asset'],
-                    'timestamp': order['timestamp'],
-                    'filled_at': order['filled_at'],
-                    'canceled_at': order['canceled_at'],
-                    'error_message': order['error_message'],
-                    'raw_data': json.loads(order['raw_data']) if order['raw_data'] else None
-                })
-            
-            return orders
+                if status:
+                    cursor = await conn.execute('''
+                        SELECT * FROM orders WHERE bot_id = ? AND status = ?
+                        ORDER BY timestamp DESC, id DESC LIMIT ?
+                    ''', (bot_id, status, limit))
+                else:
+                    cursor = await conn.execute('''
+                        SELECT * FROM orders WHERE bot_id = ?
+                        ORDER BY timestamp DESC, id DESC LIMIT ?
+                    ''', (bot_id, limit))
+            
+                return [self._order_row_to_dict(order) async for order in cursor]
             
         except Exception as e:
             logger.info(f"Błąd podczas pobierania zleceń bota: {e}")
             return []
 
+    async def get_bot_orders_page(self, bot_id: int, status: str = None, cursor: str = None,
+                                  limit: int = 100) -> Dict[str, Any]:
+        """Strona zleceń bota (najnowsze najpierw) z kursorem do następnej strony"""
+        filters = {'bot_id': bot_id}
+        if status:
+            filters['status'] = status
+        return await self._fetch_page('orders', filters, cursor, limit, self._order_row_to_dict)
+
+    @staticmethod
+    def _order_row_to_dict(order) -> Dict[str, Any]:
+        return {
+            'id': order['id'],
+            'bot_id': order['bot_id'],
+            'exchange_order_id': order['exchange_order_id'],
+            'client_order_id': order['client_order_id'],
+            'symbol': order['symbol'],
+            'side': order['side'],
+            'type': order['type'],
+            'amount': order['amount'],
+            'price': order['price'],
+            'filled_amount': order['filled_amount'],
+            'average_price': order['average_price'],
+            'status': order['status'],
+            'fee': order['fee'],
+            'fee_asset': order['fee_asset'],
+            'timestamp': order['timestamp'],
+            'filled_at': order['filled_at'],
+            'canceled_at': order['canceled_at'],
+            'error_message': order['error_message'],
+            'raw_data': json.loads(order['raw_data']) if order['raw_data'] else None
+        }
+
+    @staticmethod
+    def _page_query(table: str, filters: Dict[str, Any], cursor: Optional[str], limit: int,
+                    extra_clauses: Optional[List[Tuple[str, Any]]] = None) -> Tuple[str, List[Any]]:
+        """SQL strony keyset: ``WHERE filtry AND (kolumna, id) < kursor ORDER BY kolumna, id LIMIT n+1``.
+
+        W przeciwieństwie do OFFSET koszt strony nie rośnie z jej numerem, a nowe
+        wiersze dopisywane w trakcie przeglądania nie przesuwają kolejnych stron.
+        ``extra_clauses`` to stałe fragmenty SQL z jednym parametrem (zakresy dat).
+        """
+        order_column, descending, allowed = KEYSET_TABLES[table]
+        position = decode_cursor(cursor) if cursor else None
+        where_clause, params = build_where_clause(filters, allowed_columns=allowed)
+        keyset_clause, keyset_params, order_by = build_keyset_clause(order_column, position, descending)
+        parts = ['SELECT * FROM ', table, ' WHERE ', where_clause]
+        for clause, value in extra_clauses or []:
+            parts.extend([' AND ', clause])
+            params.append(value)
+        parts.extend([' AND ', keyset_clause, ' ORDER BY ', order_by, ' LIMIT ?'])
+        params.extend(keyset_params)
+        # Jeden wiersz więcej mówi, czy istnieje następna strona
+        params.append(limit + 1)
+        return ''.join(parts), params
+
+    async def _fetch_page(self, table: str, filters: Dict[str, Any], cursor: Optional[str], limit: int,
+                          row_mapper, extra_clauses: Optional[List[Tuple[str, Any]]] = None) -> Dict[str, Any]:
+        """Strona wyników ``{'items': [...], 'next_cursor': token | None}``."""
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        sql, params = self._page_query(table, filters, cursor, limit, extra_clauses)
+        try:
+            async with self.read_connection() as conn:
+                cursor_obj = await conn.execute(sql, params)
+                rows = await cursor_obj.fetchall()
+        except Exception as e:
+            logger.info(f"Błąd podczas pobierania strony z {table}: {e}")
+            return {'items': [], 'next_cursor': None}
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            order_column = KEYSET_TABLES[table][0]
+            next_cursor = encode_cursor(rows[-1][order_column], rows[-1]['id'])
+        return {'items': [row_mapper(row) for row in rows], 'next_cursor': next_cursor}
+
     async def get_first_user(self) -> Optional[Dict[str, Any]]:
         """Zwraca pierwszego użytkownika (najniższe ID)."""
         try:
@@ -1053,8 +1296,7 @@ class DatabaseManager:
     async def upsert_strategy_order(self, bot_id: int, order_id: str, payload: Dict[str, Any], status: str) -> bool:
         """Dodaje lub aktualizuje wpis operacji strategii."""
         try:
-            conn = await self.get_connection()
-            await conn.execute('''
+            await self._write('''
                 INSERT INTO strategy_orders (bot_id, order_id, payload, status, updated_at)
                 VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
                 ON CONFLICT(bot_id, order_id) DO UPDATE SET
@@ -1062,7 +1304,6 @@ class DatabaseManager:
                     status = excluded.status,
                     updated_at = CURRENT_TIMESTAMP
             ''', (bot_id, order_id, json.dumps(payload), status))
-            await conn.commit()
             return True
         except Exception as e:
             logger.info(f"Błąd podczas zapisywania operacji strategii: {e}")
@@ -1133,16 +1374,12 @@ class DatabaseManager:
                       bot_id: int = None, user_id: int = None, details: Dict = None):
         """Dodanie wpisu do logów"""
         try:
-            conn = await self.get_connection()
-            
-            await conn.execute('''
+            await self._write('''
                 INSERT INTO logs (bot_id, user_id, type, level, message, details)
                 VALUES (?, ?, ?, ?, ?, ?)
             ''', (bot_id, user_id, log_type, level, message, 
                   json.dumps(details) if details else None))
             
-            await conn.commit()
-            
         except Exception as e:
             
             logger.info(f"Błąd podczas dodawania logu: {e}")
@@ -1151,44 +1388,51 @@ class DatabaseManager:
                       level: str = None, limit: int = 1000) -> List[Dict]:
         """Pobranie logów"""
         try:
-            conn = await self.get_connection()
+            async with self.read_connection() as conn:
             
-            filters = {}
-            if bot_id is not None:
-                filters['bot_id'] = bot_id
-            if user_id is not None:
-                filters['user_id'] = user_id
-            if log_type is not None:
-                filters['type'] = log_type
-            if level is not None:
-                filters['level'] = level
-            
-            allowed = {'bot_id','user_id','type','level'}
-            where_clause, params = build_where_clause(filters, allowed_columns=allowed)
-            sql = ''.join(['SELECT * FROM logs WHERE ', where_clause, ' ORDER BY timestamp DESC LIMIT ?'])
-            params.append(limit)
-            cursor = await conn.execute(sql, params)
+                filters = {}
+                if bot_id is not None:
+                    filters['bot_id'] = bot_id
+                if user_id is not None:
+                    filters['user_id'] = user_id
+                if log_type is not None:
+                    filters['type'] = log_type
+                if level is not None:
+                    filters['level'] = level
             
-            logs = []
-            async for log in cursor:
-                logs.append({
-                    'id': log['id'],
-                    'bot_id': log['bot_id'],
-                    'user_id': log['user_id'],
-                    'type': log['type'],
-                    'level': log['level'],
-                    'message': log['message'],
-                    'details': json.loads(log['details']) if log['details'] else None,
-                    'timestamp': log['timestamp']
-                })
+                allowed = {'bot_id','user_id','type','level'}
+                where_clause, params = build_where_clause(filters, allowed_columns=allowed)
+                sql = ''.join(['SELECT * FROM logs WHERE ', where_clause, ' ORDER BY timestamp DESC, id DESC LIMIT ?'])
+                params.append(limit)
+                cursor = await conn.execute(sql, params)
             
-            return logs
+                return [self._log_row_to_dict(log) async for log in cursor]
             
         except Exception as e:
             
             logger.info(f"Błąd podczas pobierania logów: {e}")
             return []
     
+    async def get_logs_page(self, bot_id: int = None, user_id: int = None, log_type: str = None,
+                            level: str = None, cursor: str = None, limit: int = 100) -> Dict[str, Any]:
+        """Strona logów (najnowsze najpierw) z kursorem do następnej strony"""
+        filters = {'bot_id': bot_id, 'user_id': user_id, 'type': log_type, 'level': level}
+        filters = {key: value for key, value in filters.items() if value is not None}
+        return await self._fetch_page('logs', filters, cursor, limit, self._log_row_to_dict)
+
+    @staticmethod
+    def _log_row_to_dict(log) -> Dict[str, Any]:
+        return {
+            'id': log['id'],
+            'bot_id': log['bot_id'],
+            'user_id': log['user_id'],
+            'type': log['type'],
+            'level': log['level'],
+            'message': log['message'],
+            'details': json.loads(log['details']) if log['details'] else None,
+            'timestamp': log['timestamp']
+        }
+
     # === OPERACJE NA STATYSTYKACH ===
     
     async def save_daily_statistics(self, bot_id: int, date: str, trades_count: int,
@@ -1214,43 +1458,54 @@ class DatabaseManager:
                                 end_date: str = None) -> List[Dict]:
         """Pobranie statystyk bota"""
         try:
-            conn = await self.get_connection()
-            
-            # Bezpieczne budowanie WHERE
-            filters = {'bot_id': bot_id}
-            where_clause, params = build_where_clause(filters, allowed_columns={'bot_id'})
+            async with self.read_connection() as conn:
             
-            if start_date:
-                where_clause = where_clause + ' AND date >= ?'
-                params.append(start_date)
-            if end_date:
-                where_clause = where_clause + ' AND date <= ?'
-                params.append(end_date)
+                # Bezpieczne budowanie WHERE
+                filters = {'bot_id': bot_id}
+                where_clause, params = build_where_clause(filters, allowed_columns={'bot_id'})
             
-            sql = ''.join(['SELECT * FROM bot_statistics WHERE ', where_clause, ' ORDER BY date ASC'])
-            cursor = await conn.execute(sql, params)
+                if start_date:
+                    where_clause = where_clause + ' AND date >= ?'
+                    params.append(start_date)
+                if end_date:
+                    where_clause = where_clause + ' AND date <= ?'
+                    params.append(end_date)
             
-            statistics = []
-            async for stat in cursor:
-                statistics.append({
-                    'id': stat['id'],
-                    'bot_id': stat['bot_id'],
-                    'date': stat['date'],
-                    'trades_count': stat['trades_count'],
-                    'profit_loss': stat['profit_loss'],
-                    'volume': stat['volume'],
-                    'win_trades': stat['win_trades'],
-                    'loss_trades': stat['loss_trades'],
-                    'fees_paid': stat['fees_paid'],
-                    'created_at': stat['created_at']
-                })
+                sql = ''.join(['SELECT * FROM bot_statistics WHERE ', where_clause, ' ORDER BY date ASC, id ASC'])
+                cursor = await conn.execute(sql, params)
             
-            return statistics
+                return [self._statistics_row_to_dict(stat) async for stat in cursor]
             
         except Exception as e:
             logger.info(f"Błąd podczas pobierania statystyk bota: {e}")
             return []
     
+    async def get_bot_statistics_page(self, bot_id: int, start_date: str = None, end_date: str = None,
+                                      cursor: str = None, limit: int = 100) -> Dict[str, Any]:
+        """Strona dziennych statystyk bota (rosnąco po dacie) z kursorem do następnej strony"""
+        extra = []
+        if start_date:
+            extra.append(('date >= ?', start_date))
+        if end_date:
+            extra.append(('date <= ?', end_date))
+        return await self._fetch_page('bot_statistics', {'bot_id': bot_id}, cursor, limit,
+                                      self._statistics_row_to_dict, extra_clauses=extra)
+
+    @staticmethod
+    def _statistics_row_to_dict(stat) -> Dict[str, Any]:
+        return {
+            'id': stat['id'],
+            'bot_id': stat['bot_id'],
+            'date': stat['date'],
+            'trades_count': stat['trades_count'],
+            'profit_loss': stat['profit_loss'],
+            'volume': stat['volume'],
+            'win_trades': stat['win_trades'],
+            'loss_trades': stat['loss_trades'],
+            'fees_paid': stat['fees_paid'],
+            'created_at': stat['created_at']
+        }
+
     # === BACKUP I RESTORE ===
     
     async def backup_database(self, backup_path: str) -> bool:
@@ -1558,30 +1813,37 @@ class DatabaseManager:
     async def get_risk_events(self, bot_id: int = None, limit: int = 100):
         """Pobiera zdarzenia ryzyka"""
         try:
-            conn = await self.get_connection()
+            async with self.read_connection() as conn:
             
-            if bot_id:
-                cursor = await conn.execute(
-                    'SELECT * FROM risk_events WHERE bot_id = ? ORDER BY timestamp DESC LIMIT ?',
-                    (bot_id, limit)
-                )
-            else:
-                cursor = await conn.execute(
-                    'SELECT * FROM risk_events ORDER BY timestamp DESC LIMIT ?',
-                    (limit,)
-                )
+                if bot_id:
+                    cursor = await conn.execute(
+                        'SELECT * FROM risk_events WHERE bot_id = ? ORDER BY timestamp DESC, id DESC LIMIT ?',
+                        (bot_id, limit)
+                    )
+                else:
+                    cursor = await conn.execute(
+                        'SELECT * FROM risk_events ORDER BY timestamp DESC, id DESC LIMIT ?',
+                        (limit,)
+                    )
             
-            events = []
-            async for row in cursor:
-                event = dict(row)
-                if event['details']:
-                    event['details'] = json.loads(event['details'])
-                events.append(event)
-            return events
+                return [self._risk_event_row_to_dict(row) async for row in cursor]
         except Exception as e:
             logger.info(f"Błąd podczas pobierania zdarzeń ryzyka: {e}")
             return []
 
+    async def get_risk_events_page(self, bot_id: int = None, cursor: str = None,
+                                   limit: int = 100) -> Dict[str, Any]:
+        """Strona zdarzeń ryzyka (najnowsze najpierw) z kursorem do następnej strony"""
+        filters = {'bot_id': bot_id} if bot_id else {}
+        return await self._fetch_page('risk_events', filters, cursor, limit, self._risk_event_row_to_dict)
+
+    @staticmethod
+    def _risk_event_row_to_dict(row) -> Dict[str, Any]:
+        event = dict(row)
+        if event['details']:
+            event['details'] = json.loads(event['details'])
+        return event
+
     async def resolve_risk_event(self, event_id: int):
         """Oznacza zdarzenie ryzyka jako rozwiązane"""
         try:
@@ -1793,27 +2055,27 @@ class DatabaseManager:
                                       notification_type: str = None, limit: int = 100):
         """Pobiera historię powiadomień"""
         try:
-            conn = await self.get_connection()
-            
-            filters = {}
-            if user_id is not None:
-                filters['user_id'] = user_id
-            if bot_id is not None:
-                filters['bot_id'] = bot_id
-            if notification_type is not None:
-                filters['notification_type'] = notification_type
-            where_clause, params = build_where_clause(filters, allowed_columns={'user_id', 'bot_id', 'notification_type'})
-            params.append(limit)
-            sql = ''.join(['SELECT * FROM notification_history WHERE ', where_clause, ' ORDER BY created_at DESC LIMIT ?'])
-            cursor = await conn.execute(sql, params)
-            
-            history = []
-            async for row in cursor:
-                notification = dict(row)
-                if notification['metadata']:
-                    notification['metadata'] = json.loads(notification['metadata'])
-                history.append(notification)
-            return history
+            async with self.read_connection() as conn:
+            
+                filters = {}
+                if user_id is not None:
+                    filters['user_id'] = user_id
+                if bot_id is not None:
+                    filters['bot_id'] = bot_id
+                if notification_type is not None:
+                    filters['notification_type'] = notification_type
+                where_clause, params = build_where_clause(filters, allowed_columns={'user_id', 'bot_id', 'notification_type'})
+                params.append(limit)
+                sql = ''.join(['SELECT * FROM notification_history WHERE ', where_clause, ' ORDER BY created_at DESC LIMIT ?'])
+                cursor = await conn.execute(sql, params)
+            
+                history = []
+                async for row in cursor:
+                    notification = dict(row)
+                    if notification['metadata']:
+                        notification['metadata'] = json.loads(notification['metadata'])
+                    history.append(notification)
+                return history
         except Exception as e:
             logger.info(f"Błąd podczas pobierania historii powiadomień: {e}")
             return []
@@ -0,0 +1,317 @@
+"""Retencja tabel historycznych ``DatabaseManager``: agregaty, archiwum i usuwanie.
+
+Każda polityka (``RetentionPolicy``) mówi, ile dni surowych wierszy trzymać
+w tabeli. Starsze wiersze są przetwarzane małymi paczkami:
+
+1. dopisywane do skompresowanej partycji archiwum
+   ``<archive_dir>/<tabela>/<tabela>-<RRRR-MM>.jsonl.gz`` (jeden plik na miesiąc),
+2. sumowane do agregatów godzinowych/dziennych w tabeli ``history_rollups``,
+3. usuwane z tabeli źródłowej - agregaty i usunięcie w jednej transakcji.
+
+Paczka działa w wątku roboczym na osobnym połączeniu ``sqlite3`` z krótką
+transakcją ``BEGIN IMMEDIATE``, a między paczkami pętla zdarzeń dostaje
+``pause`` sekund - zapisy handlowe czekają najwyżej na jedną paczkę. Zwolnione
+strony SQLite są używane ponownie, więc przy stałym napływie danych rozmiar
+pliku bazy przestaje rosnąć bez ``VACUUM``.
+
+Archiwum jest zapisywane (z ``fsync``) przed commitem usunięcia: awaria
+pomiędzy tymi krokami może najwyżej zdublować paczkę w archiwum, nigdy jej
+nie zgubić.
+"""
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+from utils.db_utils import validate_identifiers
+
+logger = logging.getLogger(__name__)
+
+# Kolumny agregatów w ``history_rollups`` (oprócz licznika wierszy)
+ROLLUP_MEASURES = ('amount_sum', 'volume_sum', 'fee_sum', 'pnl_sum')
+_BUCKET_LENGTH = {'hour': 13, 'day': 10}  # prefiks 'RRRR-MM-DD HH' / 'RRRR-MM-DD'
+
+
+def _number(value: Any) -> float:
+    try:
+        return float(value or 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """Polityka retencji jednej tabeli."""
+
+    table: str
+    time_column: str
+    keep_days: int
+    rollup: Optional[str] = None                    # 'hour' | 'day' | None
+    dimensions: Tuple[str, ...] = ()
+    measures: Mapping[str, Callable[[Mapping[str, Any]], float]] = field(default_factory=dict)
+    archive: bool = True
+    # Stały fragment SQL zawężający wiersze do usunięcia (np. tylko zakończone zlecenia)
+    condition: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        validate_identifiers(self.table, self.time_column, *self.dimensions)
+        if self.rollup is not None and self.rollup not in _BUCKET_LENGTH:
+            raise ValueError(f"Nieznana granulacja agregatów: {self.rollup}")
+        unknown = set(self.measures) - set(ROLLUP_MEASURES)
+        if unknown:
+            raise ValueError(f"Nieznane miary agregatów: {sorted(unknown)}")
+
+
+DEFAULT_POLICIES: Dict[str, RetentionPolicy] = {
+    'logs': RetentionPolicy(
+        'logs', 'timestamp', keep_days=30, rollup='hour', dimensions=('bot_id', 'type', 'level'),
+    ),
+    'notification_history': RetentionPolicy(
+        'notification_history', 'created_at', keep_days=30, rollup='day',
+        dimensions=('notification_type', 'channel', 'status'),
+        condition="status <> 'pending'",
+    ),
+    'strategy_orders': RetentionPolicy(
+        'strategy_orders', 'updated_at', keep_days=90, rollup='day', dimensions=('bot_id', 'status'),
+        condition="status NOT IN ('new', 'open', 'pending', 'active', 'partially_filled')",
+    ),
+    'orders': RetentionPolicy(
+        'orders', 'timestamp', keep_days=365, rollup='day', dimensions=('bot_id', 'symbol', 'side', 'status'),
+        measures={
+            'amount_sum': lambda row: _number(row['amount']),
+            'volume_sum': lambda row: _number(row['filled_amount']) * _number(row['average_price']),
+            'fee_sum': lambda row: _number(row['fee']),
+        },
+        condition="status IN ('filled', 'canceled', 'rejected', 'expired')",
+    ),
+    'risk_metrics': RetentionPolicy(
+        'risk_metrics', 'date', keep_days=365, rollup=None,
+    ),
+}
+
+
+def resolve_policies(overrides: Optional[Mapping[str, Any]] = None) -> Dict[str, RetentionPolicy]:
+    """Domyślne polityki z nadpisaniami z konfiguracji.
+
+    ``{'logs': {'keep_days': 14}, 'orders': {'archive': False}, 'risk_metrics': None}``
+    - ``None`` wyłącza retencję tabeli; zmieniać można ``keep_days``, ``archive``
+    i ``rollup``.
+    """
+    policies = dict(DEFAULT_POLICIES)
+    for table, changes in (overrides or {}).items():
+        if table not in DEFAULT_POLICIES:
+            raise ValueError(f"Brak polityki retencji dla tabeli: {table}")
+        if changes is None:
+            policies.pop(table, None)
+            continue
+        unknown = set(changes) - {'keep_days', 'archive', 'rollup'}
+        if unknown:
+            raise ValueError(f"Nieobsługiwane pola polityki retencji: {sorted(unknown)}")
+        policies[table] = replace(DEFAULT_POLICIES[table], **dict(changes))
+    return policies
+
+
+def iter_archive(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """Wiersze z partycji archiwum (wszystkie człony gzip po kolei)."""
+    with gzip.open(path, 'rt', encoding='utf-8') as handle:
+        for line in handle:
+            if line.strip():
+                yield json.loads(line)
+
+
+class RetentionManager:
+    """Przyrostowa retencja tabel według ``RetentionPolicy``."""
+
+    def __init__(
+        self,
+        db_path: str,
+        archive_dir: Union[str, Path] = 'data/archive',
+        policies: Optional[Mapping[str, RetentionPolicy]] = None,
+        *,
+        batch_size: int = 500,
+        pause: float = 0.05,
+        busy_timeout: float = 5.0,
+    ):
+        self.db_path = str(db_path)
+        self.archive_dir = Path(archive_dir)
+        self.policies = dict(policies if policies is not None else DEFAULT_POLICIES)
+        self.batch_size = max(1, int(batch_size))
+        self.pause = max(0.0, float(pause))
+        self.busy_timeout = busy_timeout
+        self._conn: Optional[sqlite3.Connection] = None
+        self._thread_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._stats: Dict[str, Dict[str, Any]] = defaultdict(
+            lambda: {'deleted': 0, 'archived': 0, 'rolled_up': 0, 'batches': 0, 'last_run': None}
+        )
+
+    # --- wątek roboczy -------------------------------------------------
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout, check_same_thread=False,
+                                   isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA foreign_keys = ON')
+            self._conn = conn
+        return self._conn
+
+    def _select_sql(self, policy: RetentionPolicy) -> str:
+        parts = ['SELECT * FROM ', policy.table, ' WHERE ', policy.time_column, ' < ?']
+        if policy.condition:
+            parts.extend([' AND (', policy.condition, ')'])
+        parts.extend([' ORDER BY ', policy.time_column, ', id LIMIT ?'])
+        return ''.join(parts)
+
+    def _process_batch(self, policy: RetentionPolicy, cutoff: str) -> Dict[str, int]:
+        """Jedna paczka: archiwum, agregaty i usunięcie (wywoływane w wątku)."""
+        with self._thread_lock:
+            conn = self._connection()
+            rows = conn.execute(self._select_sql(policy), (cutoff, self.batch_size)).fetchall()
+            if not rows:
+                return {'deleted': 0, 'archived': 0, 'rolled_up': 0}
+            archived = self._archive(policy, rows) if policy.archive else 0
+            rollups = self._rollups(policy, rows)
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                if rollups:
+                    conn.executemany(
+                        'INSERT INTO history_rollups '
+                        '(source, granularity, bucket, dimensions, row_count, amount_sum, volume_sum, fee_sum, pnl_sum) '
+                        'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) '
+                        'ON CONFLICT(source, granularity, bucket, dimensions) DO UPDATE SET '
+                        'row_count = row_count + excluded.row_count, '
+                        'amount_sum = amount_sum + excluded.amount_sum, '
+                        'volume_sum = volume_sum + excluded.volume_sum, '
+                        'fee_sum = fee_sum + excluded.fee_sum, '
+                        'pnl_sum = pnl_sum + excluded.pnl_sum',
+                        rollups,
+                    )
+                delete_sql = ''.join(['DELETE FROM ', policy.table, ' WHERE id = ?'])
+                conn.executemany(delete_sql, [(row['id'],) for row in rows])
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            return {'deleted': len(rows), 'archived': archived, 'rolled_up': len(rollups)}
+
+    def _archive(self, policy: RetentionPolicy, rows: List[sqlite3.Row]) -> int:
+        partitions: Dict[str, List[str]] = defaultdict(list)
+        for row in rows:
+            month = str(row[policy.time_column] or '')[:7] or 'unknown'
+            partitions[month].append(json.dumps(dict(row), default=str, ensure_ascii=False))
+        target_dir = self.archive_dir / policy.table
+        target_dir.mkdir(parents=True, exist_ok=True)
+        for month, lines in partitions.items():
+            path = target_dir / ''.join([policy.table, '-', month, '.jsonl.gz'])
+            # Tryb 'ab' dopisuje nowy człon gzip - plik pozostaje poprawnym archiwum
+            with open(path, 'ab') as raw:
+                with gzip.GzipFile(fileobj=raw, mode='ab') as handle:
+                    handle.write(('\n'.join(lines) + '\n').encode('utf-8'))
+                raw.flush()
+                os.fsync(raw.fileno())
+        return len(rows)
+
+    def _rollups(self, policy: RetentionPolicy, rows: List[sqlite3.Row]) -> List[Tuple[Any, ...]]:
+        if policy.rollup is None:
+            return []
+        length = _BUCKET_LENGTH[policy.rollup]
+        totals: Dict[Tuple[str, str], List[float]] = {}
+        for row in rows:
+            bucket = str(row[policy.time_column] or '')[:length].replace('T', ' ')
+            dims = json.dumps({name: row[name] for name in policy.dimensions}, sort_keys=True, default=str)
+            acc = totals.setdefault((bucket, dims), [0] + [0.0] * len(ROLLUP_MEASURES))
+            acc[0] += 1
+            for index, name in enumerate(ROLLUP_MEASURES, start=1):
+                measure = policy.measures.get(name)
+                if measure is not None:
+                    acc[index] += measure(row)
+        return [
+            (policy.table, policy.rollup, bucket, dims, *acc)
+            for (bucket, dims), acc in totals.items()
+        ]
+
+    def _close_connection(self) -> None:
+        with self._thread_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # --- API asynchroniczne --------------------------------------------
+
+    async def run_once(self, max_batches: Optional[int] = None, now: Optional[datetime] = None) -> Dict[str, Dict[str, int]]:
+        """Jedno przejście po wszystkich politykach; ``max_batches`` ogranicza paczki na tabelę."""
+        now = now or datetime.now(timezone.utc)
+        summary: Dict[str, Dict[str, int]] = {}
+        for table, policy in self.policies.items():
+            cutoff = (now - timedelta(days=policy.keep_days)).strftime('%Y-%m-%d %H:%M:%S')
+            totals = {'deleted': 0, 'archived': 0, 'rolled_up': 0, 'batches': 0}
+            while max_batches is None or totals['batches'] < max_batches:
+                try:
+                    result = await asyncio.to_thread(self._process_batch, policy, cutoff)
+                except Exception as exc:
+                    logger.warning("Retencja tabeli %s przerwana: %s", table, exc)
+                    break
+                if not result['deleted']:
+                    break
+                totals['batches'] += 1
+                for key in ('deleted', 'archived', 'rolled_up'):
+                    totals[key] += result[key]
+                if result['deleted'] < self.batch_size:
+                    break
+                # Oddaj pętlę zdarzeń zapisom handlowym między paczkami
+                await asyncio.sleep(self.pause)
+            stats = self._stats[table]
+            for key in ('deleted', 'archived', 'rolled_up', 'batches'):
+                stats[key] += totals[key]
+            stats['last_run'] = now.isoformat()
+            summary[table] = totals
+            if totals['deleted']:
+                logger.info("Retencja %s: usunięto %d wierszy (archiwum: %d, agregaty: %d)",
+                            table, totals['deleted'], totals['archived'], totals['rolled_up'])
+        return summary
+
+    def start(self, interval: float = 3600.0) -> asyncio.Task:
+        """Uruchamia cykliczną retencję w tle co ``interval`` sekund."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run_forever(interval))
+        return self._task
+
+    async def _run_forever(self, interval: float) -> None:
+        while True:
+            await self.run_once()
+            await asyncio.sleep(interval)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Skumulowane liczniki retencji per tabela."""
+        return {table: dict(values) for table, values in self._stats.items()}
+
+    async def close(self) -> None:
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await asyncio.to_thread(self._close_connection)
+
+
+__all__ = [
+    'DEFAULT_POLICIES',
+    'ROLLUP_MEASURES',
+    'RetentionManager',
+    'RetentionPolicy',
+    'iter_archive',
+    'resolve_policies',
+]
@@ -0,0 +1,179 @@
+"""Write-behind dla ``DatabaseManager``: zapisy grupowane w mikro-paczki.
+
+Zamiast ``commit()`` po każdym zapisie operacje trafiają do bufora i są
+zatwierdzane jedną transakcją - po ``max_delay`` sekundach, po zebraniu
+``max_batch`` operacji albo na żądanie (``flush``). Kolejne operacje z tym
+samym SQL są wykonywane jednym ``executemany``. Zapisy, których wynik jest
+potrzebny (np. ``lastrowid`` nowego zlecenia), czekają na future rozwiązywane
+dopiero po commicie paczki i wymuszają zatwierdzenie w najbliższym obrocie
+pętli - zapisy zgłoszone w tym samym obrocie dzielą jeden commit (group commit).
+
+Kolejność zapisów jest zachowana, a ``DatabaseManager.get_connection`` opróżnia
+bufor przed każdym innym użyciem połączenia, więc odczyty widzą własne zapisy.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingWrite:
+    sql: str
+    params: Sequence[Any]
+    future: Optional[asyncio.Future] = None
+
+
+class WriteBehindBuffer:
+    """Bufor zapisów zatwierdzanych paczkami na wspólnym połączeniu aiosqlite."""
+
+    def __init__(
+        self,
+        connection_factory: Callable[[], Awaitable[Any]],
+        *,
+        max_batch: int = 200,
+        max_delay: float = 0.05,
+    ):
+        self._connection_factory = connection_factory
+        self.max_batch = max(1, int(max_batch))
+        self.max_delay = max(0.0, float(max_delay))
+        self._pending: List[_PendingWrite] = []
+        self._lock: Optional[asyncio.Lock] = None
+        self._timer: Optional[asyncio.Task] = None
+        self._kick: Optional[asyncio.Task] = None
+        self._stats: Dict[str, Any] = {
+            'submitted': 0,
+            'written': 0,
+            'batches': 0,
+            'failed_batches': 0,
+            'last_batch_size': 0,
+            'max_batch_size': 0,
+            'avg_batch_size': 0.0,
+            'max_queue_depth': 0,
+            'last_flush_ms': 0.0,
+        }
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def submit(self, sql: str, params: Sequence[Any] = (), *, wait: bool = False) -> Optional[asyncio.Future]:
+        """Dodaje zapis do bufora; z ``wait=True`` zwraca future z ``lastrowid`` po commicie."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future() if wait else None
+        self._pending.append(_PendingWrite(sql, tuple(params), future))
+        stats = self._stats
+        stats['submitted'] += 1
+        stats['max_queue_depth'] = max(stats['max_queue_depth'], len(self._pending))
+        if wait or len(self._pending) >= self.max_batch:
+            if self._kick is None or self._kick.done():
+                self._kick = loop.create_task(self.flush())
+        elif self._timer is None or self._timer.done():
+            self._timer = loop.create_task(self._flush_later())
+        return future
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.max_delay)
+        await self.flush()
+
+    async def flush(self) -> int:
+        """Zatwierdza wszystkie oczekujące zapisy jedną transakcją; zwraca ich liczbę."""
+        written = await self._flush_batch()
+        # Zapisy z oczekującym wywołującym, które przyszły w trakcie commitu
+        if any(item.future is not None for item in self._pending):
+            written += await self._flush_batch()
+        return written
+
+    async def _flush_batch(self) -> int:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+            started = time.perf_counter()
+            conn = await self._connection_factory()
+            results: List[Any] = []
+            try:
+                i = 0
+                while i < len(batch):
+                    item = batch[i]
+                    if item.future is not None:
+                        cursor = await conn.execute(item.sql, item.params)
+                        results.append((item.future, cursor.lastrowid))
+                        i += 1
+                        continue
+                    # Kolejne zapisy z identycznym SQL -> jedno executemany
+                    j = i
+                    while j < len(batch) and batch[j].future is None and batch[j].sql == item.sql:
+                        j += 1
+                    if j - i == 1:
+                        await conn.execute(item.sql, item.params)
+                    else:
+                        await conn.executemany(item.sql, [w.params for w in batch[i:j]])
+                    i = j
+                await conn.commit()
+            except Exception as exc:
+                # Jeden błędny zapis nie może zgubić reszty paczki - powtórz pojedynczo
+                self._stats['failed_batches'] += 1
+                logger.warning("Write-behind batch of %d writes failed (%s) - retrying one by one", len(batch), exc)
+                try:
+                    await conn.rollback()
+                except Exception:
+                    pass
+                written = await self._write_individually(conn, batch)
+                self._record_batch(written, (time.perf_counter() - started) * 1000.0)
+                return written
+
+            for future, value in results:
+                if not future.done():
+                    future.set_result(value)
+            self._record_batch(len(batch), (time.perf_counter() - started) * 1000.0)
+            return len(batch)
+
+    async def _write_individually(self, conn: Any, batch: List[_PendingWrite]) -> int:
+        written = 0
+        for item in batch:
+            try:
+                cursor = await conn.execute(item.sql, item.params)
+                await conn.commit()
+            except Exception as exc:
+                logger.error("Write-behind write failed: %s", exc)
+                try:
+                    await conn.rollback()
+                except Exception:
+                    pass
+                if item.future is not None and not item.future.done():
+                    item.future.set_exception(exc)
+                continue
+            written += 1
+            if item.future is not None and not item.future.done():
+                item.future.set_result(cursor.lastrowid)
+        return written
+
+    def _record_batch(self, size: int, elapsed_ms: float) -> None:
+        stats = self._stats
+        stats['batches'] += 1
+        stats['written'] += size
+        stats['last_batch_size'] = size
+        stats['max_batch_size'] = max(stats['max_batch_size'], size)
+        stats['avg_batch_size'] = stats['written'] / stats['batches'] if stats['batches'] else 0.0
+        stats['last_flush_ms'] = elapsed_ms
+
+    def stats(self) -> Dict[str, Any]:
+        """Metryki bufora: głębokość kolejki i rozmiary paczek."""
+        return {**self._stats, 'queue_depth': len(self._pending)}
+
+    async def close(self) -> None:
+        if self._timer is not None and not self._timer.done():
+            self._timer.cancel()
+        self._timer = None
+        await self.flush()
+
+
+__all__ = ['WriteBehindBuffer']
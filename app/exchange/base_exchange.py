@@ -10,7 +10,9 @@ import time
 import logging
 logger = logging.getLogger(__name__)
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Mapping, Optional, Any
+
+from utils.rate_limit import AdaptiveRateLimiter, consume_prepaid, endpoint_cost, get_exchange_limiter
 
 
 class BaseExchange(ABC):
@@ -26,6 +28,7 @@ class BaseExchange(ABC):
         self.is_connected: bool = False
         self.min_request_interval: float = 0.2
         self.last_request_time: float = 0.0
+        self._rate_limiter: Optional[AdaptiveRateLimiter] = None
         slug = (self.EXCHANGE_SLUG or self.__class__.__name__.replace("Exchange", "")).lower()
         self.guard_namespace = slug
 
@@ -59,14 +62,32 @@ class BaseExchange(ABC):
             # Never let disconnect raise
             logger.warning(f"Disconnect encountered error but continuing: {e}", exc_info=True)
 
-    async def rate_limit(self) -> None:
-        """Ensure minimal interval between requests."""
-        current_time = time.time()
-        elapsed = current_time - self.last_request_time
-        if elapsed < self.min_request_interval:
-            await asyncio.sleep(self.min_request_interval - elapsed)
+    @property
+    def rate_limiter(self) -> AdaptiveRateLimiter:
+        """Shared per-exchange limiter; falls back to ``min_request_interval`` when unconfigured."""
+        if self._rate_limiter is None:
+            self._rate_limiter = get_exchange_limiter(
+                self.guard_namespace,
+                default_rate=1.0 / max(self.min_request_interval, 1e-3),
+                default_capacity=1.0,
+            )
+        return self._rate_limiter
+
+    async def rate_limit(self, endpoint: Optional[str] = None) -> None:
+        """Wait for room in the exchange limiter (weight/lane of ``endpoint`` from config)."""
+        # The first request of a net_guard-wrapped call was already admitted there
+        if not consume_prepaid():
+            weight, lane = endpoint_cost(self.guard_namespace, endpoint)
+            await self.rate_limiter.acquire(weight, lane)
         self.last_request_time = time.time()
 
+    def observe_rate_limit_headers(self, headers: Mapping[str, Any], status: Optional[int] = None) -> None:
+        """Feed response usage headers (and 429/418 status) back into the limiter."""
+        try:
+            self.rate_limiter.update_from_headers(headers, status)
+        except Exception as e:
+            logger.debug(f"Rate limit header update failed: {e}")
+
     # ---- Abstract interface ----
     @abstractmethod
     async def test_connection(self) -> bool:
@@ -8,7 +8,7 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Dict, Optional
 
-from utils.rate_limiter import RateLimitExceeded, RateLimiter
+from utils.rate_limiter import RateLimiter
 
 
 @dataclass
@@ -49,21 +49,10 @@ class SimulatedExchangeAdapter:
         return True
 
     async def wait_for_rate_limit(self) -> None:
-        try:
-            self.rate_limiter.check(
-                f"{self.name}:requests",
-                metadata={"adapter": self.name},
-            )
-        except RateLimitExceeded:
-            await asyncio.sleep(self.request_delay)
-            try:
-                self.rate_limiter.check(
-                    f"{self.name}:requests",
-                    metadata={"adapter": self.name, "recheck": True},
-                )
-            except RateLimitExceeded:
-                # W warunkach testowych po prostu wstrzymaj się dodatkowo
-                await asyncio.sleep(self.request_delay)
+        await self.rate_limiter.acquire(
+            f"{self.name}:requests",
+            metadata={"adapter": self.name},
+        )
 
     async def get_server_time(self) -> datetime:
         await asyncio.sleep(0)
@@ -515,7 +515,7 @@ class BinanceExchange(BaseExchange):
                           signed: bool = False, data: Dict = None) -> Optional[Dict]:
         """Wykonanie requestu HTTP do Binance API"""
         try:
-            await self.rate_limit()
+            await self.rate_limit(endpoint)
             
             if not self.session:
                 raise Exception("Brak aktywnej sesji HTTP")
@@ -544,6 +544,8 @@ class BinanceExchange(BaseExchange):
                 json=data,
                 headers=headers
             ) as response:
+                # Wykorzystanie wagi (X-MBX-USED-WEIGHT-1M) i 429/418 spowalniają limiter
+                self.observe_rate_limit_headers(response.headers, response.status)
                 
                 if response.status == 200:
                     return await response.json()
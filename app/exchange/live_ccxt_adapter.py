@@ -115,6 +115,17 @@ class LiveCCXTAdapter:
     async def fetch_ticker(self, symbol: str) -> Dict[str, Any]:
         return await self._client.fetch_ticker(symbol)
 
+    @net_guard("exchange:get_tickers")
+    async def fetch_tickers(self, symbols: Optional[list[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Fetch many tickers in one request (ccxt ``fetchTickers``)."""
+
+        has = getattr(self._client, "has", {}) or {}
+        if not has.get("fetchTickers", hasattr(self._client, "fetch_tickers")):
+            raise RuntimeError(
+                f"Exchange {self.exchange_id} does not expose fetch_tickers"
+            )
+        return await self._client.fetch_tickers(symbols)
+
     @net_guard("exchange:place_order")
     async def place_order(
         self,
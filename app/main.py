@@ -7,7 +7,6 @@ uruchamia interfejs użytkownika i zarządza cyklem życia aplikacji.
 
 import sys
 import os
-import asyncio
 import signal
 import logging
 from pathlib import Path
@@ -45,6 +44,7 @@ from utils.config_manager import get_config_manager, get_app_setting
 from utils.logger import get_logger, LogType
 from utils.encryption import get_encryption_manager
 from utils.test_runner import create_startup_test_runner
+from utils.async_runtime import get_async_runtime, shutdown_async_runtime
 from core.database_manager import DatabaseManager
 from bot_manager import BotManager
 from app.risk_management import RiskManager
@@ -281,10 +281,9 @@ class CryptoBotApplication:
 
                 return restarted
 
-            import asyncio
-
             try:
-                restarted = asyncio.run(_restore())
+                # Boty muszą działać w tej samej pętli co pozostałe komponenty
+                restarted = get_async_runtime().run(_restore())
             except RuntimeError:
                 restarted = 0
                 self.logger.warning("Asyncio loop already running – skipping auto restore")
@@ -381,8 +380,11 @@ class CryptoBotApplication:
             except Exception:
                 pass
             
-            # Uruchom asynchroniczne czyszczenie
-            asyncio.run(self._async_cleanup())
+            # Uruchom asynchroniczne czyszczenie w pętli tła, potem ją zatrzymaj
+            try:
+                get_async_runtime().run(self._async_cleanup(), timeout=30)
+            finally:
+                shutdown_async_runtime()
             
         except Exception as e:
             logger.info(f"Error during cleanup: {e}")
@@ -0,0 +1,166 @@
+"""Scalanie serii powiadomień w zbiorcze wiadomości (digest) i licznik okna przesuwnego.
+
+``NotificationCoalescer`` grupuje powiadomienia po kluczu (typ, bot_id,
+szablon). Pierwsze powiadomienie serii wychodzi od razu, kolejne w tym samym
+oknie są buforowane i po jego upływie wysyłane jako jedna wiadomość zbiorcza
+z liczbą zdarzeń i kilkoma ostatnimi treściami.
+
+``SlidingWindowCounter`` to przybliżony licznik okna przesuwnego (dwa
+sąsiednie okna stałe, ważone) - stała pamięć i czas O(1) na zdarzenie,
+w miejsce filtrowania listy znaczników czasu.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+CoalesceKey = Tuple[Hashable, ...]
+
+
+class SlidingWindowCounter:
+    """Licznik zdarzeń w oknie przesuwnym o długości ``window`` sekund."""
+
+    __slots__ = ('limit', 'window', '_clock', '_start', '_current', '_previous')
+
+    def __init__(self, limit: int, window: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        self.limit = int(limit)
+        self.window = float(window)
+        self._clock = clock
+        self._start = clock()
+        self._current = 0
+        self._previous = 0
+
+    def _roll(self, now: float) -> float:
+        elapsed = now - self._start
+        if elapsed >= self.window:
+            windows = int(elapsed // self.window)
+            self._previous = self._current if windows == 1 else 0
+            self._current = 0
+            self._start += windows * self.window
+            elapsed = now - self._start
+        return elapsed
+
+    def count(self, now: Optional[float] = None) -> float:
+        """Szacowana liczba zdarzeń w ostatnim oknie."""
+        now = self._clock() if now is None else now
+        elapsed = self._roll(now)
+        return self._previous * (1.0 - elapsed / self.window) + self._current
+
+    def hit(self, now: Optional[float] = None, force: bool = False) -> bool:
+        """Rejestruje zdarzenie, jeśli mieści się w limicie (``force`` - zawsze)."""
+        now = self._clock() if now is None else now
+        if not force and self.count(now) >= self.limit:
+            return False
+        self._roll(now)
+        self._current += 1
+        return True
+
+
+@dataclass
+class _Burst:
+    opened: float
+    pending: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class NotificationCoalescer:
+    """Bufor serii podobnych powiadomień.
+
+    Powiadomienia o randze 0 (``rank``) - krytyczne i pilne - nigdy nie czekają na digest.
+    """
+
+    def __init__(self, window: float = 30.0, max_samples: int = 5,
+                 rank: Optional[Callable[[Dict[str, Any]], int]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.window = float(window)
+        self.max_samples = max(1, int(max_samples))
+        self.rank = rank
+        self._clock = clock
+        self._bursts: Dict[CoalesceKey, _Burst] = {}
+        self.stats: Dict[str, int] = {'passed': 0, 'coalesced': 0, 'digests': 0}
+
+    @staticmethod
+    def key_for(notification: Dict[str, Any]) -> CoalesceKey:
+        metadata = notification.get('metadata') or {}
+        notification_type = notification['type']
+        return (
+            getattr(notification_type, 'value', notification_type),
+            metadata.get('bot_id'),
+            metadata.get('template') or notification['title'],
+        )
+
+    def offer(self, notification: Dict[str, Any]) -> Tuple[CoalesceKey, bool]:
+        """Zwraca ``(klucz, czy_wysłać_teraz)``; gdy ``False`` - powiadomienie czeka na digest."""
+        key = self.key_for(notification)
+        if self.rank is not None and self.rank(notification) == 0:
+            self.stats['passed'] += 1
+            return key, True
+        now = self._clock()
+        burst = self._bursts.get(key)
+        if burst is None or now - burst.opened >= self.window:
+            if burst is None or not burst.pending:
+                self._bursts[key] = _Burst(opened=now)
+                self.stats['passed'] += 1
+                return key, True
+        burst.pending.append(notification)
+        self.stats['coalesced'] += 1
+        return key, False
+
+    def remaining(self, key: CoalesceKey) -> float:
+        """Czas do zamknięcia okna serii."""
+        burst = self._bursts.get(key)
+        if burst is None:
+            return 0.0
+        return max(0.0, self.window - (self._clock() - burst.opened))
+
+    def pop_digest(self, key: CoalesceKey) -> Optional[Dict[str, Any]]:
+        """Zamyka serię i buduje wiadomość zbiorczą (``None`` gdy nic nie czeka)."""
+        burst = self._bursts.pop(key, None)
+        if burst is None or not burst.pending:
+            return None
+        self.stats['digests'] += 1
+        return self.build_digest(burst.pending, self.max_samples, self.rank)
+
+    def pending_keys(self) -> List[CoalesceKey]:
+        return [key for key, burst in self._bursts.items() if burst.pending]
+
+    @staticmethod
+    def build_digest(pending: List[Dict[str, Any]], max_samples: int,
+                     rank: Optional[Callable[[Dict[str, Any]], int]] = None) -> Dict[str, Any]:
+        first, last = pending[0], pending[-1]
+        count = len(pending)
+        samples = pending[-max_samples:]
+        lines = [f"- {item['message']}" for item in samples]
+        if count > len(samples):
+            lines.append(f"... (+{count - len(samples)})")
+
+        channels: List[Any] = []
+        for item in pending:
+            for channel in item['channels']:
+                if channel not in channels:
+                    channels.append(channel)
+
+        # Digest dziedziczy najwyższy priorytet z serii
+        priority = (min(pending, key=rank) if rank else last)['priority']
+
+        metadata = {k: v for k, v in (last.get('metadata') or {}).items() if k != 'results'}
+        metadata.update({
+            'digest': True,
+            'coalesced': count,
+            'coalesced_ids': [item['id'] for item in pending],
+            'first_at': first['timestamp'].isoformat(),
+            'last_at': last['timestamp'].isoformat(),
+        })
+        return {
+            'title': f"{last['title']} (x{count})",
+            'message': '\n'.join(lines),
+            'type': last['type'],
+            'channels': channels,
+            'priority': priority,
+            'metadata': metadata,
+            'timestamp': datetime.now(),
+        }
+
+
+__all__ = ['CoalesceKey', 'NotificationCoalescer', 'SlidingWindowCounter']
@@ -0,0 +1,183 @@
+"""Historia powiadomień w pamięci: bufor cykliczny z indeksami pomocniczymi.
+
+Bufor ma stałą pojemność - najstarszy wpis jest nadpisywany w miejscu, bez
+kopiowania listy przy przycinaniu. Każdy wpis dostaje rosnący numer
+sekwencyjny; indeksy (typ, bot_id, priorytet, kanał, id) trzymają kolejki
+numerów w kolejności wstawiania, więc usunięty wpis jest zawsze na ich
+początku (``popleft`` w O(1)). Zapytania z filtrem przechodzą tylko po
+najkrótszym pasującym indeksie, od najnowszych - koszt zależy od wyniku,
+nie od rozmiaru historii. Licznik nieprzeczytanych jest utrzymywany na bieżąco.
+"""
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Deque, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+_IndexKey = Tuple[str, Hashable]
+
+
+def _value(item: Any) -> Any:
+    return getattr(item, 'value', item)
+
+
+class NotificationHistoryBuffer:
+    """Bufor cykliczny wpisów ``NotificationHistory`` z indeksami."""
+
+    def __init__(self, capacity: int = 10000):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = int(capacity)
+        self._slots: List[Any] = [None] * self.capacity
+        self._next_seq = 0
+        self._oldest_seq = 0
+        self._index: Dict[_IndexKey, Deque[int]] = {}
+        self._by_id: Dict[str, int] = {}
+        self._unread = 0
+
+    # --- Interfejs sekwencji (zgodność z dotychczasową listą) ---
+    def __len__(self) -> int:
+        return self._next_seq - self._oldest_seq
+
+    def __iter__(self) -> Iterator[Any]:
+        """Od najstarszego do najnowszego."""
+        for seq in range(self._oldest_seq, self._next_seq):
+            yield self._slots[seq % self.capacity]
+
+    def __reversed__(self) -> Iterator[Any]:
+        for seq in range(self._next_seq - 1, self._oldest_seq - 1, -1):
+            yield self._slots[seq % self.capacity]
+
+    def __bool__(self) -> bool:
+        return self._next_seq > self._oldest_seq
+
+    def append(self, entry: Any) -> None:
+        if len(self) == self.capacity:
+            self._evict_oldest()
+        seq = self._next_seq
+        self._slots[seq % self.capacity] = entry
+        self._next_seq += 1
+        for key in self._keys(entry):
+            self._index.setdefault(key, deque()).append(seq)
+        self._by_id[entry.id] = seq
+        if not getattr(entry, 'is_read', False):
+            self._unread += 1
+
+    def extend(self, entries: Iterable[Any]) -> None:
+        for entry in entries:
+            self.append(entry)
+
+    def clear(self) -> None:
+        self._slots = [None] * self.capacity
+        self._oldest_seq = self._next_seq
+        self._index.clear()
+        self._by_id.clear()
+        self._unread = 0
+
+    # --- Zapytania ---
+    def get(self, notification_id: str) -> Optional[Any]:
+        seq = self._by_id.get(notification_id)
+        return None if seq is None else self._slots[seq % self.capacity]
+
+    def query(self, limit: int = 100, notification_type: Any = None, channel: Any = None,
+              bot_id: Any = None, priority: Any = None) -> List[Any]:
+        """Najnowsze wpisy spełniające wszystkie podane filtry."""
+        filters = self._filter_keys(notification_type, channel, bot_id, priority)
+        if limit <= 0:
+            return []
+        if not filters:
+            result = []
+            for entry in reversed(self):
+                result.append(entry)
+                if len(result) >= limit:
+                    break
+            return result
+
+        candidates = [self._index.get(key) for key in filters]
+        if any(not seqs for seqs in candidates):
+            return []
+        # Przejście po najkrótszym indeksie, pozostałe filtry sprawdzane na wpisie
+        driver = min(candidates, key=len)
+        result = []
+        for seq in reversed(driver):
+            entry = self._slots[seq % self.capacity]
+            if all(key in self._keys(entry) for key in filters):
+                result.append(entry)
+                if len(result) >= limit:
+                    break
+        return result
+
+    def count(self, notification_type: Any = None, channel: Any = None,
+              bot_id: Any = None, priority: Any = None) -> int:
+        """Liczba wpisów dla jednego filtra w O(1) (bez filtra - cała historia)."""
+        filters = self._filter_keys(notification_type, channel, bot_id, priority)
+        if not filters:
+            return len(self)
+        if len(filters) == 1:
+            return len(self._index.get(filters[0], ()))
+        return len(self.query(len(self), notification_type, channel, bot_id, priority))
+
+    def counts_by(self, field: str) -> Dict[Hashable, int]:
+        """Rozkład liczby wpisów po polu indeksu (``type``, ``bot_id``, ``priority``, ``channel``)."""
+        return {key[1]: len(seqs) for key, seqs in self._index.items() if key[0] == field and seqs}
+
+    # --- Przeczytane / nieprzeczytane ---
+    @property
+    def unread_count(self) -> int:
+        return self._unread
+
+    def mark_read(self, notification_ids: Optional[Iterable[str]] = None) -> int:
+        """Oznacza wpisy jako przeczytane (bez argumentu - wszystkie); zwraca liczbę zmienionych."""
+        if notification_ids is None:
+            entries: Iterable[Any] = self if self._unread else ()
+        else:
+            entries = filter(None, (self.get(notification_id) for notification_id in notification_ids))
+        changed = 0
+        for entry in entries:
+            if not entry.is_read:
+                entry.is_read = True
+                changed += 1
+        self._unread -= changed
+        return changed
+
+    # --- Wewnętrzne ---
+    @staticmethod
+    def _keys(entry: Any) -> List[_IndexKey]:
+        keys: List[_IndexKey] = [('type', _value(entry.notification_type)), ('priority', _value(entry.priority))]
+        bot_id = (entry.metadata or {}).get('bot_id')
+        if bot_id is not None:
+            keys.append(('bot_id', bot_id))
+        keys.extend(('channel', _value(channel)) for channel in dict.fromkeys(entry.channels))
+        return keys
+
+    @staticmethod
+    def _filter_keys(notification_type: Any, channel: Any, bot_id: Any, priority: Any) -> List[_IndexKey]:
+        filters: List[_IndexKey] = []
+        if notification_type is not None:
+            filters.append(('type', _value(notification_type)))
+        if channel is not None:
+            filters.append(('channel', _value(channel)))
+        if bot_id is not None:
+            filters.append(('bot_id', bot_id))
+        if priority is not None:
+            filters.append(('priority', _value(priority)))
+        return filters
+
+    def _evict_oldest(self) -> None:
+        seq = self._oldest_seq
+        slot = seq % self.capacity
+        entry = self._slots[slot]
+        self._slots[slot] = None
+        self._oldest_seq += 1
+        for key in self._keys(entry):
+            seqs = self._index.get(key)
+            if seqs and seqs[0] == seq:
+                seqs.popleft()
+                if not seqs:
+                    del self._index[key]
+        if self._by_id.get(entry.id) == seq:
+            del self._by_id[entry.id]
+        if not getattr(entry, 'is_read', False):
+            self._unread -= 1
+
+
+__all__ = ['NotificationHistoryBuffer']
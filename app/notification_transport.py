@@ -0,0 +1,164 @@
+"""Transport kanałów powiadomień: pula połączeń SMTP i pomiar opóźnień wysyłki.
+
+``smtplib`` jest blokujący, więc ``SMTPConnectionPool`` wykonuje wysyłkę
+w wątku roboczym i trzyma zalogowane połączenia między wysyłkami (klucz:
+serwer, port, użytkownik). Przed ponownym użyciem połączenie jest sprawdzane
+``NOOP``; zerwane połączenie jest otwierane od nowa i wysyłka powtarzana raz.
+``ChannelLatency`` zbiera czasy wysyłki per kanał (średnia, maksimum, p95
+z ostatnich próbek).
+"""
+from __future__ import annotations
+
+import asyncio
+import smtplib
+import ssl
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Mapping, Sequence, Tuple
+
+_SMTPKey = Tuple[str, int, str]
+
+
+# Błędy odpowiedzi serwera - ponowienie na nowym połączeniu nic nie zmieni
+_SERVER_REFUSALS = (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused)
+
+
+class SMTPConnectionPool:
+    """Połączenia SMTP współdzielone między kolejnymi wysyłkami."""
+
+    def __init__(self, max_idle: int = 2, idle_timeout: float = 300.0, timeout: float = 30.0):
+        self.max_idle = max(0, int(max_idle))
+        self.idle_timeout = float(idle_timeout)
+        self.timeout = float(timeout)
+        self._idle: Dict[_SMTPKey, List[Tuple[smtplib.SMTP, float]]] = {}
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {'connects': 0, 'reuses': 0, 'sends': 0, 'reconnects': 0}
+
+    async def send(self, settings: Mapping[str, Any], from_addr: str, to_addrs: Sequence[str], message: str) -> None:
+        """Wysyła gotową wiadomość przez połączenie z puli (w wątku roboczym)."""
+        await asyncio.to_thread(self._send_sync, dict(settings), from_addr, list(to_addrs), message)
+
+    def _send_sync(self, settings: Dict[str, Any], from_addr: str, to_addrs: List[str], message: str) -> None:
+        key = (str(settings['smtp_server']), int(settings['smtp_port']), str(settings.get('username') or ''))
+        server, reused = self._checkout(key, settings)
+        try:
+            self._deliver(key, server, from_addr, to_addrs, message)
+        except (smtplib.SMTPServerDisconnected, ConnectionError, OSError) as exc:
+            if not reused or isinstance(exc, _SERVER_REFUSALS):
+                raise
+            # Serwer zamknął bezczynne połączenie - jedna próba na świeżym
+            self.stats['reconnects'] += 1
+            self._deliver(key, self._connect(settings), from_addr, to_addrs, message)
+        self.stats['sends'] += 1
+
+    def _deliver(self, key: _SMTPKey, server: smtplib.SMTP, from_addr: str, to_addrs: List[str], message: str) -> None:
+        """``sendmail``; połączenie wraca do puli albo jest zamykane na każdej ścieżce."""
+        try:
+            server.sendmail(from_addr, to_addrs, message)
+        except _SERVER_REFUSALS:
+            # Odmowa serwera (adresaci, nadawca, dane) - po RSET połączenie jest nadal używalne
+            self._checkin(key, server)
+            raise
+        except BaseException:
+            self._discard(server)
+            raise
+        self._checkin(key, server)
+
+    def _checkout(self, key: _SMTPKey, settings: Dict[str, Any]) -> Tuple[smtplib.SMTP, bool]:
+        now = time.monotonic()
+        while True:
+            with self._lock:
+                idle = self._idle.get(key)
+                entry = idle.pop() if idle else None
+            if entry is None:
+                return self._connect(settings), False
+            server, since = entry
+            if now - since > self.idle_timeout:
+                self._discard(server)
+                continue
+            try:
+                if server.noop()[0] == 250:
+                    self.stats['reuses'] += 1
+                    return server, True
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._discard(server)
+
+    def _connect(self, settings: Dict[str, Any]) -> smtplib.SMTP:
+        server = smtplib.SMTP(settings['smtp_server'], int(settings['smtp_port']), timeout=self.timeout)
+        try:
+            if settings.get('use_tls', True):
+                server.starttls(context=ssl.create_default_context())
+            if settings.get('username'):
+                server.login(settings['username'], settings['password'])
+        except Exception:
+            self._discard(server)
+            raise
+        self.stats['connects'] += 1
+        return server
+
+    def _checkin(self, key: _SMTPKey, server: smtplib.SMTP) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle:
+                idle.append((server, time.monotonic()))
+                return
+        self._discard(server)
+
+    @staticmethod
+    def _discard(server: smtplib.SMTP) -> None:
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    def close(self) -> None:
+        """Zamyka wszystkie bezczynne połączenia."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for entries in idle.values():
+            for server, _ in entries:
+                self._discard(server)
+
+
+class ChannelLatency:
+    """Czasy wysyłki per kanał."""
+
+    def __init__(self, samples: int = 256):
+        self._samples: Dict[str, Deque[float]] = {}
+        self._counters: Dict[str, Dict[str, float]] = {}
+        self._size = max(1, int(samples))
+
+    def record(self, channel: str, elapsed_ms: float, ok: bool = True) -> None:
+        counters = self._counters.setdefault(
+            channel, {'count': 0, 'errors': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'last_ms': 0.0}
+        )
+        counters['count'] += 1
+        counters['errors'] += 0 if ok else 1
+        counters['total_ms'] += elapsed_ms
+        counters['max_ms'] = max(counters['max_ms'], elapsed_ms)
+        counters['last_ms'] = elapsed_ms
+        self._samples.setdefault(channel, deque(maxlen=self._size)).append(elapsed_ms)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """``{kanał: {count, errors, avg_ms, max_ms, last_ms, p95_ms}}``."""
+        result: Dict[str, Dict[str, float]] = {}
+        for channel, counters in self._counters.items():
+            ordered = sorted(self._samples[channel])
+            p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+            result[channel] = {
+                'count': counters['count'],
+                'errors': counters['errors'],
+                'avg_ms': counters['total_ms'] / counters['count'],
+                'max_ms': counters['max_ms'],
+                'last_ms': counters['last_ms'],
+                'p95_ms': p95,
+            }
+        return result
+
+
+__all__ = ['ChannelLatency', 'SMTPConnectionPool']
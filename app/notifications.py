@@ -3,9 +3,9 @@ Notification Manager - Zaawansowany system powiadomień
 """
 
 import asyncio
-import smtplib
+import itertools
 import json
-import ssl
+import time
 import aiohttp
 from typing import Dict, List, Optional, Any, Union
 from datetime import datetime, timedelta
@@ -34,6 +34,9 @@ except ImportError:
 from utils.logger import get_logger
 from core.database_manager import DatabaseManager
 from utils.encryption import EncryptionManager
+from app.notification_transport import ChannelLatency, SMTPConnectionPool
+from app.notification_coalescing import CoalesceKey, NotificationCoalescer, SlidingWindowCounter
+from app.notification_history import NotificationHistoryBuffer
 
 
 class NotificationType(Enum):
@@ -91,7 +94,7 @@ class NotificationConfig:
     retry_delay: int = 5  # seconds
 
 
-@dataclass
+@dataclass(slots=True)
 class NotificationHistory:
     """Historia powiadomienia"""
     id: str
@@ -104,6 +107,7 @@ class NotificationHistory:
     status: str  # sent, failed, pending
     error_message: Optional[str] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
+    is_read: bool = False
 
 
 @dataclass
@@ -137,6 +141,25 @@ DEFAULT_CHANNEL_CONFIGS: Dict[NotificationChannel, NotificationConfig] = {
     ),
 }
 
+# Maksymalna liczba równoległych wysyłek per kanał (nadpisywana kluczem
+# ``max_concurrency`` w ustawieniach kanału)
+DEFAULT_CHANNEL_CONCURRENCY: Dict[NotificationChannel, int] = {
+    NotificationChannel.DESKTOP: 1,
+    NotificationChannel.EMAIL: 2,
+    NotificationChannel.SMS: 2,
+    NotificationChannel.TELEGRAM: 4,
+    NotificationChannel.DISCORD: 4,
+    NotificationChannel.WEBHOOK: 4,
+}
+
+# Kolejność obsługi w kolejce - mniejsza wartość jest pobierana wcześniej
+PRIORITY_RANK: Dict[NotificationPriority, int] = {
+    NotificationPriority.URGENT: 0,
+    NotificationPriority.HIGH: 1,
+    NotificationPriority.NORMAL: 2,
+    NotificationPriority.LOW: 3,
+}
+
 DEFAULT_NOTIFICATION_TEMPLATES: List[NotificationTemplate] = [
     NotificationTemplate(
         name="critical_alert",
@@ -169,7 +192,10 @@ class NotificationManager:
     """Zaawansowany manager powiadomień"""
     
     def __init__(self, database_manager: DatabaseManager, 
-                 encryption_manager: EncryptionManager):
+                 encryption_manager: EncryptionManager,
+                 worker_count: int = 4,
+                 coalesce_window: float = 30.0,
+                 history_capacity: int = 10000):
         self.logger = get_logger("NotificationManager")
         self.db = database_manager
         self.encryption = encryption_manager
@@ -180,24 +206,40 @@ class NotificationManager:
         # Szablony powiadomień
         self.templates: Dict[str, NotificationTemplate] = {}
         
-        # Historia powiadomień
-        self.history: List[NotificationHistory] = []
+        # Historia powiadomień (bufor cykliczny z indeksami typ/bot/priorytet/kanał)
+        self.history = NotificationHistoryBuffer(capacity=history_capacity)
         
         # Statystyki
         self.stats = NotificationStats()
         
-        # Rate limiting
-        self.rate_limits: Dict[NotificationChannel, List[datetime]] = {}
+        # Rate limiting (licznik okna przesuwnego per kanał)
+        self.rate_limits: Dict[NotificationChannel, SlidingWindowCounter] = {}
         
-        # Kolejka powiadomień
-        self.notification_queue: asyncio.Queue = asyncio.Queue()
+        # Scalanie serii podobnych powiadomień w digest (okno 0 wyłącza)
+        self.coalescer: Optional[NotificationCoalescer] = (
+            NotificationCoalescer(window=coalesce_window, rank=self._queue_rank)
+            if coalesce_window and coalesce_window > 0 else None
+        )
+        self._digest_tasks: Dict[CoalesceKey, asyncio.Task] = {}
+        
+        # Kolejka priorytetowa: (ranga, numer kolejny, powiadomienie)
+        self.notification_queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._queue_seq = itertools.count()
         
         # Flagi kontrolne
         self.is_running = False
-        self.worker_task: Optional[asyncio.Task] = None
+        self.worker_count = max(1, int(worker_count))
+        self.worker_tasks: List[asyncio.Task] = []
+        
+        # Limity równoległych wysyłek per kanał
+        self._channel_semaphores: Dict[NotificationChannel, asyncio.Semaphore] = {}
         
-        # Session dla HTTP requests
+        # Session dla HTTP requests i pula połączeń SMTP (współdzielone między wysyłkami)
         self.session: Optional[aiohttp.ClientSession] = None
+        self.smtp_pool = SMTPConnectionPool()
+        
+        # Czasy wysyłki per kanał
+        self.channel_latency = ChannelLatency()
         
     async def initialize(self):
         """Inicjalizacja managera"""
@@ -205,9 +247,7 @@ class NotificationManager:
             self.logger.info("Inicjalizacja NotificationManager...")
             
             # Utworzenie session HTTP
-            self.session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=30)
-            )
+            await self._get_session()
             
             # Ładowanie konfiguracji z bazy danych
             await self.load_configurations()
@@ -235,8 +275,11 @@ class NotificationManager:
                 
             self.is_running = True
             
-            # Uruchomienie worker'a do przetwarzania kolejki
-            self.worker_task = asyncio.create_task(self._notification_worker())
+            # Uruchomienie puli worker'ów przetwarzających kolejkę
+            self.worker_tasks = [
+                asyncio.create_task(self._notification_worker())
+                for _ in range(self.worker_count)
+            ]
             
             self.logger.info("NotificationManager uruchomiony")
             
@@ -247,19 +290,26 @@ class NotificationManager:
     async def stop(self):
         """Zatrzymanie managera"""
         try:
+            # Wysłanie oczekujących digestów, zanim worker'y zostaną zatrzymane
+            if await self.flush_digests() and self.worker_tasks:
+                try:
+                    await asyncio.wait_for(self.notification_queue.join(), timeout=5.0)
+                except asyncio.TimeoutError:
+                    self.logger.warning("Nie wszystkie digesty zostały wysłane przed zatrzymaniem")
+            
             self.is_running = False
             
-            # Zatrzymanie worker'a
-            if self.worker_task:
-                self.worker_task.cancel()
-                try:
-                    await self.worker_task
-                except asyncio.CancelledError:
-                    pass
+            # Zatrzymanie worker'ów
+            for task in self.worker_tasks:
+                task.cancel()
+            await asyncio.gather(*self.worker_tasks, return_exceptions=True)
+            self.worker_tasks = []
             
-            # Zamknięcie session HTTP
+            # Zamknięcie session HTTP i połączeń SMTP
             if self.session:
                 await self.session.close()
+                self.session = None
+            await asyncio.to_thread(self.smtp_pool.close)
             
             # Zapisanie statystyk
             await self.save_statistics()
@@ -273,7 +323,8 @@ class NotificationManager:
                               notification_type: NotificationType = NotificationType.INFO,
                               channels: Optional[List[NotificationChannel]] = None,
                               priority: NotificationPriority = NotificationPriority.NORMAL,
-                              metadata: Optional[Dict[str, Any]] = None) -> str:
+                              metadata: Optional[Dict[str, Any]] = None,
+                              coalesce: bool = True) -> str:
         """Wysłanie powiadomienia"""
         try:
             # Generowanie ID powiadomienia
@@ -293,40 +344,94 @@ class NotificationManager:
                 self.logger.warning("Brak aktywnych kanałów powiadomień")
                 return notification_id
             
-            # Sprawdzenie rate limiting
-            allowed_channels = []
-            for channel in active_channels:
-                if await self._check_rate_limit(channel):
-                    allowed_channels.append(channel)
-                else:
-                    self.logger.warning(f"Rate limit przekroczony dla kanału {channel.value}")
-            
-            if not allowed_channels:
-                self.logger.warning("Wszystkie kanały przekroczyły rate limit")
-                return notification_id
-            
             # Utworzenie obiektu powiadomienia
             notification = {
                 'id': notification_id,
                 'title': title,
                 'message': message,
                 'type': notification_type,
-                'channels': allowed_channels,
+                'channels': active_channels,
                 'priority': priority,
                 'metadata': metadata or {},
                 'timestamp': datetime.now()
             }
             
-            # Dodanie do kolejki
-            await self.notification_queue.put(notification)
+            # Kolejne podobne powiadomienia w oknie trafiają do digestu
+            if coalesce and self.coalescer is not None:
+                key, send_now = self.coalescer.offer(notification)
+                if not send_now:
+                    self._schedule_digest(key)
+                    return notification_id
             
-            self.logger.info(f"Powiadomienie dodane do kolejki: {notification_id}")
+            if await self._enqueue(notification):
+                self.logger.info(f"Powiadomienie dodane do kolejki: {notification_id}")
             return notification_id
             
         except Exception as e:
             self.logger.error(f"Błąd podczas wysyłania powiadomienia: {e}")
             return ""
     
+    @staticmethod
+    def _queue_rank(notification: Dict[str, Any]) -> int:
+        """Ranga w kolejce - pilne i krytyczne wyprzedzają pozostałe"""
+        if notification['type'] == NotificationType.CRITICAL:
+            return 0
+        return PRIORITY_RANK.get(notification['priority'], 2)
+    
+    async def _enqueue(self, notification: Dict[str, Any], force: bool = False) -> bool:
+        """Sprawdzenie rate limitu kanałów i dodanie powiadomienia do kolejki"""
+        rank = self._queue_rank(notification)
+        # Alerty krytyczne i digesty nie są odrzucane przez rate limit
+        force = force or rank == 0
+        
+        allowed_channels = []
+        for channel in notification['channels']:
+            if await self._check_rate_limit(channel, force=force):
+                allowed_channels.append(channel)
+            else:
+                self.logger.warning(f"Rate limit przekroczony dla kanału {channel.value}")
+        
+        if not allowed_channels:
+            self.logger.warning("Wszystkie kanały przekroczyły rate limit")
+            return False
+        
+        notification['channels'] = allowed_channels
+        await self.notification_queue.put((rank, next(self._queue_seq), notification))
+        return True
+    
+    def _schedule_digest(self, key: CoalesceKey):
+        """Zaplanowanie wysyłki digestu po zamknięciu okna serii"""
+        if key not in self._digest_tasks:
+            self._digest_tasks[key] = asyncio.create_task(self._flush_digest_later(key))
+    
+    async def _flush_digest_later(self, key: CoalesceKey):
+        try:
+            await asyncio.sleep(self.coalescer.remaining(key))
+            await self._flush_digest(key)
+        finally:
+            self._digest_tasks.pop(key, None)
+    
+    async def _flush_digest(self, key: CoalesceKey) -> bool:
+        digest = self.coalescer.pop_digest(key)
+        if digest is None:
+            return False
+        digest['id'] = self._generate_notification_id(digest['title'], digest['message'])
+        await self._enqueue(digest, force=True)
+        self.logger.info(f"Digest {digest['id']} scala {digest['metadata']['coalesced']} powiadomień")
+        return True
+    
+    async def flush_digests(self) -> int:
+        """Natychmiastowe wysłanie wszystkich oczekujących digestów"""
+        if self.coalescer is None:
+            return 0
+        for task in list(self._digest_tasks.values()):
+            task.cancel()
+        await asyncio.gather(*self._digest_tasks.values(), return_exceptions=True)
+        flushed = 0
+        for key in self.coalescer.pending_keys():
+            flushed += await self._flush_digest(key)
+        return flushed
+    
     async def send_from_template(self, template_name: str, 
                                variables: Optional[Dict[str, str]] = None,
                                override_channels: Optional[List[NotificationChannel]] = None) -> str:
@@ -354,7 +459,8 @@ class NotificationManager:
                 message=message,
                 notification_type=template.notification_type,
                 channels=channels,
-                priority=template.priority
+                priority=template.priority,
+                metadata={'template': template_name}
             )
             
         except Exception as e:
@@ -366,13 +472,16 @@ class NotificationManager:
         while self.is_running:
             try:
                 # Pobranie powiadomienia z kolejki
-                notification = await asyncio.wait_for(
+                _, _, notification = await asyncio.wait_for(
                     self.notification_queue.get(), 
                     timeout=1.0
                 )
                 
                 # Przetworzenie powiadomienia
-                await self._process_notification(notification)
+                try:
+                    await self._process_notification(notification)
+                finally:
+                    self.notification_queue.task_done()
                 
             except asyncio.TimeoutError:
                 continue
@@ -391,27 +500,12 @@ class NotificationManager:
             metadata = notification['metadata']
             timestamp = notification['timestamp']
             
-            # Wysłanie przez wszystkie kanały
-            results = {}
-            
-            for channel in channels:
-                try:
-                    if channel == NotificationChannel.DESKTOP:
-                        await self._send_desktop_notification(title, message, notification_type)
-                    elif channel == NotificationChannel.EMAIL:
-                        await self._send_email_notification(title, message, notification_type, metadata)
-                    elif channel == NotificationChannel.TELEGRAM:
-                        await self._send_telegram_notification(title, message, notification_type, metadata)
-                    elif channel == NotificationChannel.DISCORD:
-                        await self._send_discord_notification(title, message, notification_type, metadata)
-                    elif channel == NotificationChannel.WEBHOOK:
-                        await self._send_webhook_notification(title, message, notification_type, metadata)
-                    
-                    results[channel.value] = "success"
-                    
-                except Exception as e:
-                    self.logger.error(f"Błąd wysyłania przez {channel.value}: {e}")
-                    results[channel.value] = f"error: {str(e)}"
+            # Wysłanie równolegle przez wszystkie kanały
+            outcomes = await asyncio.gather(*[
+                self._send_via_channel(channel, title, message, notification_type, metadata)
+                for channel in channels
+            ])
+            results = {channel.value: outcome for channel, outcome in zip(channels, outcomes)}
             
             # Zapisanie do historii
             history_entry = NotificationHistory(
@@ -428,10 +522,6 @@ class NotificationManager:
             
             self.history.append(history_entry)
             
-            # Ograniczenie historii
-            if len(self.history) > 10000:
-                self.history = self.history[-5000:]
-            
             # Aktualizacja statystyk
             await self._update_statistics(notification_type, channels, results)
             
@@ -441,6 +531,56 @@ class NotificationManager:
         except Exception as e:
             self.logger.error(f"Błąd podczas przetwarzania powiadomienia: {e}")
     
+    async def _send_via_channel(self, channel: NotificationChannel, title: str, message: str,
+                                notification_type: NotificationType,
+                                metadata: Dict[str, Any]) -> str:
+        """Wysłanie przez jeden kanał z limitem równoległości i pomiarem czasu"""
+        async with self._channel_semaphore(channel):
+            started = time.perf_counter()
+            try:
+                if channel == NotificationChannel.DESKTOP:
+                    await self._send_desktop_notification(title, message, notification_type)
+                elif channel == NotificationChannel.EMAIL:
+                    await self._send_email_notification(title, message, notification_type, metadata)
+                elif channel == NotificationChannel.TELEGRAM:
+                    await self._send_telegram_notification(title, message, notification_type, metadata)
+                elif channel == NotificationChannel.DISCORD:
+                    await self._send_discord_notification(title, message, notification_type, metadata)
+                elif channel == NotificationChannel.WEBHOOK:
+                    await self._send_webhook_notification(title, message, notification_type, metadata)
+                
+                self.channel_latency.record(channel.value, (time.perf_counter() - started) * 1000.0)
+                return "success"
+                
+            except Exception as e:
+                self.channel_latency.record(channel.value, (time.perf_counter() - started) * 1000.0, ok=False)
+                self.logger.error(f"Błąd wysyłania przez {channel.value}: {e}")
+                return f"error: {str(e)}"
+    
+    def _channel_semaphore(self, channel: NotificationChannel) -> asyncio.Semaphore:
+        """Semafor ograniczający liczbę równoległych wysyłek kanału"""
+        semaphore = self._channel_semaphores.get(channel)
+        if semaphore is None:
+            config = self.channel_configs.get(channel)
+            limit = (config.settings.get('max_concurrency') if config else None) \
+                or DEFAULT_CHANNEL_CONCURRENCY.get(channel, 1)
+            semaphore = asyncio.Semaphore(max(1, int(limit)))
+            self._channel_semaphores[channel] = semaphore
+        return semaphore
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Współdzielona session HTTP (keep-alive między wysyłkami)"""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=30),
+                connector=aiohttp.TCPConnector(limit_per_host=8, keepalive_timeout=60)
+            )
+        return self.session
+    
+    def get_channel_latency(self) -> Dict[str, Dict[str, float]]:
+        """Statystyki czasu wysyłki per kanał (ms)"""
+        return self.channel_latency.snapshot()
+    
     async def _send_desktop_notification(self, title: str, message: str, 
                                        notification_type: NotificationType):
         """Wysłanie powiadomienia desktop"""
@@ -531,17 +671,13 @@ CryptoBotDesktop - Automated Trading System
             msg.attach(MIMEText(text_body, 'plain'))
             msg.attach(MIMEText(html_body, 'html'))
             
-            # Wysłanie email
-            context = ssl.create_default_context()
-            
-            with smtplib.SMTP(settings['smtp_server'], settings['smtp_port']) as server:
-                server.starttls(context=context)
-                server.login(settings['username'], settings['password'])
-                server.sendmail(
-                    settings['from_email'], 
-                    settings['to_emails'], 
-                    msg.as_string()
-                )
+            # Wysłanie email przez połączenie z puli (bez nowego handshake'u TLS i logowania)
+            await self.smtp_pool.send(
+                settings,
+                settings['from_email'],
+                settings['to_emails'],
+                msg.as_string()
+            )
             
         except Exception as e:
             raise Exception(f"Błąd powiadomienia email: {e}")
@@ -583,6 +719,7 @@ _{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}_
             """.strip()
             
             # Wysłanie do wszystkich chat_ids
+            session = await self._get_session()
             for chat_id in chat_ids:
                 url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
                 
@@ -593,7 +730,7 @@ _{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}_
                     'disable_web_page_preview': True
                 }
                 
-                async with self.session.post(url, json=payload) as response:
+                async with session.post(url, json=payload) as response:
                     if not response.ok:
                         error_text = await response.text()
                         raise Exception(f"Telegram API error: {error_text}")
@@ -650,7 +787,8 @@ _{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}_
                 'username': 'CryptoBot'
             }
             
-            async with self.session.post(webhook_url, json=payload) as response:
+            session = await self._get_session()
+            async with session.post(webhook_url, json=payload) as response:
                 if not response.ok:
                     error_text = await response.text()
                     raise Exception(f"Discord webhook error: {error_text}")
@@ -678,7 +816,8 @@ _{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}_
                 'metadata': metadata
             }
             
-            async with self.session.post(
+            session = await self._get_session()
+            async with session.post(
                 webhook_url, 
                 json=payload, 
                 headers=headers
@@ -690,33 +829,19 @@ _{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}_
         except Exception as e:
             raise Exception(f"Błąd powiadomienia webhook: {e}")
     
-    async def _check_rate_limit(self, channel: NotificationChannel) -> bool:
-        """Sprawdzenie rate limiting"""
+    async def _check_rate_limit(self, channel: NotificationChannel, force: bool = False) -> bool:
+        """Sprawdzenie rate limiting (``force`` - zlicz, ale nie odrzucaj)"""
         try:
             config = self.channel_configs.get(channel)
             if not config or not config.rate_limit:
                 return True
             
-            now = datetime.now()
-            minute_ago = now - timedelta(minutes=1)
+            counter = self.rate_limits.get(channel)
+            if counter is None or counter.limit != config.rate_limit:
+                counter = SlidingWindowCounter(config.rate_limit, window=60.0)
+                self.rate_limits[channel] = counter
             
-            # Inicjalizacja listy jeśli nie istnieje
-            if channel not in self.rate_limits:
-                self.rate_limits[channel] = []
-            
-            # Usunięcie starych wpisów
-            self.rate_limits[channel] = [
-                timestamp for timestamp in self.rate_limits[channel]
-                if timestamp > minute_ago
-            ]
-            
-            # Sprawdzenie limitu
-            if len(self.rate_limits[channel]) >= config.rate_limit:
-                return False
-            
-            # Dodanie aktualnego timestamp
-            self.rate_limits[channel].append(now)
-            return True
+            return counter.hit(force=force)
             
         except Exception as e:
             self.logger.error(f"Błąd sprawdzania rate limit: {e}")
@@ -870,29 +995,19 @@ _{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}_
     # Metody zarządzania danymi
     async def get_notification_history(self, limit: int = 100, 
                                      notification_type: Optional[NotificationType] = None,
-                                     channel: Optional[NotificationChannel] = None) -> List[NotificationHistory]:
+                                     channel: Optional[NotificationChannel] = None,
+                                     bot_id: Optional[int] = None,
+                                     priority: Optional[NotificationPriority] = None) -> List[NotificationHistory]:
         """Pobranie historii powiadomień"""
         try:
-            filtered_history = self.history
-            
-            # Filtrowanie według typu
-            if notification_type:
-                filtered_history = [
-                    h for h in filtered_history 
-                    if h.notification_type == notification_type
-                ]
-            
-            # Filtrowanie według kanału
-            if channel:
-                filtered_history = [
-                    h for h in filtered_history 
-                    if channel in h.channels
-                ]
-            
-            # Sortowanie według czasu (najnowsze pierwsze)
-            filtered_history.sort(key=lambda x: x.timestamp, reverse=True)
-            
-            return filtered_history[:limit]
+            # Najnowsze pierwsze, przejście tylko po pasującym indeksie
+            return self.history.query(
+                limit,
+                notification_type=notification_type,
+                channel=channel,
+                bot_id=bot_id,
+                priority=priority
+            )
             
         except Exception as e:
             self.logger.error(f"Błąd pobierania historii: {e}")
@@ -902,6 +1017,21 @@ _{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}_
         """Pobranie statystyk"""
         return self.stats
     
+    def count_notifications(self, notification_type: Optional[NotificationType] = None,
+                            channel: Optional[NotificationChannel] = None,
+                            bot_id: Optional[int] = None,
+                            priority: Optional[NotificationPriority] = None) -> int:
+        """Liczba powiadomień w historii (z indeksu, bez skanowania)"""
+        return self.history.count(notification_type, channel, bot_id, priority)
+    
+    def get_unread_count(self) -> int:
+        """Liczba nieprzeczytanych powiadomień w historii"""
+        return self.history.unread_count
+    
+    def mark_notifications_read(self, notification_ids: Optional[List[str]] = None) -> int:
+        """Oznaczenie powiadomień jako przeczytane (bez argumentu - wszystkich)"""
+        return self.history.mark_read(notification_ids)
+    
     async def clear_history(self):
         """Wyczyszczenie historii"""
         try:
@@ -923,18 +1053,16 @@ _{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}_
                 title="Test Notification",
                 message=test_message,
                 notification_type=NotificationType.INFO,
-                channels=[channel]
+                channels=[channel],
+                coalesce=False
             )
             
             # Czekanie na przetworzenie
             await asyncio.sleep(2)
             
             # Sprawdzenie rezultatu
-            for entry in reversed(self.history):
-                if entry.id == notification_id:
-                    return entry.status == "sent"
-            
-            return False
+            entry = self.history.get(notification_id)
+            return entry is not None and entry.status == "sent"
             
         except Exception as e:
             self.logger.error(f"Błąd testu kanału {channel.value}: {e}")
@@ -1037,13 +1165,14 @@ _{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}_
     async def load_history(self):
         """Ładowanie historii z bazy danych"""
         try:
-            self.history = []
+            self.history.clear()
             if self.db is None:
                 self._recalculate_stats_from_history()
                 return
 
             records = await self.db.get_notification_history(limit=500)
-            for record in records:
+            # Rekordy przychodzą od najnowszych - bufor wypełniany od najstarszych
+            for record in reversed(records):
                 metadata = record.get('metadata') or {}
                 channels_raw = metadata.get('channels') or []
                 channels: List[NotificationChannel] = []
@@ -1234,29 +1363,19 @@ _{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}_
     
     def get_notification_history_sync(self, limit: int = 100, 
                                     notification_type: Optional[NotificationType] = None,
-                                    channel: Optional[NotificationChannel] = None) -> List[NotificationHistory]:
+                                    channel: Optional[NotificationChannel] = None,
+                                    bot_id: Optional[int] = None,
+                                    priority: Optional[NotificationPriority] = None) -> List[NotificationHistory]:
         """Synchroniczny wrapper dla get_notification_history"""
         try:
-            filtered_history = self.history
-            
-            # Filtrowanie według typu
-            if notification_type:
-                filtered_history = [
-                    h for h in filtered_history 
-                    if h.notification_type == notification_type
-                ]
-            
-            # Filtrowanie według kanału
-            if channel:
-                filtered_history = [
-                    h for h in filtered_history 
-                    if channel in h.channels
-                ]
-            
-            # Sortowanie według czasu (najnowsze pierwsze)
-            filtered_history.sort(key=lambda x: x.timestamp, reverse=True)
-            
-            return filtered_history[:limit]
+            # Najnowsze pierwsze, przejście tylko po pasującym indeksie
+            return self.history.query(
+                limit,
+                notification_type=notification_type,
+                channel=channel,
+                bot_id=bot_id,
+                priority=priority
+            )
             
         except Exception as e:
             self.logger.error(f"Błąd pobierania historii (sync): {e}")
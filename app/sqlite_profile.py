@@ -0,0 +1,206 @@
+"""Profil wydajności SQLite i pula połączeń tylko do odczytu dla ``DatabaseManager``.
+
+Domyślny profil włącza WAL (czytelnicy nie blokują pisarza), ``synchronous=
+NORMAL`` (fsync tylko przy checkpoincie), mmap pliku bazy, większy cache stron
+i ``busy_timeout`` zamiast natychmiastowego ``database is locked``. Zapytania
+dashboardu idą przez ``ReadConnectionPool`` - osobne połączenia ``mode=ro``
+z ``query_only``, więc nie czekają w kolejce za zapisami handlowymi na
+głównym połączeniu.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import sqlite3
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+try:  # pragma: no cover - zależne od środowiska uruchomieniowego
+    import aiosqlite  # type: ignore
+except Exception:  # pragma: no cover - fallback do stubu
+    from utils.async_sqlite_stub import install_aiosqlite_stub
+
+    aiosqlite = install_aiosqlite_stub()
+
+DEFAULT_PRAGMAS: Dict[str, Any] = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'foreign_keys': 'ON',
+    'busy_timeout': 5000,          # ms
+    'cache_size': -65536,          # ujemne = KiB (64 MiB)
+    'mmap_size': 268435456,        # 256 MiB
+    'temp_store': 'MEMORY',
+}
+
+# Pragmy, które można ustawić z konfiguracji (nazwy trafiają do SQL, więc whitelist)
+ALLOWED_PRAGMAS = {
+    'journal_mode', 'synchronous', 'foreign_keys', 'busy_timeout', 'cache_size',
+    'mmap_size', 'temp_store', 'wal_autocheckpoint', 'journal_size_limit', 'query_only',
+}
+# Pragmy dotyczące pliku bazy, nie połączenia - połączenia tylko do odczytu ich nie ustawiają
+_DATABASE_LEVEL = {'journal_mode', 'wal_autocheckpoint', 'journal_size_limit'}
+_VALUE_RE = re.compile(r'^-?[A-Za-z0-9_]+$')
+
+
+def resolve_pragmas(overrides: Optional[Mapping[str, Any]] = None) -> Dict[str, Any]:
+    """Domyślny profil z nadpisaniami; ``None`` jako wartość usuwa pragmę z profilu."""
+    pragmas = dict(DEFAULT_PRAGMAS)
+    for name, value in (overrides or {}).items():
+        name = str(name).lower()
+        if name not in ALLOWED_PRAGMAS:
+            raise ValueError(f"Niedozwolona pragma SQLite: {name}")
+        if value is None:
+            pragmas.pop(name, None)
+        else:
+            pragmas[name] = value
+    return pragmas
+
+
+def _pragma_sql(name: str, value: Any = None) -> str:
+    if name not in ALLOWED_PRAGMAS:
+        raise ValueError(f"Niedozwolona pragma SQLite: {name}")
+    if value is None:
+        return ''.join(['PRAGMA ', name])
+    value = str(value)
+    if not _VALUE_RE.match(value):
+        raise ValueError(f"Niepoprawna wartość pragmy {name}: {value!r}")
+    return ''.join(['PRAGMA ', name, ' = ', value])
+
+
+async def apply_pragmas(conn: Any, pragmas: Mapping[str, Any], *, read_only: bool = False) -> None:
+    """Ustawia pragmy na połączeniu aiosqlite (dla ``read_only`` pomija pragmy pliku bazy)."""
+    for name, value in pragmas.items():
+        if read_only and name in _DATABASE_LEVEL:
+            continue
+        try:
+            cursor = await conn.execute(_pragma_sql(name, value))
+            await cursor.close()
+        except sqlite3.Error as exc:
+            logger.warning("Nie udało się ustawić PRAGMA %s=%s: %s", name, value, exc)
+
+
+async def read_pragmas(conn: Any, names: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Aktualne wartości pragm na połączeniu."""
+    result: Dict[str, Any] = {}
+    for name in names or list(DEFAULT_PRAGMAS):
+        cursor = await conn.execute(_pragma_sql(name))
+        row = await cursor.fetchone()
+        await cursor.close()
+        result[name] = row[0] if row else None
+    return result
+
+
+_SYNCHRONOUS = {'OFF': 0, 'NORMAL': 1, 'FULL': 2, 'EXTRA': 3}
+_TEMP_STORE = {'DEFAULT': 0, 'FILE': 1, 'MEMORY': 2}
+_BOOLEAN = {'OFF': 0, 'ON': 1, 'FALSE': 0, 'TRUE': 1}
+
+
+def pragma_mismatches(requested: Mapping[str, Any], active: Mapping[str, Any]) -> Dict[str, Any]:
+    """Pragmy, których aktywna wartość różni się od żądanej: ``{nazwa: (żądana, aktywna)}``."""
+    mismatches: Dict[str, Any] = {}
+    for name, wanted in requested.items():
+        if name not in active:
+            continue
+        have = active[name]
+        expected: Any = wanted
+        if isinstance(wanted, str):
+            upper = wanted.upper()
+            lookup = {'synchronous': _SYNCHRONOUS, 'temp_store': _TEMP_STORE}.get(name, _BOOLEAN)
+            expected = lookup.get(upper, upper)
+            have = have.upper() if isinstance(have, str) else have
+        if expected != have:
+            mismatches[name] = (wanted, active[name])
+    return mismatches
+
+
+class ReadConnectionPool:
+    """Mała pula połączeń aiosqlite tylko do odczytu (otwieranych leniwie)."""
+
+    def __init__(self, db_path: str, size: int = 2, pragmas: Optional[Mapping[str, Any]] = None):
+        self.db_path = db_path
+        self.size = max(0, int(size))
+        self.pragmas = dict(pragmas if pragmas is not None else DEFAULT_PRAGMAS)
+        self._idle: List[Any] = []
+        self._created = 0
+        self._waiters: List[asyncio.Future] = []
+        self._closed = False
+        self.stats: Dict[str, int] = {'acquired': 0, 'waited': 0, 'opened': 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0 and not self._closed
+
+    async def _open(self) -> Any:
+        uri = Path(self.db_path).resolve().as_uri() + '?mode=ro'
+        timeout = float(self.pragmas.get('busy_timeout', 5000)) / 1000.0
+        conn = await aiosqlite.connect(uri, uri=True, timeout=timeout)
+        conn.row_factory = sqlite3.Row
+        await apply_pragmas(conn, {**self.pragmas, 'query_only': 'ON'}, read_only=True)
+        self.stats['opened'] += 1
+        return conn
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Any]:
+        """Połączenie z puli; gdy wszystkie są zajęte, czeka na zwolnienie."""
+        conn = await self._take()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    async def _take(self) -> Any:
+        self.stats['acquired'] += 1
+        if self._idle:
+            return self._idle.pop()
+        if self._created < self.size:
+            self._created += 1
+            try:
+                return await self._open()
+            except Exception:
+                self._created -= 1
+                raise
+        self.stats['waited'] += 1
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        return await waiter
+
+    def _release(self, conn: Any) -> None:
+        if self._closed:
+            self._created -= 1
+            asyncio.ensure_future(conn.close())
+            return
+        while self._waiters:
+            waiter = self._waiters.pop(0)
+            if not waiter.done():
+                waiter.set_result(conn)
+                return
+        self._idle.append(conn)
+
+    async def close(self) -> None:
+        self._closed = True
+        idle, self._idle = self._idle, []
+        for conn in idle:
+            self._created -= 1
+            try:
+                await conn.close()
+            except Exception:
+                pass
+
+    def reopen(self) -> None:
+        """Przywraca pulę po ``close`` (np. po przywróceniu bazy z kopii)."""
+        self._closed = False
+
+
+__all__ = [
+    'DEFAULT_PRAGMAS',
+    'ALLOWED_PRAGMAS',
+    'ReadConnectionPool',
+    'apply_pragmas',
+    'pragma_mismatches',
+    'read_pragmas',
+    'resolve_pragmas',
+]
@@ -36,6 +36,7 @@ from ..risk_management import RiskManager
 from ..notifications import NotificationManager
 from utils.config_manager import get_config_manager
 from utils.logger import get_logger
+from utils.indicators import IndicatorFeed, get_indicator_registry
 
 
 @dataclass
@@ -283,21 +284,34 @@ class AITradingBot(BaseBot):
             pair = self.parameters['pair']
 
             # Pobierz dane OHLCV
-            ohlcv_data = await self.exchange.get_ohlcv(pair, '1h', limit=100)
+            timeframe = '1h'
+            synthetic = False
+            ohlcv_data = await self.exchange.get_ohlcv(pair, timeframe, limit=100)
             if not ohlcv_data:
-                ohlcv_data = await self._fallback_ohlcv_from_provider(pair)
+                ohlcv_data, timeframe, synthetic = await self._fallback_ohlcv_from_provider(pair)
             if not ohlcv_data:
                 return self.current_market_condition
             
             df = pd.DataFrame(ohlcv_data, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
             
+            # Wskaźniki trendu/momentum ze współdzielonego strumienia pary (O(1) na nową świecę),
+            # kluczowanego faktycznym interwałem świec
+            if synthetic:
+                # Bez prawdziwych znaczników czasu świece nie dają się przypisać do
+                # interwałów - liczymy je jako kolejne w prywatnym strumieniu
+                feed = IndicatorFeed(pair, timeframe)
+                feed.extend([[None, *row[1:]] for row in ohlcv_data])
+            else:
+                feed = get_indicator_registry().feed(pair, timeframe)
+                feed.extend(ohlcv_data)
+            
             # Oblicz wskaźniki techniczne
             volatility = self._calculate_volatility(df)
-            trend_strength = self._calculate_trend_strength(df)
+            trend_strength = self._calculate_trend_strength(feed)
             volume_ratio = self._calculate_volume_ratio(df)
-            rsi = self._calculate_rsi(df)
-            macd_signal = self._calculate_macd(df)
-            bollinger_position = self._calculate_bollinger_position(df)
+            rsi = self._calculate_rsi(feed)
+            macd_signal = self._calculate_macd(feed)
+            bollinger_position = self._calculate_bollinger_position(feed)
             market_sentiment = self._analyze_sentiment(df)
             
             # Utwórz obiekt warunków rynkowych
@@ -401,9 +415,10 @@ class AITradingBot(BaseBot):
             return f"{base}{quote}"
         return pair.replace('-', '').upper()
 
-    async def _fallback_ohlcv_from_provider(self, pair: str) -> List[List[float]]:
+    async def _fallback_ohlcv_from_provider(self, pair: str) -> Tuple[List[List[float]], str, bool]:
+        """Świece z migawki dostawcy AI: (wiersze ccxt, interwał, czy znaczniki czasu są zastępcze)."""
         if self.ai_data_provider is None:
-            return []
+            return [], '1m', False
 
         symbol = self._normalise_symbol_for_provider(pair)
         snapshot = self.latest_ai_snapshot or self.ai_data_provider.get_last_snapshot()
@@ -421,6 +436,10 @@ class AITradingBot(BaseBot):
                 self.logger.debug(f"Fallback OHLCV refresh failed: {exc}")
                 candles = []
 
+        timeframe = '1m'
+        if snapshot and isinstance(snapshot, dict):
+            timeframe = snapshot.get('candle_timeframe') or timeframe
+        synthetic = False
         normalized: List[List[float]] = []
         for candle in candles or []:
             ts = candle.get('timestamp')
@@ -429,10 +448,12 @@ class AITradingBot(BaseBot):
                     ts_dt = datetime.fromisoformat(ts)
                 except Exception:
                     ts_dt = datetime.now()
+                    synthetic = True
             elif isinstance(ts, datetime):
                 ts_dt = ts
             else:
                 ts_dt = datetime.now()
+                synthetic = True
 
             normalized.append(
                 [
@@ -444,18 +465,20 @@ class AITradingBot(BaseBot):
                     float(candle.get('volume', 0.0)),
                 ]
             )
-        return normalized
+        return normalized, timeframe, synthetic
     
-    def _calculate_trend_strength(self, df: pd.DataFrame) -> float:
+    def _calculate_trend_strength(self, feed: IndicatorFeed) -> float:
         """Oblicz siłę trendu"""
-        if len(df) < 20:
+        if len(feed) < 20:
             return 0.0
         
         # Użyj EMA do określenia trendu
-        ema_short = df['close'].ewm(span=12).mean()
-        ema_long = df['close'].ewm(span=26).mean()
+        ema_short = feed.get('ema', period=12).value
+        ema_long = feed.get('ema', period=26).value
+        if ema_short is None or ema_long is None or ema_long == 0:
+            return 0.0
         
-        trend_diff = (ema_short.iloc[-1] - ema_long.iloc[-1]) / ema_long.iloc[-1]
+        trend_diff = (ema_short - ema_long) / ema_long
         return float(np.tanh(trend_diff * 10))  # Normalizacja do [-1, 1]
     
     def _calculate_volume_ratio(self, df: pd.DataFrame) -> float:
@@ -468,50 +491,21 @@ class AITradingBot(BaseBot):
         
         return float(current_volume / avg_volume) if avg_volume > 0 else 1.0
     
-    def _calculate_rsi(self, df: pd.DataFrame, period: int = 14) -> float:
+    def _calculate_rsi(self, feed: IndicatorFeed, period: int = 14) -> float:
         """Oblicz RSI"""
-        if len(df) < period + 1:
-            return 50.0
-        
-        delta = df['close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        return float(rsi.iloc[-1]) if not np.isnan(rsi.iloc[-1]) else 50.0
+        rsi = feed.get('rsi', period=period).value
+        return float(rsi) if rsi is not None else 50.0
     
-    def _calculate_macd(self, df: pd.DataFrame) -> float:
-        """Oblicz MACD signal"""
-        if len(df) < 26:
-            return 0.0
-        
-        ema_12 = df['close'].ewm(span=12).mean()
-        ema_26 = df['close'].ewm(span=26).mean()
-        macd = ema_12 - ema_26
-        signal = macd.ewm(span=9).mean()
-        
-        return float(macd.iloc[-1] - signal.iloc[-1])
+    def _calculate_macd(self, feed: IndicatorFeed) -> float:
+        """Oblicz MACD signal (histogram)"""
+        histogram = feed.get('macd', fast=12, slow=26, signal=9).histogram
+        return float(histogram) if histogram is not None else 0.0
     
-    def _calculate_bollinger_position(self, df: pd.DataFrame, period: int = 20) -> float:
+    def _calculate_bollinger_position(self, feed: IndicatorFeed, period: int = 20) -> float:
         """Oblicz pozycję w pasmach Bollingera"""
-        if len(df) < period:
-            return 0.5
-        
-        sma = df['close'].rolling(period).mean()
-        std = df['close'].rolling(period).std()
-        
-        upper_band = sma + (2 * std)
-        lower_band = sma - (2 * std)
-        
-        current_price = df['close'].iloc[-1]
-        band_width = upper_band.iloc[-1] - lower_band.iloc[-1]
-        
-        if band_width == 0:
+        position = feed.get('bollinger', period=period, std_dev=2.0).position(feed.last_close)
+        if position is None:
             return 0.5
-        
-        position = (current_price - lower_band.iloc[-1]) / band_width
         return float(np.clip(position, 0, 1))
     
     def _analyze_sentiment(self, df: pd.DataFrame) -> str:
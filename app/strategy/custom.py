@@ -19,6 +19,7 @@ from ..database import DatabaseManager
 from ..risk_management import RiskManager
 from utils.logger import get_logger
 from utils.helpers import FormatHelper, CalculationHelper
+from utils.indicators import StreamingIndicator, get_indicator_registry
 
 
 class CustomStatus(Enum):
@@ -352,6 +353,13 @@ class CustomStrategy:
                 self.price_history.append(price)
                 self.volume_history.append(volume)
             
+            # Zasilenie współdzielonych strumieni wskaźników (dla pary robione raz)
+            registry = get_indicator_registry()
+            for timeframe in self._indicator_timeframes():
+                tf_candles = candles if timeframe == '1m' else await self.exchange.get_ohlcv(self.pair, timeframe, limit=500)
+                if tf_candles:
+                    registry.feed(self.pair, timeframe).extend(tf_candles)
+            
             # Jeśli brak historii, użyj aktualnej ceny
             if not self.price_history:
                 ticker = await self.exchange.get_ticker(self.pair)
@@ -376,12 +384,29 @@ class CustomStrategy:
             self.price_history.append(current_price)
             self.volume_history.append(volume)
             
+            # Tick koryguje bieżącą świecę we wszystkich używanych interwałach
+            registry = get_indicator_registry()
+            for timeframe in self._indicator_timeframes():
+                registry.push(self.pair, timeframe, current_price, ts=ticker.get('timestamp'))
+            
             # Czyszczenie cache wskaźników
             self.indicator_cache.clear()
             
         except Exception as e:
             logger.error(f"Błąd aktualizacji danych: {e}")
 
+    def _indicator_timeframes(self) -> List[str]:
+        """Interwały używane w warunkach reguł (zawsze co najmniej '1m')"""
+        timeframes = {'1m'}
+        for rule in self.custom_rules:
+            for condition in rule.conditions:
+                timeframes.add(str(condition.get('timeframe', '1m')))
+        return sorted(timeframes)
+
+    def _indicator(self, condition: Dict, kind: str, **params) -> StreamingIndicator:
+        """Współdzielona instancja wskaźnika dla pary i interwału warunku"""
+        return get_indicator_registry().get(self.pair, condition.get('timeframe', '1m'), kind, **params)
+
     async def _check_all_rules(self):
         """Sprawdzenie wszystkich reguł"""
         try:
@@ -468,81 +493,35 @@ class CustomStrategy:
             return None
 
     async def _get_rsi_indicator(self, condition: Dict) -> Optional[float]:
-        """Wskaźnik RSI"""
+        """Wskaźnik RSI (Wilder)"""
         try:
-            period = condition.get('period', 14)
-            
-            if len(self.price_history) < period + 1:
-                return None
-            
-            prices = list(self.price_history)[-period-1:]
-            deltas = [prices[i+1] - prices[i] for i in range(len(prices)-1)]
-            
-            gains = [d if d > 0 else 0 for d in deltas]
-            losses = [-d if d < 0 else 0 for d in deltas]
-            
-            avg_gain = sum(gains) / len(gains) if gains else 0
-            avg_loss = sum(losses) / len(losses) if losses else 0
-            
-            if avg_loss == 0:
-                return 100.0
-            
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-            
-            return rsi
-            
+            return self._indicator(condition, 'rsi', period=condition.get('period', 14)).value
         except Exception:
             return None
 
     async def _get_ema_indicator(self, condition: Dict) -> Optional[float]:
         """Wskaźnik EMA"""
         try:
-            period = condition.get('period', 20)
-            
-            if len(self.price_history) < period:
-                return None
-            
-            prices = list(self.price_history)
-            multiplier = 2 / (period + 1)
-            ema = prices[0]
-            
-            for price in prices[1:]:
-                ema = (price * multiplier) + (ema * (1 - multiplier))
-            
-            return ema
-            
+            return self._indicator(condition, 'ema', period=condition.get('period', 20)).value
         except Exception:
             return None
 
     async def _get_sma_indicator(self, condition: Dict) -> Optional[float]:
         """Wskaźnik SMA"""
         try:
-            period = condition.get('period', 20)
-            
-            if len(self.price_history) < period:
-                return None
-            
-            prices = list(self.price_history)[-period:]
-            return sum(prices) / len(prices)
-            
+            return self._indicator(condition, 'sma', period=condition.get('period', 20)).value
         except Exception:
             return None
 
     async def _get_macd_indicator(self, condition: Dict) -> Optional[float]:
-        """Wskaźnik MACD"""
-        try:
-            fast_period = condition.get('fast_period', 12)
-            slow_period = condition.get('slow_period', 26)
-            
-            ema_fast = await self._get_ema_indicator({'period': fast_period})
-            ema_slow = await self._get_ema_indicator({'period': slow_period})
-            
-            if ema_fast is None or ema_slow is None:
-                return None
-            
-            return ema_fast - ema_slow
-            
+        """Wskaźnik MACD (linia MACD)"""
+        try:
+            return self._indicator(
+                condition, 'macd',
+                fast=condition.get('fast_period', 12),
+                slow=condition.get('slow_period', 26),
+                signal=condition.get('signal_period', 9),
+            ).value
         except Exception:
             return None
 
@@ -558,80 +537,36 @@ class CustomStrategy:
     async def _get_bollinger_upper_indicator(self, condition: Dict) -> Optional[float]:
         """Górna linia Bollinger Bands"""
         try:
-            period = condition.get('period', 20)
-            std_dev = condition.get('std_dev', 2.0)
-            
-            if len(self.price_history) < period:
-                return None
-            
-            prices = list(self.price_history)[-period:]
-            sma = sum(prices) / len(prices)
-            variance = sum((p - sma) ** 2 for p in prices) / len(prices)
-            std = variance ** 0.5
-            
-            return sma + (std * std_dev)
-            
+            return self._indicator(
+                condition, 'bollinger',
+                period=condition.get('period', 20),
+                std_dev=condition.get('std_dev', 2.0),
+            ).upper
         except Exception:
             return None
 
     async def _get_bollinger_lower_indicator(self, condition: Dict) -> Optional[float]:
         """Dolna linia Bollinger Bands"""
         try:
-            period = condition.get('period', 20)
-            std_dev = condition.get('std_dev', 2.0)
-            
-            if len(self.price_history) < period:
-                return None
-            
-            prices = list(self.price_history)[-period:]
-            sma = sum(prices) / len(prices)
-            variance = sum((p - sma) ** 2 for p in prices) / len(prices)
-            std = variance ** 0.5
-            
-            return sma - (std * std_dev)
-            
+            return self._indicator(
+                condition, 'bollinger',
+                period=condition.get('period', 20),
+                std_dev=condition.get('std_dev', 2.0),
+            ).lower
         except Exception:
             return None
 
     async def _get_atr_indicator(self, condition: Dict) -> Optional[float]:
         """Wskaźnik ATR"""
         try:
-            period = condition.get('period', 14)
-            
-            if len(self.price_history) < period + 1:
-                return None
-            
-            prices = list(self.price_history)[-period-1:]
-            true_ranges = []
-            
-            for i in range(1, len(prices)):
-                tr = abs(prices[i] - prices[i-1])
-                true_ranges.append(tr)
-            
-            return sum(true_ranges) / len(true_ranges) if true_ranges else None
-            
+            return self._indicator(condition, 'atr', period=condition.get('period', 14)).value
         except Exception:
             return None
 
     async def _get_stochastic_indicator(self, condition: Dict) -> Optional[float]:
-        """Wskaźnik Stochastic"""
+        """Wskaźnik Stochastic (%K)"""
         try:
-            period = condition.get('period', 14)
-            
-            if len(self.price_history) < period:
-                return None
-            
-            prices = list(self.price_history)[-period:]
-            current_price = prices[-1]
-            lowest_low = min(prices)
-            highest_high = max(prices)
-            
-            if highest_high == lowest_low:
-                return 50.0
-            
-            stoch_k = ((current_price - lowest_low) / (highest_high - lowest_low)) * 100
-            return stoch_k
-            
+            return self._indicator(condition, 'stochastic', k_period=condition.get('period', 14)).value
         except Exception:
             return None
 
@@ -16,6 +16,7 @@ from core.database_manager import DatabaseManager
 from app.risk_management import RiskManager
 from utils.logger import get_logger
 from utils.helpers import FormatHelper, CalculationHelper
+from utils.indicators import get_indicator_registry
 import logging
 logger = logging.getLogger(__name__)
 
@@ -164,6 +165,8 @@ class ScalpingStrategy:
         self.price_history = deque(maxlen=200)
         self.volume_history = deque(maxlen=200)
         self.indicators = ScalpingIndicators()
+        # Wskaźniki współdzielone z innymi botami tej samej pary i interwału
+        self.indicator_feed = get_indicator_registry().feed(symbol, timeframe)
         
         # Pozycje i transakcje
         self.current_position: Optional[ScalpingPosition] = None
@@ -221,6 +224,9 @@ class ScalpingStrategy:
             # Wczytanie historii transakcji
             await self._load_trade_history()
             
+            # Historia świec dla wskaźników
+            await self._warm_up_indicators()
+            
             # Obliczenie statystyk
             await self._calculate_statistics()
             
@@ -326,8 +332,9 @@ class ScalpingStrategy:
             ticker = await self.exchange.get_ticker(self.symbol)
             current_price = float(ticker['last'])
             
-            # Dodanie do historii
+            # Dodanie do historii i współdzielonego strumienia wskaźników
             self.price_history.append(current_price)
+            self.indicator_feed.push(current_price, ts=ticker.get('timestamp'))
             
             # Pobranie wolumenu (jeśli dostępny)
             if 'volume' in ticker:
@@ -337,31 +344,31 @@ class ScalpingStrategy:
             logger.error(f"Błąd aktualizacji danych rynkowych: {e}")
     
     async def _calculate_indicators(self):
-        """Obliczenie wskaźników technicznych"""
+        """Odczyt wskaźników ze współdzielonego strumienia (aktualizowanych w O(1) na tick)"""
         try:
-            if len(self.price_history) < max(self.rsi_period, self.ema_slow, self.bb_period):
+            if len(self.indicator_feed) < max(self.rsi_period, self.ema_slow, self.bb_period):
                 return
             
-            prices = list(self.price_history)
+            feed = self.indicator_feed
             
             # RSI
-            self.indicators.rsi = self._calculate_rsi(prices, self.rsi_period)
+            self.indicators.rsi = feed.get('rsi', period=self.rsi_period).value
             
             # EMA
-            self.indicators.ema_fast = self._calculate_ema(prices, self.ema_fast)
-            self.indicators.ema_slow = self._calculate_ema(prices, self.ema_slow)
+            self.indicators.ema_fast = feed.get('ema', period=self.ema_fast).value
+            self.indicators.ema_slow = feed.get('ema', period=self.ema_slow).value
             
-            # MACD
-            macd_data = self._calculate_macd(prices, self.ema_fast, self.ema_slow, self.macd_signal)
-            self.indicators.macd = macd_data['macd']
-            self.indicators.macd_signal = macd_data['signal']
-            self.indicators.macd_histogram = macd_data['histogram']
+            # MACD (z prawdziwą linią sygnału)
+            macd = feed.get('macd', fast=self.ema_fast, slow=self.ema_slow, signal=self.macd_signal)
+            self.indicators.macd = macd.value
+            self.indicators.macd_signal = macd.signal
+            self.indicators.macd_histogram = macd.histogram
             
             # Bollinger Bands
-            bb_data = self._calculate_bollinger_bands(prices, self.bb_period, self.bb_std)
-            self.indicators.bb_upper = bb_data['upper']
-            self.indicators.bb_middle = bb_data['middle']
-            self.indicators.bb_lower = bb_data['lower']
+            bb = feed.get('bollinger', period=self.bb_period, std_dev=self.bb_std)
+            self.indicators.bb_upper = bb.upper
+            self.indicators.bb_middle = bb.value
+            self.indicators.bb_lower = bb.lower
             
             # Średni wolumen
             if self.volume_history:
@@ -370,96 +377,17 @@ class ScalpingStrategy:
         except Exception as e:
             logger.error(f"Błąd obliczania wskaźników: {e}")
     
-    def _calculate_rsi(self, prices: List[float], period: int) -> Optional[float]:
-        """Obliczenie RSI"""
-        try:
-            if len(prices) < period + 1:
-                return None
-            
-            deltas = [prices[i] - prices[i-1] for i in range(1, len(prices))]
-            gains = [d if d > 0 else 0 for d in deltas]
-            losses = [-d if d < 0 else 0 for d in deltas]
-            
-            avg_gain = sum(gains[-period:]) / period
-            avg_loss = sum(losses[-period:]) / period
-            
-            if avg_loss == 0:
-                return 100
-            
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-            
-            return rsi
-            
-        except Exception:
-            return None
-    
-    def _calculate_ema(self, prices: List[float], period: int) -> Optional[float]:
-        """Obliczenie EMA"""
-        try:
-            if len(prices) < period:
-                return None
-            
-            multiplier = 2 / (period + 1)
-            ema = sum(prices[:period]) / period
-            
-            for price in prices[period:]:
-                ema = (price * multiplier) + (ema * (1 - multiplier))
-            
-            return ema
-            
-        except Exception:
-            return None
-    
-    def _calculate_macd(self, prices: List[float], fast: int, slow: int, signal: int) -> Dict:
-        """Obliczenie MACD"""
+    async def _warm_up_indicators(self):
+        """Zasilenie strumienia wskaźników historią świec (boty tej samej pary robią to raz)"""
         try:
-            ema_fast = self._calculate_ema(prices, fast)
-            ema_slow = self._calculate_ema(prices, slow)
-            
-            if ema_fast is None or ema_slow is None:
-                return {'macd': None, 'signal': None, 'histogram': None}
-            
-            macd = ema_fast - ema_slow
-            
-            # Obliczenie sygnału (EMA z MACD)
-            macd_history = [macd]  # W rzeczywistości potrzebujemy historii MACD
-            signal_line = self._calculate_ema(macd_history, signal)
-            
-            histogram = macd - signal_line if signal_line else None
-            
-            return {
-                'macd': macd,
-                'signal': signal_line,
-                'histogram': histogram
-            }
-            
-        except Exception:
-            return {'macd': None, 'signal': None, 'histogram': None}
-    
-    def _calculate_bollinger_bands(self, prices: List[float], period: int, std_dev: float) -> Dict:
-        """Obliczenie Bollinger Bands"""
-        try:
-            if len(prices) < period:
-                return {'upper': None, 'middle': None, 'lower': None}
-            
-            recent_prices = prices[-period:]
-            middle = sum(recent_prices) / period
-            
-            variance = sum((p - middle) ** 2 for p in recent_prices) / period
-            std = variance ** 0.5
-            
-            upper = middle + (std * std_dev)
-            lower = middle - (std * std_dev)
-            
-            return {
-                'upper': upper,
-                'middle': middle,
-                'lower': lower
-            }
-            
-        except Exception:
-            return {'upper': None, 'middle': None, 'lower': None}
+            get_ohlcv = getattr(self.exchange, 'get_ohlcv', None)
+            if get_ohlcv is None:
+                return
+            candles = await get_ohlcv(self.symbol, self.timeframe, limit=self.price_history.maxlen)
+            if isinstance(candles, list) and candles:
+                self.indicator_feed.extend(candles)
+        except Exception as e:
+            logger.warning(f"Nie udało się wczytać historii świec dla wskaźników: {e}")
     
     async def _check_entry_signals(self):
         """Sprawdzenie sygnałów wejścia"""
@@ -1009,6 +937,7 @@ class ScalpingStrategy:
             # Walidacja
             try:
                 self._validate_parameters()
+                self.indicator_feed = get_indicator_registry().feed(self.symbol, self.timeframe)
                 logger.info("Parametry strategii Scalping zaktualizowane")
             except ValueError as e:
                 # Przywrócenie starych parametrów
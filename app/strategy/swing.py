@@ -16,6 +16,7 @@ from core.database_manager import DatabaseManager
 from app.risk_management import RiskManager
 from utils.logger import get_logger
 from utils.helpers import FormatHelper, CalculationHelper
+from utils.indicators import compute, get_indicator_registry, series
 
 
 class SwingStatus(Enum):
@@ -203,6 +204,8 @@ class SwingStrategy:
         self.statistics = SwingStatistics()
         self.price_history: deque = deque(maxlen=200)  # Ostatnie 200 świec
         self.indicators_history: deque = deque(maxlen=50)
+        # Wskaźniki współdzielone z innymi botami tej samej pary i interwału
+        self.indicator_feed = get_indicator_registry().feed(symbol, timeframe)
         
         # Logger
         self.logger = get_logger(f"SwingStrategy_{symbol}")
@@ -294,40 +297,27 @@ class SwingStrategy:
             self.logger.error(f"Błąd pobierania danych rynkowych: {e}")
             return None
 
-    def _calculate_moving_average(self, ohlcv: List[Union[List, Dict]], period: int) -> List[float]:
-        """Prosta średnia krocząca z danych OHLCV (lista wartości dla kolejnych świec)"""
+    @staticmethod
+    def _closes(ohlcv: List[Union[List, Dict]]) -> List[float]:
+        """Ceny zamknięcia z danych OHLCV (listy ccxt lub dicty)"""
         closes: List[float] = []
         for row in ohlcv:
             if isinstance(row, dict) and 'close' in row:
                 closes.append(float(row['close']))
             elif isinstance(row, (list, tuple)) and len(row) >= 5:
                 closes.append(float(row[4]))
-        if len(closes) < period:
-            return []
-        ma: List[float] = []
-        for i in range(period, len(closes)+1):
-            window = closes[i-period:i]
-            ma.append(sum(window) / period)
-        return ma
+        return closes
+
+    def _calculate_moving_average(self, ohlcv: List[Union[List, Dict]], period: int) -> List[float]:
+        """Prosta średnia krocząca z danych OHLCV (lista wartości dla kolejnych świec)"""
+        return series('sma', self._closes(ohlcv), period=period)
 
     def _calculate_bollinger_bands(self, ohlcv: List[Union[List, Dict]], period: int, std_dev: float) -> Tuple[float, float, float]:
         """Oblicz Bollinger Bands (zwraca wartości dla ostatniego okna)"""
-        closes: List[float] = []
-        for row in ohlcv:
-            if isinstance(row, dict) and 'close' in row:
-                closes.append(float(row['close']))
-            elif isinstance(row, (list, tuple)) and len(row) >= 5:
-                closes.append(float(row[4]))
-        if len(closes) < period:
+        bb = compute('bollinger', self._closes(ohlcv), period=period, std_dev=std_dev)
+        if bb.value is None:
             return 0.0, 0.0, 0.0
-        window = closes[-period:]
-        sma = sum(window) / period
-        variance = sum((x - sma) ** 2 for x in window) / period
-        std = variance ** 0.5
-        bb_middle = sma
-        bb_upper = sma + std_dev * std
-        bb_lower = sma - std_dev * std
-        return bb_upper, bb_middle, bb_lower
+        return bb.upper, bb.value, bb.lower
 
     def _can_trade_today(self, daily_trades: int, max_daily: Optional[int] = None) -> bool:
         """Sprawdź czy można handlować dziś zgodnie z limitem dziennym"""
@@ -686,37 +676,35 @@ class SwingStrategy:
         try:
             if period is None:
                 period = self.rsi_period
-            closes: List[float] = []
-            for row in ohlcv:
-                if isinstance(row, dict) and 'close' in row:
-                    closes.append(float(row['close']))
-                elif isinstance(row, (list, tuple)) and len(row) >= 5:
-                    closes.append(float(row[4]))
-            if len(closes) < period + 1:
-                return []
-            deltas = [closes[i] - closes[i - 1] for i in range(1, len(closes))]
-            gains = [max(d, 0.0) for d in deltas]
-            losses = [abs(min(d, 0.0)) for d in deltas]
-            avg_gain = sum(gains[:period]) / period
-            avg_loss = sum(losses[:period]) / period
-            rsi_values: List[float] = []
-            # Pierwsza wartość RSI po początkowym oknie
-            rs = (avg_gain / avg_loss) if avg_loss > 0 else float('inf')
-            rsi_values.append(100 - (100 / (1 + rs)))
-            for i in range(period, len(deltas)):
-                avg_gain = ((avg_gain * (period - 1)) + gains[i]) / period
-                avg_loss = ((avg_loss * (period - 1)) + losses[i]) / period
-                if avg_loss == 0:
-                    rsi = 100.0
-                else:
-                    rs = avg_gain / avg_loss
-                    rsi = 100 - (100 / (1 + rs))
-                rsi_values.append(rsi)
-            return rsi_values
+            return series('rsi', self._closes(ohlcv), period=period)
         except Exception as e:
             self.logger.error(f"Błąd obliczania RSI: {e}")
             return []
 
+    def _read_indicators(self) -> SwingIndicators:
+        """Odczytaj wskaźniki ze współdzielonego strumienia (symbol, timeframe)"""
+        feed = self.indicator_feed
+        macd = feed.get('macd', fast=self.macd_fast, slow=self.macd_slow, signal=self.macd_signal)
+        bb = feed.get('bollinger', period=self.bb_period, std_dev=self.bb_std)
+        stoch = feed.get('stochastic', k_period=self.stoch_k, d_period=self.stoch_d)
+        return SwingIndicators(
+            sma_20=feed.get('sma', period=self.sma_short).value,
+            sma_50=feed.get('sma', period=self.sma_medium).value,
+            sma_200=feed.get('sma', period=self.sma_long).value,
+            ema_12=feed.get('ema', period=self.macd_fast).value,
+            ema_26=feed.get('ema', period=self.macd_slow).value,
+            rsi=feed.get('rsi', period=self.rsi_period).value,
+            macd=macd.value,
+            macd_signal=macd.signal,
+            macd_histogram=macd.histogram,
+            bb_upper=bb.upper,
+            bb_middle=bb.value,
+            bb_lower=bb.lower,
+            stoch_k=stoch.k,
+            stoch_d=stoch.d,
+            atr=feed.get('atr', period=self.atr_period).value
+        )
+
     def _identify_trend(self, indicators: SwingIndicators) -> SwingTrend:
         """Zidentyfikuj trend na podstawie wskaźników"""
         try:
@@ -748,23 +736,9 @@ class SwingStrategy:
             market_data = await self._get_market_data()
             if not market_data:
                 return False
-            ohlcv = market_data['candles']
-            # Oblicz podstawowe wskaźniki
-            ma_fast_list = self._calculate_moving_average(ohlcv, self.sma_short)
-            ma_slow_list = self._calculate_moving_average(ohlcv, self.sma_medium)
-            ma_fast = ma_fast_list[-1] if ma_fast_list else None
-            ma_slow = ma_slow_list[-1] if ma_slow_list else None
-            rsi_values = self._calculate_rsi(ohlcv, self.rsi_period)
-            rsi = rsi_values[-1] if rsi_values else None
-            bb_upper, bb_middle, bb_lower = self._calculate_bollinger_bands(ohlcv, self.bb_period, self.bb_std)
-            indicators = SwingIndicators(
-                sma_20=ma_fast,
-                sma_50=ma_slow,
-                rsi=rsi,
-                bb_upper=bb_upper,
-                bb_middle=bb_middle,
-                bb_lower=bb_lower
-            )
+            # Nowe świece aktualizują współdzielone wskaźniki w O(1) na świecę
+            self.indicator_feed.extend(market_data['candles'])
+            indicators = self._read_indicators()
             self.indicators_history.append(indicators)
             # Aktualizacja pozycji jeśli istnieje
             await self._update_position({
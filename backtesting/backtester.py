@@ -1,6 +1,7 @@
 from typing import List, Dict, Tuple, Callable, Optional
 import csv
 from pathlib import Path
+from utils.candle_store import CandleStore, get_candle_store
 from utils.metrics import equity_curve, max_drawdown, sharpe_ratio, win_rate
 
 Candle = Dict[str, float]
@@ -22,38 +23,67 @@ def load_ohlcv_csv(path: Path) -> List[Candle]:
             })
     return rows
 
+def load_ohlcv_store(symbol: str, timeframe: str, start=None, end=None,
+                     store: Optional[CandleStore] = None) -> List[Candle]:
+    # Świece z magazynu kolumnowego (bez parsowania CSV); zakres [start, end) w ms
+    # Silnik wektorowy może zamiast tego przyjąć bezpośrednio store.read(...)
+    return (store or get_candle_store()).read(symbol, timeframe, start, end).to_candles()
+
 def sma(values: List[float], period: int) -> List[float]:
+    # Różnica sum skumulowanych - te same działania zmiennoprzecinkowe co
+    # vectorized.sma_np, więc remisy przy przecięciach rozstrzygają się identycznie
     out = []
+    csum = []
     s = 0.0
     for i,v in enumerate(values):
         s += v
-        if i >= period:
-            s -= values[i-period]
-        out.append(s/period if i+1 >= period else None)
+        csum.append(s)
+        if i+1 < period:
+            out.append(None)
+        elif i+1 == period:
+            out.append(s/period)
+        else:
+            out.append((s - csum[i-period])/period)
     return out
 
+def _sma_cross_signal(s: List[Optional[float]], l: List[Optional[float]], i: int) -> Optional[str]:
+    if i == 0 or s[i] is None or l[i] is None:
+        return None
+    prev = i-1
+    if s[prev] is None or l[prev] is None:
+        return None
+    # crossover
+    if s[prev] <= l[prev] and s[i] > l[i]:
+        return 'buy'
+    if s[prev] >= l[prev] and s[i] < l[i]:
+        return 'sell'
+    return None
+
 def sma_cross_strategy(short:int=10, long:int=20) -> SignalFunc:
     def fn(candles: List[Candle], i: int) -> Optional[str]:
         closes = [c['c'] for c in candles[:i+1]]
+        return _sma_cross_signal(sma(closes, short), sma(closes, long), i)
+
+    def prepare(candles: List[Candle]) -> SignalFunc:
+        # SMA liczone raz na wywołanie backtest() (wartość w i zależy tylko od
+        # świec <= i) - pętla jest O(n) zamiast O(n²)
+        closes = [c['c'] for c in candles]
         s = sma(closes, short)
         l = sma(closes, long)
-        if i == 0 or s[i] is None or l[i] is None:
-            return None
-        prev = i-1
-        if s[prev] is None or l[prev] is None:
-            return None
-        # crossover
-        if s[prev] <= l[prev] and s[i] > l[i]:
-            return 'buy'
-        if s[prev] >= l[prev] and s[i] < l[i]:
-            return 'sell'
-        return None
+        return lambda _candles, i: _sma_cross_signal(s, l, i)
+
+    fn.prepare = prepare
     return fn
 
 def backtest(candles: List[Candle], signal: SignalFunc) -> Dict:
     position = None  # store entry price
     trades: List[Tuple[float,float]] = []
     returns: List[float] = []
+    # Strategia może udostępnić prepare(candles) -> SignalFunc, by policzyć
+    # wskaźniki raz dla całej serii
+    prepare = getattr(signal, 'prepare', None)
+    if prepare is not None:
+        signal = prepare(candles)
     for i in range(len(candles)):
         sig = signal(candles, i)
         # auto-close on last candle if still open
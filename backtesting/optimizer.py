@@ -0,0 +1,369 @@
+"""Równoległy optymalizator parametrów strategii (grid search i walk-forward).
+
+Zadania ``(strategia, parametry, symbol, okno)`` są rozdzielane na
+``ProcessPoolExecutor``. Świece nie są serializowane do workerów: trafiają
+raz do plików ``.npy`` (``SharedCandleStore``), które każdy proces otwiera
+przez ``np.load(mmap_mode='r')`` - strony pamięci są współdzielone przez cache
+systemu, a zadanie przenosi tylko ścieżkę i zakres indeksów. Dzięki temu
+przepustowość rośnie niemal liniowo z liczbą rdzeni.
+
+Grid search może przycinać słabe zestawy parametrów (``prune_quantile``):
+seria dzielona jest na kolejne okna, a po każdym z nich odpadają zestawy
+z wynikiem poniżej zadanego kwantyla. Wyniki trafiają do ``ResultsTable``
+(sortowanie, CSV, tabela SQLite ``optimizer_results``).
+"""
+import csv
+import json
+import logging
+import math
+import os
+import shutil
+import sqlite3
+import tempfile
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import product
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from backtesting.simulators import SIMULATORS
+from backtesting.vectorized import OHLCVArrays, summarize_returns
+
+logger = logging.getLogger(__name__)
+
+Candle = Dict[str, float]
+MarketData = Union[OHLCVArrays, Sequence[Candle]]
+
+METRIC_COLUMNS = ('total_pnl', 'win_rate', 'max_drawdown', 'sharpe', 'num_trades')
+
+
+@dataclass(frozen=True)
+class Job:
+    """Pojedyncze zadanie backtestu; ``end`` jest wyłączny."""
+    strategy: str
+    params: Tuple[Tuple[str, Any], ...]
+    symbol: str
+    start: int
+    end: int
+    phase: str = 'grid'
+    fold: int = 0
+
+
+class SharedCandleStore:
+    """Świece symboli zapisane jako ``.npy`` (6 x n: t, o, h, l, c, v) do odczytu przez mmap."""
+
+    def __init__(self, directory: Optional[Path] = None):
+        self._owned = directory is None
+        self.directory = Path(directory) if directory is not None else Path(tempfile.mkdtemp(prefix='optimizer-'))
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._paths: Dict[str, str] = {}
+        self._lengths: Dict[str, int] = {}
+
+    def add(self, symbol: str, data: MarketData) -> str:
+        arrays = data if isinstance(data, OHLCVArrays) else OHLCVArrays.from_candles(data)
+        matrix = np.vstack([arrays.t, arrays.o, arrays.h, arrays.l, arrays.c, arrays.v]).astype(np.float64)
+        safe = ''.join(ch if ch.isalnum() else '_' for ch in symbol)
+        path = self.directory / f"{safe}-{len(self._paths)}.npy"
+        np.save(path, matrix)
+        self._paths[symbol] = str(path)
+        self._lengths[symbol] = matrix.shape[1]
+        return str(path)
+
+    def path(self, symbol: str) -> str:
+        return self._paths[symbol]
+
+    def length(self, symbol: str) -> int:
+        return self._lengths[symbol]
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._paths)
+
+    def close(self) -> None:
+        # Mapy z bieżącego procesu (max_workers=1) trzymają pliki otwarte
+        _release_arrays(self._paths.values())
+        if self._owned:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def __enter__(self) -> 'SharedCandleStore':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# Otwarte mmapy w procesie workera (jeden na plik), ważne dla (inode, mtime, rozmiar) pliku
+_MMAPS: Dict[str, Tuple[Tuple[int, int, int], np.ndarray]] = {}
+
+
+def _open_arrays(path: str) -> OHLCVArrays:
+    st = os.stat(path)
+    signature = (st.st_ino, st.st_mtime_ns, st.st_size)
+    cached = _MMAPS.get(path)
+    if cached is None or cached[0] != signature:
+        # Plik o tej samej nazwie mógł zostać nadpisany przez kolejny przebieg
+        cached = (signature, np.load(path, mmap_mode='r'))
+        _MMAPS[path] = cached
+    matrix = cached[1]
+    return OHLCVArrays(*(matrix[row] for row in range(6)))
+
+
+def _release_arrays(paths: Iterable[str]) -> None:
+    for path in paths:
+        _MMAPS.pop(path, None)
+
+
+def score_metrics(metrics: Mapping[str, float], objective: str = 'sharpe', min_trades: int = 1) -> float:
+    """Wynik do rankingu (większy = lepszy); ``max_drawdown`` jest minimalizowany."""
+    if metrics.get('num_trades', 0) < min_trades:
+        return -math.inf
+    value = float(metrics.get(objective, 0.0))
+    return -value if objective == 'max_drawdown' else value
+
+
+def _run_job(spec: Tuple[Job, str, str, int]) -> Dict[str, Any]:
+    job, path, objective, min_trades = spec
+    arrays = _open_arrays(path).window(job.start, job.end)
+    params = dict(job.params)
+    metrics = summarize_returns(SIMULATORS[job.strategy](arrays, params))
+    return {
+        'strategy': job.strategy,
+        'symbol': job.symbol,
+        'phase': job.phase,
+        'fold': job.fold,
+        'start': job.start,
+        'end': job.end,
+        'params': params,
+        'score': score_metrics(metrics, objective, min_trades),
+        **metrics,
+    }
+
+
+def walk_forward_splits(n: int, train: int, test: int, step: Optional[int] = None) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+    """Kolejne pary (okno treningowe, okno testowe) przesuwane o ``step`` (domyślnie ``test``)."""
+    if train <= 0 or test <= 0:
+        raise ValueError("train i test muszą być > 0")
+    step = step or test
+    splits = []
+    start = 0
+    while start + train + test <= n:
+        splits.append(((start, start + train), (start + train, start + train + test)))
+        start += step
+    return splits
+
+
+class ResultsTable:
+    """Tabela wyników optymalizacji z sortowaniem i eksportem."""
+
+    COLUMNS = ('strategy', 'symbol', 'phase', 'fold', 'start', 'end', 'params', 'score') + METRIC_COLUMNS
+
+    def __init__(self, rows: Iterable[Dict[str, Any]] = ()):
+        self.rows: List[Dict[str, Any]] = list(rows)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.rows)
+
+    def sort(self, by: str = 'score', descending: bool = True) -> 'ResultsTable':
+        return ResultsTable(sorted(self.rows, key=lambda r: r.get(by, 0), reverse=descending))
+
+    def filter(self, **equals: Any) -> 'ResultsTable':
+        return ResultsTable(r for r in self.rows if all(r.get(k) == v for k, v in equals.items()))
+
+    def top(self, n: int = 10, by: str = 'score') -> List[Dict[str, Any]]:
+        return self.sort(by).rows[:n]
+
+    def to_csv(self, path: Path) -> Path:
+        """Zapis CSV; parametry rozpisane na kolumny ``p_<nazwa>``."""
+        param_names = sorted({k for r in self.rows for k in r.get('params', {})})
+        header = [c for c in self.COLUMNS if c != 'params'] + [f"p_{name}" for name in param_names]
+        path = Path(path)
+        with path.open('w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            for r in self.rows:
+                params = r.get('params', {})
+                writer.writerow([r.get(c) for c in self.COLUMNS if c != 'params'] + [params.get(n) for n in param_names])
+        return path
+
+    def to_sqlite(self, path: Union[str, Path], run_id: str = '') -> int:
+        """Dopisuje wyniki do tabeli ``optimizer_results`` (indeksy po wyniku i metrykach)."""
+        conn = sqlite3.connect(str(path))
+        try:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS optimizer_results (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    run_id TEXT,
+                    strategy TEXT,
+                    symbol TEXT,
+                    phase TEXT,
+                    fold INTEGER,
+                    start_idx INTEGER,
+                    end_idx INTEGER,
+                    params TEXT,
+                    score REAL,
+                    total_pnl REAL,
+                    win_rate REAL,
+                    max_drawdown REAL,
+                    sharpe REAL,
+                    num_trades INTEGER
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_optimizer_results_score ON optimizer_results(run_id, score DESC)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_optimizer_results_symbol ON optimizer_results(strategy, symbol, phase)")
+            conn.executemany(
+                """
+                INSERT INTO optimizer_results (run_id, strategy, symbol, phase, fold, start_idx, end_idx, params,
+                                               score, total_pnl, win_rate, max_drawdown, sharpe, num_trades)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (run_id, r['strategy'], r['symbol'], r['phase'], r['fold'], r['start'], r['end'],
+                     json.dumps(r['params'], sort_keys=True), r['score'] if math.isfinite(r['score']) else None,
+                     r['total_pnl'], r['win_rate'], r['max_drawdown'], r['sharpe'], r['num_trades'])
+                    for r in self.rows
+                ],
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        return len(self.rows)
+
+
+class ParallelOptimizer:
+    """Optymalizator siatki parametrów jednej strategii na wielu symbolach."""
+
+    def __init__(
+        self,
+        strategy: str,
+        param_grid: Mapping[str, Sequence[Any]],
+        data: Mapping[str, MarketData],
+        *,
+        objective: str = 'sharpe',
+        min_trades: int = 1,
+        max_workers: Optional[int] = None,
+        chunksize: Optional[int] = None,
+        store_dir: Optional[Path] = None,
+        mp_context: Any = None,
+    ):
+        if strategy not in SIMULATORS:
+            raise ValueError(f"Nieznana strategia: {strategy!r} (dostępne: {sorted(SIMULATORS)})")
+        self.strategy = strategy
+        self.param_grid = {k: list(v) for k, v in param_grid.items()}
+        self.data = dict(data)
+        self.objective = objective
+        self.min_trades = min_trades
+        self.max_workers = max_workers
+        self.chunksize = chunksize
+        self.store_dir = store_dir
+        self.mp_context = mp_context
+
+    def param_sets(self) -> List[Tuple[Tuple[str, Any], ...]]:
+        names = sorted(self.param_grid)
+        return [tuple(zip(names, values)) for values in product(*(self.param_grid[n] for n in names))]
+
+    # --- wykonanie -------------------------------------------------------
+    def _executor(self) -> Optional[Executor]:
+        if self.max_workers == 1:
+            return None
+        return ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self.mp_context)
+
+    def _run(self, executor: Optional[Executor], store: SharedCandleStore, jobs: List[Job]) -> List[Dict[str, Any]]:
+        specs = [(job, store.path(job.symbol), self.objective, self.min_trades) for job in jobs]
+        if executor is None:
+            return [_run_job(spec) for spec in specs]
+        workers = self.max_workers or os.cpu_count() or 1
+        chunksize = self.chunksize or max(1, len(specs) // (workers * 4))
+        return list(executor.map(_run_job, specs, chunksize=chunksize))
+
+    def _store(self) -> SharedCandleStore:
+        store = SharedCandleStore(self.store_dir)
+        for symbol, data in self.data.items():
+            store.add(symbol, data)
+        return store
+
+    # --- tryby -------------------------------------------------------------
+    def grid_search(self, windows: int = 1, prune_quantile: Optional[float] = None) -> ResultsTable:
+        """Przegląd siatki na ``windows`` kolejnych oknach każdego symbolu.
+
+        Z ``prune_quantile`` (np. 0.5) po każdym oknie poza ostatnim odrzucane
+        są zestawy, których średni dotychczasowy wynik leży poniżej kwantyla.
+        """
+        active = self.param_sets()
+        rows: List[Dict[str, Any]] = []
+        totals: Dict[Tuple[Tuple[str, Any], ...], List[float]] = {p: [] for p in active}
+        with self._store() as store:
+            executor = self._executor()
+            try:
+                for rnd in range(windows):
+                    jobs = []
+                    for symbol in store.symbols:
+                        n = store.length(symbol)
+                        start, end = n * rnd // windows, n * (rnd + 1) // windows
+                        jobs.extend(Job(self.strategy, p, symbol, start, end, 'grid', rnd) for p in active)
+                    results = self._run(executor, store, jobs)
+                    rows.extend(results)
+                    for job, res in zip(jobs, results):
+                        totals[job.params].append(res['score'])
+                    if prune_quantile and rnd < windows - 1 and len(active) > 1:
+                        active = self._prune(active, totals, prune_quantile)
+            finally:
+                if executor is not None:
+                    executor.shutdown()
+        return ResultsTable(rows)
+
+    @staticmethod
+    def _prune(active, totals, quantile: float):
+        means = {p: float(np.mean(totals[p])) for p in active}
+        finite = [v for v in means.values() if math.isfinite(v)]
+        threshold = float(np.quantile(finite, quantile)) if finite else -math.inf
+        kept = [p for p in active if means[p] >= threshold]
+        if not kept:
+            kept = [max(active, key=lambda p: means[p])]
+        logger.debug("Optimizer pruned %d of %d parameter sets", len(active) - len(kept), len(active))
+        return kept
+
+    def walk_forward(self, train: int, test: int, step: Optional[int] = None) -> ResultsTable:
+        """Walk-forward: najlepszy zestaw z okna treningowego oceniany na kolejnym oknie testowym."""
+        params = self.param_sets()
+        with self._store() as store:
+            executor = self._executor()
+            try:
+                train_jobs: List[Job] = []
+                test_windows: Dict[Tuple[str, int], Tuple[int, int]] = {}
+                for symbol in store.symbols:
+                    for fold, (tr, te) in enumerate(walk_forward_splits(store.length(symbol), train, test, step)):
+                        train_jobs.extend(Job(self.strategy, p, symbol, tr[0], tr[1], 'train', fold) for p in params)
+                        test_windows[(symbol, fold)] = te
+                train_rows = self._run(executor, store, train_jobs)
+
+                best: Dict[Tuple[str, int], Tuple[float, Tuple[Tuple[str, Any], ...]]] = {}
+                for job, row in zip(train_jobs, train_rows):
+                    key = (job.symbol, job.fold)
+                    if key not in best or row['score'] > best[key][0]:
+                        best[key] = (row['score'], job.params)
+                test_jobs = [
+                    Job(self.strategy, best[key][1], key[0], te[0], te[1], 'test', key[1])
+                    for key, te in test_windows.items()
+                ]
+                test_rows = self._run(executor, store, test_jobs)
+            finally:
+                if executor is not None:
+                    executor.shutdown()
+        return ResultsTable(train_rows + test_rows)
+
+
+__all__ = [
+    'Job',
+    'SharedCandleStore',
+    'ResultsTable',
+    'ParallelOptimizer',
+    'score_metrics',
+    'walk_forward_splits',
+]
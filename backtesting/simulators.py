@@ -0,0 +1,174 @@
+"""Uproszczone symulatory strategii (grid, DCA, scalping, swing, SMA cross) dla optymalizatora.
+
+Każdy symulator przyjmuje kolumnowe ``OHLCVArrays`` oraz słownik parametrów
+i zwraca tablicę zwrotów zamkniętych transakcji (long, po prowizji ``fee`` i
+poślizgu ``slippage``). Pozycja otwarta na końcu okna jest zamykana na
+ostatniej świecy - tak jak w ``backtester.backtest``. Reguły odwzorowują
+warunki wejścia/wyjścia strategii z ``app/strategy`` w wersji bez giełdy.
+"""
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+from backtesting.vectorized import (
+    OHLCVArrays,
+    positions_from_signals,
+    sma_cross_signals,
+    sma_np,
+    trade_returns,
+)
+from utils.indicators import create_indicator
+
+Simulator = Callable[[OHLCVArrays, Dict[str, Any]], np.ndarray]
+
+
+def _costs(params: Dict[str, Any]) -> Tuple[float, float]:
+    return float(params.get('fee', 0.0)), float(params.get('slippage', 0.0))
+
+
+def _returns(entries: List[float], exits: List[float], params: Dict[str, Any]) -> np.ndarray:
+    fee, slippage = _costs(params)
+    return trade_returns(np.asarray(entries, dtype=np.float64), np.asarray(exits, dtype=np.float64), fee, slippage)
+
+
+def _indicator_arrays(kind: str, a: OHLCVArrays, fields: Tuple[str, ...], **params: Any) -> Tuple[np.ndarray, ...]:
+    """Wartości wskaźnika strumieniowego wyrównane do świec (NaN przed rozgrzaniem)."""
+    indicator = create_indicator(kind, **params)
+    out = [np.full(len(a), np.nan) for _ in fields]
+    for i, (close, high, low) in enumerate(zip(a.c.tolist(), a.h.tolist(), a.l.tolist())):
+        indicator.update(close, high, low)
+        for arr, field in zip(out, fields):
+            value = getattr(indicator, field)
+            if value is not None:
+                arr[i] = value
+    return tuple(out)
+
+
+def simulate_sma_cross(a: OHLCVArrays, params: Dict[str, Any]) -> np.ndarray:
+    closes = a.c
+    buy, sell = sma_cross_signals(sma_np(closes, int(params.get('short', 10))), sma_np(closes, int(params.get('long', 20))))
+    entries, exits = positions_from_signals(buy, sell)
+    fee, slippage = _costs(params)
+    return trade_returns(closes[entries], closes[exits], fee, slippage)
+
+
+def simulate_swing(a: OHLCVArrays, params: Dict[str, Any]) -> np.ndarray:
+    """Wejście na przecięciu SMA w górę przy RSI poniżej ``rsi_overbought``; wyjście na przecięciu w dół lub stop lossie."""
+    closes = a.c
+    buy, sell = sma_cross_signals(sma_np(closes, int(params.get('sma_short', 20))), sma_np(closes, int(params.get('sma_medium', 50))))
+    (rsi,) = _indicator_arrays('rsi', a, ('value',), period=int(params.get('rsi_period', 14)))
+    rsi_overbought = float(params.get('rsi_overbought', 70.0))
+    stop = float(params.get('stop_loss_percentage', 5.0)) / 100.0
+    entries: List[float] = []
+    exits: List[float] = []
+    entry = None
+    last = len(closes) - 1
+    for i in range(last + 1):
+        px = closes[i]
+        if entry is not None and (i == last or sell[i] or px <= entry * (1 - stop)):
+            entries.append(entry)
+            exits.append(px)
+            entry = None
+        elif entry is None and i < last and buy[i] and not rsi[i] >= rsi_overbought:
+            entry = px
+    return _returns(entries, exits, params)
+
+
+def simulate_scalping(a: OHLCVArrays, params: Dict[str, Any]) -> np.ndarray:
+    """Wejście przy RSI < ``rsi_oversold`` i cenie pod dolną wstęgą; wyjście na TP/SL, RSI > ``rsi_overbought`` lub po ``max_bars``."""
+    closes = a.c
+    (rsi,) = _indicator_arrays('rsi', a, ('value',), period=int(params.get('rsi_period', 14)))
+    (bb_lower,) = _indicator_arrays('bollinger', a, ('lower',), period=int(params.get('bb_period', 20)),
+                                    std_dev=float(params.get('bb_std', 2.0)))
+    oversold = float(params.get('rsi_oversold', 30.0))
+    overbought = float(params.get('rsi_overbought', 70.0))
+    take_profit = float(params.get('take_profit_percentage', 0.5)) / 100.0
+    stop = float(params.get('stop_loss_percentage', 0.5)) / 100.0
+    max_bars = int(params.get('max_bars', 30))
+    entries: List[float] = []
+    exits: List[float] = []
+    entry = None
+    opened = 0
+    last = len(closes) - 1
+    for i in range(last + 1):
+        px = closes[i]
+        if entry is not None:
+            if (i == last or px >= entry * (1 + take_profit) or px <= entry * (1 - stop)
+                    or rsi[i] > overbought or i - opened >= max_bars):
+                entries.append(entry)
+                exits.append(px)
+                entry = None
+        elif i < last and rsi[i] < oversold and px <= bb_lower[i]:
+            entry, opened = px, i
+    return _returns(entries, exits, params)
+
+
+def simulate_dca(a: OHLCVArrays, params: Dict[str, Any]) -> np.ndarray:
+    """Zakup co ``interval`` świec (do ``max_orders``) i zamknięcie cyklu po wzroście o ``take_profit_percentage`` ponad średnią."""
+    closes = a.c
+    interval = max(1, int(params.get('interval', 24)))
+    max_orders = max(1, int(params.get('max_orders', 10)))
+    take_profit = float(params.get('take_profit_percentage', 3.0)) / 100.0
+    entries: List[float] = []
+    exits: List[float] = []
+    units = 0.0
+    invested = 0.0
+    orders = 0
+    last = len(closes) - 1
+    for i in range(last + 1):
+        px = closes[i]
+        if orders and (i == last or px >= invested / units * (1 + take_profit)):
+            # Cykl DCA jako jedna transakcja po średniej cenie wejścia
+            entries.append(invested / units)
+            exits.append(px)
+            units = invested = 0.0
+            orders = 0
+        elif i < last and i % interval == 0 and orders < max_orders:
+            units += 1.0 / px
+            invested += 1.0
+            orders += 1
+    return _returns(entries, exits, params)
+
+
+def simulate_grid(a: OHLCVArrays, params: Dict[str, Any]) -> np.ndarray:
+    """Siatka ``grid_levels`` poziomów co ``grid_spacing`` % pod ceną startową; każdy poziom sprzedawany poziom wyżej."""
+    closes = a.c
+    if len(closes) == 0:
+        return np.empty(0)
+    levels_count = max(1, int(params.get('grid_levels', 10)))
+    spacing = float(params.get('grid_spacing', 1.0)) / 100.0
+    base = float(closes[0])
+    levels = [base * (1 - spacing) ** (k + 1) for k in range(levels_count)]
+    held: Dict[int, float] = {}
+    entries: List[float] = []
+    exits: List[float] = []
+    last = len(closes) - 1
+    for i in range(1, last + 1):
+        px = closes[i]
+        for k, level in enumerate(levels):
+            if k in held:
+                if px >= held[k] * (1 + spacing) or i == last:
+                    entries.append(held.pop(k))
+                    exits.append(px)
+            elif i < last and px <= level:
+                held[k] = px
+    return _returns(entries, exits, params)
+
+
+SIMULATORS: Dict[str, Simulator] = {
+    'sma_cross': simulate_sma_cross,
+    'swing': simulate_swing,
+    'scalping': simulate_scalping,
+    'dca': simulate_dca,
+    'grid': simulate_grid,
+}
+
+
+__all__ = [
+    'SIMULATORS',
+    'simulate_sma_cross',
+    'simulate_swing',
+    'simulate_scalping',
+    'simulate_dca',
+    'simulate_grid',
+]
@@ -9,12 +9,14 @@ import asyncio
 import threading
 import time
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
 import ast
 
 from core.database_manager import DatabaseManager as AppDatabaseManager
+from utils.db_utils import build_keyset_clause, build_where_clause, decode_cursor, encode_cursor
 
 # Konfiguracja logowania
 logging.basicConfig(level=logging.INFO)
@@ -74,40 +76,202 @@ class ValidationHelper:
         return type_str if type_str in valid_types else 'info'
 
 class DatabaseTransactionHelper:
-    """Helper do wykonywania transakcji bazodanowych z retry i rollback"""
+    """Helper do wykonywania transakcji bazodanowych z retry i rollback.
+
+    Operacje wykonuje jeden dedykowany wątek z trwałym połączeniem SQLite,
+    więc korutyny nie blokują pętli zdarzeń: ``execute_async``/``query_async``
+    czekają na wynik przez ``run_in_executor``, a backoff między próbami to
+    ``asyncio.sleep``. Zapisy zgłoszone w tym samym obrocie pętli trafiają do
+    jednej transakcji (przy błędzie paczki każdy jest ponawiany osobno).
+    ``stats()`` raportuje czas spędzony na wątku pętli i na wątku bazy.
+    ``execute_with_retry`` pozostaje dla wywołań synchronicznych.
+    """
     
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, backoff_base: float = 1.0):
         self.db_path = db_path
+        self.backoff_base = backoff_base
         self.lock = threading.Lock()
-        
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="data-manager-db")
+        self._conn: Optional[sqlite3.Connection] = None  # używane wyłącznie na wątku bazy
+        # Kolejka i zadanie opróżniające są osobne dla każdej pętli zdarzeń:
+        # future można rozstrzygać tylko z wątku pętli, która je utworzyła.
+        self._pending: Dict[asyncio.AbstractEventLoop, List[Tuple[Callable, int, asyncio.Future]]] = {}
+        self._drain_tasks: Dict[asyncio.AbstractEventLoop, asyncio.Task] = {}
+        self._stats: Dict[str, Any] = {
+            'operations': 0,
+            'batches': 0,
+            'max_batch': 0,
+            'retries': 0,
+            'failures': 0,
+            'db_time_ms': 0.0,
+            'loop_time_ms': 0.0,
+            'max_loop_block_ms': 0.0,
+        }
+
+    # --- wątek bazy ---
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30.0)
+            conn.execute("PRAGMA foreign_keys = ON")
+            self._conn = conn
+        return self._conn
+
+    def _run_transaction(self, operations: List[Callable]) -> List[Any]:
+        """Wykonuje operacje jedną transakcją (na wątku bazy)."""
+        started = time.perf_counter()
+        conn = self._connection()
+        cursor = conn.cursor()
+        try:
+            results = [operation_func(cursor, conn) for operation_func in operations]
+            conn.commit()
+            return results
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            self._stats['db_time_ms'] += (time.perf_counter() - started) * 1000.0
+
+    def _close_connection(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # --- wywołania synchroniczne ---
+
     def execute_with_retry(self, operation_func, max_retries: int = 3) -> bool:
-        """Wykonuje operację z retry i obsługą błędów"""
+        """Wykonuje operację z retry i obsługą błędów (blokuje wywołującego)"""
         with self.lock:
             for attempt in range(max_retries):
                 try:
-                    with sqlite3.connect(self.db_path, timeout=30.0) as conn:
-                        conn.execute("PRAGMA foreign_keys = ON")
-                        cursor = conn.cursor()
-                        
-                        # Wykonaj operację
-                        operation_func(cursor, conn)
-                        conn.commit()
-                        return True
+                    self._executor.submit(self._run_transaction, [operation_func]).result()
+                    self._stats['operations'] += 1
+                    return True
                         
                 except sqlite3.Error as e:
                     logger.error(f"Database error (attempt {attempt + 1}): {e}")
                     if attempt < max_retries - 1:
                         # Exponential backoff
-                        time.sleep(2 ** attempt)
+                        self._stats['retries'] += 1
+                        time.sleep(self.backoff_base * 2 ** attempt)
                     else:
                         logger.error(f"Database operation failed after {max_retries} attempts")
+                        self._stats['failures'] += 1
                         return False
                 except Exception as e:
                     logger.error(f"Unexpected error in database operation: {e}")
+                    self._stats['failures'] += 1
                     return False
             
             return False
 
+    # --- ścieżka asynchroniczna ---
+
+    def _account_loop_time(self, started: float) -> None:
+        elapsed = (time.perf_counter() - started) * 1000.0
+        self._stats['loop_time_ms'] += elapsed
+        self._stats['max_loop_block_ms'] = max(self._stats['max_loop_block_ms'], elapsed)
+
+    async def _in_db_thread(self, operations: List[Callable]) -> List[Any]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._run_transaction, operations)
+
+    async def execute_async(self, operation_func, max_retries: int = 3) -> bool:
+        """Asynchroniczny odpowiednik ``execute_with_retry`` (zapis w paczce z innymi zapisami)."""
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(loop, []).append((operation_func, max_retries, future))
+        task = self._drain_tasks.get(loop)
+        if task is None or task.done():
+            self._drain_tasks[loop] = loop.create_task(self._drain(loop))
+        self._account_loop_time(started)
+        return await future
+
+    async def _drain(self, loop: asyncio.AbstractEventLoop) -> None:
+        try:
+            while True:
+                batch = self._pending.pop(loop, None)
+                if not batch:
+                    return
+                await self._drain_batch(batch)
+        finally:
+            if self._drain_tasks.get(loop) is asyncio.current_task():
+                del self._drain_tasks[loop]
+
+    async def _drain_batch(self, batch: List[Tuple[Callable, int, asyncio.Future]]) -> None:
+        try:
+            await self._in_db_thread([op for op, _, _ in batch])
+        except Exception as e:
+            if len(batch) > 1:
+                logger.warning(f"Database batch of {len(batch)} operations failed ({e}) - retrying individually")
+            for op, max_retries, future in batch:
+                ok = await self._execute_one(op, max_retries, first_error=e if len(batch) == 1 else None)
+                if not future.done():
+                    future.set_result(ok)
+            return
+        started = time.perf_counter()
+        stats = self._stats
+        stats['operations'] += len(batch)
+        stats['batches'] += 1
+        stats['max_batch'] = max(stats['max_batch'], len(batch))
+        for _, _, future in batch:
+            if not future.done():
+                future.set_result(True)
+        self._account_loop_time(started)
+
+    async def _execute_one(self, operation_func, max_retries: int, first_error: Optional[Exception] = None) -> bool:
+        attempt = 0
+        error = first_error
+        while True:
+            if error is None:
+                try:
+                    await self._in_db_thread([operation_func])
+                    self._stats['operations'] += 1
+                    return True
+                except Exception as e:
+                    error = e
+            if not isinstance(error, sqlite3.Error):
+                logger.error(f"Unexpected error in database operation: {error}")
+                self._stats['failures'] += 1
+                return False
+            logger.error(f"Database error (attempt {attempt + 1}): {error}")
+            attempt += 1
+            if attempt >= max_retries:
+                logger.error(f"Database operation failed after {max_retries} attempts")
+                self._stats['failures'] += 1
+                return False
+            self._stats['retries'] += 1
+            await asyncio.sleep(self.backoff_base * 2 ** (attempt - 1))
+            error = None
+
+    async def query_async(self, operation_func) -> Any:
+        """Wykonuje odczyt na wątku bazy i zwraca wynik ``operation_func(cursor, conn)``."""
+        results = await self._in_db_thread([operation_func])
+        return results[0]
+
+    async def flush(self) -> None:
+        """Czeka na zakończenie zgłoszonych zapisów."""
+        loop = asyncio.get_running_loop()
+        while True:
+            task = self._drain_tasks.get(loop)
+            if task is None or task.done():
+                return
+            await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        """Liczniki operacji/paczek oraz czas na wątku pętli (``loop_time_ms``) i bazy (``db_time_ms``)."""
+        pending = sum(len(batch) for batch in list(self._pending.values()))
+        return {**self._stats, 'pending': pending}
+
+    def close(self) -> None:
+        """Zamyka połączenie i wątek bazy."""
+        try:
+            self._executor.submit(self._close_connection).result()
+        finally:
+            self._executor.shutdown(wait=True)
+
 @dataclass
 class PortfolioData:
     """Struktura danych portfolio"""
@@ -176,7 +340,8 @@ class DataManager:
         self.cache_duration = timedelta(minutes=5)
         self.db_helper = DatabaseTransactionHelper(db_path)
         self._initialized = False
-        self._init_lock = threading.Lock()
+        # asyncio.Lock - threading.Lock trzymany przez await blokowałby pętlę
+        self._init_lock: Optional[asyncio.Lock] = None
 
         # Konfiguracja z zmiennych środowiskowych
         self.use_real_data = os.getenv('USE_REAL_DATA', 'false').lower() == 'true'
@@ -189,7 +354,9 @@ class DataManager:
     async def ensure_initialized(self):
         """Zapewnia, że DataManager jest zainicjalizowany"""
         if not self._initialized:
-            with self._init_lock:
+            if self._init_lock is None:
+                self._init_lock = asyncio.Lock()
+            async with self._init_lock:
                 if not self._initialized:
                     await self.init_database()
                     self._initialized = True
@@ -279,7 +446,7 @@ class DataManager:
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_alerts_read ON alerts(read)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_bots_active ON bots(active)')
             
-        success = self.db_helper.execute_with_retry(create_tables_operation)
+        success = await self.db_helper.execute_async(create_tables_operation)
         if success:
             logger.info("Database initialized successfully")
         else:
@@ -318,6 +485,16 @@ class DataManager:
                     return None
         return self._app_db_manager
 
+    async def close_app_database(self) -> None:
+        """Zamyka połączenia DatabaseManagera aplikacji; kolejne użycie otworzy je ponownie.
+
+        Połączenie aiosqlite ma własny wątek (nie daemon) - musi zostać zamknięte,
+        zanim zakończy się pętla, w której zostało otwarte (np. ``asyncio.run``).
+        """
+        manager, self._app_db_manager = self._app_db_manager, None
+        if manager is not None:
+            await manager.close()
+
     async def _resolve_default_user_id(self) -> Optional[int]:
         """Próbuje ustalić identyfikator użytkownika dla ustawień globalnych."""
         app_db = await self._get_app_database()
@@ -365,10 +542,7 @@ class DataManager:
             return cursor.fetchone()
         
         try:
-            result = None
-            with sqlite3.connect(self.db_path, timeout=30.0) as conn:
-                cursor = conn.cursor()
-                result = get_portfolio_operation(cursor, conn)
+            result = await self.db_helper.query_async(get_portfolio_operation)
             
             if result:
                 return PortfolioData(
@@ -420,7 +594,7 @@ class DataManager:
                 data.last_updated.isoformat()
             ))
         
-        self.db_helper.execute_with_retry(insert_operation)
+        await self.db_helper.execute_async(insert_operation)
 
     async def get_bots_data(self, limit: int = 100) -> List[BotData]:
         """Pobiera dane botów"""
@@ -449,8 +623,7 @@ class DataManager:
     async def _get_real_bots_data(self, limit: int) -> List[BotData]:
         """Pobiera rzeczywiste dane botów z bazy"""
         try:
-            with sqlite3.connect(self.db_path, timeout=30.0) as conn:
-                cursor = conn.cursor()
+            def select_operation(cursor, conn):
                 cursor.execute('''
                     SELECT id, name, status, active, profit, profit_percent,
                            trades_count, last_trade, risk_level, created_at
@@ -459,29 +632,31 @@ class DataManager:
                     LIMIT ?
                 ''', (limit,))
                 
-                results = cursor.fetchall()
-                
-                if not results:
-                    # Brak danych – zwróć pustą listę (nie wstawiaj przykładowych danych)
-                    return []
-                
-                bots = []
-                for row in results:
-                    bots.append(BotData(
-                        id=row[0],
-                        name=row[1],
-                        status=row[2],
-                        active=bool(row[3]),
-                        profit=row[4],
-                        profit_percent=row[5],
-                        trades_count=row[6],
-                        last_trade=datetime.fromisoformat(row[7]) if row[7] else None,
-                        risk_level=row[8],
-                        created_at=datetime.fromisoformat(row[9])
-                    ))
-                
-                return bots
-                
+                return cursor.fetchall()
+
+            results = await self.db_helper.query_async(select_operation)
+            
+            if not results:
+                # Brak danych – zwróć pustą listę (nie wstawiaj przykładowych danych)
+                return []
+            
+            bots = []
+            for row in results:
+                bots.append(BotData(
+                    id=row[0],
+                    name=row[1],
+                    status=row[2],
+                    active=bool(row[3]),
+                    profit=row[4],
+                    profit_percent=row[5],
+                    trades_count=row[6],
+                    last_trade=datetime.fromisoformat(row[7]) if row[7] else None,
+                    risk_level=row[8],
+                    created_at=datetime.fromisoformat(row[9])
+                ))
+            
+            return bots
+            
         except Exception as e:
             logger.error(f"Error getting real bots data: {e}")
             # Nie zwracaj przykładowych danych – zwróć pustą listę
@@ -546,7 +721,7 @@ class DataManager:
                     bot.risk_level, bot.created_at.isoformat(), datetime.now().isoformat()
                 ))
         
-        self.db_helper.execute_with_retry(insert_operation)
+        await self.db_helper.execute_async(insert_operation)
 
     async def get_risk_metrics(self) -> RiskMetrics:
         """Pobiera metryki ryzyka bez używania przykładowych danych.
@@ -581,8 +756,7 @@ class DataManager:
     async def _get_real_risk_metrics(self) -> RiskMetrics:
         """Pobiera rzeczywiste metryki ryzyka z bazy; zwraca zera gdy brak danych"""
         try:
-            with sqlite3.connect(self.db_path, timeout=30.0) as conn:
-                cursor = conn.cursor()
+            def select_operation(cursor, conn):
                 cursor.execute('''
                     SELECT var_1d, var_7d, sharpe_ratio, max_drawdown,
                            volatility, beta, last_calculated
@@ -590,28 +764,30 @@ class DataManager:
                     ORDER BY last_calculated DESC 
                     LIMIT 1
                 ''')
-                result = cursor.fetchone()
-                if result:
-                    return RiskMetrics(
-                        var_1d=result[0] or 0.0,
-                        var_7d=result[1] or 0.0,
-                        sharpe_ratio=result[2] or 0.0,
-                        max_drawdown=result[3] or 0.0,
-                        volatility=result[4] or 0.0,
-                        beta=result[5] or 0.0,
-                        last_calculated=datetime.fromisoformat(result[6])
-                    )
-                else:
-                    # Brak danych - zwróć metryki zerowe zamiast przykładowych
-                    return RiskMetrics(
-                        var_1d=0.0,
-                        var_7d=0.0,
-                        sharpe_ratio=0.0,
-                        max_drawdown=0.0,
-                        volatility=0.0,
-                        beta=0.0,
-                        last_calculated=datetime.now()
-                    )
+                return cursor.fetchone()
+
+            result = await self.db_helper.query_async(select_operation)
+            if result:
+                return RiskMetrics(
+                    var_1d=result[0] or 0.0,
+                    var_7d=result[1] or 0.0,
+                    sharpe_ratio=result[2] or 0.0,
+                    max_drawdown=result[3] or 0.0,
+                    volatility=result[4] or 0.0,
+                    beta=result[5] or 0.0,
+                    last_calculated=datetime.fromisoformat(result[6])
+                )
+            else:
+                # Brak danych - zwróć metryki zerowe zamiast przykładowych
+                return RiskMetrics(
+                    var_1d=0.0,
+                    var_7d=0.0,
+                    sharpe_ratio=0.0,
+                    max_drawdown=0.0,
+                    volatility=0.0,
+                    beta=0.0,
+                    last_calculated=datetime.now()
+                )
         except Exception as e:
             logger.error(f"Error getting real risk metrics: {e}")
             return RiskMetrics(
@@ -652,9 +828,7 @@ class DataManager:
     async def _get_real_logs(self, limit: int, level: str = None) -> List[LogEntry]:
         """Pobiera rzeczywiste logi z bazy"""
         try:
-            with sqlite3.connect(self.db_path, timeout=30.0) as conn:
-                cursor = conn.cursor()
-                
+            def select_operation(cursor, conn):
                 if level:
                     cursor.execute('''
                         SELECT id, timestamp, level, message, source, bot_id
@@ -671,31 +845,75 @@ class DataManager:
                         LIMIT ?
                     ''', (limit,))
                 
-                results = cursor.fetchall()
-                
-                if not results:
-                    # Brak danych - wstaw przykładowe
-                    sample_data = await self._get_sample_logs(limit, level)
-                    await self._insert_sample_logs(sample_data)
-                    return sample_data
-                
-                logs = []
-                for row in results:
-                    logs.append(LogEntry(
-                        id=row[0],
-                        timestamp=datetime.fromisoformat(row[1]),
-                        level=row[2],
-                        message=row[3],
-                        source=row[4],
-                        bot_id=row[5]
-                    ))
-                
-                return logs
-                
+                return cursor.fetchall()
+
+            results = await self.db_helper.query_async(select_operation)
+            
+            if not results:
+                # Brak danych - wstaw przykładowe
+                sample_data = await self._get_sample_logs(limit, level)
+                await self._insert_sample_logs(sample_data)
+                return sample_data
+            
+            return [self._log_row_to_entry(row) for row in results]
+            
         except Exception as e:
             logger.error(f"Error getting real logs: {e}")
             return await self._get_sample_logs(limit, level)
 
+    async def get_logs_page(self, cursor: Optional[str] = None, limit: int = 200,
+                            level: str = None) -> Dict[str, Any]:
+        """Strona logów (najnowsze najpierw) z kursorem keyset do starszych wpisów.
+
+        Zwraca ``{'items': [LogEntry, ...], 'next_cursor': token | None}``;
+        ``next_cursor`` przekazany w kolejnym wywołaniu zwraca następną,
+        starszą stronę. Koszt strony nie zależy od jej numeru (brak OFFSET).
+        """
+        try:
+            await self.ensure_initialized()
+            limit = ValidationHelper.validate_limit(limit)
+            if level:
+                level = ValidationHelper.validate_log_level(level)
+            if not self.use_real_data:
+                items = [] if cursor else await self._get_sample_logs(limit, level)
+                return {'items': items, 'next_cursor': None}
+
+            position = decode_cursor(cursor) if cursor else None
+            where_clause, params = build_where_clause({'level': level} if level else {}, allowed_columns={'level'})
+            keyset_clause, keyset_params, order_by = build_keyset_clause('timestamp', position)
+            sql = ''.join([
+                'SELECT id, timestamp, level, message, source, bot_id FROM logs WHERE ', where_clause,
+                ' AND ', keyset_clause, ' ORDER BY ', order_by, ' LIMIT ?'
+            ])
+            # Jeden wiersz więcej mówi, czy istnieje starsza strona
+            params = params + keyset_params + [limit + 1]
+
+            def select_operation(cursor_obj, conn):
+                cursor_obj.execute(sql, params)
+                return cursor_obj.fetchall()
+
+            rows = await self.db_helper.query_async(select_operation)
+        except Exception as e:
+            logger.error(f"Error getting logs page: {e}")
+            return {'items': [], 'next_cursor': None}
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1][1], rows[-1][0])
+        return {'items': [self._log_row_to_entry(row) for row in rows], 'next_cursor': next_cursor}
+
+    @staticmethod
+    def _log_row_to_entry(row) -> LogEntry:
+        return LogEntry(
+            id=row[0],
+            timestamp=datetime.fromisoformat(row[1]),
+            level=row[2],
+            message=row[3],
+            source=row[4],
+            bot_id=row[5]
+        )
+
     async def _get_sample_logs(self, limit: int, level: str = None) -> List[LogEntry]:
         """Zwraca przykładowe logi"""
         sample_logs = [
@@ -750,7 +968,7 @@ class DataManager:
                     log.source, log.bot_id
                 ))
         
-        self.db_helper.execute_with_retry(insert_operation)
+        await self.db_helper.execute_async(insert_operation)
 
     async def add_log(self, level: str, message: str, source: str, bot_id: str = None):
         """Dodaje nowy wpis do logów"""
@@ -764,7 +982,7 @@ class DataManager:
                     VALUES (?, ?, ?, ?)
                 ''', (level, message, source, bot_id))
             
-            success = self.db_helper.execute_with_retry(insert_operation)
+            success = await self.db_helper.execute_async(insert_operation)
             
             if success:
                 # Wyczyść cache logów
@@ -781,6 +999,16 @@ class DataManager:
         except Exception as e:
             logger.error(f"Error adding log: {e}")
 
+    def get_db_stats(self) -> Dict[str, Any]:
+        """Statystyki wątku bazy (operacje, paczki, czas blokowania pętli zdarzeń)"""
+        return self.db_helper.stats()
+
+    async def close(self):
+        """Czeka na zgłoszone zapisy i zamyka wątek bazy"""
+        await self.close_app_database()
+        await self.db_helper.flush()
+        await asyncio.get_running_loop().run_in_executor(None, self.db_helper.close)
+
     def clear_cache(self):
         """Czyści cache"""
         self.cache.clear()
@@ -901,9 +1129,7 @@ class DataManager:
     async def _get_real_alerts(self, limit: int, unread_only: bool) -> List[AlertEntry]:
         """Pobiera rzeczywiste alerty z bazy"""
         try:
-            with sqlite3.connect(self.db_path, timeout=30.0) as conn:
-                cursor = conn.cursor()
-                
+            def select_operation(cursor, conn):
                 if unread_only:
                     cursor.execute('''
                         SELECT id, timestamp, type, severity, title, message, read, bot_id
@@ -920,29 +1146,31 @@ class DataManager:
                         LIMIT ?
                     ''', (limit,))
                 
-                results = cursor.fetchall()
-                
-                if not results:
-                    # Brak danych - wstaw przykładowe
-                    sample_data = await self._get_sample_alerts(limit, unread_only)
-                    await self._insert_sample_alerts(sample_data)
-                    return sample_data
-                
-                alerts = []
-                for row in results:
-                    alerts.append(AlertEntry(
-                        id=row[0],
-                        timestamp=datetime.fromisoformat(row[1]),
-                        type=row[2],
-                        severity=row[3],
-                        title=row[4],
-                        message=row[5],
-                        read=bool(row[6]),
-                        bot_id=row[7]
-                    ))
-                
-                return alerts
-                
+                return cursor.fetchall()
+
+            results = await self.db_helper.query_async(select_operation)
+            
+            if not results:
+                # Brak danych - wstaw przykładowe
+                sample_data = await self._get_sample_alerts(limit, unread_only)
+                await self._insert_sample_alerts(sample_data)
+                return sample_data
+            
+            alerts = []
+            for row in results:
+                alerts.append(AlertEntry(
+                    id=row[0],
+                    timestamp=datetime.fromisoformat(row[1]),
+                    type=row[2],
+                    severity=row[3],
+                    title=row[4],
+                    message=row[5],
+                    read=bool(row[6]),
+                    bot_id=row[7]
+                ))
+            
+            return alerts
+            
         except Exception as e:
             logger.error(f"Error getting real alerts: {e}")
             return await self._get_sample_alerts(limit, unread_only)
@@ -999,7 +1227,7 @@ class DataManager:
                     alert.title, alert.message, alert.read, alert.bot_id
                 ))
         
-        self.db_helper.execute_with_retry(insert_operation)
+        await self.db_helper.execute_async(insert_operation)
 
     async def add_alert(self, alert_type: str, severity: str, title: str, 
                        message: str, bot_id: str = None):
@@ -1015,7 +1243,7 @@ class DataManager:
                     VALUES (?, ?, ?, ?, ?)
                 ''', (alert_type, severity, title, message, bot_id))
             
-            success = self.db_helper.execute_with_retry(insert_operation)
+            success = await self.db_helper.execute_async(insert_operation)
             
             if success:
                 # Wyczyść cache alertów
@@ -1040,7 +1268,7 @@ class DataManager:
                     UPDATE alerts SET read = 1 WHERE id = ?
                 ''', (alert_id,))
             
-            success = self.db_helper.execute_with_retry(update_operation)
+            success = await self.db_helper.execute_async(update_operation)
             
             if success:
                 # Wyczyść cache alertów
@@ -1194,7 +1422,7 @@ class DataManager:
                         WHERE id = ?
                     ''', (status, bot_id))
             
-            success = self.db_helper.execute_with_retry(update_bot_operation)
+            success = await self.db_helper.execute_async(update_bot_operation)
             
             if success:
                 # Wyczyść cache botów
@@ -13,12 +13,12 @@ try:
     from app.database import DatabaseManager as _AppDatabaseManager  # prefer real implementation
 
     class DatabaseManager(_AppDatabaseManager):  # type: ignore[misc]
-        def __init__(self, db_path: Union[str, Path] = "data/database.db"):
-            super().__init__(db_path)
+        def __init__(self, db_path: Union[str, Path] = "data/database.db", **kwargs):
+            super().__init__(db_path, **kwargs)
 
 except Exception:
     class DatabaseManager:  # fallback stub
-        def __init__(self, db_path: Union[str, Path] = "data/database.db"):
+        def __init__(self, db_path: Union[str, Path] = "data/database.db", **kwargs):
             self.db_path = str(db_path)
 
         async def initialize(self):
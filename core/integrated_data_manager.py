@@ -13,6 +13,7 @@ from .trading_engine import TradingEngine, OrderRequest, OrderResponse, Balance
 from .strategy_engine import StrategyEngine, StrategyConfig, StrategyType, TradingSignal
 from .updated_risk_manager import UpdatedRiskManager
 from .unified_data_manager import UnifiedDataManager, get_unified_data_manager, UnifiedSystemStatus
+from .ui_feed import FeedDiff, FeedPublisher, FeedState, as_record, normalize_bot
 import os
 from utils.helpers import get_or_create_event_loop, schedule_coro_safely
 
@@ -106,6 +107,12 @@ class IntegratedDataManager:
         self._system_status_task = None
         self._ai_snapshot_task = None
         self._ai_data_provider = None
+        self._ui_feed_task = None
+
+        # Push-based feed dla UI: jedna migawka na cykl, do widgetów trafiają różnice
+        self.ui_feed_interval = self._feed_setting('ui_feed_interval', 2.0)
+        self.ui_feed = FeedPublisher(max_fps=self._feed_setting('ui_feed_max_fps', 10.0))
+        self._feed_state = FeedState()
 
         # Rozszerzone komponenty i cache dashboardu
         self.enhanced_portfolio_manager = None
@@ -210,6 +217,8 @@ class IntegratedDataManager:
             loop = get_or_create_event_loop()
             self._portfolio_task = schedule_coro_safely(lambda: self._portfolio_update_loop())
             self._system_status_task = schedule_coro_safely(lambda: self._system_status_update_loop())
+            if self._ui_feed_task is None or self._ui_feed_task.done():
+                self._ui_feed_task = schedule_coro_safely(lambda: self._ui_feed_loop())
 
             # Uruchom agregator danych AI (rynek + ryzyko + strategie)
             provider = self._ensure_ai_provider()
@@ -239,6 +248,8 @@ class IntegratedDataManager:
             loop = get_or_create_event_loop()
             self._portfolio_task = schedule_coro_safely(lambda: self._portfolio_update_loop())
             self._system_status_task = schedule_coro_safely(lambda: self._system_status_update_loop())
+            if self._ui_feed_task is None or self._ui_feed_task.done():
+                self._ui_feed_task = schedule_coro_safely(lambda: self._ui_feed_loop())
 
             provider = self._ensure_ai_provider()
             if provider:
@@ -255,7 +266,11 @@ class IntegratedDataManager:
         try:
             # Ustaw flagę initialized na False aby przerwać pętle
             self.initialized = False
-            tasks = [getattr(self, '_portfolio_task', None), getattr(self, '_system_status_task', None)]
+            tasks = [
+                getattr(self, '_portfolio_task', None),
+                getattr(self, '_system_status_task', None),
+                getattr(self, '_ui_feed_task', None),
+            ]
             for t in tasks:
                 try:
                     if t and not t.done():
@@ -279,6 +294,8 @@ class IntegratedDataManager:
             # Wyczyść referencje
             self._portfolio_task = None
             self._system_status_task = None
+            self._ui_feed_task = None
+            self.ui_feed.close()
             try:
                 await self.stop_ai_snapshot_updates()
             except Exception as exc:
@@ -300,9 +317,20 @@ class IntegratedDataManager:
                 await self.stop_ai_snapshot_updates()
             except Exception as exc:
                 logger.debug("AI snapshot shutdown warning: %s", exc)
+            await self._close_database_connections()
         except Exception as e:
             logger.error(f"Error during IntegratedDataManager shutdown: {e}")
 
+    async def _close_database_connections(self):
+        """Zamyka połączenia aiosqlite otwarte w bieżącej pętli (otwierane ponownie przy użyciu)"""
+        try:
+            if self.data_manager is not None and hasattr(self.data_manager, 'close_app_database'):
+                await self.data_manager.close_app_database()
+            if self.database_manager is not None and hasattr(self.database_manager, 'close'):
+                await self.database_manager.close()
+        except Exception as e:
+            logger.warning(f"Error closing database connections: {e}")
+
     def _ensure_ai_provider(self):
         if self._ai_data_provider is None:
             try:
@@ -371,6 +399,88 @@ class IntegratedDataManager:
     def subscribe_to_ui_updates(self, event_type: str, callback: Callable):
         """Alias dla subscribe_to_updates - kompatybilność z UI komponentami"""
         self.subscribe_to_updates(event_type, callback)
+
+    # === UI FEED (push różnic) ===
+
+    def _feed_setting(self, key: str, default: float) -> float:
+        try:
+            return float(self.config_manager.get_setting("ui", key, default))
+        except Exception:
+            return default
+
+    def subscribe_to_feed(self, callback: Callable[[FeedDiff], Any]):
+        """Rejestruje odbiorcę różnic feedu UI (wywoływany w wątku pętli asyncio)."""
+        self.ui_feed.subscribe(callback)
+        logger.info("UI subscribed to data feed")
+
+    def unsubscribe_from_feed(self, callback: Callable[[FeedDiff], Any]):
+        """Wyrejestrowuje odbiorcę feedu UI"""
+        self.ui_feed.unsubscribe(callback)
+
+    def get_feed_snapshot(self) -> FeedDiff:
+        """Pełna ostatnia migawka feedu - stan początkowy dla nowego widgetu"""
+        return self._feed_state.snapshot()
+
+    async def refresh_ui_feed(self) -> FeedDiff:
+        """Buduje migawkę danych UI raz dla wszystkich widgetów i publikuje różnice."""
+        bots: Dict[str, Dict[str, Any]] = {}
+        for bot in await self.get_bots_data():
+            record = normalize_bot(bot)
+            if record:
+                bots[record['id']] = record
+
+        portfolio = await self.get_portfolio_data()
+        positions: Dict[str, Dict[str, Any]] = {}
+        portfolio_summary = None
+        if portfolio:
+            portfolio_summary = {k: v for k, v in portfolio.items() if k != 'positions'}
+            for position in portfolio.get('positions') or []:
+                record = as_record(position)
+                symbol = record.get('symbol')
+                if symbol:
+                    positions[str(symbol)] = record
+
+        balances: Dict[str, Dict[str, Any]] = {}
+        balance_data = await self.get_balance_data()
+        if isinstance(balance_data, dict):
+            for asset, balance in balance_data.items():
+                if isinstance(balance, dict):
+                    balances[str(asset)] = dict(balance)
+
+        trades = await self.get_recent_trades(50)
+
+        diff = self._feed_state.diff(
+            bots=bots,
+            positions=positions,
+            balances=balances,
+            trades=trades or [],
+            portfolio=portfolio_summary,
+        )
+        self.ui_feed.publish(diff)
+        return diff
+
+    def _publish_bot_records(self, bots: Any):
+        """Wypycha do feedu rekordy botów zmienione poza cyklem feedu."""
+        records = {}
+        for bot in bots or []:
+            record = normalize_bot(bot)
+            if record:
+                records[record['id']] = record
+        if records:
+            self.ui_feed.publish(self._feed_state.diff(bots=records, partial=True))
+
+    async def _ui_feed_loop(self):
+        """Pętla feedu UI - liczy różnice tylko, gdy ktoś subskrybuje"""
+        while self.initialized:
+            try:
+                if self.ui_feed.has_subscribers:
+                    await self.refresh_ui_feed()
+                await asyncio.sleep(self.ui_feed_interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in UI feed loop: {e}")
+                await asyncio.sleep(self.ui_feed_interval * 5)
     
     async def get_dashboard_data(self) -> Dict[str, Any]:
         """Pobiera dane dla Dashboard widget wraz z telemetrią i metrykami portfela."""
@@ -856,6 +966,7 @@ class IntegratedDataManager:
             # Powiadom UI o zmianie statusu
             bot_data = await self.get_bot_management_data()
             await self._notify_ui_callbacks('bot_status_update', bot_data)
+            self._publish_bot_records(bot_data.get('bots') if bot_data else None)
             
         except Exception as e:
             logger.error(f"Error updating bot status: {e}")
@@ -1697,6 +1808,18 @@ class IntegratedDataManager:
             logger.error(f"Error getting logs: {e}")
             return []
     
+    async def get_logs_page(self, cursor: Optional[str] = None, limit: int = 200,
+                            level: str = None) -> Dict[str, Any]:
+        """Strona logów z kursorem do starszych wpisów - delegacja do data_manager"""
+        try:
+            if self.data_manager is None:
+                logger.warning("data_manager is None, returning empty logs page")
+                return {'items': [], 'next_cursor': None}
+            return await self.data_manager.get_logs_page(cursor=cursor, limit=limit, level=level)
+        except Exception as e:
+            logger.error(f"Error getting logs page: {e}")
+            return {'items': [], 'next_cursor': None}
+    
     async def get_alerts(self, limit: int = 50, unread_only: bool = False) -> List[AlertEntry]:
         """Pobiera alerty z systemu - delegacja do data_manager"""
         try:
@@ -1740,8 +1863,15 @@ def get_integrated_data_manager() -> IntegratedDataManager:
                 # We're in an async context; schedule initialization
                 schedule_coro_safely(lambda: _integrated_data_manager.initialize())
             except RuntimeError:
-                # No running loop; run initialization synchronously
-                asyncio.run(_integrated_data_manager.initialize())
+                # No running loop; run initialization synchronously. Połączenia
+                # otwarte w tej krótkotrwałej pętli są zamykane przed jej końcem
+                async def _initialize_detached():
+                    try:
+                        await _integrated_data_manager.initialize()
+                    finally:
+                        await _integrated_data_manager._close_database_connections()
+
+                asyncio.run(_initialize_detached())
         except Exception as e:
             logger.error(f"Failed to initialize IntegratedDataManager: {e}")
         
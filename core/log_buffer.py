@@ -0,0 +1,273 @@
+"""Bufor logów dla widoku logów UI.
+
+Pierścieniowy bufor ostatnich ``capacity`` wpisów z indeksami po poziomie,
+typie i bocie. Każdy wpis dostaje rosnący numer sekwencyjny (``seq``), więc
+widok trzyma tylko listę numerów widocznych wierszy: nowe wpisy są
+dopisywane, wypchnięte z bufora - odcinane, a zmiana filtra przegląda
+wyłącznie indeks najbardziej selektywnego kryterium zamiast całej historii.
+"""
+from __future__ import annotations
+
+import threading
+from collections import Counter, defaultdict, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from core.ui_feed import as_record
+
+# Klucz indeksu dla wpisów bez bota
+SYSTEM_BOT = '__system__'
+
+ALL = "Wszystkie"
+
+PERIODS = {
+    "Ostatnia godzina": timedelta(hours=1),
+    "Ostatnie 24h": timedelta(days=1),
+    "Ostatni tydzień": timedelta(weeks=1),
+    "Ostatni miesiąc": timedelta(days=30),
+}
+
+
+def _parse_timestamp(value: Any) -> datetime:
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return datetime.now()
+    if not isinstance(value, datetime):
+        return datetime.now()
+    if value.tzinfo is not None:
+        # Porównania z datetime.now() wymagają czasu lokalnego bez strefy
+        value = value.astimezone().replace(tzinfo=None)
+    return value
+
+
+def normalize_log(entry: Any) -> Dict[str, Any]:
+    """Ujednolica wpis (``LogEntry``, dict z bazy lub UI) do formatu widoku."""
+    record = as_record(entry) if not isinstance(entry, dict) else dict(entry)
+    record['timestamp'] = _parse_timestamp(record.get('timestamp'))
+    record['level'] = str(record.get('level') or 'INFO').upper()
+    record['type'] = str(record.get('type') or 'SYSTEM').upper()
+    bot_id = record.get('bot_id')
+    record['bot_id'] = str(bot_id) if bot_id not in (None, '') else None
+    record['message'] = str(record.get('message') or '')
+    return record
+
+
+def log_key(record: Dict[str, Any]) -> Any:
+    """Klucz deduplikacji: id z bazy albo komplet pól wpisu."""
+    if record.get('id') is not None:
+        return ('id', record['id'])
+    return (record['timestamp'], record['level'], record['bot_id'], record['message'])
+
+
+@dataclass(frozen=True, slots=True)
+class LogQuery:
+    """Kryteria filtrowania logów (``None`` = bez ograniczenia)."""
+
+    search: str = ''
+    level: Optional[str] = None
+    type: Optional[str] = None
+    bot: Optional[str] = None
+    since: Optional[datetime] = None
+
+    @classmethod
+    def from_filters(cls, filters: Dict[str, str], now: Optional[datetime] = None) -> 'LogQuery':
+        """Buduje zapytanie z wartości ``LogFilterWidget.get_filters()``."""
+        bot = filters.get('bot') or ALL
+        if bot == ALL:
+            bot = None
+        elif bot == "System":
+            bot = SYSTEM_BOT
+        else:
+            bot = bot.replace("Bot #", "")
+        period = PERIODS.get(filters.get('period') or ALL)
+        level = filters.get('level') or ALL
+        log_type = filters.get('type') or ALL
+        return cls(
+            search=(filters.get('search') or '').lower(),
+            level=None if level == ALL else level,
+            type=None if log_type == ALL else log_type,
+            bot=bot,
+            since=(now or datetime.now()) - period if period else None,
+        )
+
+    def index_terms(self) -> List[Tuple[str, str]]:
+        terms = [('level', self.level), ('type', self.type), ('bot', self.bot)]
+        return [(kind, value) for kind, value in terms if value is not None]
+
+    def matches(self, record: Dict[str, Any]) -> bool:
+        if self.level is not None and record['level'] != self.level:
+            return False
+        if self.type is not None and record['type'] != self.type:
+            return False
+        if self.bot is not None and (record['bot_id'] or SYSTEM_BOT) != self.bot:
+            return False
+        if self.since is not None and record['timestamp'] < self.since:
+            return False
+        if self.search and self.search not in record['message'].lower():
+            return False
+        return True
+
+
+@dataclass(slots=True)
+class LogSelection:
+    """Wynik filtrowania: rosnące ``seq`` pasujących wpisów i zakres bufora w chwili odczytu."""
+
+    rows: List[int]
+    first_seq: int
+    last_seq: int
+    levels: Counter = field(default_factory=Counter)
+
+
+class LogBuffer:
+    """Pierścieniowy bufor wpisów z indeksami ``level``/``type``/``bot``.
+
+    Sloty przechowują pary ``(seq, wpis)``, dzięki czemu ``select`` może
+    działać w wątku roboczym bez trzymania blokady - wpis nadpisany w trakcie
+    filtrowania jest rozpoznawany po niezgodnym ``seq`` i pomijany.
+    """
+
+    def __init__(self, capacity: int = 100_000) -> None:
+        self.capacity = max(1, int(capacity))
+        self._slots: List[Optional[Tuple[int, Dict[str, Any]]]] = [None] * self.capacity
+        self._first = 0
+        self._next = 0
+        self._lock = threading.Lock()
+        self._indexes: Dict[str, Dict[str, Deque[int]]] = {
+            'level': defaultdict(deque), 'type': defaultdict(deque), 'bot': defaultdict(deque),
+        }
+        self._keys: Dict[Any, int] = {}
+
+    def __len__(self) -> int:
+        return self._next - self._first
+
+    @property
+    def first_seq(self) -> int:
+        return self._first
+
+    @property
+    def last_seq(self) -> int:
+        """Numer najnowszego wpisu (``first_seq - 1`` dla pustego bufora)."""
+        return self._next - 1
+
+    @property
+    def is_full(self) -> bool:
+        return len(self) >= self.capacity
+
+    def get(self, seq: int) -> Optional[Dict[str, Any]]:
+        slot = self._slots[seq % self.capacity]
+        if slot is None or slot[0] != seq:
+            return None
+        return slot[1]
+
+    def append(self, records: Iterable[Dict[str, Any]]) -> Tuple[List[int], List[Tuple[int, Dict[str, Any]]]]:
+        """Dopisuje nowe wpisy (w kolejności chronologicznej).
+
+        Zwraca ``(dodane_seq, wypchnięte)``, gdzie ``wypchnięte`` to pary
+        ``(seq, wpis)`` usunięte z początku bufora; duplikaty są pomijane.
+        """
+        added: List[int] = []
+        evicted: List[Tuple[int, Dict[str, Any]]] = []
+        with self._lock:
+            for record in records:
+                key = log_key(record)
+                if key in self._keys:
+                    continue
+                if len(self) >= self.capacity:
+                    evicted.append(self._evict_oldest())
+                seq = self._next
+                self._next += 1
+                self._store(seq, key, record, newest=True)
+                added.append(seq)
+        return added, evicted
+
+    def prepend(self, records: Iterable[Dict[str, Any]]) -> List[int]:
+        """Dokłada starsze wpisy (od najnowszego do najstarszego) przed początkiem bufora.
+
+        Zatrzymuje się, gdy bufor jest pełny - starsza historia nie wypiera
+        nowszej. Zwraca dodane ``seq`` (malejąco).
+        """
+        added: List[int] = []
+        with self._lock:
+            for record in records:
+                if len(self) >= self.capacity:
+                    break
+                key = log_key(record)
+                if key in self._keys:
+                    continue
+                self._first -= 1
+                self._store(self._first, key, record, newest=False)
+                added.append(self._first)
+        return added
+
+    def select(self, query: LogQuery) -> LogSelection:
+        """Zwraca wpisy pasujące do ``query`` (bezpieczne w wątku roboczym)."""
+        with self._lock:
+            first, last = self._first, self._next - 1
+            candidates = None
+            for kind, value in query.index_terms():
+                seqs = self._indexes[kind].get(value)
+                if not seqs:
+                    return LogSelection([], first, last)
+                if candidates is None or len(seqs) < len(candidates):
+                    candidates = seqs
+            candidates = list(candidates) if candidates is not None else range(first, last + 1)
+
+        selection = LogSelection([], first, last)
+        for seq in candidates:
+            record = self.get(seq)
+            if record is not None and query.matches(record):
+                selection.rows.append(seq)
+                selection.levels[record['level']] += 1
+        return selection
+
+    def clear(self) -> None:
+        with self._lock:
+            self._slots = [None] * self.capacity
+            self._first = self._next
+            for index in self._indexes.values():
+                index.clear()
+            self._keys.clear()
+
+    def _store(self, seq: int, key: Any, record: Dict[str, Any], newest: bool) -> None:
+        self._slots[seq % self.capacity] = (seq, record)
+        self._keys[key] = seq
+        for kind, value in self._index_values(record):
+            if newest:
+                self._indexes[kind][value].append(seq)
+            else:
+                self._indexes[kind][value].appendleft(seq)
+
+    def _evict_oldest(self) -> Tuple[int, Dict[str, Any]]:
+        seq = self._first
+        _, record = self._slots[seq % self.capacity]
+        self._slots[seq % self.capacity] = None
+        self._first += 1
+        self._keys.pop(log_key(record), None)
+        for kind, value in self._index_values(record):
+            # Najstarszy wpis jest zawsze na początku swoich indeksów
+            index = self._indexes[kind][value]
+            index.popleft()
+            if not index:
+                del self._indexes[kind][value]
+        return seq, record
+
+    @staticmethod
+    def _index_values(record: Dict[str, Any]) -> Tuple[Tuple[str, str], ...]:
+        return (
+            ('level', record['level']),
+            ('type', record['type']),
+            ('bot', record['bot_id'] or SYSTEM_BOT),
+        )
+
+
+__all__ = [
+    'LogBuffer',
+    'LogQuery',
+    'LogSelection',
+    'SYSTEM_BOT',
+    'log_key',
+    'normalize_log',
+]
@@ -14,9 +14,11 @@ import json
 import os
 import random
 import threading
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Callable, Tuple, Set
+from urllib.parse import urlsplit
 from dataclasses import dataclass
 
 try:  # pragma: no cover - optional dependency in CI
@@ -24,15 +26,13 @@ try:  # pragma: no cover - optional dependency in CI
 except Exception:  # pragma: no cover - fallback used in tests
     websocket = None  # type: ignore
 
-try:  # pragma: no cover - optional dependency
-    import requests  # type: ignore
-except Exception:  # pragma: no cover - handled by mock helpers
-    requests = None
-
 from app.exchange.adapter_factory import create_exchange_adapter
 from app.exchange.live_ccxt_adapter import LiveCCXTAdapter
+from utils.async_http import HttpStatusError, close_http_client, get_http_client, http_available
+from utils.candle_store import CandleStore, OHLCVArrays, get_candle_store
 from utils.config_manager import get_config_manager
 from utils.helpers import get_or_create_event_loop, schedule_coro_safely
+from utils.indicators import timeframe_to_ms
 
 try:  # pragma: no cover - opcjonalny moduł (może nie istnieć w środowisku CI)
     from app.api_config_manager import get_api_config_manager
@@ -80,11 +80,31 @@ class MarketDataManager:
         self.price_cache: Dict[str, PriceData] = {}
         self.orderbook_cache: Dict[str, OrderBookData] = {}
         self.candle_cache: Dict[str, List[Dict[str, Any]]] = {}
+        # Magazyn zamkniętych świec na dysku (włączany przez CANDLE_STORE_DIR
+        # lub attach_candle_store); zastępuje wtedy candle_cache
+        self.candle_store: Optional[CandleStore] = (
+            get_candle_store() if os.environ.get('CANDLE_STORE_DIR') else None
+        )
+        self._forming_candles: Dict[str, Tuple[float, Dict[str, Any]]] = {}
         self.websocket_connections: Dict[str, Any] = {}
         self._websocket_threads: Dict[str, threading.Thread] = {}
         self.running = False
         self.update_interval = 1.0  # sekundy
 
+        # Polling cen: jedno żądanie "all tickers" zamiast zapytania per symbol
+        self.batch_polling = True
+        self.poll_concurrency = 8  # limit równoległych zapytań w trybie fallback
+        self.all_tickers_threshold = 40  # powyżej tej liczby symboli pobierz wszystkie tickery
+        self.poll_stats: Dict[str, Any] = {
+            'cycles': 0,
+            'last_cycle_ms': 0.0,
+            'avg_cycle_ms': 0.0,
+            'max_cycle_ms': 0.0,
+            'last_mode': None,
+            'last_symbols': 0,
+            'last_updated': 0,
+        }
+
         # Symbole do śledzenia
         self.tracked_symbols = ['BTCUSDT', 'ETHUSDT', 'ADAUSDT', 'SOLUSDT']
 
@@ -377,6 +397,9 @@ class MarketDataManager:
                 if thread and thread.is_alive():  # pragma: no cover - requires live ws
                     thread.join(timeout=2.0)
 
+            # Zwolnij pulę połączeń HTTP przypisaną do bieżącej pętli
+            await close_http_client()
+
             logger.info("MarketDataManager stopped")
 
         except Exception as e:
@@ -509,6 +532,22 @@ class MarketDataManager:
             logger.error(f"Error getting orderbook for {symbol}: {e}")
             return None
 
+    def attach_candle_store(self, store: Optional[CandleStore]) -> None:
+        """Włącza (lub wyłącza przez ``None``) dyskowy magazyn świec."""
+        self.candle_store = store
+        self._forming_candles.clear()
+
+    def get_candle_arrays(
+        self,
+        symbol: str,
+        timeframe: str = "1m",
+        start: Optional[Any] = None,
+        end: Optional[Any] = None,
+    ) -> OHLCVArrays:
+        """Zapisane świece ``[start, end)`` jako kolumnowy widok mmap (bez kopiowania)."""
+        store = self.candle_store or get_candle_store()
+        return store.read(symbol, timeframe, start, end)
+
     async def fetch_candles(
         self,
         symbol: str,
@@ -520,8 +559,14 @@ class MarketDataManager:
 
         Preferuje połączenie CCXT, następnie publiczne REST API Binance, a na
         końcu generuje stabilny fallback na podstawie lokalnego cache'u.
+        Z dołączonym ``candle_store`` pobierane są tylko brakujące świece.
         """
 
+        if self.candle_store is not None:
+            stored = await self._fetch_candles_stored(symbol, timeframe, limit)
+            if stored:
+                return stored
+
         cache_key = f"{symbol}:{timeframe}:{limit}"
         cached = self.candle_cache.get(cache_key)
         if cached and cached and (
@@ -529,6 +574,87 @@ class MarketDataManager:
         ):
             return cached
 
+        candles = await self._download_candles(symbol, timeframe, limit)
+
+        # 3. Generuj fallback gdy brak zewnętrznych danych
+        if not candles:
+            candles = self._generate_mock_candles(symbol, limit)
+
+        self.candle_cache[cache_key] = candles
+        return candles
+
+    async def _fetch_candles_stored(self, symbol: str, timeframe: str, limit: int) -> List[Dict[str, Any]]:
+        """Świece z magazynu uzupełnione o brakujące zamknięte świece i bieżącą (formującą się).
+
+        Zamknięte świece trafiają do magazynu, formująca się jest trzymana w
+        pamięci przez 30 s. Przy luce dłuższej niż ``limit`` pobierane jest
+        tylko ostatnie ``limit`` świec. Gdy magazyn ma krótszą historię niż
+        ``limit`` (a dopisuje tylko nowsze świece), zwracane jest pełne pobranie.
+        """
+        store = self.candle_store
+        tf_ms = timeframe_to_ms(timeframe)
+        forming_start = int(time.time() * 1000) // tf_ms * tf_ms
+        key = f"{symbol}:{timeframe}"
+        last = store.last_timestamp(symbol, timeframe)
+        forming = self._forming_candles.get(key)
+        up_to_date = last is not None and last >= forming_start - tf_ms
+        fresh = (
+            forming is not None
+            and time.monotonic() - forming[0] < 30.0
+            and int(forming[1]["timestamp"].timestamp() * 1000) >= forming_start
+        )
+
+        history_short = store.length(symbol, timeframe) + 1 < limit
+        if history_short or not (up_to_date and fresh):
+            if last is None or history_short:
+                fetch_limit = limit
+            else:
+                fetch_limit = max(1, min(limit, (forming_start - last) // tf_ms))
+            downloaded = await self._download_candles(symbol, timeframe, fetch_limit)
+            closed = []
+            for candle in downloaded:
+                if int(candle["timestamp"].timestamp() * 1000) < forming_start:
+                    closed.append(candle)
+                else:
+                    self._forming_candles[key] = (time.monotonic(), candle)
+            if closed:
+                try:
+                    store.append(symbol, timeframe, closed)
+                except OSError as exc:
+                    logger.warning("Candle store append failed for %s: %s", key, exc)
+                    return downloaded
+            if history_short and downloaded:
+                return downloaded
+
+        forming = self._forming_candles.get(key)
+        if forming is not None and int(forming[1]["timestamp"].timestamp() * 1000) < forming_start:
+            forming = None
+        tail = store.tail(symbol, timeframe, limit - (1 if forming else 0))
+        candles = self._candles_from_arrays(symbol, tail)
+        if forming is not None:
+            candles.append(forming[1])
+        return candles
+
+    @staticmethod
+    def _candles_from_arrays(symbol: str, arrays: OHLCVArrays) -> List[Dict[str, Any]]:
+        return [
+            {
+                "symbol": symbol,
+                "timestamp": datetime.fromtimestamp(t / 1000.0),
+                "open": o,
+                "high": h,
+                "low": l,
+                "close": c,
+                "volume": v,
+            }
+            for t, o, h, l, c, v in zip(
+                arrays.t.tolist(), arrays.o.tolist(), arrays.h.tolist(),
+                arrays.l.tolist(), arrays.c.tolist(), arrays.v.tolist(),
+            )
+        ]
+
+    async def _download_candles(self, symbol: str, timeframe: str, limit: int) -> List[Dict[str, Any]]:
+        """Świece z CCXT lub REST API Binance; pusta lista gdy oba źródła zawiodą."""
         candles: List[Dict[str, Any]] = []
 
         # 1. Spróbuj użyć adaptera CCXT jeżeli jest dostępny
@@ -554,105 +680,181 @@ class MarketDataManager:
                 logger.debug("CCXT fetch_ohlcv failed for %s: %s", symbol, exc)
 
         # 2. Publiczne REST API Binance jako fallback
-        if not candles and self.exchanges.get("binance", {}).get("enabled") and requests:
+        if not candles and self.exchanges.get("binance", {}).get("enabled") and http_available():
             try:
-                url = f"{self.exchanges['binance']['rest_url']}/klines"
-                params = {"symbol": symbol, "interval": timeframe, "limit": limit}
-                response = requests.get(url, params=params, timeout=5)  # type: ignore[operator]
-                if response.status_code == 200:
-                    data = response.json()
-                    candles = [
-                        {
-                            "symbol": symbol,
-                            "timestamp": datetime.fromtimestamp(int(item[0]) / 1000.0),
-                            "open": float(item[1]),
-                            "high": float(item[2]),
-                            "low": float(item[3]),
-                            "close": float(item[4]),
-                            "volume": float(item[5]),
-                        }
-                        for item in data
-                    ]
-                else:
-                    logger.debug(
-                        "Binance klines request failed (%s): %s",
-                        response.status_code,
-                        response.text[:200],
-                    )
+                data = await self._binance_get_json(
+                    "/klines", {"symbol": symbol, "interval": timeframe, "limit": limit}
+                )
+                candles = [
+                    {
+                        "symbol": symbol,
+                        "timestamp": datetime.fromtimestamp(int(item[0]) / 1000.0),
+                        "open": float(item[1]),
+                        "high": float(item[2]),
+                        "low": float(item[3]),
+                        "close": float(item[4]),
+                        "volume": float(item[5]),
+                    }
+                    for item in data
+                ]
+            except HttpStatusError as exc:
+                logger.debug("Binance klines request failed (%s): %s", exc.status, exc.response.text[:200])
             except Exception as exc:
                 logger.debug("Binance klines fetch failed for %s: %s", symbol, exc)
 
-        # 3. Generuj fallback gdy brak zewnętrznych danych
-        if not candles:
-            candles = self._generate_mock_candles(symbol, limit)
-
-        self.candle_cache[cache_key] = candles
         return candles
-    
+
     async def _price_update_loop(self):
         """Pętla aktualizacji cen"""
         while self.running:
             try:
-                # Aktualizuj ceny dla wszystkich śledzonych symboli
-                for symbol in self.tracked_symbols:
-                    price_data = await self._fetch_price_from_api(symbol)
-                    if price_data:
-                        self.price_cache[symbol] = price_data
-                        
-                        # Powiadom subskrybentów
-                        if symbol in self.subscriptions:
-                            for callback in self.subscriptions[symbol]:
-                                try:
-                                    callback(price_data)
-                                except Exception as e:
-                                    logger.error(f"Error in price callback for {symbol}: {e}")
-                
-                await asyncio.sleep(self.update_interval)
+                started = time.monotonic()
+                await self.poll_prices_once()
+                elapsed = time.monotonic() - started
+                await asyncio.sleep(max(0.0, self.update_interval - elapsed))
                 
             except Exception as e:
                 logger.error(f"Error in price update loop: {e}")
                 await asyncio.sleep(5)  # Czekaj dłużej przy błędzie
+
+    async def poll_prices_once(self) -> Dict[str, PriceData]:
+        """Jeden cykl odpytywania cen dla wszystkich śledzonych symboli.
+
+        Ceny są pobierane zbiorczo, a następnie w jednym przebiegu trafiają do
+        cache i subskrybentów. Czas cyklu jest raportowany w ``poll_stats``.
+        """
+        started = time.monotonic()
+        symbols = list(self.tracked_symbols)
+        prices, mode = await self._fetch_prices_batch(symbols)
+        self._fan_out_prices(prices)
+
+        cycle_ms = (time.monotonic() - started) * 1000.0
+        stats = self.poll_stats
+        stats['cycles'] += 1
+        stats['last_cycle_ms'] = cycle_ms
+        stats['avg_cycle_ms'] += (cycle_ms - stats['avg_cycle_ms']) / stats['cycles']
+        stats['max_cycle_ms'] = max(stats['max_cycle_ms'], cycle_ms)
+        stats['last_mode'] = mode
+        stats['last_symbols'] = len(symbols)
+        stats['last_updated'] = len(prices)
+        logger.debug("Price poll cycle: %d/%d symbols via %s in %.1f ms", len(prices), len(symbols), mode, cycle_ms)
+        return prices
+
+    def get_poll_stats(self) -> Dict[str, Any]:
+        """Zwraca statystyki cykli odpytywania cen"""
+        return dict(self.poll_stats)
+
+    def _fan_out_prices(self, prices: Dict[str, PriceData]) -> None:
+        """Aktualizuje cache i powiadamia subskrybentów w jednym przebiegu"""
+        for symbol, price_data in prices.items():
+            self.price_cache[symbol] = price_data
+            for callback in self.subscriptions.get(symbol, ()):
+                try:
+                    callback(price_data)
+                except Exception as e:
+                    logger.error(f"Error in price callback for {symbol}: {e}")
+
+    async def _fetch_prices_batch(self, symbols: List[str]) -> Tuple[Dict[str, PriceData], str]:
+        """Pobiera ceny wielu symboli: najpierw zbiorczo, brakujące równolegle."""
+        if not symbols:
+            return {}, 'empty'
+
+        prices: Dict[str, PriceData] = {}
+        mode = 'concurrent'
+        if self.batch_polling:
+            try:
+                if self._live_price_adapter and hasattr(self._live_price_adapter, 'fetch_tickers'):
+                    prices = await self._fetch_tickers_ccxt(symbols)
+                    mode = 'ccxt_fetch_tickers'
+                elif self.exchanges.get('binance', {}).get('enabled') and http_available():
+                    prices = await self._fetch_tickers_binance(symbols)
+                    mode = 'binance_ticker_24hr'
+            except Exception as exc:
+                logger.debug("Batch ticker fetch failed, falling back to per-symbol: %s", exc)
+                prices = {}
+                mode = 'concurrent'
+
+        missing = [symbol for symbol in symbols if symbol not in prices]
+        if missing:
+            semaphore = asyncio.Semaphore(max(1, self.poll_concurrency))
+
+            async def _fetch_one(symbol: str) -> Tuple[str, Optional[PriceData]]:
+                async with semaphore:
+                    return symbol, await self._fetch_price_from_api(symbol)
+
+            for symbol, price_data in await asyncio.gather(*(_fetch_one(s) for s in missing)):
+                if price_data:
+                    prices[symbol] = price_data
+            if mode != 'concurrent':
+                mode = f"{mode}+concurrent"
+        return prices, mode
+
+    async def _fetch_tickers_ccxt(self, symbols: List[str]) -> Dict[str, PriceData]:
+        ccxt_symbols = {self._normalise_symbol_for_ccxt(symbol): symbol for symbol in symbols}
+        tickers = await self._live_price_adapter.fetch_tickers(list(ccxt_symbols))
+        prices: Dict[str, PriceData] = {}
+        for ccxt_symbol, ticker in (tickers or {}).items():
+            symbol = ccxt_symbols.get(ccxt_symbol)
+            if symbol and isinstance(ticker, dict):
+                prices[symbol] = self._price_from_ccxt_ticker(symbol, ticker)
+        return prices
+
+    async def _fetch_tickers_binance(self, symbols: List[str]) -> Dict[str, PriceData]:
+        wanted = set(symbols)
+        if len(symbols) > self.all_tickers_threshold:
+            params: Dict[str, Any] = {}
+        else:
+            params = {'symbols': json.dumps(symbols, separators=(',', ':'))}
+        data = await self._binance_get_json('/ticker/24hr', params)
+        prices: Dict[str, PriceData] = {}
+        for item in data if isinstance(data, list) else [data]:
+            symbol = item.get('symbol')
+            if symbol in wanted:
+                prices[symbol] = self._price_from_binance_ticker(symbol, item)
+        return prices
+
+    @staticmethod
+    def _price_from_ccxt_ticker(symbol: str, ticker: Dict[str, Any]) -> PriceData:
+        return PriceData(
+            symbol=symbol,
+            price=float(ticker.get('last') or ticker.get('close') or ticker.get('ask') or 0.0),
+            bid=float(ticker.get('bid') or ticker.get('ask') or 0.0),
+            ask=float(ticker.get('ask') or ticker.get('bid') or 0.0),
+            volume_24h=float(ticker.get('baseVolume') or ticker.get('quoteVolume') or 0.0),
+            change_24h=float(ticker.get('change') or (ticker.get('percentage') or 0.0) * 0.01),
+            change_24h_percent=float(ticker.get('percentage') or 0.0),
+            timestamp=datetime.now(),
+        )
+
+    @staticmethod
+    def _price_from_binance_ticker(symbol: str, data: Dict[str, Any]) -> PriceData:
+        return PriceData(
+            symbol=symbol,
+            price=float(data['lastPrice']),
+            bid=float(data['bidPrice']),
+            ask=float(data['askPrice']),
+            volume_24h=float(data['volume']),
+            change_24h=float(data['priceChange']),
+            change_24h_percent=float(data['priceChangePercent']),
+            timestamp=datetime.now()
+        )
     
     async def _fetch_price_from_api(self, symbol: str) -> Optional[PriceData]:
         """Pobiera cenę z API Binance"""
         try:
             if self._live_price_adapter:
                 ticker = await self._live_price_adapter.fetch_ticker(symbol)
-                return PriceData(
-                    symbol=symbol,
-                    price=float(ticker.get('last') or ticker.get('close') or ticker.get('ask') or 0.0),
-                    bid=float(ticker.get('bid') or ticker.get('ask') or 0.0),
-                    ask=float(ticker.get('ask') or ticker.get('bid') or 0.0),
-                    volume_24h=float(ticker.get('baseVolume') or ticker.get('quoteVolume') or 0.0),
-                    change_24h=float(ticker.get('change') or ticker.get('percentage', 0.0) * 0.01),
-                    change_24h_percent=float(ticker.get('percentage') or 0.0),
-                    timestamp=datetime.now(),
-                )
+                return self._price_from_ccxt_ticker(symbol, ticker)
 
-            if not self.exchanges.get('binance', {}).get('enabled') or not requests:
+            if not self.exchanges.get('binance', {}).get('enabled') or not http_available():
                 return self._get_mock_price_data(symbol)
 
-            url = f"{self.exchanges['binance']['rest_url']}/ticker/24hr"
-            params = {'symbol': symbol}
-
-            response = requests.get(url, params=params, timeout=5)  # type: ignore[operator]
-            if response.status_code == 200:
-                data = response.json()
+            data = await self._binance_get_json('/ticker/24hr', {'symbol': symbol})
+            return self._price_from_binance_ticker(symbol, data)
 
-                return PriceData(
-                    symbol=symbol,
-                    price=float(data['lastPrice']),
-                    bid=float(data['bidPrice']),
-                    ask=float(data['askPrice']),
-                    volume_24h=float(data['volume']),
-                    change_24h=float(data['priceChange']),
-                    change_24h_percent=float(data['priceChangePercent']),
-                    timestamp=datetime.now()
-                )
-            else:
-                logger.warning(f"API request failed for {symbol}: {response.status_code}")
-                return self._get_mock_price_data(symbol)
-                
+        except HttpStatusError as e:
+            logger.warning(f"API request failed for {symbol}: {e.status}")
+            return self._get_mock_price_data(symbol)
         except Exception as e:
             logger.error(f"Error fetching price for {symbol}: {e}")
             return self._get_mock_price_data(symbol)
@@ -671,32 +873,39 @@ class MarketDataManager:
                     timestamp=datetime.now(),
                 )
 
-            if not self.exchanges.get('binance', {}).get('enabled') or not requests:
+            if not self.exchanges.get('binance', {}).get('enabled') or not http_available():
                 return self._get_mock_orderbook_data(symbol)
 
-            url = f"{self.exchanges['binance']['rest_url']}/depth"
-            params = {'symbol': symbol, 'limit': depth}
+            data = await self._binance_get_json('/depth', {'symbol': symbol, 'limit': depth})
 
-            response = requests.get(url, params=params, timeout=5)  # type: ignore[operator]
-            if response.status_code == 200:
-                data = response.json()
-                
-                bids = [(float(bid[0]), float(bid[1])) for bid in data['bids']]
-                asks = [(float(ask[0]), float(ask[1])) for ask in data['asks']]
-                
-                return OrderBookData(
-                    symbol=symbol,
-                    bids=bids,
-                    asks=asks,
-                    timestamp=datetime.now()
-                )
-            else:
-                return self._get_mock_orderbook_data(symbol)
-                
+            bids = [(float(bid[0]), float(bid[1])) for bid in data['bids']]
+            asks = [(float(ask[0]), float(ask[1])) for ask in data['asks']]
+
+            return OrderBookData(
+                symbol=symbol,
+                bids=bids,
+                asks=asks,
+                timestamp=datetime.now()
+            )
+
+        except HttpStatusError:
+            return self._get_mock_orderbook_data(symbol)
         except Exception as e:
             logger.error(f"Error fetching orderbook for {symbol}: {e}")
             return self._get_mock_orderbook_data(symbol)
     
+    async def _binance_get_json(self, path: str, params: Dict[str, Any]) -> Any:
+        """GET do publicznego REST API Binance przez współdzielony klient HTTP.
+
+        Żądanie przechodzi przez ``net_guard`` (limit ``binance:rest:/api/v3<path>``),
+        a połączenia są utrzymywane w puli keep-alive - pętla nie jest blokowana.
+        """
+        base_url = self.exchanges['binance']['rest_url']
+        guard_path = urlsplit(base_url).path + ('/ticker' if path.startswith('/ticker') else path)
+        return await get_http_client().get_json(
+            f"{base_url}{path}", params=params, guard=f"binance:rest:{guard_path}"
+        )
+
     async def _start_binance_websocket(self):
         """Uruchamia WebSocket dla Binance"""
         try:
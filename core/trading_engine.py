@@ -266,6 +266,9 @@ class TradingEngine:
             except Exception:
                 return float(default)
 
+        # Zlecenie czeka na miejsce w limicie najwyżej max_wait sekund, potem jest odrzucane
+        self.rate_limit_max_wait = max(as_float(config.get("max_wait", 5.0), 5.0), 0.0)
+
         global_cfg = config.get("global") or {}
         global_limit = max(as_int(global_cfg.get("limit", 60), 60), 1)
         global_period = max(as_float(global_cfg.get("period", 60.0), 60.0), 1.0)
@@ -304,15 +307,19 @@ class TradingEngine:
                 warning_threshold=as_float(warning, global_warning),
             )
 
-    def _enforce_rate_limits(self, request: OrderRequest) -> None:
+    async def _acquire_rate_limits(self, request: OrderRequest) -> None:
         metadata = {
             "symbol": request.symbol,
             "side": request.side.value,
             "client_order_id": request.client_order_id,
         }
-        self.rate_limiter.check("global", metadata=metadata)
-        self.rate_limiter.check("symbol:*", metadata=metadata)
-        self.rate_limiter.check(f"symbol:{request.symbol}", metadata=metadata)
+        # Wszystkie zakresy albo żaden - odrzucone zlecenie nie zużywa limitu globalnego
+        await self.rate_limiter.acquire_all(
+            ("global", "symbol:*", f"symbol:{request.symbol}"),
+            metadata=metadata,
+            lane="order",
+            max_wait=self.rate_limit_max_wait,
+        )
 
     def _build_rate_limited_response(self, request: OrderRequest, exc: RateLimitExceeded) -> OrderResponse:
         metadata = dict(request.metadata or {})
@@ -405,7 +412,7 @@ class TradingEngine:
         normalised = self._normalise_order_payload(payload)
 
         try:
-            self._enforce_rate_limits(normalised)
+            await self._acquire_rate_limits(normalised)
         except RateLimitExceeded as exc:
             logger.warning("Order rejected due to rate limit: %s", exc)
             response = self._build_rate_limited_response(normalised, exc)
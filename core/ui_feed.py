@@ -0,0 +1,311 @@
+"""Push-based feed danych dla UI.
+
+Zamiast tego, by każdy widget co kilka sekund odpytywał
+``IntegratedDataManager`` o pełny payload, manager raz na cykl buduje
+migawkę (boty, pozycje, salda, transakcje, portfel), porównuje ją z
+poprzednią i wypycha subskrybentom wyłącznie różnice. ``FeedPublisher``
+łączy kolejne różnice i dostarcza je najwyżej ``max_fps`` razy na sekundę,
+więc koszt po stronie GUI nie rośnie z liczbą otwartych widgetów.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field, is_dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Sekcje z rekordami identyfikowanymi kluczem (id bota, symbol, aktywo)
+KEYED_SECTIONS = ('bots', 'positions', 'balances')
+
+# Pola zmieniające się przy każdym odczycie - nie są traktowane jako zmiana
+VOLATILE_KEYS = frozenset({'last_updated', 'timestamp_fetched'})
+
+
+@dataclass(slots=True)
+class FeedDiff:
+    """Różnica między kolejnymi migawkami danych UI.
+
+    ``bots``/``positions``/``balances`` zawierają tylko zmienione lub nowe
+    rekordy, ``*_removed`` - klucze rekordów, które zniknęły. ``trades`` to
+    nowe transakcje (najnowsze pierwsze), ``portfolio`` jest ustawiony tylko
+    wtedy, gdy podsumowanie portfela się zmieniło. ``full=True`` oznacza
+    pełną migawkę (np. dla nowo podłączonego widgetu).
+    """
+
+    seq: int = 0
+    full: bool = False
+    bots: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    bots_removed: List[str] = field(default_factory=list)
+    positions: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    positions_removed: List[str] = field(default_factory=list)
+    balances: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    balances_removed: List[str] = field(default_factory=list)
+    trades: List[Dict[str, Any]] = field(default_factory=list)
+    portfolio: Optional[Dict[str, Any]] = None
+
+    def is_empty(self) -> bool:
+        if self.trades or self.portfolio is not None:
+            return False
+        return not any(
+            getattr(self, section) or getattr(self, f'{section}_removed')
+            for section in KEYED_SECTIONS
+        )
+
+    def merge(self, newer: 'FeedDiff') -> None:
+        """Dołącza nowszą różnicę (nowsze wartości wygrywają)."""
+        for section in KEYED_SECTIONS:
+            changed: Dict[str, Dict[str, Any]] = getattr(self, section)
+            removed: List[str] = getattr(self, f'{section}_removed')
+            for key in getattr(newer, f'{section}_removed'):
+                changed.pop(key, None)
+                if key not in removed:
+                    removed.append(key)
+            for key, record in getattr(newer, section).items():
+                if key in removed:
+                    removed.remove(key)
+                changed[key] = record
+        if newer.trades:
+            self.trades = list(newer.trades) + self.trades
+        if newer.portfolio is not None:
+            self.portfolio = newer.portfolio
+        self.full = self.full or newer.full
+
+
+def as_record(value: Any) -> Dict[str, Any]:
+    """Zamienia dataclass/obiekt na słownik z prostymi wartościami."""
+    if isinstance(value, dict):
+        record = dict(value)
+    elif is_dataclass(value) and not isinstance(value, type):
+        record = asdict(value)
+    elif hasattr(value, '__dict__'):
+        record = {k: v for k, v in vars(value).items() if not k.startswith('_')}
+    else:
+        return {'value': value}
+    for key, item in record.items():
+        if isinstance(item, datetime):
+            record[key] = item.isoformat()
+        elif isinstance(item, Enum):
+            record[key] = item.value
+    return record
+
+
+def normalize_bot(bot: Any) -> Optional[Dict[str, Any]]:
+    """Ujednolica rekord bota (``BotData`` lub dict) do formatu widgetów."""
+    try:
+        record = as_record(bot)
+    except Exception:
+        return None
+    bot_id = record.get('id') or record.get('name')
+    if not bot_id:
+        return None
+    record['id'] = str(bot_id)
+    if 'pnl' not in record:
+        record['pnl'] = record.get('profit', 0.0) or 0.0
+    record.setdefault('status', 'stopped')
+    record.setdefault('active', False)
+    record.setdefault('strategy', 'N/A')
+    record.setdefault('symbol', 'N/A')
+    return record
+
+
+def trade_key(trade: Dict[str, Any]) -> Any:
+    """Klucz identyfikujący transakcję (id albo komplet jej pól)."""
+    for name in ('id', 'trade_id', 'order_id'):
+        if trade.get(name):
+            return (name, trade[name])
+    return tuple(
+        trade.get(name)
+        for name in ('timestamp', 'time', 'bot', 'bot_id', 'pair', 'symbol', 'side', 'amount', 'quantity', 'price')
+    )
+
+
+def _same(previous: Optional[Dict[str, Any]], current: Dict[str, Any]) -> bool:
+    if previous is None:
+        return False
+    keys = (set(previous) | set(current)) - VOLATILE_KEYS
+    return all(previous.get(key) == current.get(key) for key in keys)
+
+
+class FeedState:
+    """Ostatnia migawka danych UI i wyznaczanie różnic względem niej."""
+
+    def __init__(self, trade_history: int = 50, trade_memory: int = 1000) -> None:
+        self._lock = threading.Lock()
+        self._sections: Dict[str, Dict[str, Dict[str, Any]]] = {name: {} for name in KEYED_SECTIONS}
+        self._portfolio: Optional[Dict[str, Any]] = None
+        self._trades: Deque[Dict[str, Any]] = deque(maxlen=trade_history)
+        self._seen_order: Deque[Any] = deque()
+        self._seen: Set[Any] = set()
+        self._trade_memory = trade_memory
+        self._seeded = {name: False for name in KEYED_SECTIONS}
+
+    def diff(
+        self,
+        *,
+        bots: Optional[Dict[str, Dict[str, Any]]] = None,
+        positions: Optional[Dict[str, Dict[str, Any]]] = None,
+        balances: Optional[Dict[str, Dict[str, Any]]] = None,
+        trades: Optional[Iterable[Dict[str, Any]]] = None,
+        portfolio: Optional[Dict[str, Any]] = None,
+        partial: bool = False,
+    ) -> FeedDiff:
+        """Porównuje nowe dane z migawką i ją aktualizuje.
+
+        Sekcje przekazane jako ``None`` nie są zmieniane. Przy
+        ``partial=True`` brak rekordu w sekcji nie oznacza jego usunięcia
+        (np. aktualizacja pojedynczego bota).
+        """
+        result = FeedDiff()
+        with self._lock:
+            for section, current in (('bots', bots), ('positions', positions), ('balances', balances)):
+                if current is None:
+                    continue
+                previous = self._sections[section]
+                changed = getattr(result, section)
+                for key, record in current.items():
+                    if not _same(previous.get(key), record):
+                        changed[key] = record
+                        previous[key] = record
+                if not partial:
+                    removed = [key for key in previous if key not in current]
+                    for key in removed:
+                        del previous[key]
+                    getattr(result, f'{section}_removed').extend(removed)
+                self._seeded[section] = True
+
+            if trades is not None:
+                fresh = []
+                for trade in trades:
+                    key = trade_key(trade)
+                    if key in self._seen:
+                        continue
+                    self._remember(key)
+                    fresh.append(trade)
+                if fresh:
+                    # Zakładamy kolejność od najnowszych, jak w get_recent_trades
+                    for trade in reversed(fresh):
+                        self._trades.appendleft(trade)
+                    result.trades = fresh
+
+            if portfolio is not None and not _same(self._portfolio, portfolio):
+                self._portfolio = portfolio
+                result.portfolio = portfolio
+        return result
+
+    def snapshot(self) -> FeedDiff:
+        """Pełna migawka jako ``FeedDiff(full=True)``."""
+        with self._lock:
+            return FeedDiff(
+                full=True,
+                bots=dict(self._sections['bots']),
+                positions=dict(self._sections['positions']),
+                balances=dict(self._sections['balances']),
+                trades=list(self._trades),
+                portfolio=self._portfolio,
+            )
+
+    @property
+    def is_seeded(self) -> bool:
+        return any(self._seeded.values()) or self._portfolio is not None
+
+    def _remember(self, key: Any) -> None:
+        self._seen.add(key)
+        self._seen_order.append(key)
+        if len(self._seen_order) > self._trade_memory:
+            self._seen.discard(self._seen_order.popleft())
+
+
+class FeedPublisher:
+    """Rozsyła różnice do subskrybentów z limitem częstotliwości.
+
+    Różnice publikowane szybciej niż co ``1 / max_fps`` sekund są łączone
+    w jedną (``FeedDiff.merge``) i dostarczane na końcu okna. Callbacki są
+    wywoływane w wątku pętli asyncio - subskrybenci UI muszą sami przenieść
+    dane do wątku GUI (np. sygnałem Qt).
+    """
+
+    def __init__(self, max_fps: float = 10.0, clock: Callable[[], float] = time.monotonic) -> None:
+        self.min_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self._clock = clock
+        self._subscribers: List[Callable[[FeedDiff], Any]] = []
+        self._pending: Optional[FeedDiff] = None
+        self._handle: Optional[asyncio.Handle] = None
+        self._last_flush = float('-inf')
+        self._seq = 0
+        self.stats = {'published': 0, 'coalesced': 0, 'flushed': 0}
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    def subscribe(self, callback: Callable[[FeedDiff], Any]) -> None:
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[FeedDiff], Any]) -> None:
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def publish(self, diff: FeedDiff) -> None:
+        """Kolejkuje różnicę do wysłania w najbliższej ramce."""
+        if diff.is_empty() and not diff.full:
+            return
+        self.stats['published'] += 1
+        if self._pending is None:
+            self._pending = diff
+        else:
+            self._pending.merge(diff)
+            self.stats['coalesced'] += 1
+        if self._handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        delay = max(0.0, self._last_flush + self.min_interval - self._clock())
+        # Nawet bez opóźnienia odłóż wysyłkę do końca bieżącej iteracji pętli,
+        # aby zmiany z jednego cyklu trafiły do jednej ramki
+        self._handle = loop.call_later(delay, self.flush)
+
+    def flush(self) -> Optional[FeedDiff]:
+        """Natychmiast wysyła zaległą różnicę (jeśli jest)."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        diff, self._pending = self._pending, None
+        if diff is None:
+            return None
+        self._seq += 1
+        diff.seq = self._seq
+        self._last_flush = self._clock()
+        self.stats['flushed'] += 1
+        for callback in list(self._subscribers):
+            try:
+                callback(diff)
+            except Exception as exc:
+                logger.error(f"Error in UI feed subscriber: {exc}")
+        return diff
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._pending = None
+
+
+__all__ = [
+    'FeedDiff',
+    'FeedPublisher',
+    'FeedState',
+    'as_record',
+    'normalize_bot',
+    'trade_key',
+]
@@ -33,6 +33,7 @@ from .failsafe_manager import FailSafeManager
 
 # Import starych komponentów (dla kompatybilności)
 from utils.config_manager import get_config_manager
+from utils.async_runtime import get_async_runtime
 from utils.encryption import get_encryption_manager
 from core.database_manager import DatabaseManager
 from notifications import NotificationManager
@@ -72,8 +73,9 @@ class UpdatedApplicationInitializer(QThread):
     def run(self):
         """Uruchamia inicjalizację"""
         try:
-            # Uruchom asynchroniczną inicjalizację
-            asyncio.run(self._async_initialize())
+            # Inicjalizacja we współdzielonej pętli tła - pętle danych, sesje
+            # i połączenia z bazą pozostają w niej aktywne po zakończeniu run()
+            get_async_runtime().run(self._async_initialize())
         except Exception as e:
             error_msg = f"Initialization failed: {str(e)}"
             if self.logger:
@@ -318,12 +320,30 @@ class UpdatedApplicationInitializer(QThread):
     
     async def _init_database_manager(self):
         """Inicjalizuje database manager"""
-        self.db_manager = DatabaseManager()
+        # Nadpisania profilu SQLite (database.sqlite_pragmas) i rozmiar puli odczytów
+        pragmas = None
+        read_pool_size = 2
+        if self.config_manager:
+            pragmas = self.config_manager.get_setting('app', 'database.sqlite_pragmas', None) or None
+            read_pool_size = int(self.config_manager.get_setting('app', 'database.read_pool_size', 2))
+        self.db_manager = DatabaseManager(pragmas=pragmas, read_pool_size=read_pool_size)
         try:
             await self.db_manager.initialize()
         except Exception as exc:
             logger.warning("DatabaseManager initialize failed: %s", exc)
             raise
+        # Grupowanie zapisów zleceń/statystyk/logów w paczki (database.write_behind)
+        if self.config_manager and self.config_manager.get_setting('app', 'database.write_behind', False):
+            self.db_manager.enable_write_behind()
+        # Retencja tabel historycznych: agregaty, archiwum, usuwanie (database.retention)
+        retention = self.config_manager.get_setting('app', 'database.retention', {}) if self.config_manager else {}
+        if isinstance(retention, dict) and retention.get('enabled'):
+            self.db_manager.enable_retention(
+                policies=retention.get('policies') or None,
+                archive_dir=retention.get('archive_dir', 'data/archive'),
+                interval=float(retention.get('interval_minutes', 60)) * 60.0,
+                batch_size=int(retention.get('batch_size', 500)),
+            )
     
     async def _init_trading_engine(self):
         """Inicjalizuje trading engine"""
@@ -612,7 +632,7 @@ class UpdatedCryptoBotApplication:
             if self.components:
                 # Zatrzymaj boty
                 if "updated_bot_manager" in self.components and self.components["updated_bot_manager"]:
-                    asyncio.run(self._cleanup_bot_manager())
+                    get_async_runtime().run(self._cleanup_bot_manager(), timeout=30)
                 
                 # Zatrzymaj inne komponenty
                 # Każdy komponent powinien mieć metodę cleanup()
@@ -6,13 +6,16 @@ zapewniając spójny interfejs i format danych.
 """
 
 import asyncio
-import json
+import itertools
 import logging
-from datetime import datetime
-from typing import Dict, List, Any, Optional, Callable, Union
-from dataclasses import dataclass
+import re
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Callable, Union, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
 
+from utils.json_codec import get_decoder, JsonDecoder
 from utils.logger import get_logger
 
 
@@ -27,7 +30,7 @@ class WebSocketEventType(Enum):
     CONNECTION = "connection"
 
 
-@dataclass
+@dataclass(slots=True)
 class StandardizedTickerData:
     """Standardowy format danych ticker"""
     symbol: str
@@ -42,7 +45,7 @@ class StandardizedTickerData:
     raw_data: Dict[str, Any]
 
 
-@dataclass
+@dataclass(slots=True)
 class StandardizedTradeData:
     """Standardowy format danych transakcji"""
     symbol: str
@@ -55,7 +58,7 @@ class StandardizedTradeData:
     raw_data: Dict[str, Any]
 
 
-@dataclass
+@dataclass(slots=True)
 class StandardizedOrderBookData:
     """Standardowy format danych księgi zleceń"""
     symbol: str
@@ -66,7 +69,7 @@ class StandardizedOrderBookData:
     raw_data: Dict[str, Any]
 
 
-@dataclass
+@dataclass(slots=True)
 class StandardizedKlineData:
     """Standardowy format danych świec"""
     symbol: str
@@ -91,9 +94,106 @@ class WebSocketCallbackInfo:
     exchange: str
     callback_function: Callable
     created_at: datetime
-    last_called: Optional[datetime] = None
     call_count: int = 0
     error_count: int = 0
+    is_async: bool = False
+    # Zegar monotoniczny - tani w gorącej ścieżce, konwertowany do datetime na żądanie
+    created_monotonic: float = field(default_factory=time.monotonic)
+    last_called_monotonic: Optional[float] = None
+
+    @property
+    def last_called(self) -> Optional[datetime]:
+        """Czas ostatniego wywołania wyliczony z zegara monotonicznego"""
+        if self.last_called_monotonic is None:
+            return None
+        return self.created_at + timedelta(seconds=self.last_called_monotonic - self.created_monotonic)
+
+
+WILDCARD = "*"
+
+# Tanie wyłuskanie symbolu z surowej ramki (bez pełnego dekodowania JSON)
+_SYMBOL_FIELDS = {
+    'binance': 's',
+    'bybit': 'symbol',
+    'kucoin': 'symbol',
+    'coinbase': 'product_id',
+}
+_SYMBOL_PATTERNS = {
+    exchange: (
+        re.compile(r'"%s"\s*:\s*"([^"]+)"' % field_name),
+        re.compile((r'"%s"\s*:\s*"([^"]+)"' % field_name).encode()),
+    )
+    for exchange, field_name in _SYMBOL_FIELDS.items()
+}
+
+
+class WebSocketMessageEnvelope:
+    """
+    Koperta surowej wiadomości WebSocket dekodowana leniwie.
+    
+    Symbol (klucz routingu) jest wyłuskiwany z surowego tekstu bez parsowania
+    JSON, dzięki czemu wiadomości bez subskrybentów można odrzucić tanio.
+    Pełne dekodowanie następuje dopiero przy pierwszym dostępie do ``data``.
+    """
+    
+    __slots__ = ('exchange', 'event_type', 'raw', 'symbol_hint', '_decoder', '_data', '_symbol')
+    
+    _UNSET = object()
+    
+    def __init__(self,
+                 exchange: str,
+                 raw: Union[str, bytes, Dict[str, Any], List[Any]],
+                 event_type: WebSocketEventType,
+                 symbol_hint: Optional[str] = None,
+                 decoder: Optional[JsonDecoder] = None):
+        self.exchange = exchange
+        self.event_type = event_type
+        self.raw = raw
+        self.symbol_hint = symbol_hint
+        self._decoder = decoder or get_decoder()
+        self._data = raw if isinstance(raw, (dict, list)) else self._UNSET
+        self._symbol = self._UNSET
+    
+    @property
+    def is_decoded(self) -> bool:
+        return self._data is not self._UNSET
+    
+    @property
+    def symbol(self) -> Optional[str]:
+        """Symbol z wiadomości (jak w parserze giełdy) lub podpowiedź wywołującego"""
+        if self._symbol is self._UNSET:
+            self._symbol = self._peek_symbol()
+        return self._symbol
+    
+    def _peek_symbol(self) -> Optional[str]:
+        patterns = _SYMBOL_PATTERNS.get(self.exchange)
+        if patterns is None:
+            return self.symbol_hint
+        if self.is_decoded:
+            data = self._data
+            if isinstance(data, dict):
+                inner = data.get('data') if self.exchange in ('bybit', 'kucoin') else data
+                if isinstance(inner, dict):
+                    value = inner.get(_SYMBOL_FIELDS[self.exchange])
+                    if value is not None:
+                        return value
+            return self.symbol_hint
+        raw = self.raw
+        pattern = patterns[1] if isinstance(raw, (bytes, bytearray)) else patterns[0]
+        match = pattern.search(raw)
+        if match is None:
+            return self.symbol_hint
+        value = match.group(1)
+        return value.decode() if isinstance(value, bytes) else value
+    
+    @property
+    def data(self) -> Any:
+        """Zdekodowana wiadomość (dekodowanie przy pierwszym dostępie)"""
+        if self._data is self._UNSET:
+            self._data = self._decoder.loads(self.raw)
+        return self._data
+
+DispatchKey = Tuple[WebSocketEventType, str, str]
 
 
 class WebSocketCallbackManager:
@@ -119,12 +219,26 @@ class WebSocketCallbackManager:
         # Callbacki pogrupowane według symbolu
         self.callbacks_by_symbol: Dict[str, List[str]] = {}
         
+        # Indeks dyspozycji (event_type, exchange, symbol) -> callbacki.
+        # Krotki są podmieniane przy (wy)rejestracji, więc iteracja w trakcie
+        # wywołań jest bezpieczna. Callbacki z symbolem "*" trafiają do
+        # osobnego kubełka (event_type, exchange).
+        self._dispatch_index: Dict[DispatchKey, Tuple[WebSocketCallbackInfo, ...]] = {}
+        self._wildcard_index: Dict[Tuple[WebSocketEventType, str], Tuple[WebSocketCallbackInfo, ...]] = {}
+        self._callback_seq = itertools.count(1)
+        # Liczba callbacków per (event_type, exchange) - szybki test "czy ktoś słucha"
+        self._route_counts: Dict[Tuple[WebSocketEventType, str], int] = {}
+        
+        # Dekoder JSON (orjson/msgspec/json)
+        self.decoder: JsonDecoder = get_decoder()
+        
         # Statystyki
         self.total_messages_processed = 0
         self.messages_by_exchange: Dict[str, int] = {}
         self.messages_by_type: Dict[WebSocketEventType, int] = {
             event_type: 0 for event_type in WebSocketEventType
         }
+        self.messages_dropped_unsubscribed = 0
         
         # Parsery dla różnych giełd
         self.exchange_parsers = {
@@ -154,7 +268,7 @@ class WebSocketCallbackManager:
             ID callbacku
         """
         try:
-            callback_id = f"{exchange}_{event_type.value}_{symbol}_{datetime.now().timestamp()}"
+            callback_id = f"{exchange}_{event_type.value}_{symbol}_{datetime.now().timestamp()}_{next(self._callback_seq)}"
             
             callback_info = WebSocketCallbackInfo(
                 callback_id=callback_id,
@@ -162,11 +276,13 @@ class WebSocketCallbackManager:
                 symbol=symbol,
                 exchange=exchange,
                 callback_function=callback_function,
-                created_at=datetime.now()
+                created_at=datetime.now(),
+                is_async=asyncio.iscoroutinefunction(callback_function)
             )
             
             # Zapisz callback
             self.callbacks[callback_id] = callback_info
+            self._index_add(callback_info)
             
             # Dodaj do indeksów
             self.callbacks_by_type[event_type].append(callback_id)
@@ -196,6 +312,7 @@ class WebSocketCallbackManager:
             callback_info = self.callbacks[callback_id]
             
             # Usuń z indeksów
+            self._index_remove(callback_info)
             self.callbacks_by_type[callback_info.event_type].remove(callback_id)
             self.callbacks_by_exchange[callback_info.exchange].remove(callback_id)
             self.callbacks_by_symbol[callback_info.symbol].remove(callback_id)
@@ -210,7 +327,7 @@ class WebSocketCallbackManager:
     
     async def process_websocket_message(self, 
                                       exchange: str,
-                                      raw_message: Union[str, Dict[str, Any]],
+                                      raw_message: Union[str, bytes, Dict[str, Any]],
                                       event_type: WebSocketEventType,
                                       symbol: str = None):
         """
@@ -223,25 +340,27 @@ class WebSocketCallbackManager:
             symbol: Symbol (jeśli znany)
         """
         try:
-            # Parsuj wiadomość
-            if isinstance(raw_message, str):
-                try:
-                    message_data = json.loads(raw_message)
-                except json.JSONDecodeError:
-                    self.logger.error(f"Błąd parsowania JSON: {raw_message}")
-                    return
-            else:
-                message_data = raw_message
-            
-            # Użyj parsera specyficznego dla giełdy
-            if exchange in self.exchange_parsers:
-                standardized_data = await self.exchange_parsers[exchange](
-                    message_data, event_type, symbol
-                )
-            else:
+            parser = self.exchange_parsers.get(exchange)
+            if parser is None:
                 self.logger.warning(f"Brak parsera dla giełdy {exchange}")
                 return
             
+            envelope = WebSocketMessageEnvelope(exchange, raw_message, event_type, symbol, self.decoder)
+            
+            # Odrzuć wiadomości bez subskrybentów zanim zostaną zdekodowane
+            if not self.has_subscribers(event_type, exchange, envelope.symbol):
+                self.messages_dropped_unsubscribed += 1
+                return
+            
+            try:
+                message_data = envelope.data
+            except (ValueError, self.decoder.decode_error):
+                self.logger.error(f"Błąd parsowania JSON: {raw_message!r}")
+                return
+            
+            # Użyj parsera specyficznego dla giełdy
+            standardized_data = parser(message_data, event_type, symbol)
+            
             if standardized_data is None:
                 return
             
@@ -251,34 +370,96 @@ class WebSocketCallbackManager:
             self.messages_by_type[event_type] += 1
             
             # Znajdź i wywołaj odpowiednie callbacki
-            await self._invoke_callbacks(event_type, standardized_data.symbol, standardized_data)
+            await self._invoke_callbacks(event_type, standardized_data.symbol, standardized_data, exchange)
             
         except Exception as e:
             self.logger.error(f"Błąd przetwarzania wiadomości WebSocket {exchange}: {e}")
     
+    def has_subscribers(self,
+                        event_type: WebSocketEventType,
+                        exchange: str,
+                        symbol: Optional[str] = None) -> bool:
+        """Sprawdza w O(1), czy jakikolwiek callback odbierze daną wiadomość"""
+        if (event_type, exchange) in self._wildcard_index or (event_type, WILDCARD) in self._wildcard_index:
+            return True
+        if symbol is None:
+            return bool(self._route_counts.get((event_type, exchange)) or self._route_counts.get((event_type, WILDCARD)))
+        return (event_type, exchange, symbol) in self._dispatch_index or (event_type, WILDCARD, symbol) in self._dispatch_index
+    
+    # === INDEKS DYSPOZYCJI ===
+    
+    def _index_add(self, callback_info: WebSocketCallbackInfo) -> None:
+        """Dodaje callback do indeksu dyspozycji (inkrementalnie)"""
+        route = (callback_info.event_type, callback_info.exchange)
+        self._route_counts[route] = self._route_counts.get(route, 0) + 1
+        if callback_info.symbol == WILDCARD:
+            key = (callback_info.event_type, callback_info.exchange)
+            self._wildcard_index[key] = self._wildcard_index.get(key, ()) + (callback_info,)
+        else:
+            key = (callback_info.event_type, callback_info.exchange, callback_info.symbol)
+            self._dispatch_index[key] = self._dispatch_index.get(key, ()) + (callback_info,)
+    
+    def _index_remove(self, callback_info: WebSocketCallbackInfo) -> None:
+        """Usuwa callback z indeksu dyspozycji"""
+        route = (callback_info.event_type, callback_info.exchange)
+        if self._route_counts.get(route, 0) > 1:
+            self._route_counts[route] -= 1
+        else:
+            self._route_counts.pop(route, None)
+        if callback_info.symbol == WILDCARD:
+            index, key = self._wildcard_index, (callback_info.event_type, callback_info.exchange)
+        else:
+            index, key = self._dispatch_index, (callback_info.event_type, callback_info.exchange, callback_info.symbol)
+        remaining = tuple(info for info in index.get(key, ()) if info is not callback_info)
+        if remaining:
+            index[key] = remaining
+        else:
+            index.pop(key, None)
+    
+    def get_matching_callbacks(self,
+                               event_type: WebSocketEventType,
+                               symbol: str,
+                               exchange: str = None) -> Tuple[WebSocketCallbackInfo, ...]:
+        """
+        Zwraca callbacki pasujące do (event_type, exchange, symbol).
+        
+        Giełda "*" w rejestracji oznacza wszystkie giełdy; gdy exchange nie
+        jest znane, przeszukiwane są wszystkie giełdy z indeksu.
+        """
+        if exchange is None:
+            exchanges = {key[1] for key in self._dispatch_index if key[0] == event_type}
+            exchanges.update(key[1] for key in self._wildcard_index if key[0] == event_type)
+        else:
+            exchanges = (exchange, WILDCARD) if exchange != WILDCARD else (WILDCARD,)
+        matching: Tuple[WebSocketCallbackInfo, ...] = ()
+        for ex in exchanges:
+            matching += self._dispatch_index.get((event_type, ex, symbol), ())
+            matching += self._wildcard_index.get((event_type, ex), ())
+        return matching
+    
     async def _invoke_callbacks(self, 
                               event_type: WebSocketEventType,
                               symbol: str,
-                              data: Any):
+                              data: Any,
+                              exchange: str = None):
         """Wywołuje wszystkie pasujące callbacki"""
         try:
-            # Znajdź callbacki dla tego typu wydarzenia i symbolu
-            matching_callbacks = []
-            
-            for callback_id in self.callbacks_by_type[event_type]:
-                callback_info = self.callbacks[callback_id]
-                if callback_info.symbol == symbol or callback_info.symbol == "*":
-                    matching_callbacks.append(callback_info)
+            if exchange is None:
+                exchange = getattr(data, 'exchange', None)
+            matching_callbacks = self.get_matching_callbacks(event_type, symbol, exchange)
+            if not matching_callbacks:
+                return
+            now = time.monotonic()
             
             # Wywołaj callbacki
             for callback_info in matching_callbacks:
                 try:
                     # Aktualizuj statystyki callbacku
-                    callback_info.last_called = datetime.now()
+                    callback_info.last_called_monotonic = now
                     callback_info.call_count += 1
                     
                     # Wywołaj callback
-                    if asyncio.iscoroutinefunction(callback_info.callback_function):
+                    if callback_info.is_async:
                         await callback_info.callback_function(data)
                     else:
                         callback_info.callback_function(data)
@@ -292,10 +473,10 @@ class WebSocketCallbackManager:
     
     # === PARSERY DLA RÓŻNYCH GIEŁD ===
     
-    async def _parse_binance_data(self, 
-                                data: Dict[str, Any],
-                                event_type: WebSocketEventType,
-                                symbol: str = None) -> Optional[Any]:
+    def _parse_binance_data(self, 
+                          data: Dict[str, Any],
+                          event_type: WebSocketEventType,
+                          symbol: str = None) -> Optional[Any]:
         """Parser dla danych Binance"""
         try:
             if event_type == WebSocketEventType.TICKER:
@@ -343,16 +524,30 @@ class WebSocketCallbackManager:
                         raw_data=data
                     )
             
+            elif event_type == WebSocketEventType.ORDER_BOOK:
+                # Partial book depth ("bids"/"asks") lub diff depth ("b"/"a")
+                bids = data.get('bids', data.get('b'))
+                asks = data.get('asks', data.get('a'))
+                if bids is not None and asks is not None:
+                    return StandardizedOrderBookData(
+                        symbol=data.get('s', symbol),
+                        bids=[[float(price), float(qty)] for price, qty in bids],
+                        asks=[[float(price), float(qty)] for price, qty in asks],
+                        timestamp=datetime.now(),
+                        exchange='binance',
+                        raw_data=data
+                    )
+            
             return None
             
         except Exception as e:
             self.logger.error(f"Błąd parsowania danych Binance: {e}")
             return None
     
-    async def _parse_bybit_data(self, 
-                              data: Dict[str, Any],
-                              event_type: WebSocketEventType,
-                              symbol: str = None) -> Optional[Any]:
+    def _parse_bybit_data(self, 
+                        data: Dict[str, Any],
+                        event_type: WebSocketEventType,
+                        symbol: str = None) -> Optional[Any]:
         """Parser dla danych Bybit"""
         try:
             if event_type == WebSocketEventType.TICKER:
@@ -377,10 +572,10 @@ class WebSocketCallbackManager:
             self.logger.error(f"Błąd parsowania danych Bybit: {e}")
             return None
     
-    async def _parse_kucoin_data(self, 
-                               data: Dict[str, Any],
-                               event_type: WebSocketEventType,
-                               symbol: str = None) -> Optional[Any]:
+    def _parse_kucoin_data(self, 
+                         data: Dict[str, Any],
+                         event_type: WebSocketEventType,
+                         symbol: str = None) -> Optional[Any]:
         """Parser dla danych KuCoin"""
         try:
             if event_type == WebSocketEventType.TICKER:
@@ -405,10 +600,10 @@ class WebSocketCallbackManager:
             self.logger.error(f"Błąd parsowania danych KuCoin: {e}")
             return None
     
-    async def _parse_coinbase_data(self, 
-                                 data: Dict[str, Any],
-                                 event_type: WebSocketEventType,
-                                 symbol: str = None) -> Optional[Any]:
+    def _parse_coinbase_data(self, 
+                           data: Dict[str, Any],
+                           event_type: WebSocketEventType,
+                           symbol: str = None) -> Optional[Any]:
         """Parser dla danych Coinbase"""
         try:
             if event_type == WebSocketEventType.TICKER:
@@ -432,10 +627,10 @@ class WebSocketCallbackManager:
             self.logger.error(f"Błąd parsowania danych Coinbase: {e}")
             return None
     
-    async def _parse_bitfinex_data(self, 
-                                 data: Dict[str, Any],
-                                 event_type: WebSocketEventType,
-                                 symbol: str = None) -> Optional[Any]:
+    def _parse_bitfinex_data(self, 
+                           data: Dict[str, Any],
+                           event_type: WebSocketEventType,
+                           symbol: str = None) -> Optional[Any]:
         """Parser dla danych Bitfinex"""
         try:
             if event_type == WebSocketEventType.TICKER:
@@ -459,10 +654,10 @@ class WebSocketCallbackManager:
             self.logger.error(f"Błąd parsowania danych Bitfinex: {e}")
             return None
     
-    async def _parse_kraken_data(self, 
-                               data: Dict[str, Any],
-                               event_type: WebSocketEventType,
-                               symbol: str = None) -> Optional[Any]:
+    def _parse_kraken_data(self, 
+                         data: Dict[str, Any],
+                         event_type: WebSocketEventType,
+                         symbol: str = None) -> Optional[Any]:
         """Parser dla danych Kraken"""
         try:
             if event_type == WebSocketEventType.TICKER:
@@ -500,7 +695,11 @@ class WebSocketCallbackManager:
                 exchange: len(callback_ids)
                 for exchange, callback_ids in self.callbacks_by_exchange.items()
             },
+            'dispatch_index_keys': len(self._dispatch_index),
+            'wildcard_buckets': len(self._wildcard_index),
             'total_messages_processed': self.total_messages_processed,
+            'messages_dropped_unsubscribed': self.messages_dropped_unsubscribed,
+            'json_decoder': self.decoder.name,
             'messages_by_exchange': self.messages_by_exchange,
             'messages_by_type': {
                 event_type.value: count
@@ -122,6 +122,9 @@ def test_event_bus_runtime_metrics_persistence_and_audit(tmp_path, monkeypatch,
     assert lat_count >= 1
 
     # Assertions: audit log contains our events (publish is monkey-patched to log JSONL)
+    # Audit writer batches records in the background - force a flush first
+    from utils import audit_log
+    audit_log.flush()
     log_file = Path("logs") / "events.jsonl"
     assert log_file.exists(), "Brak pliku audytu zdarzeń"
     # read last lines and ensure our events are present
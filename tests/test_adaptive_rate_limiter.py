@@ -0,0 +1,171 @@
+import asyncio
+import time
+
+import pytest
+
+import utils.net_wrappers as nw
+from utils import rate_limit
+from utils.rate_limit import AdaptiveRateLimiter, RateLimitTimeout, consume_prepaid, endpoint_cost
+from utils.rate_limiter import RateLimiter, RateLimitExceeded
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry():
+    rate_limit.reset_limiters()
+    yield
+    rate_limit.reset_limiters()
+
+
+def test_gcra_weights_and_lane_headroom():
+    clock = FakeClock()
+    limiter = AdaptiveRateLimiter(2.0, 4.0, clock=clock)
+
+    # Market data may only use 70% of the capacity, orders get the rest
+    assert limiter.try_acquire(1, 'market_data') == 0.0
+    assert limiter.try_acquire(1, 'market_data') == 0.0
+    assert limiter.try_acquire(1, 'market_data') == pytest.approx(0.1)
+    assert limiter.try_acquire(1, 'order') == 0.0
+    assert limiter.try_acquire(1, 'order') == 0.0
+    assert limiter.try_acquire(1, 'order') == pytest.approx(0.5)
+    assert limiter.available() == 0.0
+
+    # Refills at two units per second; a heavy request waits for its full weight
+    clock.now += 1.0
+    assert limiter.available() == pytest.approx(2.0)
+    assert limiter.try_acquire(3, 'order') == pytest.approx(0.5)
+    clock.now += 0.5
+    assert limiter.try_acquire(3, 'order') == 0.0
+
+
+def test_order_lane_preempts_queued_market_data():
+    limiter = AdaptiveRateLimiter(20.0, 2.0)
+    finished = []
+
+    async def request(label, lane):
+        await limiter.acquire(1, lane)
+        finished.append(label)
+
+    async def scenario():
+        polls = [asyncio.create_task(request(f'poll{i}', 'market_data')) for i in range(5)]
+        await asyncio.sleep(0)
+        await request('order', 'order')
+        await asyncio.gather(*polls)
+
+    asyncio.run(scenario())
+    assert finished.index('order') <= 1
+    assert len(finished) == 6
+    assert limiter.stats['waited'] >= 4
+
+
+def test_usage_headers_and_retry_after_slow_the_limiter():
+    limiter = rate_limit.get_exchange_limiter('binance')
+    assert limiter.snapshot()['factor'] == 1.0
+
+    limiter.update_from_headers({'X-MBX-USED-WEIGHT-1M': '5700'})
+    assert limiter.snapshot()['factor'] == pytest.approx(0.05 / 0.3)
+    limiter.update_from_headers({'x-mbx-used-weight-1m': '100'})
+    assert limiter.snapshot()['factor'] == 1.0
+
+    limiter.update_from_headers({'Retry-After': '2'}, status=429)
+    assert limiter.try_acquire(1, 'order') > 1.9
+    assert limiter.snapshot()['throttled'] == 1
+
+    bybit = rate_limit.get_exchange_limiter('bybit')
+    bybit.update_from_headers({'X-Bapi-Limit': '10', 'X-Bapi-Limit-Status': '1'})
+    assert bybit.snapshot()['factor'] == pytest.approx(0.1 / 0.3)
+
+
+def test_endpoint_costs_come_from_config():
+    assert endpoint_cost('binance', '/api/v3/order') == (1.0, 'order')
+    assert endpoint_cost('binance', '/api/v3/ticker/price') == (2.0, 'market_data')
+    assert endpoint_cost('binance', 'get_balance') == (20.0, 'account')
+    assert endpoint_cost('okx', 'create_order') == (1.0, 'order')
+    assert endpoint_cost('okx', '/api/v5/trade/order') == (1.0, 'order')
+    assert endpoint_cost('kraken', '/0/public/Ticker') == (1.0, 'market_data')
+    assert endpoint_cost('binance', None) == (1.0, 'market_data')
+
+
+def test_scoped_rate_limiter_waits_instead_of_raising():
+    limiter = RateLimiter(event_bus=_NullBus())
+    limiter.configure_scope('global', limit=2, period=0.2)
+
+    async def scenario():
+        waits = [await limiter.acquire('global') for _ in range(3)]
+        with pytest.raises(RateLimitExceeded):
+            await limiter.acquire('global', max_wait=0.01)
+        return waits
+
+    waits = asyncio.run(scenario())
+    assert waits[:2] == [0.0, 0.0] and waits[2] > 0.05
+    with pytest.raises(RateLimitExceeded):
+        limiter.check('global')
+    assert limiter.snapshot()['global']['count'] == 2
+
+
+def test_acquire_all_refunds_earlier_scopes_on_failure():
+    limiter = RateLimiter(event_bus=_NullBus())
+    limiter.configure_scope('global', limit=5, period=10.0)
+    limiter.configure_scope('symbol:BTC/USDT', limit=1, period=10.0)
+
+    async def scenario():
+        await limiter.acquire_all(['global', 'symbol:BTC/USDT'])
+        with pytest.raises(RateLimitExceeded):
+            await limiter.acquire_all(['global', 'symbol:BTC/USDT'], max_wait=0.01)
+
+    asyncio.run(scenario())
+    # The rejected request did not consume the global scope
+    assert limiter.snapshot()['global']['count'] == 1
+
+
+def test_sync_net_guard_does_not_block_for_the_async_max_wait():
+    rate_limit.get_exchange_limiter('syncex', default_rate=20.0, default_capacity=1.0)
+
+    @nw.net_guard('syncex:rest:/v1/thing')
+    def call():
+        return 'ok'
+
+    assert call() == 'ok'
+    rate_limit.get_exchange_limiter('syncex').penalize(10)
+    started = time.monotonic()
+    with pytest.raises(RuntimeError, match='rate_limited'):
+        call()
+    assert time.monotonic() - started < nw.DEFAULT_SYNC_MAX_WAIT + 0.2
+
+
+def test_net_guard_waits_and_prepays_the_first_request():
+    rate_limit.get_exchange_limiter('testex', default_rate=20.0, default_capacity=1.0)
+    prepaid = []
+
+    @nw.net_guard('testex:rest:/v1/thing')
+    async def call():
+        prepaid.append((consume_prepaid(), consume_prepaid()))
+        return 'ok'
+
+    async def scenario():
+        started = time.monotonic()
+        results = [await call() for _ in range(3)]
+        return results, time.monotonic() - started
+
+    results, elapsed = asyncio.run(scenario())
+    assert results == ['ok'] * 3
+    assert elapsed >= 0.08
+    assert prepaid == [(True, False)] * 3
+    assert not consume_prepaid()
+
+    limiter = rate_limit.get_exchange_limiter('testex')
+    limiter.penalize(60)
+    with pytest.raises(RateLimitTimeout):
+        limiter.acquire_blocking(1, 'order', max_wait=0.01)
+
+
+class _NullBus:
+    def publish(self, *args, **kwargs):
+        pass
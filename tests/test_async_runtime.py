@@ -0,0 +1,132 @@
+import asyncio
+import threading
+
+import pytest
+
+from ui.async_helper import AsyncBridge, AsyncManager
+from utils.async_runtime import AsyncRuntime
+
+
+@pytest.fixture
+def runtime():
+    rt = AsyncRuntime("test-runtime")
+    yield rt
+    rt.stop()
+
+
+def test_runtime_reuses_one_loop_and_its_resources(runtime):
+    async def loop_identity():
+        return asyncio.get_running_loop(), threading.current_thread()
+
+    first = runtime.run(loop_identity())
+    second = runtime.submit(loop_identity()).result(1)
+    assert first == second
+    assert first[1].daemon and first[1] is not threading.current_thread()
+
+    # Obiekty związane z pętlą (połączenia, kolejki) przeżywają kolejne wywołania
+    async def make_queue():
+        return asyncio.Queue()
+
+    queue = runtime.run(make_queue())
+
+    async def roundtrip(value):
+        await queue.put(value)
+        return await queue.get()
+
+    assert [runtime.run(roundtrip(i)) for i in range(3)] == [0, 1, 2]
+    assert runtime.stats['submitted'] == 6
+
+
+def test_runtime_timeout_cancels_and_stop_joins(runtime):
+    cancelled = threading.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(TimeoutError):
+        runtime.run(slow(), timeout=0.05)
+    assert cancelled.wait(1)
+
+    async def nested():
+        return runtime.run(asyncio.sleep(0))
+
+    with pytest.raises(RuntimeError):
+        runtime.run(nested())
+
+    thread = runtime._thread
+    runtime.stop()
+    assert not thread.is_alive()
+
+
+def test_bridge_delivers_results_and_coalesces_pending_refreshes(runtime):
+    bridge = AsyncBridge(runtime)
+    signals, results, errors = [], [], []
+    bridge.result_ready.connect(lambda task_id, result: signals.append((task_id, result)))
+    bridge.error.connect(lambda task_id, message: signals.append((task_id, message)))
+    release = threading.Event()
+    delivered = threading.Event()
+
+    async def refresh(value):
+        await asyncio.get_running_loop().run_in_executor(None, release.wait, 1)
+        return value
+
+    def on_result(value):
+        results.append(value)
+        delivered.set()
+
+    first = bridge.submit(refresh(1), 'portfolio', on_result)
+    # Odświeżenie w toku - kolejny tick nie jest dublowany
+    assert bridge.submit(refresh(2), 'portfolio', on_result) is first
+    assert bridge.is_pending('portfolio')
+    release.set()
+    assert delivered.wait(1)
+    assert results == [1] and signals == [('portfolio', 1)]
+    assert not bridge.is_pending('portfolio')
+
+    async def boom():
+        raise ValueError('offline')
+
+    failed = threading.Event()
+    bridge.submit(boom(), 'status', on_error=lambda exc: (errors.append(exc), failed.set()))
+    assert failed.wait(1)
+    assert isinstance(errors[0], ValueError)
+    assert ('status', 'offline') in signals
+
+
+def test_bridge_timeout_frees_a_hung_refresh(runtime):
+    bridge = AsyncBridge(runtime)
+    errors, results = [], []
+    failed = threading.Event()
+    delivered = threading.Event()
+
+    async def hang():
+        await asyncio.sleep(60)
+
+    async def quick():
+        return 'fresh'
+
+    bridge.submit(hang(), 'risk', on_error=lambda exc: (errors.append(exc), failed.set()), timeout=0.05)
+    assert failed.wait(1)
+    assert isinstance(errors[0], asyncio.TimeoutError)
+    # The task id is released, so the next tick runs again
+    assert not bridge.is_pending('risk')
+    bridge.submit(quick(), 'risk', lambda value: (results.append(value), delivered.set()), timeout=0.05)
+    assert delivered.wait(1) and results == ['fresh']
+
+
+def test_async_manager_runs_tasks_on_the_shared_loop(runtime):
+    manager = AsyncManager(runtime=runtime)
+    finished = threading.Event()
+    outcome = []
+    manager.task_finished.connect(lambda task_id, result: (outcome.append((task_id, result)), finished.set()))
+
+    async def work():
+        return threading.current_thread().name
+
+    assert manager.run_async(work(), 'job') == 'job'
+    assert finished.wait(1)
+    assert outcome == [('job', 'test-runtime')]
@@ -0,0 +1,55 @@
+import json
+
+from utils import audit_log
+from utils.audit_log import AuditWriter, _sanitize_deep
+
+
+def test_audit_writer_batches_and_flushes(tmp_path):
+    path = tmp_path / "events.jsonl"
+    writer = AuditWriter(path, batch_size=50, flush_interval=10.0, max_bytes=0)
+    for i in range(120):
+        writer.submit({"ts": i, "event": "data.updated", "payload": {"seq": i}})
+    assert writer.flush(timeout=2.0)
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(ln)["payload"]["seq"] for ln in lines] == list(range(120))
+    stats = writer.stats()
+    assert stats["written"] == 120
+    # Two full batches plus the remainder released by flush()
+    assert stats["batches"] == 3
+    writer.close()
+
+
+def test_audit_writer_rotates_by_size(tmp_path):
+    path = tmp_path / "events.jsonl"
+    writer = AuditWriter(path, batch_size=1, flush_interval=0.01, max_bytes=200, backup_count=2)
+    for i in range(20):
+        writer.submit({"ts": i, "event": "order.submitted", "payload": {"note": "x" * 40}})
+    writer.close()
+
+    assert writer.stats()["rotations"] >= 2
+    assert (tmp_path / "events.jsonl.1").exists()
+    assert (tmp_path / "events.jsonl.2").exists()
+    assert not (tmp_path / "events.jsonl.3").exists()
+
+
+def test_audit_writer_drops_instead_of_blocking_when_queue_full(tmp_path):
+    writer = AuditWriter(tmp_path / "events.jsonl", max_queue=1)
+    # Do not start the thread: fill the queue directly to simulate a stalled writer
+    writer._ensure_started = lambda: None
+    writer.submit({"event": "a"})
+    writer.submit({"event": "b"})
+    assert writer.stats()["dropped"] == 1
+
+
+def test_sanitize_deep_masks_nested_sensitive_keys():
+    audit_log._sensitive_keys.cache_clear()
+    payload = {"symbol": "BTCUSDT", "api_key": "ABCDEFGH", "nested": [{"secret": "topsecret", "qty": 1}]}
+    for _ in range(3):
+        out = _sanitize_deep(payload)
+    assert out["api_key"] == "AB***GH"
+    assert out["nested"][0]["secret"] == "to***et"
+    assert out["nested"][0]["qty"] == 1
+    assert payload["api_key"] == "ABCDEFGH"
+    # Sanitization decisions are cached per key set
+    assert audit_log._sensitive_keys.cache_info().hits >= 4
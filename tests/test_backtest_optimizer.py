@@ -0,0 +1,99 @@
+import sqlite3
+
+import numpy as np
+import pytest
+
+from backtesting.optimizer import ParallelOptimizer, SharedCandleStore, walk_forward_splits
+from backtesting.simulators import SIMULATORS
+from backtesting.vectorized import OHLCVArrays, backtest_sma_cross
+
+
+def _series(n=1500, seed=0):
+    rng = np.random.default_rng(seed)
+    c = 100 * np.cumprod(1 + rng.normal(0, 0.004, n)) * (1 + 0.05 * np.sin(np.arange(n) / 40))
+    t = 1_700_000_000_000 + np.arange(n, dtype=np.int64) * 60_000
+    return OHLCVArrays(t, c, c * 1.002, c * 0.998, c, np.ones(n))
+
+
+@pytest.mark.parametrize("strategy", sorted(SIMULATORS))
+def test_every_simulator_produces_trades(strategy):
+    returns = SIMULATORS[strategy](_series(), {})
+    assert returns.ndim == 1
+    assert len(returns) > 0
+    assert np.isfinite(returns).all()
+
+
+def test_grid_search_matches_single_backtests_and_prunes():
+    data = {"BTCUSDT": _series(seed=1), "ETHUSDT": _series(seed=2)}
+    grid = {"short": [5, 10, 20], "long": [30, 60]}
+    opt = ParallelOptimizer("sma_cross", grid, data, max_workers=2)
+
+    table = opt.grid_search()
+    assert len(table) == 6 * 2
+    row = table.filter(symbol="ETHUSDT").filter(params={"long": 60, "short": 10}).rows[0]
+    expected = backtest_sma_cross(data["ETHUSDT"], 10, 60)["metrics"]
+    for key, value in expected.items():
+        assert row[key] == pytest.approx(value)
+
+    pruned = ParallelOptimizer("sma_cross", grid, data, max_workers=1).grid_search(windows=3, prune_quantile=0.5)
+    rounds = [len(pruned.filter(fold=k)) for k in range(3)]
+    assert rounds[0] == 12
+    assert rounds[2] < rounds[0]
+
+
+def test_walk_forward_evaluates_best_train_params_on_test_window(tmp_path):
+    data = {"BTCUSDT": _series(seed=3)}
+    opt = ParallelOptimizer("scalping", {"rsi_oversold": [25, 35], "bb_std": [1.5, 2.0]}, data,
+                            objective="total_pnl", max_workers=2)
+    table = opt.walk_forward(train=500, test=250)
+
+    splits = walk_forward_splits(1500, 500, 250)
+    assert len(splits) == 4
+    tests = table.filter(phase="test")
+    assert len(tests) == len(splits)
+    for row in tests:
+        train_rows = table.filter(phase="train", fold=row["fold"]).top(1)
+        assert row["params"] == train_rows[0]["params"]
+        assert (row["start"], row["end"]) == splits[row["fold"]][1]
+
+    db = tmp_path / "results.db"
+    assert table.to_sqlite(db, run_id="wf") == len(table)
+    with sqlite3.connect(db) as conn:
+        best = conn.execute(
+            "SELECT phase, score FROM optimizer_results WHERE run_id = ? ORDER BY score DESC LIMIT 1", ("wf",)
+        ).fetchone()
+    assert best[1] == pytest.approx(table.sort("score").rows[0]["score"])
+    assert (tmp_path / "r.csv") == table.to_csv(tmp_path / "r.csv")
+    assert "p_bb_std" in (tmp_path / "r.csv").read_text(encoding="utf-8").splitlines()[0]
+
+
+def test_shared_store_is_memory_mapped_and_cleaned_up():
+    with SharedCandleStore() as store:
+        path = store.add("BTC/USDT", _series(100))
+        mapped = np.load(path, mmap_mode="r")
+        assert isinstance(mapped, np.memmap)
+        assert mapped.shape == (6, 100)
+        directory = store.directory
+    assert not directory.exists()
+
+
+def test_in_process_runs_do_not_reuse_stale_maps(tmp_path):
+    from backtesting import optimizer
+
+    grid = {"short": [5], "long": [30]}
+    for seed in (3, 4):
+        data = {"BTCUSDT": _series(seed=seed)}
+        # Same store_dir and symbol -> same .npy file name on every run
+        table = ParallelOptimizer("sma_cross", grid, data, max_workers=1, store_dir=tmp_path).grid_search()
+        expected = backtest_sma_cross(data["BTCUSDT"], 5, 30)["metrics"]
+        assert table.rows[0]["total_pnl"] == pytest.approx(expected["total_pnl"])
+        assert optimizer._MMAPS == {}
+
+    # A file rewritten behind a cached map is reopened
+    with SharedCandleStore(tmp_path / "reuse") as store:
+        path = store.add("BTCUSDT", _series(200, seed=5))
+        assert len(optimizer._open_arrays(path)) == 200
+        other = _series(300, seed=6)
+        np.save(path, np.vstack([other.t, other.o, other.h, other.l, other.c, other.v]).astype(np.float64))
+        assert np.array_equal(optimizer._open_arrays(path).c, other.c)
+    assert optimizer._MMAPS == {}
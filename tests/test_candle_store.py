@@ -0,0 +1,168 @@
+import asyncio
+import time
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from backtesting.backtester import load_ohlcv_csv, load_ohlcv_store
+from backtesting.vectorized import backtest_sma_cross
+from core import market_data_manager
+from utils.candle_store import CandleStore, OHLCVArrays
+
+T0 = 1_700_000_040_000
+MINUTE = 60_000
+
+
+def _arrays(n, start=T0, seed=0):
+    rng = np.random.default_rng(seed)
+    c = 100 * np.cumprod(1 + rng.normal(0, 0.003, n))
+    t = start + np.arange(n, dtype=np.int64) * MINUTE
+    return OHLCVArrays(t, c, c * 1.001, c * 0.999, c, rng.uniform(1, 5, n))
+
+
+def test_append_is_incremental_and_reads_are_memory_mapped(tmp_path):
+    store = CandleStore(tmp_path)
+    data = _arrays(100)
+    assert store.append("BTC/USDT", "1m", data.window(0, 60)) == 60
+    # Overlapping batch: only the 40 newer candles are added
+    assert store.append("BTCUSDT", "1m", data.window(30, 100)) == 40
+    assert store.append("btc-usdt", "1m", data) == 0
+
+    reopened = CandleStore(tmp_path)
+    assert reopened.length("BTCUSDT", "1m") == 100
+    assert reopened.series() == [("BTCUSDT", "1m")]
+    window = reopened.read("BTCUSDT", "1m", start=T0 + 10 * MINUTE, end=T0 + 20 * MINUTE)
+    assert isinstance(window.c, np.memmap)
+    assert window.t.tolist() == data.t[10:20].tolist()
+    assert window.c.tolist() == data.c[10:20].tolist()
+    assert reopened.tail("BTCUSDT", "1m", 5).t.tolist() == data.t[-5:].tolist()
+    assert reopened.last_timestamp("BTCUSDT", "1m") == int(data.t[-1])
+
+
+def test_append_accepts_unsorted_candle_dicts_and_repairs_partial_write(tmp_path):
+    store = CandleStore(tmp_path)
+    candles = [
+        {"timestamp": datetime.fromtimestamp((T0 + 2 * MINUTE) / 1000), "open": 3, "high": 3, "low": 3, "close": 3, "volume": 1},
+        [T0, 1, 1, 1, 1, 1],
+        {"t": T0 + MINUTE, "o": 2, "h": 2, "l": 2, "c": 2, "v": 1},
+        {"t": T0 + MINUTE, "o": 2, "h": 2, "l": 2, "c": 2.5, "v": 1},
+    ]
+    assert store.append("ETHUSDT", "1m", candles) == 3
+    assert store.read("ETHUSDT", "1m").c.tolist() == [1.0, 2.5, 3.0]
+
+    # Simulate a crash after only the timestamp column was written
+    with open(tmp_path / "ETHUSDT" / "1m" / "t.bin", "ab") as f:
+        f.write(np.array([T0 + 3 * MINUTE], dtype=np.int64).tobytes())
+    assert store.length("ETHUSDT", "1m") == 3
+    assert store.append("ETHUSDT", "1m", [[T0 + 3 * MINUTE, 4, 4, 4, 4, 1]]) == 1
+    assert store.read("ETHUSDT", "1m").c.tolist() == [1.0, 2.5, 3.0, 4.0]
+
+
+def test_csv_import_feeds_both_backtesters(tmp_path):
+    data = _arrays(400, seed=3)
+    csv_path = tmp_path / "ohlcv.csv"
+    rows = ["timestamp,open,high,low,close,volume"]
+    rows += [",".join(repr(x) for x in r) for r in zip(data.t.tolist(), data.o.tolist(), data.h.tolist(),
+                                                        data.l.tolist(), data.c.tolist(), data.v.tolist())]
+    csv_path.write_text("\n".join(rows) + "\n", encoding="utf-8")
+
+    store = CandleStore(tmp_path / "store")
+    assert store.import_csv(csv_path, "BTCUSDT", "1m") == 400
+    assert load_ohlcv_store("BTCUSDT", "1m", store=store) == load_ohlcv_csv(csv_path)
+    result = backtest_sma_cross(store.read("BTCUSDT", "1m"), 5, 20)
+    assert result == backtest_sma_cross(load_ohlcv_csv(csv_path), 5, 20)
+
+
+def test_fetch_candles_downloads_only_missing_candles(tmp_path, monkeypatch):
+    monkeypatch.setenv("ENABLE_REAL_MARKET_DATA", "0")
+    manager = market_data_manager.MarketDataManager()
+    manager.attach_candle_store(CandleStore(tmp_path))
+    forming_start = int(time.time() * 1000) // MINUTE * MINUTE
+    requested = []
+
+    async def download(symbol, timeframe, limit):
+        requested.append(limit)
+        start = forming_start - (limit - 1) * MINUTE
+        return [
+            {"symbol": symbol, "timestamp": datetime.fromtimestamp((start + k * MINUTE) / 1000),
+             "open": 1.0, "high": 1.0, "low": 1.0, "close": float(start + k * MINUTE), "volume": 1.0}
+            for k in range(limit)
+        ]
+
+    monkeypatch.setattr(manager, "_download_candles", download)
+    first = asyncio.run(manager.fetch_candles("BTCUSDT", timeframe="1m", limit=50))
+    second = asyncio.run(manager.fetch_candles("BTCUSDT", timeframe="1m", limit=50))
+
+    assert requested == [50]
+    assert len(first) == len(second) == 50
+    assert [c["timestamp"] for c in first] == [c["timestamp"] for c in second]
+    # The forming candle is not persisted
+    assert manager.candle_store.length("BTCUSDT", "1m") == 49
+    assert manager.get_candle_arrays("BTCUSDT", "1m").t[-1] == forming_start - MINUTE
+
+    manager._forming_candles.clear()
+    asyncio.run(manager.fetch_candles("BTCUSDT", timeframe="1m", limit=50))
+    assert requested[-1] in (1, 2)  # only the forming candle (plus one if a minute boundary passed)
+
+
+def test_decimate_aggregates_ohlc_to_pixel_budget():
+    data = _arrays(1000)
+    assert data.decimate(2000) is data
+
+    view = data.decimate(300)
+    group = 4  # ceil(1000 / 300)
+    assert len(view) == 250
+    assert view.t[1] == data.t[group] and view.o[1] == data.o[group]
+    assert view.c[1] == data.c[2 * group - 1]
+    assert view.h[1] == data.h[group:2 * group].max() and view.l[1] == data.l[group:2 * group].min()
+    assert np.isclose(view.v.sum(), data.v.sum())
+
+    # Grupy liczone od początku - nowa świeca zmienia tylko ostatnią grupę
+    grown = _arrays(1001).decimate(300)
+    assert len(grown) == 251 and np.array_equal(grown.c[:-1], view.c)
+
+
+def test_merge_tail_updates_current_candle_and_appends_new_one():
+    data = _arrays(10)
+    live = OHLCVArrays(data.t[-1:], data.o[-1:], data.h[-1:] + 5, data.l[-1:], data.c[-1:] + 1, data.v[-1:])
+    merged = data.merge_tail(live)
+    assert len(merged) == 10 and merged.c[-1] == data.c[-1] + 1
+    assert np.array_equal(merged.c[:-1], data.c[:-1])
+
+    nxt = _arrays(2, start=int(data.t[-1]), seed=1)
+    assert len(data.merge_tail(nxt)) == 11
+    assert data.merge_tail(OHLCVArrays.empty()) is data
+
+    # Repeated refreshes that reach a new bar keep the series at the limit
+    series = data
+    for k in range(25):
+        series = series.merge_tail(_arrays(2, start=int(series.t[-1]), seed=k), limit=10)
+        assert len(series) == 10
+    assert np.array_equal(series.t[1:] - series.t[:-1], np.full(9, MINUTE))
+
+
+def test_fetch_candles_with_short_stored_history_returns_full_limit(tmp_path, monkeypatch):
+    monkeypatch.setenv("ENABLE_REAL_MARKET_DATA", "0")
+    manager = market_data_manager.MarketDataManager()
+    manager.attach_candle_store(CandleStore(tmp_path))
+    forming_start = int(time.time() * 1000) // MINUTE * MINUTE
+    requested = []
+
+    async def download(symbol, timeframe, limit):
+        requested.append(limit)
+        start = forming_start - (limit - 1) * MINUTE
+        return [
+            {"symbol": symbol, "timestamp": datetime.fromtimestamp((start + k * MINUTE) / 1000),
+             "open": 1.0, "high": 1.0, "low": 1.0, "close": float(start + k * MINUTE), "volume": 1.0}
+            for k in range(limit)
+        ]
+
+    monkeypatch.setattr(manager, "_download_candles", download)
+    asyncio.run(manager.fetch_candles("BTCUSDT", timeframe="1m", limit=10))
+    assert manager.candle_store.length("BTCUSDT", "1m") == 9
+
+    candles = asyncio.run(manager.fetch_candles("BTCUSDT", timeframe="1m", limit=50))
+    assert requested[-1] == 50
+    assert len(candles) == 50
+    assert candles[0]["timestamp"] == datetime.fromtimestamp((forming_start - 49 * MINUTE) / 1000)
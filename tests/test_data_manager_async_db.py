@@ -0,0 +1,146 @@
+import asyncio
+import sqlite3
+import threading
+import time
+
+from core.data_manager import DataManager
+
+
+def _count(db_path, table):
+    con = sqlite3.connect(db_path)
+    try:
+        return con.execute('SELECT COUNT(*) FROM ' + table).fetchone()[0]
+    finally:
+        con.close()
+
+
+def test_concurrent_writes_share_a_transaction(tmp_path):
+    db_path = str(tmp_path / 'dm.db')
+
+    async def scenario():
+        dm = DataManager(db_path)
+        await dm.ensure_initialized()
+        await asyncio.gather(
+            *(dm.add_log('info', f'message {i}', 'test') for i in range(40)),
+            *(dm.add_alert('info', 'low', f'alert {i}', 'body') for i in range(10)),
+        )
+        dm.use_real_data = True
+        dm.cache_enabled = False
+        logs = await dm.get_logs(limit=100)
+        stats = dm.get_db_stats()
+        await dm.close()
+        return logs, stats
+
+    logs, stats = asyncio.run(scenario())
+    assert _count(db_path, 'logs') == 40
+    assert _count(db_path, 'alerts') == 10
+    assert len(logs) == 40
+    assert stats['max_batch'] == 50
+    assert stats['failures'] == 0
+
+
+def test_lock_contention_does_not_stall_event_loop(tmp_path):
+    db_path = str(tmp_path / 'dm.db')
+    locked = threading.Event()
+
+    def hold_write_lock():
+        con = sqlite3.connect(db_path)
+        con.execute('BEGIN EXCLUSIVE')
+        locked.set()
+        time.sleep(0.4)
+        con.rollback()
+        con.close()
+
+    async def scenario():
+        dm = DataManager(db_path)
+        await dm.ensure_initialized()
+        holder = threading.Thread(target=hold_write_lock)
+        holder.start()
+        locked.wait()
+
+        gaps = []
+
+        async def heartbeat():
+            last = time.perf_counter()
+            while True:
+                await asyncio.sleep(0.01)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        hb = asyncio.create_task(heartbeat())
+        started = time.perf_counter()
+        await dm.add_log('warning', 'written after the lock is released', 'test')
+        waited = time.perf_counter() - started
+        hb.cancel()
+        holder.join()
+        stats = dm.get_db_stats()
+        await dm.close()
+        return gaps, waited, stats
+
+    gaps, waited, stats = asyncio.run(scenario())
+    assert waited >= 0.3
+    # The loop kept ticking while the DB thread waited for the lock
+    assert len(gaps) >= 15
+    assert max(gaps) < 0.15
+    assert stats['max_loop_block_ms'] < 50
+    assert _count(db_path, 'logs') == 1
+
+
+def test_transient_errors_are_retried_with_async_backoff(tmp_path):
+    db_path = str(tmp_path / 'dm.db')
+    calls = []
+
+    def flaky(cursor, conn):
+        calls.append(1)
+        if len(calls) < 3:
+            raise sqlite3.OperationalError('database is locked')
+        cursor.execute("INSERT INTO logs (level, message, source) VALUES ('INFO', 'ok', 'test')")
+
+    async def scenario():
+        dm = DataManager(db_path)
+        dm.db_helper.backoff_base = 0.01
+        await dm.ensure_initialized()
+        ok = await dm.db_helper.execute_async(flaky)
+        failed = await dm.db_helper.execute_async(lambda cursor, conn: cursor.execute('INSERT INTO missing VALUES (1)'),
+                                                  max_retries=2)
+        stats = dm.get_db_stats()
+        await dm.close()
+        return ok, failed, stats
+
+    ok, failed, stats = asyncio.run(scenario())
+    assert ok is True and failed is False
+    assert len(calls) == 3
+    assert stats['retries'] == 3
+    assert stats['failures'] == 1
+    assert _count(db_path, 'logs') == 1
+
+
+def test_writes_from_several_event_loops(tmp_path):
+    db_path = str(tmp_path / 'dm.db')
+    dm = DataManager(db_path)
+    asyncio.run(dm.ensure_initialized())
+    errors = []
+
+    def worker(n):
+        async def scenario():
+            for i in range(50):
+                await dm.add_log('info', f'loop {n} message {i}', 'test')
+            await dm.db_helper.flush()
+
+        try:
+            asyncio.run(scenario())
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=30)
+    assert not any(t.is_alive() for t in threads)
+    assert errors == []
+    assert _count(db_path, 'logs') == 200
+    stats = dm.get_db_stats()
+    assert stats['pending'] == 0 and stats['failures'] == 0
+    dm.db_helper.close()
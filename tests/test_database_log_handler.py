@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+
+from app.database import DatabaseManager
+from utils.logger import DatabaseLogHandler
+
+
+def _create_db(tmp_path):
+    db = DatabaseManager(db_path=tmp_path / 'logs.db')
+
+    async def init():
+        await db.initialize()
+        await db.close()
+
+    asyncio.run(init())
+    return db
+
+
+def _rows(db_path):
+    con = sqlite3.connect(db_path)
+    try:
+        return con.execute('SELECT type, level, message FROM logs ORDER BY id').fetchall()
+    finally:
+        con.close()
+
+
+def _logger(name, handler):
+    log = logging.getLogger(name)
+    log.propagate = False
+    log.setLevel(logging.DEBUG)
+    log.addHandler(handler)
+    return log
+
+
+def test_records_from_many_threads_are_bulk_inserted(tmp_path):
+    db = _create_db(tmp_path)
+    handler = DatabaseLogHandler(db, batch_size=200, flush_interval=0.05)
+    log = _logger('test.db_handler.bulk', handler)
+
+    def worker(n):
+        for i in range(250):
+            log.warning('thread %d record %d', n, i)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert handler.flush(timeout=10.0)
+    stats = handler.stats()
+    log.removeHandler(handler)
+    handler.close()
+
+    rows = _rows(db.db_path)
+    assert len(rows) == 2000
+    assert {(row[0], row[1]) for row in rows} == {('system', 'warning')}
+    assert stats['written'] == 2000 and stats['dropped'] == 0 and stats['failed'] == 0
+    # Far fewer transactions than records
+    assert stats['batches'] <= 40 and stats['max_batch'] > 1
+
+
+def test_queue_is_bounded_and_close_drains_it(tmp_path):
+    db = _create_db(tmp_path)
+    # The writer only wakes up on close: a long interval and a batch larger than the queue
+    handler = DatabaseLogHandler(db, max_queue_size=10, batch_size=1000, flush_interval=60.0)
+    log = _logger('test.db_handler.bounded', handler)
+    # Holding the (reentrant) queue lock keeps the writer from popping records
+    # however early or late its thread starts
+    with handler._cond:
+        for i in range(25):
+            log.error('record %d', i)
+        before_close = handler.stats()
+    log.removeHandler(handler)
+    handler.close()
+    log.error('after close')
+
+    assert before_close['queue_depth'] == 10
+    assert before_close['dropped'] == 15
+    # The oldest records were discarded, the newest ten are all written on close
+    assert [row[2] for row in _rows(db.db_path)] == [f'record {i}' for i in range(15, 25)]
+    assert handler.stats()['written'] == 10
+
+
+def test_failed_batches_are_counted_without_raising(tmp_path):
+    handler = DatabaseLogHandler(db_path=str(tmp_path / 'no_schema.db'), flush_interval=0.01)
+    log = _logger('test.db_handler.failed', handler)
+    log.info('lost')
+    assert handler.flush(timeout=5.0)
+    stats = handler.stats()
+    log.removeHandler(handler)
+    handler.close()
+    assert stats['failed'] == 1 and stats['written'] == 0
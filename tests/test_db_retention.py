@@ -0,0 +1,110 @@
+import asyncio
+import sqlite3
+from datetime import datetime, timezone
+
+import pytest
+
+from app.database import DatabaseManager
+from app.db_retention import iter_archive, resolve_policies
+
+NOW = datetime(2024, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _query(db_path, sql, params=()):
+    con = sqlite3.connect(db_path)
+    try:
+        return con.execute(sql, params).fetchall()
+    finally:
+        con.close()
+
+
+async def _setup(db_path):
+    db = DatabaseManager(db_path=db_path)
+    await db.initialize()
+    user_id = await db.create_user(username='ret', password='pw')
+    bot_id = await db.create_bot(user_id=user_id, name='ret-bot', bot_type='Custom', exchange='BINANCE',
+                                 pair='BTC/USDT', parameters={})
+    conn = await db.get_connection()
+    old_logs = [(bot_id, 'info' if i % 3 else 'error', f'old {i}', f'2024-03-{1 + i % 2:02d} 10:{i:02d}:00')
+                for i in range(25)]
+    await conn.executemany('INSERT INTO logs (bot_id, type, level, message, timestamp) VALUES (?, ?, ?, ?, ?)',
+                           [(b, 'info', level, msg, ts) for b, level, msg, ts in old_logs])
+    await conn.execute("INSERT INTO logs (bot_id, type, level, message, timestamp) VALUES (?, 'info', 'info', 'fresh', ?)",
+                       (bot_id, '2024-05-30 09:00:00'))
+    orders = [
+        ('filled', 2.0, 100.0, 0.5, '2023-01-10 08:00:00'),
+        ('filled', 1.0, 200.0, 0.25, '2023-01-10 09:00:00'),
+        ('open', 1.0, 0.0, 0.0, '2023-01-10 10:00:00'),
+        ('filled', 1.0, 300.0, 0.1, '2024-05-01 10:00:00'),
+    ]
+    await conn.executemany(
+        'INSERT INTO orders (bot_id, symbol, side, type, amount, filled_amount, average_price, status, fee, timestamp) '
+        "VALUES (?, 'BTC/USDT', 'buy', 'limit', ?, ?, ?, ?, ?, ?)",
+        [(bot_id, amount, amount if status == 'filled' else 0.0, price, status, fee, ts)
+         for status, amount, price, fee, ts in orders],
+    )
+    await conn.commit()
+    return db, bot_id
+
+
+def test_retention_archives_rolls_up_and_deletes_in_small_batches(tmp_path):
+    db_path = str(tmp_path / 'ret.db')
+    archive_dir = tmp_path / 'archive'
+
+    async def scenario():
+        db, bot_id = await _setup(db_path)
+        manager = db.enable_retention(archive_dir=archive_dir, interval=None, batch_size=10)
+        summary = await manager.run_once(now=NOW)
+        again = await manager.run_once(now=NOW)
+        log_rollups = await db.get_history_rollups('logs', granularity='hour')
+        order_rollups = await db.get_history_rollups('orders')
+        remaining = await db.get_logs(bot_id=bot_id)
+        await db.close()
+        return summary, again, log_rollups, order_rollups, remaining
+
+    summary, again, log_rollups, order_rollups, remaining = asyncio.run(scenario())
+    assert summary['logs'] == {'deleted': 25, 'archived': 25, 'rolled_up': 8, 'batches': 3}
+    assert again['logs']['deleted'] == 0
+    assert [log['message'] for log in remaining] == ['fresh']
+
+    # Hourly aggregates keep per-level counts of the deleted rows
+    counts = {(r['bucket'], r['dimensions']['level']): r['row_count'] for r in log_rollups}
+    assert counts == {('2024-03-01 10', 'error'): 5, ('2024-03-01 10', 'info'): 8,
+                      ('2024-03-02 10', 'error'): 4, ('2024-03-02 10', 'info'): 8}
+
+    # Only closed orders past the window are removed; open orders stay
+    assert summary['orders']['deleted'] == 2
+    assert _query(db_path, 'SELECT status, timestamp FROM orders ORDER BY id') == [
+        ('open', '2023-01-10 10:00:00'), ('filled', '2024-05-01 10:00:00')]
+    (rollup,) = order_rollups
+    assert rollup['bucket'] == '2023-01-10' and rollup['row_count'] == 2
+    assert rollup['amount_sum'] == 3.0 and rollup['volume_sum'] == 400.0 and rollup['fee_sum'] == 0.75
+
+    archived = list(iter_archive(archive_dir / 'logs' / 'logs-2024-03.jsonl.gz'))
+    assert sorted(row['message'] for row in archived) == sorted(f'old {i}' for i in range(25))
+    assert [row['status'] for row in iter_archive(archive_dir / 'orders' / 'orders-2023-01.jsonl.gz')] == ['filled', 'filled']
+
+
+def test_retention_is_incremental_and_configurable(tmp_path):
+    db_path = str(tmp_path / 'ret.db')
+
+    async def scenario():
+        db, _ = await _setup(db_path)
+        manager = db.enable_retention(policies={'logs': {'archive': False}, 'orders': None},
+                                      archive_dir=tmp_path / 'archive', interval=None, batch_size=10)
+        first = await manager.run_once(max_batches=1, now=NOW)
+        await manager.run_once(max_batches=1, now=NOW)
+        await db.close()
+        return first
+
+    first = asyncio.run(scenario())
+    assert first['logs'] == {'deleted': 10, 'archived': 0, 'rolled_up': 2, 'batches': 1}
+    assert 'orders' not in first
+    assert _query(db_path, 'SELECT COUNT(*) FROM logs')[0][0] == 6
+    assert _query(db_path, 'SELECT COUNT(*) FROM orders')[0][0] == 4
+    assert not (tmp_path / 'archive' / 'logs').exists()
+
+    with pytest.raises(ValueError):
+        resolve_policies({'users': {'keep_days': 1}})
+    with pytest.raises(ValueError):
+        resolve_policies({'logs': {'condition': '1=1'}})
@@ -0,0 +1,104 @@
+import asyncio
+import sqlite3
+
+from app.database import DatabaseManager
+
+
+def _count(db_path, table):
+    con = sqlite3.connect(db_path)
+    try:
+        return con.execute('SELECT COUNT(*) FROM ' + table).fetchone()[0]
+    finally:
+        con.close()
+
+
+async def _setup(db_path):
+    db = DatabaseManager(db_path=db_path)
+    await db.initialize()
+    user_id = await db.create_user(username='wb', password='pw')
+    bot_id = await db.create_bot(user_id=user_id, name='wb-bot', bot_type='Custom', exchange='BINANCE',
+                                 pair='BTC/USDT', parameters={})
+    return db, bot_id
+
+
+def test_writes_are_batched_and_reads_see_own_writes(tmp_path):
+    db_path = str(tmp_path / 'wb.db')
+
+    async def scenario():
+        db, bot_id = await _setup(db_path)
+        db.enable_write_behind(max_batch=1000, max_delay=60.0)
+        for i in range(50):
+            await db.add_log(f'log {i}', bot_id=bot_id)
+        await db.update_bot_statistics(bot_id, total_profit=12.5, total_trades=3)
+        # Nothing is committed yet: an independent connection sees no logs
+        uncommitted = _count(db_path, 'logs')
+        depth = db.get_write_stats()['queue_depth']
+        logs = await db.get_logs(bot_id=bot_id, limit=100)
+        bot = await db.get_bot(bot_id)
+        stats = db.get_write_stats()
+        await db.close()
+        return uncommitted, depth, logs, bot, stats
+
+    uncommitted, depth, logs, bot, stats = asyncio.run(scenario())
+    assert uncommitted == 0
+    assert depth == 51
+    assert len(logs) == 50
+    assert bot['total_profit'] == 12.5 and bot['total_trades'] == 3
+    assert stats['batches'] == 1
+    assert stats['last_batch_size'] == 51
+    assert stats['queue_depth'] == 0
+    assert _count(db_path, 'logs') == 50
+
+
+def test_save_order_waits_for_group_commit_and_flush_on_demand(tmp_path):
+    db_path = str(tmp_path / 'wb.db')
+
+    async def scenario():
+        db, bot_id = await _setup(db_path)
+        db.enable_write_behind(max_batch=1000, max_delay=0.01)
+        order_ids = await asyncio.gather(*(
+            db.save_order(bot_id, f'ex-{i}', f'cl-{i}', 'BTC/USDT', 'buy', 'limit', 1.0, price=100.0 + i)
+            for i in range(20)
+        ))
+        committed = _count(db_path, 'orders')
+        await db.update_order_status(order_ids[0], 'filled', filled_amount=1.0)
+        await db.upsert_strategy_order(bot_id, 'grid-1', {'level': 1}, 'open')
+        flushed = await db.flush_writes()
+        stats = db.get_write_stats()
+        await db.close()
+        return order_ids, committed, flushed, stats
+
+    order_ids, committed, flushed, stats = asyncio.run(scenario())
+    assert len(set(order_ids)) == 20 and None not in order_ids
+    # The awaited inserts were durable as soon as save_order returned, in a single batch
+    assert committed == 20
+    assert stats['batches'] >= 1 and stats['max_batch_size'] == 20
+    assert flushed == 2
+    con = sqlite3.connect(db_path)
+    try:
+        assert con.execute('SELECT status FROM orders WHERE id = ?', (order_ids[0],)).fetchone()[0] == 'filled'
+        assert con.execute('SELECT status FROM strategy_orders WHERE order_id = ?', ('grid-1',)).fetchone()[0] == 'open'
+    finally:
+        con.close()
+
+
+def test_failing_write_does_not_drop_the_rest_of_the_batch(tmp_path):
+    db_path = str(tmp_path / 'wb.db')
+
+    async def scenario():
+        db, bot_id = await _setup(db_path)
+        db.enable_write_behind(max_batch=1000, max_delay=60.0)
+        await db.add_log('before', bot_id=bot_id)
+        # Violates the foreign key on bots(id)
+        failed = await db.save_order(999_999, 'ex', 'cl', 'BTC/USDT', 'buy', 'market', 1.0)
+        await db.add_log('after', bot_id=bot_id)
+        await db.flush_writes()
+        stats = db.get_write_stats()
+        await db.close()
+        return failed, stats
+
+    failed, stats = asyncio.run(scenario())
+    assert failed is None
+    assert stats['failed_batches'] == 1
+    assert _count(db_path, 'logs') == 2
+    assert _count(db_path, 'orders') == 0
@@ -0,0 +1,70 @@
+import json
+import os
+
+from utils.event_log_reader import EventLogReader
+
+
+def _write(path, records, mode="a"):
+    with open(path, mode, encoding="utf-8") as f:
+        for rec in records:
+            f.write(json.dumps(rec) + "\n")
+
+
+def _event(ts, event="ORDER_SUBMITTED", **payload):
+    return {"ts": ts, "event": event, "payload": payload}
+
+
+def test_reader_parses_only_appended_lines(tmp_path):
+    path = tmp_path / "events.jsonl"
+    _write(path, [_event(1, symbol="BTC/USDT", bot_id="a"), _event(2, "ORDER_FILLED", symbol="BTC/USDT")])
+    reader = EventLogReader(path)
+    assert reader.poll() == 2
+    assert reader.poll() == 0
+
+    # Niedokończona linia czeka na kolejny odczyt
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(_event(3, symbol="ETH/USDT", bot_id="b")) + "\n" + '{"ts": 4, "ev')
+    assert reader.poll() == 1
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('ent": "OrderFilled", "payload": {}}\nnot json\n')
+    assert reader.poll() == 1
+    assert reader.stats["bad_lines"] == 1
+    assert reader.stats["bytes"] == os.path.getsize(path)
+    assert reader.totals.snapshot() == {
+        "orders": 2, "fills": 2, "symbols": ["BTC/USDT", "ETH/USDT"], "bots": ["a", "b"],
+    }
+
+
+def test_reader_finishes_rotated_file_and_follows_new_one(tmp_path):
+    path = tmp_path / "events.jsonl"
+    _write(path, [_event(1)])
+    reader = EventLogReader(path)
+    reader.poll()
+
+    # Dopisane po ostatnim odczycie, a następnie rotacja jak w AuditWriter
+    _write(path, [_event(2)])
+    os.replace(path, tmp_path / "events.jsonl.1")
+    _write(path, [_event(3, "ORDER_FILLED"), _event(4)], mode="w")
+    assert reader.poll() == 3
+    assert reader.stats["rotations"] == 1
+    assert reader.totals.orders == 3 and reader.totals.fills == 1
+
+    # Obcięty plik jest czytany od początku
+    _write(path, [_event(5)], mode="w")
+    assert reader.poll() == 1
+    assert [rec["ts"] for rec in reader.iter_range()] == [5]
+
+
+def test_range_export_seeks_via_sparse_index(tmp_path):
+    path = tmp_path / "events.jsonl"
+    _write(path, [_event(ts, bot_id=str(ts)) for ts in range(1000)])
+    reader = EventLogReader(path, index_interval=2048)
+    reader.poll()
+    assert len(reader._index) > 10
+
+    records = list(reader.iter_range(500, 509))
+    assert [rec["ts"] for rec in records] == list(range(500, 510))
+    lines = list(reader.iter_range(998, None, raw=True))
+    assert [json.loads(line)["ts"] for line in lines] == [998, 999]
+    assert sum(1 for _ in reader.iter_range()) == 1000
+    assert list(reader.iter_range(2000, 3000)) == []
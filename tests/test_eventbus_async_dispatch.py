@@ -0,0 +1,98 @@
+import asyncio
+import threading
+
+from utils.event_bus import EventBus, OverflowPolicy
+
+
+def test_slow_async_subscriber_does_not_block_publisher():
+    async def scenario():
+        bus = EventBus()
+        gate = asyncio.Event()
+        received = []
+
+        async def slow(payload):
+            await gate.wait()
+            received.append(payload["seq"])
+
+        sub = bus.subscribe_async("data.updated", slow, maxsize=3, policy=OverflowPolicy.DROP_OLDEST)
+        await asyncio.sleep(0)
+        for seq in range(10):
+            bus.publish("data.updated", {"seq": seq})
+        # Publisher returned immediately although the consumer is stuck
+        assert sub.pending() <= 3
+        gate.set()
+        assert await sub.join(timeout=1.0)
+        stats = sub.stats()
+        bus.clear()
+        return received, stats
+
+    received, stats = asyncio.run(scenario())
+    # First event was already taken by the consumer, then only the 3 newest survive
+    assert received[-3:] == [7, 8, 9]
+    assert stats["dropped"] == 10 - len(received)
+    assert stats["delivered"] == len(received)
+
+
+def test_coalesce_policy_keeps_latest_per_key():
+    async def scenario():
+        bus = EventBus()
+        received = []
+        sub = bus.subscribe_async(
+            "ticker",
+            lambda p: received.append((p["symbol"], p["price"])),
+            policy=OverflowPolicy.COALESCE,
+            key_func=lambda p: p["symbol"],
+        )
+        for price in range(5):
+            bus.publish("ticker", {"symbol": "BTCUSDT", "price": price})
+            bus.publish("ticker", {"symbol": "ETHUSDT", "price": price * 10})
+        await sub.join(timeout=1.0)
+        stats = bus.get_subscriber_stats("ticker")[0]
+        bus.clear()
+        return received, stats
+
+    received, stats = asyncio.run(scenario())
+    assert received == [("BTCUSDT", 4), ("ETHUSDT", 40)]
+    assert stats["coalesced"] == 8
+    assert stats["dropped"] == 0
+
+
+def test_block_policy_applies_backpressure_to_async_publisher():
+    async def scenario():
+        bus = EventBus()
+        received = []
+
+        async def consumer(payload):
+            await asyncio.sleep(0.001)
+            received.append(payload)
+
+        sub = bus.subscribe_async("order.submitted", consumer, maxsize=2, policy="block")
+        for i in range(20):
+            await bus.publish_async("order.submitted", i)
+            assert sub.pending() <= 2
+        await sub.join(timeout=2.0)
+        bus.clear()
+        return received, sub.stats()
+
+    received, stats = asyncio.run(scenario())
+    assert received == list(range(20))
+    assert stats["dropped"] == 0
+
+
+def test_publish_from_foreign_thread_is_delivered_on_loop():
+    async def scenario():
+        bus = EventBus()
+        loop_thread = threading.get_ident()
+        seen_threads = []
+        sub = bus.subscribe_async("data.updated", lambda p: seen_threads.append(threading.get_ident()))
+        worker = threading.Thread(target=lambda: [bus.publish("data.updated", i) for i in range(5)])
+        worker.start()
+        await asyncio.to_thread(worker.join)
+        await asyncio.sleep(0)
+        await sub.join(timeout=1.0)
+        bus.unsubscribe_async(sub)
+        return loop_thread, seen_threads, bus.get_async_listeners_count("data.updated")
+
+    loop_thread, seen_threads, remaining = asyncio.run(scenario())
+    assert seen_threads == [loop_thread] * 5
+    assert remaining == 0
@@ -0,0 +1,115 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from app.database import DatabaseManager
+from utils.db_utils import decode_cursor, encode_cursor
+
+
+async def _setup(db_path):
+    db = DatabaseManager(db_path=db_path)
+    await db.initialize()
+    user_id = await db.create_user(username='pager', password='pw')
+    bot_id = await db.create_bot(user_id=user_id, name='pager-bot', bot_type='Custom', exchange='BINANCE',
+                                 pair='BTC/USDT', parameters={})
+    return db, bot_id
+
+
+async def _collect(fetch, **kwargs):
+    items, cursor, pages = [], None, 0
+    while True:
+        page = await fetch(cursor=cursor, **kwargs)
+        items.extend(page['items'])
+        pages += 1
+        cursor = page['next_cursor']
+        if cursor is None:
+            return items, pages
+
+
+def test_pages_cover_every_row_once_and_ignore_new_inserts(tmp_path):
+    async def scenario():
+        db, bot_id = await _setup(tmp_path / 'pages.db')
+        # Many rows share the same second-resolution timestamp: id breaks the tie
+        for i in range(23):
+            await db.add_log(f'log {i}', bot_id=bot_id)
+        first = await db.get_logs_page(bot_id=bot_id, limit=10)
+        # Rows written while the user is paging must not shift the next pages
+        for i in range(5):
+            await db.add_log(f'late {i}', bot_id=bot_id)
+        rest, pages = await _collect(db.get_logs_page, bot_id=bot_id, limit=10)
+        second = await db.get_logs_page(bot_id=bot_id, cursor=first['next_cursor'], limit=10)
+        third = await db.get_logs_page(bot_id=bot_id, cursor=second['next_cursor'], limit=10)
+        latest = await db.get_logs(bot_id=bot_id, limit=5)
+
+        for i in range(7):
+            order_id = await db.save_order(bot_id, f'ex-{i}', f'cl-{i}', 'BTC/USDT', 'buy', 'limit', 1.0, price=100.0)
+            if i % 2:
+                await db.update_order_status(order_id, 'filled', filled_amount=1.0)
+        filled, _ = await _collect(db.get_bot_orders_page, bot_id=bot_id, status='filled', limit=2)
+        await db.close()
+        return first, second, third, rest, pages, latest, filled
+
+    first, second, third, rest, pages, latest, filled = asyncio.run(scenario())
+    walked = [log['message'] for log in first['items'] + second['items'] + third['items']]
+    assert walked == [f'log {i}' for i in reversed(range(23))]
+    assert third['next_cursor'] is None
+    assert len(rest) == 28 and len({log['id'] for log in rest}) == 28
+    assert pages == 3
+    assert [log['message'] for log in latest] == [f'late {i}' for i in reversed(range(5))]
+    assert [order['client_order_id'] for order in filled] == ['cl-5', 'cl-3', 'cl-1']
+
+
+def test_statistics_pages_ascend_by_date_within_range(tmp_path):
+    async def scenario():
+        db, bot_id = await _setup(tmp_path / 'pages.db')
+        for day in range(1, 11):
+            await db.save_daily_statistics(bot_id, f'2024-01-{day:02d}', day, 1.0, 10.0, 1, 0, 0.1)
+        items, pages = await _collect(db.get_bot_statistics_page, bot_id=bot_id, start_date='2024-01-03',
+                                      end_date='2024-01-08', limit=4)
+        await db.close()
+        return items, pages
+
+    items, pages = asyncio.run(scenario())
+    assert [row['date'] for row in items] == [f'2024-01-{day:02d}' for day in range(3, 9)]
+    assert pages == 2
+
+
+def test_cursor_tokens_are_opaque_and_validated():
+    token = encode_cursor('2024-01-01 10:00:00', 42)
+    assert decode_cursor(token) == ['2024-01-01 10:00:00', 42]
+    with pytest.raises(ValueError):
+        decode_cursor('not-a-cursor')
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor(1, 2, 3))
+
+
+@pytest.mark.parametrize('table, filters, index', [
+    ('logs', {'bot_id': 1}, 'idx_logs_bot_timestamp'),
+    ('logs', {'level': 'error'}, 'idx_logs_level_timestamp'),
+    ('logs', {'type': 'trade'}, 'idx_logs_type_timestamp'),
+    ('logs', {}, 'idx_logs_timestamp'),
+    ('orders', {'bot_id': 1}, 'idx_orders_bot_timestamp'),
+    ('orders', {'bot_id': 1, 'status': 'open'}, 'idx_orders_bot_status_timestamp'),
+    ('risk_events', {'bot_id': 1}, 'idx_risk_events_bot_timestamp'),
+    ('risk_events', {}, 'idx_risk_events_timestamp'),
+])
+def test_history_pages_are_served_by_composite_indexes(tmp_path, table, filters, index):
+    db_path = tmp_path / 'plan.db'
+
+    async def scenario():
+        db = DatabaseManager(db_path=db_path)
+        await db.initialize()
+        await db.close()
+
+    asyncio.run(scenario())
+    con = sqlite3.connect(str(db_path))
+    try:
+        for cursor in (None, encode_cursor('2024-01-01 00:00:00', 10)):
+            sql, params = DatabaseManager._page_query(table, filters, cursor, 50)
+            plan = ' | '.join(row[-1] for row in con.execute('EXPLAIN QUERY PLAN ' + sql, params))
+            assert 'USING INDEX ' + index in plan, plan
+            # The index already yields rows in page order - no sort step
+            assert 'TEMP B-TREE' not in plan, plan
+    finally:
+        con.close()
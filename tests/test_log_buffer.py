@@ -0,0 +1,104 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from core.data_manager import DataManager, LogEntry
+from core.log_buffer import SYSTEM_BOT, LogBuffer, LogQuery, normalize_log
+
+
+def _log(i, level='INFO', bot_id=None, message=None, minutes_ago=0):
+    return normalize_log({
+        'id': i,
+        'timestamp': datetime.now() - timedelta(minutes=minutes_ago),
+        'level': level,
+        'type': 'BOT' if bot_id else 'SYSTEM',
+        'bot_id': bot_id,
+        'message': message or f'message {i}',
+    })
+
+
+def test_ring_buffer_evicts_oldest_and_keeps_indexes_in_sync():
+    buffer = LogBuffer(capacity=4)
+    added, evicted = buffer.append([_log(i, 'ERROR' if i % 2 else 'INFO') for i in range(6)])
+    assert added == list(range(6))
+    assert [seq for seq, _ in evicted] == [0, 1]
+    assert len(buffer) == 4 and (buffer.first_seq, buffer.last_seq) == (2, 5)
+    assert buffer.get(1) is None and buffer.get(5)['id'] == 5
+
+    # Duplikaty (ta sama strona pobrana ponownie) są pomijane
+    assert buffer.append([_log(5), _log(4)]) == ([], [])
+
+    errors = buffer.select(LogQuery(level='ERROR'))
+    assert errors.rows == [3, 5] and errors.levels == {'ERROR': 2}
+    assert buffer.select(LogQuery(level='CRITICAL')).rows == []
+
+
+def test_prepend_older_pages_never_evicts_newer_entries():
+    buffer = LogBuffer(capacity=5)
+    buffer.append([_log(10), _log(11), _log(12)])
+    # Starsza strona przychodzi od najnowszego wpisu
+    added = buffer.prepend([_log(9), _log(8), _log(7), _log(6)])
+    assert added == [-1, -2]
+    assert buffer.is_full and buffer.get(-2)['id'] == 8
+    assert [buffer.get(seq)['id'] for seq in buffer.select(LogQuery()).rows] == [8, 9, 10, 11, 12]
+
+
+def test_query_from_filter_widget_values():
+    now = datetime(2026, 1, 1, 12, 0)
+    query = LogQuery.from_filters(
+        {'search': 'Order', 'level': 'Wszystkie', 'type': 'BOT', 'bot': 'Bot #7', 'period': 'Ostatnia godzina'},
+        now=now,
+    )
+    assert query == LogQuery(search='order', type='BOT', bot='7', since=now - timedelta(hours=1))
+    assert LogQuery.from_filters({'bot': 'System'}).bot == SYSTEM_BOT
+
+    buffer = LogBuffer()
+    buffer.append([
+        _log(1, bot_id=7, message='Order filled', minutes_ago=90),
+        _log(2, bot_id=7, message='Order placed', minutes_ago=5),
+        _log(3, bot_id=8, message='Order placed', minutes_ago=5),
+        _log(4, message='Startup'),
+    ])
+    recent = LogQuery(search='order', bot='7', since=datetime.now() - timedelta(hours=1))
+    assert [buffer.get(seq)['id'] for seq in buffer.select(recent).rows] == [2]
+    assert [buffer.get(seq)['id'] for seq in buffer.select(LogQuery(bot=SYSTEM_BOT)).rows] == [4]
+
+
+def test_select_runs_off_thread_while_appending():
+    buffer = LogBuffer(capacity=2000)
+    buffer.append([_log(i, 'WARNING' if i % 3 == 0 else 'INFO') for i in range(2000)])
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        future = pool.submit(buffer.select, LogQuery(level='WARNING'))
+        buffer.append([_log(i, 'WARNING') for i in range(2000, 2500)])
+        selection = future.result()
+
+    # Wpisy nadpisane w trakcie filtrowania są pomijane, reszta jest spójna
+    assert all(buffer.get(seq) is None or buffer.get(seq)['level'] == 'WARNING' for seq in selection.rows)
+    assert selection.rows == sorted(selection.rows)
+
+
+def test_normalize_log_accepts_data_manager_entries():
+    entry = LogEntry(id=3, timestamp='2026-01-01T10:00:00Z', level='warning', message='High volatility',
+                     source='risk_manager', bot_id=None)
+    record = normalize_log(entry)
+    assert record['level'] == 'WARNING' and record['type'] == 'SYSTEM'
+    assert record['bot_id'] is None and record['timestamp'].tzinfo is None
+
+
+def test_data_manager_logs_page_walks_history_with_cursor(tmp_path):
+    async def scenario():
+        dm = DataManager(str(tmp_path / 'dm.db'))
+        await dm.ensure_initialized()
+        await asyncio.gather(*(dm.add_log('info', f'message {i}', 'test') for i in range(25)))
+        dm.use_real_data = True
+        pages = [await dm.get_logs_page(limit=10)]
+        while pages[-1]['next_cursor']:
+            pages.append(await dm.get_logs_page(cursor=pages[-1]['next_cursor'], limit=10))
+        await dm.close()
+        return pages
+
+    pages = asyncio.run(scenario())
+    assert [len(page['items']) for page in pages] == [10, 10, 5]
+    ids = [entry.id for page in pages for entry in page['items']]
+    assert ids == sorted(ids, reverse=True) and len(set(ids)) == 25
@@ -0,0 +1,212 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from core import market_data_manager
+from utils.async_http import AsyncHttpClient
+
+
+def _ticker(symbol):
+    return {
+        "symbol": symbol, "lastPrice": "101.5", "bidPrice": "101.4", "askPrice": "101.6",
+        "volume": "10", "priceChange": "1.5", "priceChangePercent": "1.2",
+    }
+
+
+class _StubBinanceHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    delay = 0.2
+    peers = set()
+    paths = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        type(self).peers.add(self.client_address)
+        url = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        time.sleep(self.delay)
+        type(self).paths.append(url.path + ("?" + url.query if url.query else ""))
+        if url.path == "/api/v3/ticker/24hr":
+            if "symbol" in query:
+                body = _ticker(query["symbol"])
+            elif "symbols" in query:
+                body = [_ticker(sym) for sym in json.loads(query["symbols"])]
+            else:
+                body = [_ticker(sym) for sym in ("BTCUSDT", "ETHUSDT", "ADAUSDT", "XRPUSDT")]
+        elif url.path == "/api/v3/depth":
+            body = {"bids": [["101.4", "2"]], "asks": [["101.6", "3"]]}
+        elif url.path == "/api/v3/klines":
+            body = [[1700000000000, "1", "2", "0.5", "1.5", "100"]] * int(query["limit"])
+        else:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+@pytest.fixture()
+def stub_server():
+    _StubBinanceHandler.peers = set()
+    _StubBinanceHandler.paths = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubBinanceHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/api/v3"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture()
+def manager(monkeypatch, stub_server):
+    monkeypatch.setenv("ENABLE_REAL_MARKET_DATA", "0")
+    mdm = market_data_manager.MarketDataManager()
+    mdm.exchanges["binance"]["enabled"] = True
+    mdm.exchanges["binance"]["rest_url"] = stub_server
+    return mdm
+
+
+def test_rest_fetches_do_not_block_event_loop(manager):
+    async def scenario():
+        ticks = 0
+
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        hb = asyncio.create_task(heartbeat())
+        price, book, candles = await asyncio.gather(
+            manager._fetch_price_from_api("BTCUSDT"),
+            manager._fetch_orderbook_from_api("BTCUSDT", 5),
+            manager.fetch_candles("BTCUSDT", timeframe="1m", limit=3),
+        )
+        hb.cancel()
+        await manager.stop()
+        return ticks, price, book, candles
+
+    start = time.monotonic()
+    ticks, price, book, candles = asyncio.run(scenario())
+    elapsed = time.monotonic() - start
+
+    assert price.price == 101.5 and price.bid == 101.4
+    assert book.bids == [(101.4, 2.0)] and book.asks == [(101.6, 3.0)]
+    assert len(candles) == 3 and candles[0]["close"] == 1.5
+    # Three 200 ms requests ran concurrently while the loop kept ticking
+    assert elapsed < 0.55
+    assert ticks >= 10
+
+
+def test_client_reuses_pooled_connections_and_caps_per_host(stub_server):
+    async def scenario():
+        client = AsyncHttpClient(limit_per_host=2)
+        peak = 0
+
+        async def fetch(i):
+            nonlocal peak
+            task = asyncio.create_task(client.get_json(f"{stub_server}/ticker/24hr", params={"symbol": f"S{i}"}))
+            await asyncio.sleep(0.05)
+            peak = max(peak, sum(client.in_flight.values()))
+            return await task
+
+        results = await asyncio.gather(*(fetch(i) for i in range(6)))
+        await client.close()
+        return results, peak, client.stats()
+
+    _StubBinanceHandler.delay = 0.05
+    try:
+        results, peak, stats = asyncio.run(scenario())
+    finally:
+        _StubBinanceHandler.delay = 0.2
+    assert [r["symbol"] for r in results] == [f"S{i}" for i in range(6)]
+    assert peak <= 2
+    assert stats["requests_total"] == 6
+    # Keep-alive: six requests over at most two pooled connections
+    assert len(_StubBinanceHandler.peers) <= 2
+
+
+def test_http_error_status_falls_back_to_mock_price(manager):
+    manager.exchanges["binance"]["rest_url"] = manager.exchanges["binance"]["rest_url"] + "/missing"
+
+    async def scenario():
+        try:
+            return await manager._fetch_price_from_api("BTCUSDT")
+        finally:
+            await manager.stop()
+
+    price = asyncio.run(scenario())
+    assert price.price == manager._get_mock_price_data("BTCUSDT").price
+
+
+def test_batched_poll_uses_single_ticker_request_and_fans_out(manager):
+    manager.set_tracked_symbols(["BTCUSDT", "ETHUSDT", "ADAUSDT"])
+    seen = []
+    manager.subscribe_to_price("ETHUSDT", lambda p: seen.append(p.symbol))
+
+    async def scenario():
+        try:
+            return await manager.poll_prices_once()
+        finally:
+            await manager.stop()
+
+    prices = asyncio.run(scenario())
+    assert sorted(prices) == ["ADAUSDT", "BTCUSDT", "ETHUSDT"]
+    assert seen == ["ETHUSDT"]
+    assert manager.price_cache["BTCUSDT"].price == 101.5
+    ticker_calls = [p for p in _StubBinanceHandler.paths if p.startswith("/api/v3/ticker/24hr")]
+    assert len(ticker_calls) == 1 and "symbols=" in ticker_calls[0]
+    stats = manager.get_poll_stats()
+    assert stats["last_mode"] == "binance_ticker_24hr"
+    assert stats["cycles"] == 1 and stats["last_cycle_ms"] > 0
+
+
+def test_batched_poll_all_tickers_and_concurrent_fill_for_missing(manager):
+    manager.all_tickers_threshold = 1
+    manager.set_tracked_symbols(["BTCUSDT", "DOGEUSDT"])
+
+    async def scenario():
+        try:
+            return await manager.poll_prices_once()
+        finally:
+            await manager.stop()
+
+    prices = asyncio.run(scenario())
+    assert sorted(prices) == ["BTCUSDT", "DOGEUSDT"]
+    assert "/api/v3/ticker/24hr" in _StubBinanceHandler.paths
+    assert manager.get_poll_stats()["last_mode"] == "binance_ticker_24hr+concurrent"
+
+
+def test_poll_falls_back_to_bounded_concurrency_offline(monkeypatch):
+    monkeypatch.setenv("ENABLE_REAL_MARKET_DATA", "0")
+    mdm = market_data_manager.MarketDataManager()
+    mdm.poll_concurrency = 2
+    active = peak = 0
+    original = mdm._fetch_price_from_api
+
+    async def slow_fetch(symbol):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.02)
+        active -= 1
+        return await original(symbol)
+
+    mdm._fetch_price_from_api = slow_fetch
+    mdm.set_tracked_symbols([f"SYM{i}USDT" for i in range(6)])
+    prices = asyncio.run(mdm.poll_prices_once())
+    assert len(prices) == 6
+    assert peak == 2
+    assert mdm.get_poll_stats()["last_mode"] == "concurrent"
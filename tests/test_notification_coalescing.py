@@ -0,0 +1,141 @@
+import asyncio
+
+from aiohttp import web
+
+from app.notification_coalescing import SlidingWindowCounter
+from app.notifications import (
+    NotificationChannel,
+    NotificationConfig,
+    NotificationManager,
+    NotificationPriority,
+    NotificationType,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_sliding_window_counter_weights_previous_window():
+    clock = FakeClock()
+    counter = SlidingWindowCounter(3, window=10.0, clock=clock)
+    assert [counter.hit() for _ in range(4)] == [True, True, True, False]
+
+    # Half way into the next window half of the previous one still counts
+    clock.now = 15.0
+    assert counter.count() == 1.5
+    assert [counter.hit() for _ in range(3)] == [True, True, False]
+    assert counter.hit(force=True) and counter.count() == 4.5
+
+    # After two idle windows nothing is remembered
+    clock.now = 40.0
+    assert counter.count() == 0
+
+
+async def _run_with_webhook(scenario, **settings):
+    received = []
+
+    async def handle(request):
+        received.append(await request.json())
+        return web.json_response({'ok': True})
+
+    app = web.Application()
+    app.router.add_post('/hook', handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        manager = NotificationManager(None, None, coalesce_window=settings.pop('coalesce_window', 30.0))
+        await manager.initialize()
+        manager.channel_configs[NotificationChannel.WEBHOOK] = NotificationConfig(
+            channel=NotificationChannel.WEBHOOK,
+            settings={'url': f'http://127.0.0.1:{port}/hook'},
+            rate_limit=settings.pop('rate_limit', None),
+        )
+        await manager.start()
+        await scenario(manager)
+        await manager.stop()
+    finally:
+        await runner.cleanup()
+    return manager, received
+
+
+def test_bursts_are_merged_into_a_digest_per_key():
+    channels = [NotificationChannel.WEBHOOK]
+
+    async def scenario(manager):
+        for i in range(50):
+            await manager.send_notification('Trade Executed - Bot 1', f'BUY {i} BTC/USDT', channels=channels,
+                                            notification_type=NotificationType.TRADE, metadata={'bot_id': 1})
+        await manager.send_notification('Trade Executed - Bot 2', 'SELL 1 ETH/USDT', channels=channels,
+                                        notification_type=NotificationType.TRADE, metadata={'bot_id': 2})
+        await manager.send_notification('Bot Error - Bot 1', 'timeout', channels=channels,
+                                        notification_type=NotificationType.ERROR,
+                                        priority=NotificationPriority.HIGH, metadata={'bot_id': 1})
+        await asyncio.sleep(0.5)
+        await manager.notification_queue.join()
+
+    manager, received = asyncio.run(_run_with_webhook(scenario, coalesce_window=0.3))
+    titles = [payload['title'] for payload in received]
+    assert sorted(titles) == sorted(['Trade Executed - Bot 1', 'Trade Executed - Bot 2', 'Bot Error - Bot 1',
+                                     'Trade Executed - Bot 1 (x49)'])
+    digest = next(payload for payload in received if payload['title'].endswith('(x49)'))
+    assert digest['metadata']['coalesced'] == 49 and digest['metadata']['bot_id'] == 1
+    assert digest['message'].splitlines()[-1] == '... (+44)'
+    assert 'BUY 49 BTC/USDT' in digest['message']
+    assert manager.coalescer.stats == {'passed': 3, 'coalesced': 49, 'digests': 1}
+
+
+def test_pending_digest_is_flushed_on_stop():
+    channels = [NotificationChannel.WEBHOOK]
+
+    async def scenario(manager):
+        for i in range(3):
+            await manager.send_notification('Risk escalation', f'level {i}', channels=channels)
+        await manager.notification_queue.join()
+
+    _, received = asyncio.run(_run_with_webhook(scenario, coalesce_window=60.0))
+    assert [payload['title'] for payload in received] == ['Risk escalation', 'Risk escalation (x2)']
+
+
+def test_rate_limit_never_drops_critical_alerts():
+    channels = [NotificationChannel.WEBHOOK]
+
+    async def scenario(manager):
+        for i in range(5):
+            await manager.send_notification(f'info {i}', 'm', channels=channels)
+        for i in range(2):
+            await manager.send_notification(f'critical {i}', 'm', channels=channels,
+                                            notification_type=NotificationType.CRITICAL)
+        await manager.notification_queue.join()
+
+    _, received = asyncio.run(_run_with_webhook(scenario, coalesce_window=0, rate_limit=3))
+    assert sorted(payload['title'] for payload in received if payload['title'].startswith('info')) == [
+        'info 0', 'info 1', 'info 2']
+    assert sorted(payload['title'] for payload in received if payload['title'].startswith('critical')) == [
+        'critical 0', 'critical 1']
+
+
+def test_critical_and_urgent_alerts_bypass_coalescing():
+    channels = [NotificationChannel.WEBHOOK]
+
+    async def scenario(manager):
+        for i in range(3):
+            await manager.send_notification('Exchange down', f'attempt {i}', channels=channels,
+                                            notification_type=NotificationType.CRITICAL)
+            await manager.send_notification('Stop loss hit', f'order {i}', channels=channels,
+                                            priority=NotificationPriority.URGENT)
+        await manager.notification_queue.join()
+        # Delivered well before the 60 s window would close
+        assert not manager.coalescer.pending_keys()
+
+    manager, received = asyncio.run(_run_with_webhook(scenario, coalesce_window=60.0))
+    assert sorted(payload['message'] for payload in received) == sorted(
+        [f'attempt {i}' for i in range(3)] + [f'order {i}' for i in range(3)])
+    assert manager.coalescer.stats == {'passed': 6, 'coalesced': 0, 'digests': 0}
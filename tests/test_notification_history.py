@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.notification_history import NotificationHistoryBuffer
+from app.notifications import (
+    NotificationChannel,
+    NotificationHistory,
+    NotificationManager,
+    NotificationPriority,
+    NotificationType,
+)
+
+T0 = datetime(2024, 6, 1, 12, 0)
+
+
+def _entry(i, notification_type=NotificationType.INFO, bot_id=None, priority=NotificationPriority.NORMAL,
+           channels=(NotificationChannel.DESKTOP,)):
+    return NotificationHistory(
+        id=f'n{i}',
+        timestamp=T0 + timedelta(seconds=i),
+        title=f'title {i}',
+        message='m',
+        notification_type=notification_type,
+        channels=list(channels),
+        priority=priority,
+        status='sent',
+        metadata={} if bot_id is None else {'bot_id': bot_id},
+    )
+
+
+def test_ring_buffer_overwrites_oldest_and_keeps_indexes_consistent():
+    buffer = NotificationHistoryBuffer(capacity=5)
+    types = [NotificationType.TRADE, NotificationType.ERROR]
+    for i in range(12):
+        buffer.append(_entry(i, notification_type=types[i % 2], bot_id=i % 3))
+
+    assert len(buffer) == 5
+    assert [entry.id for entry in buffer] == ['n7', 'n8', 'n9', 'n10', 'n11']
+    assert [entry.id for entry in reversed(buffer)] == ['n11', 'n10', 'n9', 'n8', 'n7']
+    assert buffer.get('n6') is None and buffer.get('n7').id == 'n7'
+
+    assert [entry.id for entry in buffer.query(notification_type=NotificationType.TRADE)] == ['n10', 'n8']
+    assert [entry.id for entry in buffer.query(bot_id=1)] == ['n10', 'n7']
+    assert buffer.query(bot_id=1, notification_type=NotificationType.ERROR) == [buffer.get('n7')]
+    assert buffer.query(bot_id=2, notification_type=NotificationType.TRADE, limit=1) == [buffer.get('n8')]
+    assert buffer.query(limit=2) == [buffer.get('n11'), buffer.get('n10')]
+    assert buffer.query(bot_id=99) == []
+
+    assert buffer.count() == 5
+    assert buffer.count(notification_type=NotificationType.ERROR) == 3
+    assert buffer.counts_by('bot_id') == {0: 1, 1: 2, 2: 2}
+    assert buffer.counts_by('channel') == {'desktop': 5}
+
+    buffer.clear()
+    assert len(buffer) == 0 and buffer.query() == [] and buffer.counts_by('type') == {}
+    buffer.append(_entry(20))
+    assert [entry.id for entry in buffer] == ['n20']
+
+    with pytest.raises(ValueError):
+        NotificationHistoryBuffer(capacity=0)
+
+
+def test_unread_counter_tracks_reads_and_evictions():
+    buffer = NotificationHistoryBuffer(capacity=3)
+    for i in range(3):
+        buffer.append(_entry(i))
+    assert buffer.unread_count == 3
+    assert buffer.mark_read(['n1', 'n1', 'missing']) == 1
+    assert buffer.unread_count == 2
+
+    # Evicting an unread entry and then a read one
+    buffer.append(_entry(3))
+    assert buffer.unread_count == 2
+    buffer.append(_entry(4))
+    assert buffer.unread_count == 3
+
+    assert buffer.mark_read() == 3
+    assert buffer.unread_count == 0
+    assert all(entry.is_read for entry in buffer)
+
+
+def test_manager_history_queries_use_the_buffer():
+    manager = NotificationManager(None, None, history_capacity=100)
+    for i in range(150):
+        priority = NotificationPriority.URGENT if i % 10 == 0 else NotificationPriority.NORMAL
+        manager.history.append(_entry(i, bot_id=i % 4, priority=priority,
+                                      channels=(NotificationChannel.DESKTOP, NotificationChannel.WEBHOOK)))
+
+    urgent = manager.get_notification_history_sync(priority=NotificationPriority.URGENT)
+    assert [entry.id for entry in urgent] == [f'n{i}' for i in range(140, 49, -10)]
+    assert [entry.id for entry in manager.get_notification_history_sync(limit=3, bot_id=2,
+                                                                        channel=NotificationChannel.WEBHOOK)] == [
+        'n146', 'n142', 'n138']
+    assert manager.count_notifications(bot_id=3) == 25
+    assert manager.get_unread_count() == 100
+    manager.mark_notifications_read(['n149'])
+    assert manager.get_unread_count() == 99
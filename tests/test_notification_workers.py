@@ -0,0 +1,223 @@
+import asyncio
+import smtplib
+import socket
+import threading
+import time
+
+import pytest
+from aiohttp import web
+
+from app.notification_transport import SMTPConnectionPool
+from app.notifications import (
+    NotificationChannel,
+    NotificationConfig,
+    NotificationManager,
+    NotificationPriority,
+    NotificationType,
+)
+
+
+class SMTPStub:
+    """Minimal plain-text SMTP server counting connections and messages."""
+
+    def __init__(self, data_delay=0.0):
+        self.data_delay = data_delay
+        self.connections = 0
+        self.messages = []
+        self._sock = socket.socket()
+        self._sock.bind(('127.0.0.1', 0))
+        self._sock.listen()
+        self.port = self._sock.getsockname()[1]
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self._session, args=(conn,), daemon=True).start()
+
+    def _session(self, conn):
+        stream = conn.makefile('rb')
+        conn.sendall(b'220 stub\r\n')
+        try:
+            for line in stream:
+                command = line.strip().upper()
+                if command.startswith(b'EHLO') or command.startswith(b'HELO'):
+                    conn.sendall(b'250 stub\r\n')
+                elif command == b'DATA':
+                    conn.sendall(b'354 go\r\n')
+                    body = []
+                    for data_line in stream:
+                        if data_line == b'.\r\n':
+                            break
+                        body.append(data_line)
+                    time.sleep(self.data_delay)
+                    self.messages.append(b''.join(body))
+                    conn.sendall(b'250 queued\r\n')
+                elif command.startswith(b'RCPT') and b'refused' in command.lower():
+                    conn.sendall(b'550 no such user\r\n')
+                elif command == b'QUIT':
+                    conn.sendall(b'221 bye\r\n')
+                    break
+                else:
+                    conn.sendall(b'250 ok\r\n')
+        finally:
+            conn.close()
+
+    def close(self):
+        self._sock.close()
+
+
+class WebhookStub:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.received = []
+        self.active = 0
+        self.max_active = 0
+        self._runner = None
+        self.url = None
+
+    async def _handle(self, request):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            payload = await request.json()
+            await asyncio.sleep(self.delay)
+            self.received.append((payload['title'], time.perf_counter()))
+            return web.json_response({'ok': True})
+        finally:
+            self.active -= 1
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_post('/hook', self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f'http://127.0.0.1:{port}/hook'
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._runner.cleanup()
+
+
+async def _manager(worker_count=4, smtp=None, webhook=None, webhook_settings=None):
+    manager = NotificationManager(None, None, worker_count=worker_count)
+    await manager.initialize()
+    if smtp is not None:
+        manager.channel_configs[NotificationChannel.EMAIL] = NotificationConfig(
+            channel=NotificationChannel.EMAIL,
+            settings={'smtp_server': '127.0.0.1', 'smtp_port': smtp.port, 'use_tls': False,
+                      'from_email': 'bot@example.com', 'to_emails': ['ops@example.com']},
+        )
+    if webhook is not None:
+        manager.channel_configs[NotificationChannel.WEBHOOK] = NotificationConfig(
+            channel=NotificationChannel.WEBHOOK,
+            settings={'url': webhook.url, **(webhook_settings or {})},
+        )
+    return manager
+
+
+def test_slow_email_does_not_delay_urgent_webhook():
+    smtp = SMTPStub(data_delay=0.6)
+
+    async def scenario():
+        async with WebhookStub() as hook:
+            manager = await _manager(smtp=smtp, webhook=hook)
+            await manager.start()
+            started = time.perf_counter()
+            await manager.send_notification('digest', 'slow', channels=[NotificationChannel.EMAIL])
+            await manager.send_notification('risk', 'stop loss hit', notification_type=NotificationType.CRITICAL,
+                                            channels=[NotificationChannel.WEBHOOK])
+            await manager.notification_queue.join()
+            elapsed = time.perf_counter() - started
+            await manager.stop()
+            return hook.received[0][1] - started, elapsed, manager
+
+    webhook_latency, elapsed, manager = asyncio.run(scenario())
+    smtp.close()
+    assert webhook_latency < 0.4 < elapsed
+    assert {entry.title: entry.status for entry in manager.history} == {'digest': 'sent', 'risk': 'sent'}
+    latency = manager.get_channel_latency()
+    assert latency['email']['count'] == 1 and latency['email']['max_ms'] >= 500
+    assert latency['webhook']['errors'] == 0
+
+
+def test_urgent_and_critical_notifications_jump_the_queue():
+    async def scenario():
+        async with WebhookStub() as hook:
+            manager = await _manager(worker_count=1, webhook=hook)
+            channels = [NotificationChannel.WEBHOOK]
+            await manager.send_notification('low', 'm', channels=channels, priority=NotificationPriority.LOW)
+            await manager.send_notification('normal', 'm', channels=channels)
+            await manager.send_notification('urgent', 'm', channels=channels, priority=NotificationPriority.URGENT)
+            await manager.send_notification('critical', 'm', channels=channels,
+                                            notification_type=NotificationType.CRITICAL)
+            await manager.send_notification('high', 'm', channels=channels, priority=NotificationPriority.HIGH)
+            await manager.start()
+            await manager.notification_queue.join()
+            await manager.stop()
+            return [title for title, _ in hook.received]
+
+    assert asyncio.run(scenario()) == ['urgent', 'critical', 'high', 'normal', 'low']
+
+
+def test_smtp_connection_is_reused_across_sends():
+    smtp = SMTPStub()
+
+    async def scenario():
+        manager = await _manager(smtp=smtp)
+        await manager.start()
+        for i in range(3):
+            await manager.send_notification(f'mail {i}', 'body', channels=[NotificationChannel.EMAIL])
+            await manager.notification_queue.join()
+        stats = dict(manager.smtp_pool.stats)
+        await manager.stop()
+        return stats
+
+    stats = asyncio.run(scenario())
+    smtp.close()
+    assert len(smtp.messages) == 3
+    assert smtp.connections == 1
+    assert stats == {'connects': 1, 'reuses': 2, 'sends': 3, 'reconnects': 0}
+
+
+def test_smtp_refusal_returns_connection_to_pool():
+    smtp = SMTPStub()
+    pool = SMTPConnectionPool()
+    settings = {'smtp_server': '127.0.0.1', 'smtp_port': smtp.port, 'use_tls': False}
+
+    async def scenario():
+        with pytest.raises(smtplib.SMTPRecipientsRefused):
+            await pool.send(settings, 'bot@example.com', ['refused@example.com'], 'Subject: x\r\n\r\nbody')
+        # Refusals are not retried and the connection is checked back in
+        assert sum(len(idle) for idle in pool._idle.values()) == 1
+        await pool.send(settings, 'bot@example.com', ['user@example.com'], 'Subject: y\r\n\r\nbody')
+
+    asyncio.run(scenario())
+    pool.close()
+    smtp.close()
+    assert smtp.connections == 1 and len(smtp.messages) == 1
+    assert pool.stats == {'connects': 1, 'reuses': 1, 'sends': 1, 'reconnects': 0}
+
+
+def test_channel_concurrency_limit_is_respected():
+    async def scenario():
+        async with WebhookStub(delay=0.1) as hook:
+            manager = await _manager(worker_count=6, webhook=hook, webhook_settings={'max_concurrency': 2})
+            await manager.start()
+            for i in range(6):
+                await manager.send_notification(f'n{i}', 'm', channels=[NotificationChannel.WEBHOOK])
+            await manager.notification_queue.join()
+            await manager.stop()
+            return hook, manager.get_channel_latency()
+
+    hook, latency = asyncio.run(scenario())
+    assert len(hook.received) == 6
+    assert hook.max_active == 2
+    assert latency['webhook']['count'] == 6 and latency['webhook']['p95_ms'] >= 100
@@ -0,0 +1,78 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from app.database import DatabaseManager
+from app.sqlite_profile import resolve_pragmas
+
+
+def test_default_profile_is_active_after_initialize(tmp_path):
+    async def scenario():
+        db = DatabaseManager(db_path=tmp_path / 'perf.db')
+        await db.initialize()
+        active = await db.check_pragmas()
+        await db.close()
+        return active
+
+    active = asyncio.run(scenario())
+    assert active['journal_mode'] == 'wal'
+    assert active['synchronous'] == 1
+    assert active['foreign_keys'] == 1
+    assert active['busy_timeout'] == 5000
+    assert active['cache_size'] == -65536
+    assert active['temp_store'] == 2
+
+
+def test_profile_overrides_are_whitelisted():
+    pragmas = resolve_pragmas({'synchronous': 'FULL', 'mmap_size': None})
+    assert pragmas['synchronous'] == 'FULL'
+    assert 'mmap_size' not in pragmas
+    with pytest.raises(ValueError):
+        resolve_pragmas({'writable_schema': 'ON'})
+
+
+def test_dashboard_reads_do_not_wait_for_open_write_transaction(tmp_path):
+    async def scenario():
+        db = DatabaseManager(db_path=tmp_path / 'perf.db', read_pool_size=2)
+        await db.initialize()
+        await db.add_log('committed')
+
+        # The writer holds an open transaction with an uncommitted row
+        writer = await db.get_connection()
+        await writer.execute("INSERT INTO logs (type, level, message) VALUES ('info', 'info', 'pending')")
+        logs = await asyncio.wait_for(db.get_logs(), timeout=2.0)
+        await writer.commit()
+        after = await db.get_logs()
+
+        async with db.read_connection() as conn:
+            with pytest.raises(sqlite3.OperationalError):
+                await conn.execute("DELETE FROM logs")
+
+        async def hold():
+            async with db.read_connection():
+                await asyncio.sleep(0.05)
+
+        await asyncio.gather(*(hold() for _ in range(4)))
+        stats = dict(db._read_pool.stats)
+        await db.close()
+        return logs, after, stats
+
+    logs, after, stats = asyncio.run(scenario())
+    assert [log['message'] for log in logs] == ['committed']
+    assert sorted(log['message'] for log in after) == ['committed', 'pending']
+    assert stats['opened'] == 2
+    assert stats['waited'] >= 2
+
+
+def test_pooled_reads_see_buffered_writes(tmp_path):
+    async def scenario():
+        db = DatabaseManager(db_path=tmp_path / 'perf.db')
+        await db.initialize()
+        db.enable_write_behind(max_batch=1000, max_delay=60.0)
+        await db.add_log('buffered')
+        logs = await db.get_logs()
+        await db.close()
+        return logs
+
+    assert [log['message'] for log in asyncio.run(scenario())] == ['buffered']
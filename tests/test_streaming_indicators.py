@@ -0,0 +1,198 @@
+import math
+import random
+
+import pytest
+
+from utils.indicators import (
+    IndicatorFeed,
+    IndicatorRegistry,
+    compute,
+    create_indicator,
+    series,
+)
+
+
+def _prices(n=300, seed=7):
+    rng = random.Random(seed)
+    price = 100.0
+    closes, highs, lows = [], [], []
+    for _ in range(n):
+        price = max(1.0, price + rng.uniform(-2, 2))
+        closes.append(price)
+        highs.append(price + rng.uniform(0, 1.5))
+        lows.append(price - rng.uniform(0, 1.5))
+    return closes, highs, lows
+
+
+def _ema(values, period):
+    alpha = 2 / (period + 1)
+    ema = sum(values[:period]) / period
+    out = [ema]
+    for v in values[period:]:
+        ema = (v - ema) * alpha + ema
+        out.append(ema)
+    return out
+
+
+def _wilder_rsi(closes, period):
+    deltas = [b - a for a, b in zip(closes, closes[1:])]
+    gains = [max(d, 0.0) for d in deltas]
+    losses = [max(-d, 0.0) for d in deltas]
+    avg_gain = sum(gains[:period]) / period
+    avg_loss = sum(losses[:period]) / period
+    for g, l in zip(gains[period:], losses[period:]):
+        avg_gain = (avg_gain * (period - 1) + g) / period
+        avg_loss = (avg_loss * (period - 1) + l) / period
+    return 100.0 if avg_loss == 0 else 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+def test_streaming_values_match_batch_formulas():
+    closes, highs, lows = _prices()
+
+    assert compute("sma", closes, period=20).value == pytest.approx(sum(closes[-20:]) / 20)
+    assert compute("ema", closes, period=12).value == pytest.approx(_ema(closes, 12)[-1])
+    assert compute("rsi", closes, period=14).value == pytest.approx(_wilder_rsi(closes, 14))
+
+    macd = compute("macd", closes, fast=12, slow=26, signal=9)
+    fast, slow = _ema(closes, 12), _ema(closes, 26)
+    line = [f - s for f, s in zip(fast[26 - 12:], slow)]
+    assert macd.value == pytest.approx(line[-1])
+    assert macd.signal == pytest.approx(_ema(line, 9)[-1])
+    assert macd.histogram == pytest.approx(line[-1] - _ema(line, 9)[-1])
+
+    bb = compute("bollinger", closes, period=20, std_dev=2.0)
+    window = closes[-20:]
+    mean = sum(window) / 20
+    std = math.sqrt(sum((x - mean) ** 2 for x in window) / 20)
+    assert bb.value == pytest.approx(mean)
+    assert bb.upper == pytest.approx(mean + 2 * std)
+    assert bb.lower == pytest.approx(mean - 2 * std)
+
+    atr = compute("atr", closes, highs, lows, period=14)
+    trs = [max(h - l, abs(h - pc), abs(l - pc)) for h, l, pc in zip(highs[1:], lows[1:], closes)]
+    expected = sum(trs[:14]) / 14
+    for tr in trs[14:]:
+        expected = (expected * 13 + tr) / 14
+    assert atr.value == pytest.approx(expected)
+
+    stoch = compute("stochastic", closes, highs, lows, k_period=14, d_period=3)
+    ks = []
+    for i in range(13, len(closes)):
+        hh, ll = max(highs[i - 13:i + 1]), min(lows[i - 13:i + 1])
+        ks.append((closes[i] - ll) / (hh - ll) * 100)
+    assert stoch.k == pytest.approx(ks[-1])
+    assert stoch.d == pytest.approx(sum(ks[-3:]) / 3)
+    assert series("stochastic", closes, highs, lows, k_period=14) == pytest.approx(ks)
+
+
+@pytest.mark.parametrize("kind,params", [
+    ("sma", {"period": 10}),
+    ("ema", {"period": 10}),
+    ("rsi", {"period": 14}),
+    ("atr", {"period": 14}),
+    ("bollinger", {"period": 20}),
+    ("macd", {}),
+    ("stochastic", {"k_period": 14}),
+])
+def test_revise_is_equivalent_to_replacing_the_last_bar(kind, params):
+    closes, highs, lows = _prices(120, seed=3)
+    live = create_indicator(kind, **params)
+    for c, h, l in zip(closes, highs, lows):
+        # A few intrabar ticks, the last one carrying the final bar values
+        live.update(c - 1.0, h - 0.5, l + 0.5)
+        live.revise(c + 0.7, h, l + 0.5)
+        live.revise(c, h, l)
+    reference = compute(kind, closes, highs, lows, **params)
+    assert live.snapshot() == pytest.approx(reference.snapshot())
+
+
+T0 = 1_700_000_040_000  # epoch ms, aligned to a minute
+
+
+def test_feed_buckets_ticks_into_bars_and_seeds_late_indicators():
+    feed = IndicatorFeed("BTC/USDT", "1m")
+    closes, _, _ = _prices(60, seed=11)
+    for minute, close in enumerate(closes):
+        base = T0 + minute * 60_000
+        feed.push(close + 0.5, ts=base + 1_000)
+        feed.push(close, ts=base + 30_000)
+    # Stale observation from an already closed bar is ignored
+    assert feed.push(1.0, ts=T0) is False
+
+    assert len(feed) == 60
+    assert feed.stats()["revisions"] == 60
+    assert feed.get("sma", period=20).value == pytest.approx(sum(closes[-20:]) / 20)
+    rsi = feed.get("rsi", period=14)
+    assert rsi.value == pytest.approx(_wilder_rsi(closes, 14))
+
+    # Live updates keep the already created instance current
+    feed.push(closes[-1] + 5, ts=T0 + 60 * 60_000)
+    assert rsi.value == pytest.approx(_wilder_rsi(closes + [closes[-1] + 5], 14))
+
+
+def test_registry_shares_instances_between_bots():
+    registry = IndicatorRegistry()
+    bot_a = registry.get("BTC/USDT", "1m", "rsi", period=14)
+    bot_b = registry.get("btc-usdt", "1m", "rsi", period=14)
+    other = registry.get("BTC/USDT", "1m", "rsi", period=7)
+
+    assert bot_a is bot_b
+    assert other is not bot_a
+
+    closes, _, _ = _prices(30, seed=5)
+    candles = [[T0 + i * 60_000, c, c, c, c, 1.0] for i, c in enumerate(closes)]
+    # Both bots load the same candle history - the second load is deduplicated
+    registry.feed("BTC/USDT", "1m").extend(candles)
+    registry.feed("BTCUSDT", "1m").extend(candles)
+    assert bot_a.count == 30
+    assert bot_a.value == pytest.approx(_wilder_rsi(closes, 14))
+
+
+def test_ai_bot_feeds_provider_candles_at_their_own_timeframe(monkeypatch):
+    import asyncio
+    from datetime import datetime, timedelta
+
+    from app.strategy import ai_trading_bot
+    from app.strategy.ai_trading_bot import AITradingBot
+
+    registry = IndicatorRegistry()
+    monkeypatch.setattr(ai_trading_bot, "get_indicator_registry", lambda: registry)
+    closes, highs, lows = _prices(90)
+    start = datetime(2024, 1, 1)
+
+    def candles(stamped):
+        return [
+            {"timestamp": (start + timedelta(minutes=i)).isoformat() if stamped else None,
+             "open": c, "high": h, "low": l, "close": c, "volume": 1.0}
+            for i, (c, h, l) in enumerate(zip(closes, highs, lows))
+        ]
+
+    class Exchange:
+        async def get_ohlcv(self, pair, timeframe, limit=100):
+            return []
+
+    class Provider:
+        snapshot = None
+
+        def get_last_snapshot(self):
+            return self.snapshot
+
+    bot = AITradingBot.__new__(AITradingBot)
+    bot.parameters = {"pair": "BTC/USDT"}
+    bot.exchange = Exchange()
+    bot.ai_data_provider = Provider()
+    bot.latest_ai_snapshot = None
+    bot.market_history = []
+    bot.current_market_condition = None
+    bot.logger = ai_trading_bot.get_logger("test")
+    bot.bot_id = "t"
+
+    expected_rsi = compute("rsi", closes, period=14).value
+    for stamped in (True, False):
+        bot.ai_data_provider.snapshot = {"candles": {"BTCUSDT": candles(stamped)}, "candle_timeframe": "1m"}
+        condition = asyncio.run(bot._analyze_market_conditions())
+        assert condition.rsi == pytest.approx(expected_rsi)
+        assert condition.macd_signal != 0
+    # Real timestamps go to the shared 1m feed; synthetic ones never touch the registry
+    assert len(registry.feed("BTC/USDT", "1m")) == 90
+    assert len(registry.feed("BTC/USDT", "1h")) == 0
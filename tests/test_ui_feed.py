@@ -0,0 +1,135 @@
+import asyncio
+from dataclasses import dataclass
+
+from core.ui_feed import FeedDiff, FeedPublisher, FeedState, normalize_bot
+from ui.async_helper import UIFeedBridge
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@dataclass
+class _Bot:
+    id: int
+    name: str
+    status: str
+    profit: float
+
+
+def test_feed_state_emits_only_changed_records():
+    state = FeedState()
+    bots = {'1': normalize_bot(_Bot(1, 'grid', 'running', 1.5)), '2': normalize_bot(_Bot(2, 'dca', 'stopped', 0.0))}
+    first = state.diff(bots=bots, portfolio={'total_value': 100.0, 'last_updated': 'a'})
+    assert set(first.bots) == {'1', '2'} and first.portfolio['total_value'] == 100.0
+    assert first.bots['1']['pnl'] == 1.5
+
+    # Ten sam stan (poza znacznikiem czasu) nie generuje różnicy
+    unchanged = state.diff(bots=dict(bots), portfolio={'total_value': 100.0, 'last_updated': 'b'})
+    assert unchanged.is_empty()
+
+    changed = dict(bots, **{'1': dict(bots['1'], status='stopped')})
+    del changed['2']
+    diff = state.diff(bots=changed)
+    assert list(diff.bots) == ['1'] and diff.bots_removed == ['2']
+
+    # Aktualizacja pojedynczego bota nie usuwa pozostałych
+    partial = state.diff(bots={'3': normalize_bot({'id': 3, 'status': 'running'})}, partial=True)
+    assert list(partial.bots) == ['3'] and not partial.bots_removed
+    assert set(state.snapshot().bots) == {'1', '3'}
+
+
+def test_feed_state_reports_only_new_trades():
+    state = FeedState(trade_history=3)
+    older = [{'id': 2, 'side': 'buy'}, {'id': 1, 'side': 'sell'}]
+    assert [t['id'] for t in state.diff(trades=older).trades] == [2, 1]
+    newer = [{'id': 4}, {'id': 3}] + older
+    assert [t['id'] for t in state.diff(trades=newer).trades] == [4, 3]
+    assert state.diff(trades=newer).is_empty()
+    assert [t['id'] for t in state.snapshot().trades] == [4, 3, 2]
+
+
+def test_publisher_coalesces_diffs_within_one_frame():
+    clock = FakeClock()
+    publisher = FeedPublisher(max_fps=10, clock=clock)
+    received = []
+    publisher.subscribe(received.append)
+
+    async def scenario():
+        publisher.publish(FeedDiff(bots={'1': {'id': '1', 'status': 'running'}}))
+        publisher.publish(FeedDiff(bots={'2': {'id': '2'}}, trades=[{'id': 1}]))
+        publisher.publish(FeedDiff(bots_removed=['2'], trades=[{'id': 2}]))
+        await asyncio.sleep(0.01)
+        assert len(received) == 1
+        # Kolejna różnica w tej samej ramce czeka na koniec okna 100 ms
+        publisher.publish(FeedDiff(portfolio={'total_value': 1.0}))
+        await asyncio.sleep(0.01)
+        assert len(received) == 1
+        await asyncio.sleep(0.15)
+
+    asyncio.run(scenario())
+    first, second = received
+    assert list(first.bots) == ['1'] and first.bots_removed == ['2']
+    assert [t['id'] for t in first.trades] == [2, 1]
+    assert second.portfolio == {'total_value': 1.0} and second.seq == first.seq + 1
+    assert publisher.stats == {'published': 4, 'coalesced': 2, 'flushed': 2}
+
+    # Puste różnice nie budzą subskrybentów
+    publisher.publish(FeedDiff())
+    assert len(received) == 2
+
+
+class _FakeManager:
+    def __init__(self, state):
+        self.state = state
+        self.subscribers = []
+        self.refreshes = 0
+
+    def subscribe_to_feed(self, callback):
+        self.subscribers.append(callback)
+
+    def unsubscribe_from_feed(self, callback):
+        self.subscribers.remove(callback)
+
+    def get_feed_snapshot(self):
+        return self.state.snapshot()
+
+    async def refresh_ui_feed(self):
+        self.refreshes += 1
+
+
+class _Runtime:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, coro):
+        self.submitted.append(coro)
+        coro.close()
+
+
+def test_bridge_sends_snapshot_to_new_widgets_then_diffs():
+    state = FeedState()
+    manager = _FakeManager(state)
+    runtime = _Runtime()
+    bridge = UIFeedBridge(manager, runtime=runtime)
+
+    empty_widget = []
+    bridge.connect_widget(empty_widget.append)
+    # Brak danych - zamiast pustej migawki wymuszane jest przeliczenie feedu
+    assert empty_widget == [] and len(runtime.submitted) == 1
+
+    state.diff(bots={'1': {'id': '1', 'status': 'running'}})
+    widget = []
+    bridge.connect_widget(widget.append)
+    assert widget[0].full and list(widget[0].bots) == ['1']
+
+    manager.subscribers[0](FeedDiff(bots_removed=['1']))
+    assert widget[-1].bots_removed == ['1'] and empty_widget[-1].bots_removed == ['1']
+
+    bridge.disconnect_widget(widget.append)
+    bridge.close()
+    assert manager.subscribers == []
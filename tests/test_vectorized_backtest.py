@@ -0,0 +1,110 @@
+import random
+
+import numpy as np
+import pytest
+
+from backtesting.backtester import backtest, sma_cross_strategy
+from backtesting.vectorized import (
+    OHLCVArrays,
+    backtest_sma_cross,
+    load_ohlcv_arrays,
+    positions_from_signals,
+    sweep,
+)
+
+
+def _candles(n=600, seed=1):
+    rng = random.Random(seed)
+    price = 100.0
+    out = []
+    for i in range(n):
+        price = max(1.0, price * (1 + rng.uniform(-0.01, 0.01)))
+        out.append({'t': 1_700_000_000_000 + i * 60_000, 'o': price, 'h': price * 1.002,
+                    'l': price * 0.998, 'c': price, 'v': rng.uniform(1, 10)})
+    return out
+
+
+@pytest.mark.parametrize("seed,short,long", [(1, 10, 20), (2, 5, 30), (3, 3, 7), (4, 20, 50)])
+def test_vectorized_matches_reference_backtest(seed, short, long):
+    candles = _candles(seed=seed)
+    expected = backtest(candles, sma_cross_strategy(short, long))
+    result = backtest_sma_cross(candles, short, long)
+
+    assert result['trades'] == expected['trades']
+    assert result['returns'] == pytest.approx(expected['returns'])
+    assert result['equity'] == pytest.approx(expected['equity'])
+    for key, value in expected['metrics'].items():
+        assert result['metrics'][key] == pytest.approx(value), key
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_vectorized_matches_reference_on_tick_rounded_prices(seed):
+    rng = random.Random(seed)
+    price = 100.0
+    candles = []
+    for i in range(300):
+        price = max(1.0, round(price + rng.choice([-0.1, 0.0, 0.1]), 1))
+        candles.append({'t': i, 'o': price, 'h': price, 'l': price, 'c': price, 'v': 1.0})
+    short, long = rng.choice([(3, 7), (5, 10), (10, 20)])
+    expected = backtest(candles, sma_cross_strategy(short, long))
+    result = backtest_sma_cross(candles, short, long)
+    assert result['trades'] == expected['trades']
+
+
+def test_strategy_does_not_reuse_signals_across_candle_lists():
+    strategy = sma_cross_strategy(3, 7)
+    for seed in range(20):
+        candles = _candles(n=120, seed=seed)
+        assert backtest(candles, strategy) == backtest(candles, sma_cross_strategy(3, 7))
+        # In-place edit keeps id() and len() but must change the signals
+        for c in candles:
+            c['c'] = -c['c'] + 300.0
+        assert backtest(candles, strategy)['trades'] == backtest_sma_cross(candles, 3, 7)['trades']
+        del candles
+    # Direct calls (without backtest) see only the candles passed in
+    candles = _candles(n=60, seed=99)
+    direct = [strategy(candles, i) for i in range(len(candles))]
+    assert direct == [sma_cross_strategy(3, 7).prepare(candles)(candles, i) for i in range(len(candles))]
+
+
+def test_position_open_at_end_is_closed_on_last_candle():
+    buy = np.array([False, True, False, True, False])
+    sell = np.zeros(5, dtype=bool)
+    entries, exits = positions_from_signals(buy, sell)
+    # Repeated buy is ignored, the open position is closed on the last candle
+    assert entries.tolist() == [1]
+    assert exits.tolist() == [4]
+
+    # An entry on the very last candle is never filled
+    buy = np.array([False, False, False, False, True])
+    entries, exits = positions_from_signals(buy, sell)
+    assert entries.tolist() == [] and exits.tolist() == []
+
+
+def test_sweep_matches_single_runs_and_applies_costs():
+    data = OHLCVArrays.from_candles(_candles(seed=7))
+    results = sweep(data, shorts=[5, 10], longs=[10, 30], fees=[0.0, 0.001], slippages=[0.0, 0.0005])
+
+    # (10, 10) is skipped; three window pairs x four cost variants
+    assert len(results) == 3 * 4
+    by_key = {(r['short'], r['long'], r['fee'], r['slippage']): r['metrics'] for r in results}
+    for short, long in [(5, 10), (5, 30), (10, 30)]:
+        single = backtest_sma_cross(data, short, long, fee=0.001, slippage=0.0005)
+        swept = by_key[(short, long, 0.001, 0.0005)]
+        for key, value in single['metrics'].items():
+            assert swept[key] == pytest.approx(value), key
+        free = by_key[(short, long, 0.0, 0.0)]
+        assert free['num_trades'] == swept['num_trades']
+        if free['num_trades']:
+            assert swept['total_pnl'] < free['total_pnl']
+
+
+def test_load_ohlcv_arrays_reads_columns(tmp_path):
+    path = tmp_path / "ohlcv.csv"
+    path.write_text("timestamp,open,high,low,close,volume\n1,10,11,9,10.5,100\n2,10.5,12,10,11.5,200\n",
+                    encoding="utf-8")
+    arrays = load_ohlcv_arrays(path)
+    assert len(arrays) == 2
+    assert arrays.t.tolist() == [1, 2]
+    assert arrays.c.tolist() == [10.5, 11.5]
+    assert arrays.v.tolist() == [100.0, 200.0]
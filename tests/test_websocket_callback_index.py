@@ -0,0 +1,110 @@
+import asyncio
+import json
+
+from core.websocket_callback_manager import WebSocketCallbackManager, WebSocketEventType
+
+
+BINANCE_TICKER = {"s": "BTCUSDT", "c": "30000", "p": "10", "P": "0.1", "h": "31000", "l": "29000", "v": "123"}
+
+
+def test_dispatch_is_scoped_by_exchange_and_symbol():
+    mgr = WebSocketCallbackManager()
+    calls = []
+    mgr.register_callback(WebSocketEventType.TICKER, "BTCUSDT", "binance", lambda d: calls.append(("binance", d.symbol)))
+    mgr.register_callback(WebSocketEventType.TICKER, "BTCUSDT", "bybit", lambda d: calls.append(("bybit", d.symbol)))
+    mgr.register_callback(WebSocketEventType.TICKER, "ETHUSDT", "binance", lambda d: calls.append(("eth", d.symbol)))
+    mgr.register_callback(WebSocketEventType.TICKER, "*", "binance", lambda d: calls.append(("wild", d.symbol)))
+
+    asyncio.run(mgr.process_websocket_message("binance", BINANCE_TICKER, WebSocketEventType.TICKER))
+
+    assert sorted(calls) == [("binance", "BTCUSDT"), ("wild", "BTCUSDT")]
+
+
+def test_index_updates_incrementally_on_unregister():
+    mgr = WebSocketCallbackManager()
+    calls = []
+
+    async def on_ticker(data):
+        calls.append(data.price)
+
+    cid = mgr.register_callback(WebSocketEventType.TICKER, "BTCUSDT", "binance", on_ticker)
+    assert len(mgr.get_matching_callbacks(WebSocketEventType.TICKER, "BTCUSDT", "binance")) == 1
+
+    asyncio.run(mgr.process_websocket_message("binance", BINANCE_TICKER, WebSocketEventType.TICKER))
+    info = mgr.get_callback_info(cid)
+    assert info["call_count"] == 1
+    assert info["last_called"] is not None
+
+    mgr.unregister_callback(cid)
+    assert mgr.get_matching_callbacks(WebSocketEventType.TICKER, "BTCUSDT", "binance") == ()
+    assert mgr.get_callback_statistics()["dispatch_index_keys"] == 0
+
+    asyncio.run(mgr.process_websocket_message("binance", BINANCE_TICKER, WebSocketEventType.TICKER))
+    assert calls == [30000.0]
+
+
+def test_callback_can_unregister_itself_during_dispatch():
+    mgr = WebSocketCallbackManager()
+    calls = []
+    ids = {}
+
+    def first(data):
+        calls.append("first")
+        mgr.unregister_callback(ids["second"])
+
+    ids["first"] = mgr.register_callback(WebSocketEventType.TICKER, "BTCUSDT", "binance", first)
+    ids["second"] = mgr.register_callback(WebSocketEventType.TICKER, "BTCUSDT", "binance", lambda d: calls.append("second"))
+
+    asyncio.run(mgr.process_websocket_message("binance", BINANCE_TICKER, WebSocketEventType.TICKER))
+    # Snapshot of the bucket is taken before dispatch, so both fire once
+    assert calls == ["first", "second"]
+    assert len(mgr.get_matching_callbacks(WebSocketEventType.TICKER, "BTCUSDT", "binance")) == 1
+
+
+def test_unsubscribed_frames_are_dropped_before_decoding():
+    mgr = WebSocketCallbackManager()
+    decoded = []
+    real_loads = mgr.decoder.loads
+
+    class CountingDecoder:
+        name = "counting"
+        decode_error = ValueError
+
+        def loads(self, raw):
+            decoded.append(raw)
+            return real_loads(raw)
+
+    mgr.decoder = CountingDecoder()
+    received = []
+    mgr.register_callback(WebSocketEventType.TICKER, "ETHUSDT", "binance", received.append)
+
+    frame = json.dumps(BINANCE_TICKER)
+    asyncio.run(mgr.process_websocket_message("binance", frame, WebSocketEventType.TICKER))
+    asyncio.run(mgr.process_websocket_message("binance", frame.encode(), WebSocketEventType.TICKER))
+    assert decoded == []
+    assert mgr.get_callback_statistics()["messages_dropped_unsubscribed"] == 2
+
+    eth_frame = json.dumps(dict(BINANCE_TICKER, s="ETHUSDT", c="2000"))
+    asyncio.run(mgr.process_websocket_message("binance", eth_frame, WebSocketEventType.TICKER))
+    assert len(decoded) == 1
+    assert [t.price for t in received] == [2000.0]
+
+
+def test_parsers_are_synchronous_and_return_slotted_records():
+    mgr = WebSocketCallbackManager()
+    ticker = mgr._parse_binance_data(BINANCE_TICKER, WebSocketEventType.TICKER)
+    assert ticker.symbol == "BTCUSDT" and ticker.price == 30000.0
+    assert not hasattr(ticker, "__dict__")
+
+    book = mgr._parse_binance_data(
+        {"s": "BTCUSDT", "b": [["100.0", "1.5"]], "a": [["101.0", "2"]]}, WebSocketEventType.ORDER_BOOK
+    )
+    assert book.bids == [[100.0, 1.5]] and book.asks == [[101.0, 2.0]]
+
+
+def test_json_codec_falls_back_to_stdlib():
+    from utils.json_codec import available_decoders, get_decoder
+
+    assert "json" in available_decoders()
+    assert get_decoder("json").loads(b'{"a": 1}') == {"a": 1}
+    assert get_decoder("does-not-exist").name == available_decoders()[0]
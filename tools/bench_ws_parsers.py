@@ -0,0 +1,118 @@
+"""Benchmark parserów WebSocket (wiadomości/s dla każdej giełdy i dekodera JSON).
+
+Mierzy trzy ścieżki na syntetycznych ramkach:
+  * ``parse``   - dekodowanie JSON + synchroniczny parser giełdy,
+  * ``dispatch`` - pełne ``process_websocket_message`` z jednym subskrybentem,
+  * ``drop``    - ramka bez subskrybentów (odrzucana przed dekodowaniem).
+
+Użycie:
+    python tools/bench_ws_parsers.py --messages 50000
+    python tools/bench_ws_parsers.py --decoder json --exchange binance
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core.websocket_callback_manager import WebSocketCallbackManager, WebSocketEventType  # noqa: E402
+from utils.json_codec import available_decoders, get_decoder  # noqa: E402
+
+SAMPLES = {
+    "binance": ("BTCUSDT", {
+        "e": "24hrTicker", "E": 1700000000000, "s": "BTCUSDT", "p": "120.5", "P": "0.42",
+        "c": "30000.10", "b": "29999.90", "a": "30000.20", "h": "30500.00", "l": "29500.00",
+        "v": "12345.678", "q": "370000000.0",
+    }),
+    "bybit": ("BTCUSDT", {
+        "topic": "tickers.BTCUSDT", "type": "snapshot", "ts": 1700000000000,
+        "data": {"symbol": "BTCUSDT", "lastPrice": "30000.1", "price24hPcnt": "0.0042",
+                 "highPrice24h": "30500", "lowPrice24h": "29500", "volume24h": "12345.6"},
+    }),
+    "kucoin": ("BTC-USDT", {
+        "type": "message", "topic": "/market/snapshot:BTC-USDT", "subject": "trade.snapshot",
+        "data": {"symbol": "BTC-USDT", "price": "30000.1", "changePrice": "120.5", "changeRate": "0.0042",
+                 "high": "30500", "low": "29500", "vol": "12345.6"},
+    }),
+    "coinbase": ("BTC-USD", {
+        "type": "ticker", "sequence": 1, "product_id": "BTC-USD", "price": "30000.10",
+        "open_24h": "29880", "volume_24h": "12345.6", "low_24h": "29500", "high_24h": "30500",
+        "best_bid": "29999.9", "best_ask": "30000.2", "time": "2023-11-14T22:13:20.000000Z",
+    }),
+    "bitfinex": ("tBTCUSD", [29999.9, 1.2, 30000.2, 0.8, 120.5, 0.0042, 30000.1, 12345.6, 30500, 29500]),
+    "kraken": ("XBT/USD", [
+        340, {"a": ["30000.2", 1, "1.0"], "b": ["29999.9", 1, "1.0"], "c": ["30000.1", "0.01"],
+              "v": ["100.0", "12345.6"], "h": ["30400", "30500"], "l": ["29600", "29500"]},
+        "ticker", "XBT/USD",
+    ]),
+}
+
+
+def _rate(count: int, elapsed: float) -> float:
+    return count / elapsed if elapsed > 0 else float("inf")
+
+
+def bench_parse(exchange: str, decoder_name: str, messages: int) -> float:
+    mgr = WebSocketCallbackManager()
+    decoder = get_decoder(decoder_name)
+    symbol, payload = SAMPLES[exchange]
+    frame = json.dumps(payload)
+    parser = mgr.exchange_parsers[exchange]
+    loads = decoder.loads
+    start = time.perf_counter()
+    for _ in range(messages):
+        parser(loads(frame), WebSocketEventType.TICKER, symbol)
+    return _rate(messages, time.perf_counter() - start)
+
+
+async def _feed(mgr: WebSocketCallbackManager, exchange: str, frame: str, symbol: str, messages: int) -> float:
+    start = time.perf_counter()
+    for _ in range(messages):
+        await mgr.process_websocket_message(exchange, frame, WebSocketEventType.TICKER, symbol)
+    return _rate(messages, time.perf_counter() - start)
+
+
+def bench_dispatch(exchange: str, decoder_name: str, messages: int, subscribed: bool) -> float:
+    mgr = WebSocketCallbackManager()
+    mgr.logger.disabled = True
+    mgr.decoder = get_decoder(decoder_name)
+    symbol, payload = SAMPLES[exchange]
+    if subscribed:
+        mgr.register_callback(WebSocketEventType.TICKER, symbol, exchange, lambda data: None)
+    else:
+        # Subskrypcja innego symbolu - ramka musi zostać odrzucona
+        mgr.register_callback(WebSocketEventType.TICKER, "OTHER", exchange, lambda data: None)
+        symbol = "UNSUBSCRIBED" if exchange in ("bitfinex", "kraken") else symbol
+    return asyncio.run(_feed(mgr, exchange, json.dumps(payload), symbol, messages))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark parserów WebSocket")
+    parser.add_argument("--messages", type=int, default=20000, help="Liczba wiadomości na pomiar")
+    parser.add_argument("--exchange", choices=sorted(SAMPLES), action="append", help="Giełda (domyślnie wszystkie)")
+    parser.add_argument("--decoder", choices=available_decoders(), action="append", help="Dekoder JSON (domyślnie wszystkie)")
+    args = parser.parse_args(argv)
+
+    exchanges = args.exchange or list(SAMPLES)
+    decoders = args.decoder or available_decoders()
+
+    print(f"{'exchange':<10} {'decoder':<8} {'parse msg/s':>14} {'dispatch msg/s':>16} {'drop msg/s':>14}")
+    for exchange in exchanges:
+        for decoder_name in decoders:
+            parse_rate = bench_parse(exchange, decoder_name, args.messages)
+            dispatch_rate = bench_dispatch(exchange, decoder_name, args.messages, subscribed=True)
+            drop_rate = bench_dispatch(exchange, decoder_name, args.messages, subscribed=False)
+            print(f"{exchange:<10} {decoder_name:<8} {parse_rate:>14,.0f} {dispatch_rate:>16,.0f} {drop_rate:>14,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,13 +1,16 @@
 """
 Moduł pomocniczy do obsługi asyncio w PyQt
 
-Zapewnia prawidłową integrację pętli zdarzeń asyncio z PyQt
+Zapewnia prawidłową integrację pętli zdarzeń asyncio z PyQt. Coroutine są
+wykonywane we współdzielonej pętli ``utils.async_runtime`` (jeden wątek przez
+cały czas życia aplikacji), a wyniki wracają do wątku GUI przez sygnały Qt.
 """
 
 import asyncio
-import threading
-from typing import Callable, Any, Optional
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future
+from typing import Callable, Any, Coroutine, Dict, Optional, TypeVar
+
+from utils.async_runtime import AsyncRuntime, get_async_runtime
 
 try:
     from PyQt6.QtCore import QObject, QTimer, pyqtSignal, QThread
@@ -15,104 +18,135 @@ try:
 except ImportError:
     PYQT_AVAILABLE = False
 
+T = TypeVar("T")
 
-class AsyncWorker(QThread):
-    """Worker thread do wykonywania zadań asyncio"""
-    
-    finished = pyqtSignal(object)
-    error = pyqtSignal(str)
-    
-    def __init__(self, coro, parent=None):
+
+class AsyncBridge(QObject):
+    """Most między wątkiem GUI a współdzieloną pętlą asyncio.
+
+    ``submit`` planuje coroutine w pętli ``AsyncRuntime`` i zwraca
+    ``concurrent.futures.Future``; wynik (lub błąd) jest przekazywany do
+    wątku GUI sygnałem, więc callbacki ``on_result``/``on_error`` mogą
+    bezpiecznie modyfikować widgety. Zadania z tym samym ``task_id`` nie są
+    dublowane - kolejne odświeżenie, gdy poprzednie jeszcze trwa, jest
+    pomijane (albo zastępuje je, gdy ``replace=True``). Z ``timeout`` zawieszone
+    zadanie kończy się ``asyncio.TimeoutError`` przekazanym do ``on_error``,
+    więc nie blokuje na stałe kolejnych odświeżeń o tym samym ``task_id``.
+    """
+
+    result_ready = pyqtSignal(str, object)
+    error = pyqtSignal(str, str)
+    _delivered = pyqtSignal(object)
+
+    def __init__(self, runtime: Optional[AsyncRuntime] = None, parent=None):
         super().__init__(parent)
-        self.coro = coro
-        self.result = None
-        # Przechowuj referencje do loopa i taska, aby umożliwić łagodne zatrzymanie
-        self.loop = None
-        self.task = None
-        
-    def run(self):
-        """Uruchamia coroutine w nowej pętli zdarzeń"""
-        try:
-            # Uruchom coroutine w dedykowanej pętli przez asyncio.run z dostępem do loopa
-            async def _runner():
-                try:
-                    # Pozyskaj działającą pętlę utworzoną przez asyncio.run
-                    self.loop = asyncio.get_running_loop()
-                    # Utwórz task z coroutine, aby można było go anulować z zewnątrz
-                    self.task = self.loop.create_task(self.coro)
-                    self.result = await self.task
-                    return self.result
-                except asyncio.CancelledError:
-                    # Task został anulowany
-                    raise
-            try:
-                self.result = asyncio.run(_runner())
-                self.finished.emit(self.result)
-            except asyncio.CancelledError:
-                self.error.emit("Cancelled")
-            except Exception as e:
-                self.error.emit(str(e))
-            finally:
-                # Upewnij się, że referencje są zwalniane
-                self.loop = None
-                self.task = None
-        except Exception:
-            # Zabezpieczenie przed nieprzewidzianymi wyjątkami
-            self.loop = None
-            self.task = None
-    
-    def stop(self):
-        """Łagodnie zatrzymuje wykonywaną coroutine"""
+        self.runtime = runtime or get_async_runtime()
+        self._pending: Dict[str, Future] = {}
+        self._delivered.connect(self._dispatch)
+
+    def submit(
+        self,
+        coro: Coroutine[Any, Any, T],
+        task_id: Optional[str] = None,
+        on_result: Optional[Callable[[T], None]] = None,
+        on_error: Optional[Callable[[BaseException], None]] = None,
+        *,
+        replace: bool = False,
+        timeout: Optional[float] = None,
+    ) -> "Future[T]":
+        """Uruchamia coroutine w pętli tła; callbacki wykonują się w wątku GUI."""
+        if task_id is None:
+            task_id = f"task_{id(coro)}"
+
+        current = self._pending.get(task_id)
+        if current is not None and not current.done():
+            if not replace:
+                coro.close()
+                return current
+            current.cancel()
+
+        if timeout is not None:
+            coro = asyncio.wait_for(coro, timeout)
+        future = self.runtime.submit(coro)
+        self._pending[task_id] = future
+        future.add_done_callback(
+            lambda done: self._delivered.emit((task_id, done, on_result, on_error))
+        )
+        return future
+
+    def is_pending(self, task_id: str) -> bool:
+        future = self._pending.get(task_id)
+        return future is not None and not future.done()
+
+    def cancel(self, task_id: str) -> bool:
+        """Anuluje zadanie; zwraca ``True``, jeśli było w toku."""
+        future = self._pending.pop(task_id, None)
+        return bool(future is not None and future.cancel())
+
+    def cancel_all(self) -> None:
+        for task_id in list(self._pending):
+            self.cancel(task_id)
+
+    def _dispatch(self, payload) -> None:
+        task_id, future, on_result, on_error = payload
+        if self._pending.get(task_id) is future:
+            del self._pending[task_id]
+        if future.cancelled():
+            self.error.emit(task_id, "Cancelled")
+            return
+        exc = future.exception()
+        if exc is not None:
+            if on_error is not None:
+                on_error(exc)
+            self.error.emit(task_id, str(exc))
+            return
+        result = future.result()
+        if on_result is not None:
+            on_result(result)
+        self.result_ready.emit(task_id, result)
+
+
+class UIFeedBridge(QObject):
+    """Przekazuje różnice feedu ``IntegratedDataManager`` do wątku GUI.
+
+    Jedna instancja na menedżer danych subskrybuje feed, a widgety łączą
+    się z sygnałem ``diff_ready`` - różnica jest liczona raz, niezależnie od
+    liczby widgetów.
+    """
+
+    diff_ready = pyqtSignal(object)
+
+    def __init__(self, data_manager, runtime: Optional[AsyncRuntime] = None, parent=None):
+        super().__init__(parent)
+        self.data_manager = data_manager
+        self.runtime = runtime or get_async_runtime()
+        data_manager.subscribe_to_feed(self._on_diff)
+
+    def _on_diff(self, diff) -> None:
+        # Wywoływane w wątku pętli asyncio; sygnał trafia do wątku GUI
+        self.diff_ready.emit(diff)
+
+    def connect_widget(self, slot: Callable[[Any], None]) -> None:
+        """Podłącza widget: najpierw pełna migawka, potem tylko różnice."""
+        self.diff_ready.connect(slot)
+        snapshot = self.data_manager.get_feed_snapshot()
+        if not snapshot.is_empty():
+            slot(snapshot)
+        else:
+            self.request_refresh()
+
+    def disconnect_widget(self, slot: Callable[[Any], None]) -> None:
         try:
-            # Anuluj task jeśli trwa
-            if self.task and not self.task.done():
-                def _cancel():
-                    try:
-                        self.task.cancel()
-                    except Exception:
-                        pass
-                try:
-                    # Bezpiecznie wywołaj anulowanie w wątku pętli
-                    if self.loop:
-                        self.loop.call_soon_threadsafe(_cancel)
-                except Exception:
-                    pass
+            self.diff_ready.disconnect(slot)
         except Exception:
             pass
 
-    def __del__(self):
-        """Zapewnia bezpieczne zatrzymanie wątku przy niszczeniu obiektu.
-        Chroni przed ostrzeżeniem: 'QThread: Destroyed while thread is still running'."""
-        try:
-            # Spróbuj łagodnego zatrzymania, bez blokowania wątku na samym sobie
-            try:
-                if hasattr(self, 'stop'):
-                    self.stop()
-            except Exception:
-                pass
+    def request_refresh(self) -> Future:
+        """Wymusza natychmiastowe przeliczenie feedu (np. przycisk Odśwież)."""
+        return self.runtime.submit(self.data_manager.refresh_ui_feed())
 
-            # Nigdy nie wywołuj wait() z wnętrza tego samego wątku – powoduje freeze
-            try:
-                from PyQt6.QtCore import QThread
-                current = QThread.currentThread()
-                if current is not self:
-                    # Poczekaj krótko na zakończenie, tylko jeśli wywołane z innego wątku
-                    self.wait(500)
-            except Exception:
-                # Jeśli API niedostępne lub sprawdzenie się nie powiodło, nie blokuj
-                pass
-
-            # Ostatecznie spróbuj przerwać bez blokowania
-            try:
-                if self.isRunning():
-                    # Preferuj łagodne przerwanie; avoid terminate() gdy to możliwe
-                    if hasattr(self, 'requestInterruption'):
-                        self.requestInterruption()
-            except Exception:
-                pass
-        except Exception:
-            # Ostateczny bezpiecznik – nie propaguj wyjątku z destruktora
-            pass
+    def close(self) -> None:
+        self.data_manager.unsubscribe_from_feed(self._on_diff)
 
 
 class AsyncManager(QObject):
@@ -121,83 +155,35 @@ class AsyncManager(QObject):
     task_finished = pyqtSignal(str, object)
     task_error = pyqtSignal(str, str)
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, runtime: Optional[AsyncRuntime] = None):
         super().__init__(parent)
-        self.workers = {}
-        self.executor = ThreadPoolExecutor(max_workers=4)
+        self.bridge = AsyncBridge(runtime, self)
+        self.bridge.result_ready.connect(self._on_task_finished)
+        self.bridge.error.connect(self._on_task_error)
         
     def run_async(self, coro, task_id: str = None):
         """Uruchamia coroutine asynchronicznie"""
         if task_id is None:
             task_id = f"task_{id(coro)}"
-        
-        # Jeśli istnieje już worker dla tego task_id, anuluj go aby uniknąć osieroconych wątków
-        if task_id in self.workers:
-            try:
-                self.cancel_task(task_id)
-            except Exception:
-                pass
-            
-        worker = AsyncWorker(coro)
-        worker.finished.connect(lambda result: self._on_task_finished(task_id, result))
-        worker.finished.connect(worker.deleteLater)
-        worker.error.connect(lambda error: self._on_task_error(task_id, error))
-        worker.error.connect(worker.deleteLater)
-        
-        self.workers[task_id] = worker
-        worker.start()
-        
+        # Nowe zadanie o tym samym task_id zastępuje poprzednie
+        self.bridge.submit(coro, task_id, replace=True)
         return task_id
     
     def _on_task_finished(self, task_id: str, result: Any):
         """Obsługuje zakończenie zadania"""
-        if task_id in self.workers:
-            del self.workers[task_id]
         self.task_finished.emit(task_id, result)
     
     def _on_task_error(self, task_id: str, error: str):
         """Obsługuje błąd zadania"""
-        if task_id in self.workers:
-            del self.workers[task_id]
         self.task_error.emit(task_id, error)
     
     def cancel_task(self, task_id: str):
         """Anuluje zadanie"""
-        if task_id in self.workers:
-            worker = self.workers[task_id]
-            try:
-                # Najpierw spróbuj łagodnego zatrzymania
-                if hasattr(worker, 'stop'):
-                    worker.stop()
-                from PyQt6.QtCore import QThread
-                # Unikaj oczekiwania na samego siebie, co powoduje komunikat 'QThread::wait: Thread tried to wait on itself'
-                current = QThread.currentThread()
-                if current is not worker:
-                    # Poczekaj na zakończenie
-                    worker.wait(500)
-                    # Jeśli nadal działa, wymuś zakończenie
-                    if worker.isRunning():
-                        worker.terminate()
-                        worker.wait(500)
-                else:
-                    # Jeżeli anulujemy z tego samego wątku, użyj przerwania bez blokowania
-                    if hasattr(worker, 'requestInterruption'):
-                        worker.requestInterruption()
-            except Exception:
-                # W ostateczności wymuś zakończenie
-                try:
-                    worker.terminate()
-                    # Nie wywołuj wait bez sprawdzenia kontekstu
-                except Exception:
-                    pass
-            finally:
-                del self.workers[task_id]
+        self.bridge.cancel(task_id)
     
     def cleanup(self):
         """Czyści wszystkie zadania"""
-        for task_id in list(self.workers.keys()):
-            self.cancel_task(task_id)
-        self.executor.shutdown(wait=True)
+        self.bridge.cancel_all()
 
 
 class BotAsyncManager(QObject):
@@ -324,9 +310,27 @@ class BotAsyncManager(QObject):
 
 
 # Singleton instance
+_async_bridge = None
 _async_manager = None
 _bot_async_manager = None
 
+def get_async_bridge():
+    """Zwraca singleton AsyncBridge"""
+    global _async_bridge
+    if _async_bridge is None:
+        _async_bridge = AsyncBridge()
+    return _async_bridge
+
+_feed_bridges: Dict[int, UIFeedBridge] = {}
+
+def get_ui_feed_bridge(data_manager):
+    """Zwraca współdzielony UIFeedBridge dla danego menedżera danych"""
+    bridge = _feed_bridges.get(id(data_manager))
+    if bridge is None or bridge.data_manager is not data_manager:
+        bridge = UIFeedBridge(data_manager)
+        _feed_bridges[id(data_manager)] = bridge
+    return bridge
+
 def get_async_manager():
     """Zwraca singleton AsyncManager"""
     global _async_manager
@@ -2,7 +2,7 @@ from pathlib import Path
 from typing import List
 from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFileDialog, QSpinBox, QMessageBox, QFormLayout
 from PyQt6.QtCore import Qt
-from backtesting.backtester import load_ohlcv_csv, sma_cross_strategy, backtest
+from backtesting.vectorized import load_ohlcv_arrays, backtest_sma_cross
 
 class BacktestWindow(QDialog):
     def __init__(self, parent=None):
@@ -53,9 +53,8 @@ class BacktestWindow(QDialog):
         if not self.csv_path or not self.csv_path.exists():
             QMessageBox.warning(self, "Brak pliku", "Wybierz poprawny plik CSV z danymi OHLCV.")
             return
-        candles = load_ohlcv_csv(self.csv_path)
-        sig = sma_cross_strategy(self.short_spin.value(), self.long_spin.value())
-        res = backtest(candles, sig)
+        data = load_ohlcv_arrays(self.csv_path)
+        res = backtest_sma_cross(data, self.short_spin.value(), self.long_spin.value())
         m = res['metrics']
         text = (
             f"Transakcji: {m['num_trades']}\n"
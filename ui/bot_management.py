@@ -62,6 +62,7 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.logger import get_logger, LogType
 from utils.config_manager import get_config_manager
+from utils.async_runtime import get_async_runtime
 
 
 class BotConfigDialog(QDialog):
@@ -1391,25 +1392,8 @@ class BotManagementWidget(QWidget):
                     # jeśli bot_manager ma metodę shutdown, wywołaj ją asynchronicznie
                     if hasattr(self.bot_manager, 'shutdown'):
                         try:
-                            import asyncio
-                            import concurrent.futures
-                            # Wykryj czy pętla asyncio już działa
-                            loop_running = False
-                            try:
-                                asyncio.get_running_loop()
-                                loop_running = True
-                            except RuntimeError:
-                                loop_running = False
-                            if loop_running:
-                                # Uruchom shutdown w osobnym wątku z asyncio.run
-                                with concurrent.futures.ThreadPoolExecutor() as executor:
-                                    future = executor.submit(lambda: asyncio.run(self.bot_manager.shutdown()))
-                                    try:
-                                        future.result(timeout=5)
-                                    except Exception:
-                                        pass
-                            else:
-                                asyncio.run(self.bot_manager.shutdown())
+                            # Shutdown w pętli tła, w której działają boty
+                            get_async_runtime().run(self.bot_manager.shutdown(), timeout=5)
                         except Exception:
                             pass
                 except Exception:
@@ -2225,20 +2209,16 @@ class BotManagementWidget(QWidget):
         self.stop_bot(bot_id)
     
     def _run_coroutine_in_thread(self, coro):
-        """Uruchamia coroutine w osobnym wątku z nową pętlą asyncio, bez wymagania aktywnej pętli w głównym wątku"""
-        import asyncio
-        import threading
-        
-        def worker():
+        """Uruchamia coroutine we współdzielonej pętli tła, bez blokowania wątku GUI"""
+        def report(e):
+            # Wywoływane w wątku GUI (sygnał AsyncBridge)
             try:
-                asyncio.run(coro)
-            except Exception as e:
-                try:
-                    self.log_message(f"❌ Błąd uruchamiania coroutine: {e}")
-                except Exception:
-                    print(f"❌ Błąd uruchamiania coroutine: {e}")
+                self.log_message(f"❌ Błąd uruchamiania coroutine: {e}")
+            except Exception:
+                print(f"❌ Błąd uruchamiania coroutine: {e}")
         
-        threading.Thread(target=worker, daemon=True).start()
+        from ui.async_helper import get_async_bridge
+        get_async_bridge().submit(coro, on_error=report)
     
     def start_bot(self, bot_id):
         """Uruchamia bota"""
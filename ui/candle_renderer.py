@@ -0,0 +1,190 @@
+"""Renderowanie wykresu świecowego poza wątkiem GUI.
+
+``CandleRenderer`` rysuje świece na własnej figurze matplotlib z backendem
+Agg (bez Qt), więc może działać w wątku roboczym; widget dostaje gotowy
+bufor RGBA i tylko wyświetla go jako obraz. Seria jest decymowana do
+szerokości widgetu w pikselach, a warstwa statyczna (osie, siatka, wszystkie
+świece poza ostatnią) jest zapamiętywana - gdy zmienia się tylko bieżąca
+świeca i mieści się w zakresie osi Y, odtwarzane jest tło i dorysowywana
+jedna świeca zamiast całej figury.
+"""
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Optional, Tuple
+
+import numpy as np
+
+from utils.candle_store import OHLCVArrays
+
+try:
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.collections import LineCollection, PolyCollection
+    from matplotlib.figure import Figure
+    from matplotlib.lines import Line2D
+    from matplotlib.patches import Rectangle
+    from matplotlib.ticker import FuncFormatter, MaxNLocator
+    RENDERER_AVAILABLE = True
+except ImportError:
+    RENDERER_AVAILABLE = False
+
+# Minimalna szerokość świecy (korpus + odstęp) w pikselach
+MIN_BAR_PX = 3
+BODY_WIDTH = 0.6
+
+BACKGROUND = '#2b2b2b'
+UP_COLOR = '#00ff88'
+DOWN_COLOR = '#ff4444'
+
+
+@dataclass(slots=True)
+class RenderedFrame:
+    """Wyrenderowany wykres (RGBA, wiersz po wierszu) gotowy do ``QImage``."""
+
+    data: bytes
+    width: int
+    height: int
+    full: bool
+
+
+def frame_to_arrays(df: Any) -> OHLCVArrays:
+    """``OHLCVArrays`` z DataFrame ``BinanceAPI.get_klines`` (indeks = czas otwarcia)."""
+    if df is None or len(df) == 0:
+        return OHLCVArrays.empty()
+    t = np.asarray(df.index.values).astype('datetime64[ms]').astype(np.int64)
+    return OHLCVArrays(t, *(df[name].to_numpy(dtype=np.float64) for name in ('open', 'high', 'low', 'close', 'volume')))
+
+
+def max_bars_for_width(width: int) -> int:
+    return max(1, int(width) // MIN_BAR_PX)
+
+
+class CandleRenderer:
+    """Rysuje świece do bufora RGBA; bezpieczny do użycia z wątku roboczego."""
+
+    def __init__(self, dpi: int = 100) -> None:
+        self.dpi = dpi
+        self.stats = {'full': 0, 'blit': 0}
+        self._lock = threading.Lock()
+        self._figure = None
+        self._canvas = None
+        self._ax = None
+        self._background = None
+        self._layout: Optional[Tuple[Any, ...]] = None
+        self._view: Optional[OHLCVArrays] = None
+        self._last_wick = None
+        self._last_body = None
+
+    def render(self, candles: OHLCVArrays, width: int, height: int, title: str = '',
+               time_format: str = '%m-%d') -> Optional[RenderedFrame]:
+        if not RENDERER_AVAILABLE or width <= 0 or height <= 0 or not len(candles):
+            return None
+        view = candles.decimate(max_bars_for_width(width))
+        layout = (width, height, title, time_format, len(view), int(view.t[0]))
+        with self._lock:
+            if self._can_blit(layout, view):
+                self._update_last(view)
+                self._canvas.restore_region(self._background)
+                self._draw_last()
+                self.stats['blit'] += 1
+                full = False
+            else:
+                self._draw_full(view, width, height, title, time_format)
+                self._layout = layout
+                full = True
+                self.stats['full'] += 1
+            self._view = view
+            renderer = self._canvas.get_renderer()
+            return RenderedFrame(bytes(self._canvas.buffer_rgba()), int(renderer.width), int(renderer.height), full)
+
+    def reset(self) -> None:
+        """Porzuca zapamiętane tło (np. po zmianie symbolu)."""
+        with self._lock:
+            self._layout = None
+            self._background = None
+            self._view = None
+
+    # --- wewnętrzne -----------------------------------------------------
+    def _can_blit(self, layout: Tuple[Any, ...], view: OHLCVArrays) -> bool:
+        previous = self._view
+        if self._background is None or layout != self._layout or previous is None:
+            return False
+        low, high = self._ax.get_ylim()
+        if view.l[-1] < low or view.h[-1] > high:
+            return False
+        # Tło jest aktualne tylko wtedy, gdy zmieniła się wyłącznie ostatnia świeca
+        return all(np.array_equal(getattr(view, name)[:-1], getattr(previous, name)[:-1])
+                   for name in ('o', 'h', 'l', 'c'))
+
+    def _draw_full(self, view: OHLCVArrays, width: int, height: int, title: str, time_format: str) -> None:
+        if self._figure is None:
+            self._figure = Figure(facecolor=BACKGROUND, dpi=self.dpi)
+            self._canvas = FigureCanvasAgg(self._figure)
+        figure = self._figure
+        figure.clear()
+        figure.set_size_inches(width / self.dpi, height / self.dpi)
+        ax = self._ax = figure.add_subplot(111)
+        ax.set_facecolor(BACKGROUND)
+
+        n = len(view)
+        x = np.arange(n, dtype=np.float64)
+        colors = np.where(view.c >= view.o, UP_COLOR, DOWN_COLOR)
+        body_low = np.minimum(view.o, view.c)
+        body_high = np.maximum(view.o, view.c)
+        left, right = x - BODY_WIDTH / 2, x + BODY_WIDTH / 2
+        # Wszystkie świece poza ostatnią trafiają do tła jako dwie kolekcje
+        wicks = np.stack((np.column_stack((x, view.l)), np.column_stack((x, view.h))), axis=1)[:-1]
+        bodies = np.stack((np.column_stack((left, body_low)), np.column_stack((left, body_high)),
+                           np.column_stack((right, body_high)), np.column_stack((right, body_low))), axis=1)[:-1]
+        ax.add_collection(LineCollection(wicks, colors=colors[:-1], linewidths=1))
+        ax.add_collection(PolyCollection(bodies, facecolors=colors[:-1], edgecolors=colors[:-1], linewidths=0.5))
+
+        self._last_wick = Line2D([], [], linewidth=1, animated=True)
+        self._last_body = Rectangle((0, 0), BODY_WIDTH, 0, linewidth=0.5, animated=True)
+        ax.add_line(self._last_wick)
+        ax.add_patch(self._last_body)
+        self._update_last(view)
+
+        low, high = float(view.l.min()), float(view.h.max())
+        pad = (high - low) * 0.05 or abs(high) * 0.01 or 1.0
+        ax.set_xlim(-1, n)
+        ax.set_ylim(low - pad, high + pad)
+
+        times = view.t
+
+        def _format_time(pos: float, _: Any) -> str:
+            idx = int(round(pos))
+            if 0 <= idx < n:
+                return datetime.fromtimestamp(times[idx] / 1000, tz=timezone.utc).strftime(time_format)
+            return ''
+
+        ax.xaxis.set_major_locator(MaxNLocator(nbins=8, integer=True))
+        ax.xaxis.set_major_formatter(FuncFormatter(_format_time))
+        ax.set_title(title, color='white', fontsize=14, pad=20)
+        ax.tick_params(colors='white')
+        ax.grid(True, alpha=0.3)
+        figure.tight_layout()
+
+        self._canvas.draw()
+        self._background = self._canvas.copy_from_bbox(figure.bbox)
+        self._draw_last()
+
+    def _update_last(self, view: OHLCVArrays) -> None:
+        x = len(view) - 1
+        o, h, l, c = view.o[-1], view.h[-1], view.l[-1], view.c[-1]
+        color = UP_COLOR if c >= o else DOWN_COLOR
+        self._last_wick.set_data([x, x], [l, h])
+        self._last_wick.set_color(color)
+        self._last_body.set_xy((x - BODY_WIDTH / 2, min(o, c)))
+        self._last_body.set_height(abs(c - o))
+        self._last_body.set_facecolor(color)
+        self._last_body.set_edgecolor(color)
+
+    def _draw_last(self) -> None:
+        self._ax.draw_artist(self._last_wick)
+        self._ax.draw_artist(self._last_body)
+
+
+__all__ = ['CandleRenderer', 'RenderedFrame', 'RENDERER_AVAILABLE', 'frame_to_arrays', 'max_bars_for_width']
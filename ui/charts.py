@@ -3,6 +3,7 @@ Moduł wykresów dla aplikacji trading bot
 Zawiera implementacje wykresów cenowych, wydajności i alokacji portfela
 """
 
+import asyncio
 import sys
 import os
 from datetime import datetime, timedelta
@@ -30,9 +31,9 @@ except ImportError:
     print("Matplotlib not available")
 
 try:
-    from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox
+    from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox, QSizePolicy
     from PyQt6.QtCore import Qt, QTimer, pyqtSignal
-    from PyQt6.QtGui import QFont
+    from PyQt6.QtGui import QFont, QImage, QPixmap
     PYQT_AVAILABLE = True
 except ImportError:
     PYQT_AVAILABLE = False
@@ -43,17 +44,27 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.logger import get_logger
 from api.binance_api import BinanceAPI
+from ui.candle_renderer import CandleRenderer, RenderedFrame, frame_to_arrays
+from utils.candle_store import OHLCVArrays
 
 logger = get_logger(__name__)
 
 class CandlestickChart(QWidget):
-    """Widget wykresu świecowego z danymi cenowymi"""
+    """Widget wykresu świecowego z danymi cenowymi
+
+    Pobieranie świec i rysowanie odbywa się poza wątkiem GUI (``CandleRenderer``
+    na backendzie Agg); widget wyświetla jedynie gotowy obraz. Odświeżenie z
+    timera pobiera tylko ostatnie świece i nakłada je na zapamiętaną serię.
+    """
     
     def __init__(self, symbol: str = "BTCUSDT", parent=None):
         super().__init__(parent)
         self.symbol = symbol
         self.timeframe = "1h"
         self.api = BinanceAPI()
+        self.renderer = CandleRenderer()
+        self.candles: Optional[OHLCVArrays] = None
+        self.candle_limit: Optional[int] = None
         self.setup_ui()
         self.load_data()
         self.start_refresh_timer()
@@ -89,11 +100,19 @@ class CandlestickChart(QWidget):
         controls_layout.addStretch()
         layout.addLayout(controls_layout)
         
-        # Wykres
+        # Wykres - obraz renderowany w tle
         if MATPLOTLIB_AVAILABLE:
-            self.figure = Figure(figsize=(12, 8), facecolor='#2b2b2b')
-            self.canvas = FigureCanvas(self.figure)
-            layout.addWidget(self.canvas)
+            self.chart_label = QLabel()
+            self.chart_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.chart_label.setMinimumSize(200, 150)
+            self.chart_label.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Ignored)
+            self.chart_label.setStyleSheet("background-color: #2b2b2b;")
+            layout.addWidget(self.chart_label)
+            # Zmiana rozmiaru przerysowuje wykres dopiero po jej zakończeniu
+            self.resize_timer = QTimer(self)
+            self.resize_timer.setSingleShot(True)
+            self.resize_timer.setInterval(150)
+            self.resize_timer.timeout.connect(self.render_chart)
         else:
             placeholder = QLabel("Matplotlib nie jest dostępne - wykres niedostępny")
             placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -111,71 +130,104 @@ class CandlestickChart(QWidget):
         self.load_data()
     
     def load_data(self):
-        """Ładuje dane cenowe z API"""
+        """Ładuje pełną historię świec z API (w wątku roboczym)"""
+        if not MATPLOTLIB_AVAILABLE:
+            return
+        self.candles = None
+        self.renderer.reset()
+        self.candle_limit = get_app_setting('charts_candle_limit', 1000)
+        self._fetch_candles(self.candle_limit, full=True)
+    
+    def refresh_last_candle(self):
+        """Pobiera tylko bieżącą i poprzednią świecę i nakłada je na serię"""
         if not MATPLOTLIB_AVAILABLE:
             return
-            
+        if self.candles is None or not len(self.candles):
+            self.load_data()
+            return
+        self._fetch_candles(2, full=False)
+    
+    def _fetch_candles(self, limit: int, full: bool):
         try:
-            # Pobierz dane z Binance - get_klines już zwraca gotowy DataFrame
-            df = self.api.get_klines(self.symbol, self.timeframe, limit=100)
-            
-            if df.empty:
-                logger.warning(f"Brak danych dla {self.symbol}")
-                self.plot_error_message(f"Brak danych dla {self.symbol}")
-                return
-            
-            logger.info(f"Załadowano {len(df)} świec dla {self.symbol}")
-            self.plot_candlestick(df)
-            
+            from ui.async_helper import get_async_bridge
+            key = (self.symbol, self.timeframe)
+            # Pełne ładowanie zastępuje trwające pobieranie, odświeżenie ostatniej świecy jest pomijane
+            get_async_bridge().submit(
+                asyncio.to_thread(self.api.get_klines, self.symbol, self.timeframe, limit=limit),
+                f'candles_fetch_{id(self)}',
+                lambda df: self._on_candles(key, full, df),
+                lambda exc: self.plot_error_message(str(exc)),
+                replace=full,
+            )
         except Exception as e:
             logger.error(f"Błąd podczas ładowania danych: {e}")
             self.plot_error_message(str(e))
     
+    def _on_candles(self, key: Tuple[str, str], full: bool, df: Any):
+        if key != (self.symbol, self.timeframe):
+            return
+        arrays = frame_to_arrays(df)
+        if not len(arrays):
+            if full or self.candles is None:
+                logger.warning(f"Brak danych dla {self.symbol}")
+                self.plot_error_message(f"Brak danych dla {self.symbol}")
+            return
+        if full or self.candles is None:
+            logger.info(f"Załadowano {len(arrays)} świec dla {self.symbol}")
+            self.candles = arrays
+        else:
+            # Seria nie rośnie ponad limit z pełnego ładowania
+            self.candles = self.candles.merge_tail(arrays, limit=self.candle_limit)
+        self.render_chart()
+    
     def plot_candlestick(self, df: pd.DataFrame):
         """Rysuje wykres świecowy"""
+        self.candles = frame_to_arrays(df)
+        self.render_chart()
+    
+    def render_chart(self):
+        """Zleca renderowanie bieżącej serii w wątku roboczym"""
+        if not MATPLOTLIB_AVAILABLE or self.candles is None or not len(self.candles):
+            return
         try:
-            self.figure.clear()
-            
-            # Konfiguracja stylu
-            style = mpf.make_mpf_style(
-                base_mpl_style='dark_background',
-                marketcolors=mpf.make_marketcolors(
-                    up='#00ff88', down='#ff4444',
-                    edge='inherit',
-                    wick={'up': '#00ff88', 'down': '#ff4444'},
-                    volume='in'
-                )
+            from ui.async_helper import get_async_bridge
+            ratio = self.chart_label.devicePixelRatioF()
+            width = int(self.chart_label.width() * ratio)
+            height = int(self.chart_label.height() * ratio)
+            time_format = '%H:%M' if self.timeframe in ['1m', '5m', '15m'] else '%m-%d'
+            get_async_bridge().submit(
+                asyncio.to_thread(self.renderer.render, self.candles, width, height,
+                                  f'{self.symbol} - {self.timeframe}', time_format),
+                f'candles_render_{id(self)}',
+                lambda frame: self._show_frame(frame, ratio),
+                lambda exc: self.plot_error_message(str(exc)),
+                replace=True,
             )
-            
-            # Rysuj wykres
-            ax = self.figure.add_subplot(111)
-            mpf.plot(df, type='candle', style=style, ax=ax, volume=False)
-            
-            # Konfiguracja osi
-            ax.set_title(f'{self.symbol} - {self.timeframe}', color='white', fontsize=14, pad=20)
-            ax.tick_params(colors='white')
-            ax.grid(True, alpha=0.3)
-            
-            # Formatowanie dat na osi X
-            ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M' if self.timeframe in ['1m', '5m', '15m'] else '%m-%d'))
-            ax.xaxis.set_major_locator(mdates.HourLocator(interval=4) if self.timeframe in ['1m', '5m', '15m'] else mdates.DayLocator())
-            
-            self.figure.tight_layout()
-            self.canvas.draw()
-            
         except Exception as e:
             logger.error(f"Błąd podczas rysowania wykresu: {e}")
             self.plot_error_message(str(e))
     
+    def _show_frame(self, frame: Optional[RenderedFrame], ratio: float):
+        if frame is None:
+            return
+        image = QImage(frame.data, frame.width, frame.height, frame.width * 4, QImage.Format.Format_RGBA8888)
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(ratio)
+        self.chart_label.setPixmap(pixmap)
+    
     def plot_error_message(self, error_msg: str):
         """Wyświetla komunikat o błędzie na wykresie"""
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
-        ax.text(0.5, 0.5, f'Błąd ładowania danych:\n{error_msg}', 
-                horizontalalignment='center', verticalalignment='center',
-                transform=ax.transAxes, color='red', fontsize=12)
-        ax.set_facecolor('#2b2b2b')
-        self.canvas.draw()
+        self.chart_label.setPixmap(QPixmap())
+        self.chart_label.setText(f'Błąd ładowania danych:\n{error_msg}')
+        self.chart_label.setStyleSheet("background-color: #2b2b2b; color: red; font-size: 12px;")
+    
+    def resizeEvent(self, event):
+        try:
+            super().resizeEvent(event)
+        except Exception:
+            pass
+        if MATPLOTLIB_AVAILABLE and self.candles is not None:
+            self.resize_timer.start()
     
     def start_refresh_timer(self):
         """Uruchamia automatyczne odświeżanie danych wykresu świecowego"""
@@ -184,7 +236,7 @@ class CandlestickChart(QWidget):
                 return
             if not hasattr(self, 'refresh_timer') or self.refresh_timer is None:
                 self.refresh_timer = QTimer(self)
-                self.refresh_timer.timeout.connect(self.load_data)
+                self.refresh_timer.timeout.connect(self.refresh_last_candle)
             interval = get_app_setting('charts_refresh_interval', 60000)  # domyślnie 60s
             self.refresh_timer.start(interval)
             logger.info(f"Candlestick chart auto-refresh started (interval: {interval} ms)")
@@ -199,6 +251,13 @@ class CandlestickChart(QWidget):
                 logger.info("Candlestick chart auto-refresh stopped")
         except Exception as e:
             logger.error(f"Błąd zatrzymywania timera wykresu świecowego: {e}")
+        try:
+            from ui.async_helper import get_async_bridge
+            bridge = get_async_bridge()
+            bridge.cancel(f'candles_fetch_{id(self)}')
+            bridge.cancel(f'candles_render_{id(self)}')
+        except Exception:
+            pass
         try:
             super().closeEvent(event)
         except Exception:
@@ -1,25 +1,30 @@
 from pathlib import Path
+from typing import Optional
 import json, csv
 
+from utils.event_log_reader import get_event_log_reader
+
 LOG_FILE = Path(__file__).resolve().parents[1] / "logs" / "events.jsonl"
 
-def export_json(path: Path) -> int:
-    path.write_text(LOG_FILE.read_text(encoding="utf-8") if LOG_FILE.exists() else "", encoding="utf-8")
-    return sum(1 for _ in LOG_FILE.open("r", encoding="utf-8")) if LOG_FILE.exists() else 0
+def export_json(path: Path, start_ts: Optional[int] = None, end_ts: Optional[int] = None) -> int:
+    """Eksport linii JSONL (opcjonalnie tylko ``start_ts <= ts <= end_ts``, ms)."""
+    count = 0
+    with path.open("w", encoding="utf-8") as out:
+        if LOG_FILE.exists():
+            for line in get_event_log_reader(LOG_FILE).iter_range(start_ts, end_ts, raw=True):
+                out.write(line)
+                count += 1
+    return count
 
-def export_csv(path: Path) -> int:
-    if not LOG_FILE.exists():
-        path.write_text("", encoding="utf-8")
-        return 0
-    rows = []
-    with LOG_FILE.open("r", encoding="utf-8") as f:
-        for line in f:
-            if not line.strip():
-                continue
-            rec = json.loads(line)
-            rows.append([rec.get("ts"), rec.get("event"), json.dumps(rec.get("payload", {}), ensure_ascii=False)])
+def export_csv(path: Path, start_ts: Optional[int] = None, end_ts: Optional[int] = None) -> int:
+    """Eksport do CSV (ts, event, payload) z opcjonalnym zakresem czasu."""
+    count = 0
     with path.open("w", newline="", encoding="utf-8") as f:
+        if not LOG_FILE.exists():
+            return 0
         w = csv.writer(f)
         w.writerow(["ts","event","payload"])
-        w.writerows(rows)
-    return len(rows)
+        for rec in get_event_log_reader(LOG_FILE).iter_range(start_ts, end_ts):
+            w.writerow([rec.get("ts"), rec.get("event"), json.dumps(rec.get("payload", {}), ensure_ascii=False)])
+            count += 1
+    return count
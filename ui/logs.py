@@ -6,6 +6,9 @@ historię działań botów i powiadomienia.
 """
 
 import sys
+import asyncio
+from bisect import bisect_left
+from collections import Counter
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from enum import Enum
@@ -15,7 +18,7 @@ try:
     from PyQt6.QtWidgets import (
         QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QFormLayout,
         QLabel, QPushButton, QFrame, QScrollArea, QTabWidget,
-        QTableWidget, QTableWidgetItem, QHeaderView, QComboBox,
+        QTableWidget, QTableWidgetItem, QTableView, QHeaderView, QComboBox,
         QLineEdit, QSpinBox, QDoubleSpinBox, QCheckBox, QGroupBox,
         QTextEdit, QProgressBar, QSplitter, QTreeWidget, QTreeWidgetItem,
         QMessageBox, QMenu, QFileDialog, QDateEdit, QSlider,
@@ -71,6 +74,10 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.config_manager import get_config_manager, get_ui_setting, get_app_setting
 from utils.logger import get_logger, LogType, LogLevel
 from utils.helpers import FormatHelper
+from core.log_buffer import LogBuffer, LogQuery, normalize_log
+
+# Maksymalny czas pobierania logów (s); zawieszone zapytanie nie blokuje kolejnych odświeżeń
+LOGS_REFRESH_TIMEOUT = 10.0
 
 class LogLevel(Enum):
     """Poziomy logów"""
@@ -156,67 +163,128 @@ class LogHighlighter(QSyntaxHighlighter):
                     self.setFormat(start, len(level.value), self.formats[level.value])
                 break
 
+# Style komórek tabeli logów: (tło RGBA lub nazwa koloru, kolor tekstu)
+LEVEL_STYLES = {
+    'ERROR': ((239, 83, 80, 40), "#EF5350"),
+    'WARNING': ((255, 183, 77, 40), "#FFB74D"),
+    'CRITICAL': ((211, 47, 47, 100), "#FFFFFF"),
+    'INFO': ((100, 181, 246, 40), "#64B5F6"),
+    'DEBUG': ((176, 176, 176, 30), "#B0B0B0"),
+    'SUCCESS': ((102, 187, 106, 40), "#66BB6A"),
+}
+TYPE_STYLES = {
+    'TRADE': ((102, 187, 106, 40), "#66BB6A"),
+    'API': ((100, 181, 246, 40), "#64B5F6"),
+    'SYSTEM': ((171, 71, 188, 40), "#AB47BC"),
+    'ERROR': ((239, 83, 80, 40), "#EF5350"),
+}
+BOT_STYLES = {
+    True: ((255, 193, 7, 40), "#FFC107"),
+    False: ((158, 158, 158, 30), "#B0B0B0"),
+}
+MESSAGE_STYLES = {
+    'ERROR': (None, "#FFCDD2"),
+    'CRITICAL': ("#D32F2F", "#FFFFFF"),
+    'WARNING': (None, "#FFF3C4"),
+    'SUCCESS': (None, "#C8E6C9"),
+    'DEBUG': (None, "#E0E0E0"),
+    'INFO': (None, "#E3F2FD"),
+}
+
 class LogTableModel(QAbstractTableModel):
-    """Model tabeli logów"""
+    """Wirtualny model tabeli logów oparty na ``LogBuffer``.
+
+    Widok pyta tylko o widoczne wiersze. Nowe wpisy są wstawiane na górze
+    (``beginInsertRows``), wpisy wypchnięte z bufora znikają z dołu, starsze
+    strony są doczytywane leniwie (``fetchMore``), a zmiana filtra jest
+    liczona poza wątkiem GUI - nowa paczka logów nigdy nie resetuje modelu.
+    """
+    
+    older_requested = pyqtSignal(str)
     
-    def __init__(self, logs: List[Dict] = None):
+    # Do tylu wpisów filtrowanie w wątku GUI jest tańsze niż przekazanie do wątku
+    SYNC_FILTER_LIMIT = 5000
+    
+    def __init__(self, logs: List[Dict] = None, capacity: int = 100_000):
         if not PYQT_AVAILABLE:
             return
         try:
             super().__init__()
-            self.logs = logs or []
+            self.buffer = LogBuffer(capacity)
+            self.query = LogQuery()
             self.headers = ["Czas", "Poziom", "Typ", "Bot", "Wiadomość"]
+            self.older_cursor: Optional[str] = None
+            # seq widocznych wpisów rosnąco - wiersz 0 to ostatni element
+            self._rows: List[int] = []
+            self._levels = Counter()
+            self._loading_older = False
+            self._filter_generation = 0
+            self._colors: Dict[Any, QColor] = {}
+            self._fonts = {
+                1: QFont("Arial", 11, QFont.Weight.Bold),
+                2: QFont("Arial", 10, QFont.Weight.Medium),
+                3: QFont("Arial", 10, QFont.Weight.Medium),
+                4: QFont("Consolas", 11),
+            }
+            if logs:
+                self.append_logs(logs)
         except Exception as e:
             print(f"Error initializing LogTableModel: {e}")
 
     def rowCount(self, parent=QModelIndex()):
-        return len(self.logs)
+        if parent.isValid():
+            return 0
+        return len(self._rows)
     
     def columnCount(self, parent=QModelIndex()):
         return len(self.headers)
     
+    def log_at(self, row: int) -> Optional[Dict]:
+        """Wpis wyświetlany w wierszu ``row`` (0 = najnowszy)"""
+        if row < 0 or row >= len(self._rows):
+            return None
+        return self.buffer.get(self._rows[len(self._rows) - 1 - row])
+    
+    def visible_logs(self) -> List[Dict]:
+        """Wszystkie widoczne wpisy, najnowsze pierwsze"""
+        logs = (self.buffer.get(seq) for seq in reversed(self._rows))
+        return [log for log in logs if log is not None]
+    
+    def level_counts(self) -> Dict[str, int]:
+        return dict(self._levels)
+    
     def data(self, index, role=Qt.ItemDataRole.DisplayRole):
-        if not index.isValid() or index.row() >= len(self.logs):
+        if not index.isValid():
+            return None
+        log = self.log_at(index.row())
+        if log is None:
             return None
-        
-        log = self.logs[index.row()]
         column = index.column()
         
         if role == Qt.ItemDataRole.DisplayRole:
             if column == 0:  # Czas
-                timestamp = log.get('timestamp', datetime.now())
-                if isinstance(timestamp, str):
-                    timestamp = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                return timestamp.strftime("%Y-%m-%d %H:%M:%S")
+                return log['timestamp'].strftime("%Y-%m-%d %H:%M:%S")
             elif column == 1:  # Poziom
-                return log.get('level', 'INFO')
+                return log['level']
             elif column == 2:  # Typ
-                return log.get('type', 'SYSTEM')
+                return log['type']
             elif column == 3:  # Bot
-                bot_id = log.get('bot_id')
-                return f"Bot #{bot_id}" if bot_id else "System"
+                return f"Bot #{log['bot_id']}" if log['bot_id'] else "System"
             elif column == 4:  # Wiadomość
-                return log.get('message', '')
-        
-        elif role == Qt.ItemDataRole.BackgroundRole:
-            level = log.get('level', 'INFO')
-            if level == 'ERROR':
-                return QColor("#FFEBEE")
-            elif level == 'WARNING':
-                return QColor("#FFF8E1")
-            elif level == 'CRITICAL':
-                return QColor("#FFCDD2")
-        
-        elif role == Qt.ItemDataRole.ForegroundRole:
-            level = log.get('level', 'INFO')
-            if level == 'ERROR':
-                return QColor("#D32F2F")
-            elif level == 'WARNING':
-                return QColor("#F57C00")
-            elif level == 'CRITICAL':
-                return QColor("#B71C1C")
-            elif level == 'DEBUG':
-                return QColor("#666666")
+                return log['message']
+        
+        elif role == Qt.ItemDataRole.TextAlignmentRole:
+            if column in (1, 2, 3):
+                return Qt.AlignmentFlag.AlignCenter
+        
+        elif role == Qt.ItemDataRole.FontRole:
+            return self._fonts.get(column)
+        
+        elif role in (Qt.ItemDataRole.BackgroundRole, Qt.ItemDataRole.ForegroundRole):
+            style = self._cell_style(log, column)
+            if style:
+                value = style[0] if role == Qt.ItemDataRole.BackgroundRole else style[1]
+                return self._color(value)
         
         return None
     
@@ -225,11 +293,151 @@ class LogTableModel(QAbstractTableModel):
             return self.headers[section]
         return None
     
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return self.older_cursor is not None and not self._loading_older and not self.buffer.is_full
+    
+    def fetchMore(self, parent=QModelIndex()):
+        """Widok doszedł do końca tabeli - poproś o starszą stronę z bazy"""
+        if not self.canFetchMore(parent):
+            return
+        self._loading_older = True
+        self.older_requested.emit(self.older_cursor)
+    
+    def append_logs(self, logs: List[Any]) -> List[Dict]:
+        """Dopisuje nowe wpisy; zwraca faktycznie dodane (bez duplikatów), chronologicznie"""
+        records = sorted((normalize_log(log) for log in logs), key=lambda record: record['timestamp'])
+        added, evicted = self.buffer.append(records)
+        self._drop_evicted(evicted)
+        first = self.buffer.first_seq
+        added = [seq for seq in added if seq >= first]
+        matched = [seq for seq in added if self.query.matches(self.buffer.get(seq))]
+        if matched:
+            self.beginInsertRows(QModelIndex(), 0, len(matched) - 1)
+            self._rows.extend(matched)
+            self._count_levels(matched, 1)
+            self.endInsertRows()
+        return [self.buffer.get(seq) for seq in added]
+    
     def update_logs(self, logs: List[Dict]):
-        """Aktualizuje logi"""
+        """Aktualizuje logi (przyrostowo - znane wpisy są pomijane)"""
+        return self.append_logs(logs)
+    
+    def prepend_older(self, logs: List[Any], next_cursor: Optional[str]) -> List[Dict]:
+        """Dokłada starszą stronę (najnowsze pierwsze) na końcu tabeli"""
+        self._loading_older = False
+        added = self.buffer.prepend(normalize_log(log) for log in logs)
+        self.older_cursor = next_cursor
+        matched = [seq for seq in added if self.query.matches(self.buffer.get(seq))]
+        if matched:
+            count = len(self._rows)
+            self.beginInsertRows(QModelIndex(), count, count + len(matched) - 1)
+            self._rows[0:0] = reversed(matched)
+            self._count_levels(matched, 1)
+            self.endInsertRows()
+        return [self.buffer.get(seq) for seq in added]
+    
+    def older_failed(self):
+        """Doczytanie starszej strony nie powiodło się - pozwól spróbować ponownie"""
+        self._loading_older = False
+    
+    def set_query(self, query: LogQuery):
+        """Zmienia filtr; przy dużym buforze dopasowanie liczy wątek roboczy"""
+        self._filter_generation += 1
+        generation = self._filter_generation
+        if len(self.buffer) <= self.SYNC_FILTER_LIMIT:
+            self._apply_selection(generation, query, self.buffer.select(query))
+            return
+        
+        def on_error(exc):
+            self._apply_selection(generation, query, self.buffer.select(query))
+        
+        try:
+            from ui.async_helper import get_async_bridge
+            get_async_bridge().submit(
+                asyncio.to_thread(self.buffer.select, query),
+                'log_filter',
+                lambda selection: self._apply_selection(generation, query, selection),
+                on_error,
+                replace=True,
+            )
+        except Exception as exc:
+            on_error(exc)
+    
+    def clear(self):
+        """Usuwa wszystkie wpisy z modelu"""
         self.beginResetModel()
-        self.logs = logs
+        self.buffer.clear()
+        self._rows = []
+        self._levels = Counter()
+        self.older_cursor = None
+        self._loading_older = False
+        self.endResetModel()
+    
+    def _apply_selection(self, generation: int, query: LogQuery, selection):
+        if generation != self._filter_generation:
+            return  # wynik starszego filtra - nowszy jest już w drodze
+        first, last = self.buffer.first_seq, self.buffer.last_seq
+        rows = selection.rows
+        levels = Counter(selection.levels)
+        if rows and rows[0] < first:
+            # Część wpisów wypadła z bufora w trakcie filtrowania
+            rows = rows[bisect_left(rows, first):]
+            levels = Counter(self.buffer.get(seq)['level'] for seq in rows)
+        # Wpisy dołożone w trakcie filtrowania (starsze strony i nowe paczki)
+        older = [seq for seq in range(first, selection.first_seq) if self._matches(query, seq)]
+        newer = [seq for seq in range(max(selection.last_seq + 1, first), last + 1) if self._matches(query, seq)]
+        
+        self.beginResetModel()
+        self.query = query
+        self._rows = older + rows + newer
+        self._levels = levels
+        self._count_levels(older + newer, 1)
         self.endResetModel()
+    
+    def _matches(self, query: LogQuery, seq: int) -> bool:
+        record = self.buffer.get(seq)
+        return record is not None and query.matches(record)
+    
+    def _drop_evicted(self, evicted):
+        if not evicted or not self._rows:
+            return
+        count = bisect_left(self._rows, self.buffer.first_seq)
+        if not count:
+            return
+        visible = set(self._rows[:count])
+        total = len(self._rows)
+        self.beginRemoveRows(QModelIndex(), total - count, total - 1)
+        del self._rows[:count]
+        for seq, record in evicted:
+            if seq in visible:
+                self._levels[record['level']] -= 1
+        self.endRemoveRows()
+    
+    def _count_levels(self, seqs: List[int], delta: int):
+        for seq in seqs:
+            self._levels[self.buffer.get(seq)['level']] += delta
+    
+    def _cell_style(self, log: Dict, column: int):
+        if column == 1:
+            return LEVEL_STYLES.get(log['level'])
+        if column == 2:
+            return TYPE_STYLES.get(log['type'])
+        if column == 3:
+            return BOT_STYLES[bool(log['bot_id'])]
+        if column == 4:
+            return MESSAGE_STYLES.get(log['level'], MESSAGE_STYLES['INFO'])
+        return None
+    
+    def _color(self, value) -> Optional[QColor]:
+        if value is None:
+            return None
+        color = self._colors.get(value)
+        if color is None:
+            color = QColor(*value) if isinstance(value, tuple) else QColor(value)
+            self._colors[value] = color
+        return color
 
 class LogFilterWidget(QWidget):
     """Widget filtrowania logów"""
@@ -329,13 +537,14 @@ class LogFilterWidget(QWidget):
 class LogTableWidget(QWidget):
     """Widget tabeli logów"""
     
+    older_logs_requested = pyqtSignal(str)
+    
     def __init__(self, parent=None):
         if not PYQT_AVAILABLE:
             return
         try:
             super().__init__(parent)
-            self.logs = []
-            self.filtered_logs = []
+            self._known_bots = set()
             self.setup_ui()
         except Exception as e:
             print(f"Error initializing LogTableWidget: {e}")
@@ -345,22 +554,28 @@ class LogTableWidget(QWidget):
         layout = QVBoxLayout(self)
         layout.setSpacing(10)
         
-        # Filtry
+        # Filtry (z krótkim opóźnieniem, aby nie filtrować po każdym znaku)
         self.filter_widget = LogFilterWidget()
-        self.filter_widget.filter_changed.connect(self.apply_filters)
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(200)
+        self._filter_timer.timeout.connect(self.apply_filters)
+        self.filter_widget.filter_changed.connect(self._filter_timer.start)
         layout.addWidget(self.filter_widget)
         
-        # Tabela
-        self.table = QTableWidget()
+        # Tabela - widok na wirtualny model
+        self.table = QTableView()
         self.model = LogTableModel()
+        self.table.setModel(self.model)
+        self.model.older_requested.connect(self.older_logs_requested.emit)
+        self.model.rowsInserted.connect(lambda *args: self.update_stats())
+        self.model.rowsRemoved.connect(lambda *args: self.update_stats())
+        self.model.modelReset.connect(self.update_stats)
         
-        # Konfiguracja tabeli
-        self.table.setColumnCount(5)
-        self.table.setHorizontalHeaderLabels(["Czas", "Poziom", "Typ", "Bot", "Wiadomość"])
-        
-        # Kompaktowe ustawienia tabeli
+        # Kompaktowe ustawienia tabeli (stała wysokość wierszy - widok nie mierzy treści)
         self.table.setMinimumHeight(200)
         self.table.setMaximumHeight(350)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
         self.table.verticalHeader().setDefaultSectionSize(26)
         self.table.verticalHeader().setVisible(False)
         self.table.setShowGrid(False)
@@ -378,28 +593,27 @@ class LogTableWidget(QWidget):
         header.setSectionResizeMode(4, QHeaderView.ResizeMode.Stretch)  # Wiadomość
         
         self.table.setAlternatingRowColors(False)
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.table.setSortingEnabled(True)
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         
         # Nowoczesny styl tabeli
         self.table.setObjectName("logsTable")
         self.table.setStyleSheet("""
-            QTableWidget#logsTable {
+            QTableView#logsTable {
                 font-size: 12px;
                 background-color: #1a1a1a;
                 border: 1px solid #2a2a2a;
                 border-radius: 8px;
                 gridline-color: #2a2a2a;
             }
-            QTableWidget#logsTable::item {
+            QTableView#logsTable::item {
                 padding: 6px 8px;
                 border-bottom: 1px solid #2a2a2a;
                 color: #ffffff;
             }
-            QTableWidget#logsTable::item:selected {
+            QTableView#logsTable::item:selected {
                 background-color: #333333;
             }
-            QTableWidget#logsTable::item:hover {
+            QTableView#logsTable::item:hover {
                 background-color: #222222;
             }
             QHeaderView::section {
@@ -468,193 +682,45 @@ class LogTableWidget(QWidget):
         
         layout.addLayout(stats_layout)
     
-    def load_logs(self, logs: List[Dict]):
-        """Ładuje logi"""
-        self.logs = logs
-        self.apply_filters()
-        self.update_stats()
-        
-        # Aktualizuj listę botów w filtrach
-        bots = set()
-        for log in logs:
-            bot_id = log.get('bot_id')
-            if bot_id:
-                bots.add(str(bot_id))
-        
-        self.filter_widget.update_bots(sorted(bots))
+    @property
+    def filtered_logs(self) -> List[Dict]:
+        """Widoczne (przefiltrowane) logi, najnowsze pierwsze"""
+        return self.model.visible_logs()
+    
+    def load_logs(self, logs: List[Dict]) -> List[Dict]:
+        """Dopisuje nowe logi do tabeli; zwraca wpisy, których jeszcze nie było"""
+        added = self.model.append_logs(logs)
+        self._update_bot_filter(added)
+        return added
+    
+    def load_older_logs(self, page: Dict[str, Any]) -> List[Dict]:
+        """Dokłada starszą stronę logów (``{'items', 'next_cursor'}``)"""
+        added = self.model.prepend_older(page.get('items') or [], page.get('next_cursor'))
+        self._update_bot_filter(added)
+        return added
+    
+    def _update_bot_filter(self, logs: List[Dict]):
+        # Aktualizuj listę botów w filtrach tylko gdy pojawił się nowy bot
+        bots = {log['bot_id'] for log in logs if log['bot_id']} - self._known_bots
+        if bots:
+            self._known_bots |= bots
+            self.filter_widget.update_bots(sorted(self._known_bots))
     
     def apply_filters(self):
         """Aplikuje filtry do logów"""
-        filters = self.filter_widget.get_filters()
-        self.filtered_logs = []
-        
-        for log in self.logs:
-            # Filtr wyszukiwania
-            if filters['search']:
-                search_text = filters['search'].lower()
-                message = log.get('message', '').lower()
-                if search_text not in message:
-                    continue
-            
-            # Filtr poziomu
-            if filters['level'] != "Wszystkie":
-                if log.get('level') != filters['level']:
-                    continue
-            
-            # Filtr typu
-            if filters['type'] != "Wszystkie":
-                if log.get('type') != filters['type']:
-                    continue
-            
-            # Filtr bota
-            if filters['bot'] != "Wszystkie":
-                if filters['bot'] == "System":
-                    if log.get('bot_id') is not None:
-                        continue
-                else:
-                    bot_id = filters['bot'].replace("Bot #", "")
-                    if str(log.get('bot_id', '')) != bot_id:
-                        continue
-            
-            # Filtr okresu
-            if filters['period'] != "Wszystkie":
-                timestamp = log.get('timestamp', datetime.now())
-                if isinstance(timestamp, str):
-                    timestamp = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                
-                now = datetime.now()
-                if filters['period'] == "Ostatnia godzina":
-                    if timestamp < now - timedelta(hours=1):
-                        continue
-                elif filters['period'] == "Ostatnie 24h":
-                    if timestamp < now - timedelta(days=1):
-                        continue
-                elif filters['period'] == "Ostatni tydzień":
-                    if timestamp < now - timedelta(weeks=1):
-                        continue
-                elif filters['period'] == "Ostatni miesiąc":
-                    if timestamp < now - timedelta(days=30):
-                        continue
-            
-            self.filtered_logs.append(log)
-        
-        # Aktualizuj tabelę
-        self.update_table()
-    
-    def update_table(self):
-        """Aktualizuje tabelę logów"""
-        self.table.setRowCount(len(self.filtered_logs))
-        
-        for row, log in enumerate(self.filtered_logs):
-            # Czas
-            timestamp = log.get('timestamp', datetime.now())
-            if isinstance(timestamp, str):
-                timestamp = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-            
-            time_item = QTableWidgetItem(timestamp.strftime("%Y-%m-%d %H:%M:%S"))
-            self.table.setItem(row, 0, time_item)
-            
-            # Poziom
-            level = log.get('level', 'INFO')
-            level_item = QTableWidgetItem(level)
-            level_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            level_item.setFont(QFont("Arial", 11, QFont.Weight.Bold))
-            
-            # Ulepszone kolorowanie poziomu dla lepszej czytelności
-            if level == 'ERROR':
-                level_item.setBackground(QColor(239, 83, 80, 40))  # Jasnoczerwony z przezroczystością
-                level_item.setForeground(QColor("#EF5350"))
-            elif level == 'WARNING':
-                level_item.setBackground(QColor(255, 183, 77, 40))  # Żółto-pomarańczowy z przezroczystością
-                level_item.setForeground(QColor("#FFB74D"))
-            elif level == 'CRITICAL':
-                level_item.setBackground(QColor(211, 47, 47, 100))  # Intensywny czerwony
-                level_item.setForeground(QColor("#FFFFFF"))
-            elif level == 'INFO':
-                level_item.setBackground(QColor(100, 181, 246, 40))  # Jasnoniebieski z przezroczystością
-                level_item.setForeground(QColor("#64B5F6"))
-            elif level == 'DEBUG':
-                level_item.setBackground(QColor(176, 176, 176, 30))  # Jasnoszary z przezroczystością
-                level_item.setForeground(QColor("#B0B0B0"))
-            elif level == 'SUCCESS':
-                level_item.setBackground(QColor(102, 187, 106, 40))  # Jasnozielony z przezroczystością
-                level_item.setForeground(QColor("#66BB6A"))
-            
-            self.table.setItem(row, 1, level_item)
-            
-            # Typ
-            type_item = QTableWidgetItem(log.get('type', 'SYSTEM'))
-            type_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            type_item.setFont(QFont("Arial", 10, QFont.Weight.Medium))
-            
-            # Ulepszone kolorowanie typu dla lepszej widoczności
-            log_type = log.get('type', 'SYSTEM')
-            if log_type == 'TRADE':
-                type_item.setBackground(QColor(102, 187, 106, 40))  # Jasnozielony z tłem
-                type_item.setForeground(QColor("#66BB6A"))
-            elif log_type == 'API':
-                type_item.setBackground(QColor(100, 181, 246, 40))  # Jasnoniebieski z tłem
-                type_item.setForeground(QColor("#64B5F6"))
-            elif log_type == 'SYSTEM':
-                type_item.setBackground(QColor(171, 71, 188, 40))  # Jasnofioletowy z tłem
-                type_item.setForeground(QColor("#AB47BC"))
-            elif log_type == 'ERROR':
-                type_item.setBackground(QColor(239, 83, 80, 40))  # Jasnoczerwony z tłem
-                type_item.setForeground(QColor("#EF5350"))
-            
-            self.table.setItem(row, 2, type_item)
-            
-            # Bot
-            bot_id = log.get('bot_id')
-            bot_item = QTableWidgetItem(f"Bot #{bot_id}" if bot_id else "System")
-            bot_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            bot_item.setFont(QFont("Arial", 10, QFont.Weight.Medium))
-            
-            if bot_id:
-                bot_item.setBackground(QColor(255, 193, 7, 40))   # Żółte tło z przezroczystością
-                bot_item.setForeground(QColor("#FFC107"))         # Jasnożółty dla botów
-            else:
-                bot_item.setBackground(QColor(158, 158, 158, 30)) # Szare tło z przezroczystością
-                bot_item.setForeground(QColor("#B0B0B0"))         # Jasnoszary dla systemu
-            
-            self.table.setItem(row, 3, bot_item)
-            
-            # Wiadomość
-            message_item = QTableWidgetItem(log.get('message', ''))
-            message_item.setFont(QFont("Consolas", 11))  # Monospace font dla wiadomości
-            
-            # Ulepszone kolorowanie wiadomości dla lepszej czytelności
-            if level == 'ERROR':
-                message_item.setForeground(QColor("#FFCDD2"))  # Jasnoróżowy dla błędów
-            elif level == 'CRITICAL':
-                message_item.setForeground(QColor("#FFFFFF"))   # Biały dla krytycznych
-                message_item.setBackground(QColor("#D32F2F"))   # Czerwone tło
-            elif level == 'WARNING':
-                message_item.setForeground(QColor("#FFF3C4"))   # Jasnożółty dla ostrzeżeń
-            elif level == 'SUCCESS':
-                message_item.setForeground(QColor("#C8E6C9"))   # Jasnozielony dla sukcesu
-            elif level == 'DEBUG':
-                message_item.setForeground(QColor("#E0E0E0"))   # Jasnoszary dla debug
-            else:  # INFO
-                message_item.setForeground(QColor("#E3F2FD"))   # Jasnoniebieski dla info
-            
-            self.table.setItem(row, 4, message_item)
-        
-        self.update_stats()
+        self.model.set_query(LogQuery.from_filters(self.filter_widget.get_filters()))
     
     def update_stats(self):
         """Aktualizuje statystyki"""
-        total = len(self.filtered_logs)
-        errors = len([log for log in self.filtered_logs if log.get('level') == 'ERROR'])
-        warnings = len([log for log in self.filtered_logs if log.get('level') == 'WARNING'])
+        counts = self.model.level_counts()
         
-        self.total_logs_label.setText(f"Łącznie: {total}")
-        self.errors_label.setText(f"Błędy: {errors}")
-        self.warnings_label.setText(f"Ostrzeżenia: {warnings}")
+        self.total_logs_label.setText(f"Łącznie: {self.model.rowCount()}")
+        self.errors_label.setText(f"Błędy: {counts.get('ERROR', 0)}")
+        self.warnings_label.setText(f"Ostrzeżenia: {counts.get('WARNING', 0)}")
     
     def show_context_menu(self, position):
         """Pokazuje menu kontekstowe"""
-        if self.table.itemAt(position) is None:
+        if not self.table.indexAt(position).isValid():
             return
         
         menu = QMenu(self)
@@ -680,10 +746,8 @@ class LogTableWidget(QWidget):
     
     def show_log_details(self):
         """Pokazuje szczegóły logu"""
-        current_row = self.table.currentRow()
-        if current_row >= 0 and current_row < len(self.filtered_logs):
-            log = self.filtered_logs[current_row]
-            
+        log = self.model.log_at(self.table.currentIndex().row())
+        if log is not None:
             details = json.dumps(log, indent=2, default=str, ensure_ascii=False)
             
             dialog = QMessageBox(self)
@@ -694,10 +758,8 @@ class LogTableWidget(QWidget):
     
     def copy_log(self):
         """Kopiuje log do schowka"""
-        current_row = self.table.currentRow()
-        if current_row >= 0 and current_row < len(self.filtered_logs):
-            log = self.filtered_logs[current_row]
-            
+        log = self.model.log_at(self.table.currentIndex().row())
+        if log is not None:
             # Formatuj log do kopiowania
             log_text = f"[{log.get('timestamp', '')}] {log.get('level', '')} - {log.get('message', '')}"
             if log.get('details'):
@@ -712,13 +774,14 @@ class LogTableWidget(QWidget):
     
     def copy_all_logs(self):
         """Kopiuje wszystkie widoczne logi"""
-        if not self.filtered_logs:
+        logs = self.filtered_logs
+        if not logs:
             QMessageBox.information(self, "Kopiuj", "Brak logów do skopiowania.")
             return
         
         # Formatuj wszystkie logi
         all_logs_text = []
-        for log in self.filtered_logs:
+        for log in logs:
             log_text = f"[{log.get('timestamp', '')}] {log.get('level', '')} - {log.get('message', '')}"
             if log.get('details'):
                 log_text += f"\nSzczegóły: {log['details']}"
@@ -729,7 +792,7 @@ class LogTableWidget(QWidget):
         clipboard = QApplication.clipboard()
         clipboard.setText('\n\n'.join(all_logs_text))
         
-        QMessageBox.information(self, "Kopiuj", f"{len(self.filtered_logs)} logów skopiowanych do schowka.")
+        QMessageBox.information(self, "Kopiuj", f"{len(logs)} logów skopiowanych do schowka.")
     
     def clear_logs(self):
         """Czyści wszystkie logi z tabeli"""
@@ -741,15 +804,14 @@ class LogTableWidget(QWidget):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            self.logs.clear()
-            self.filtered_logs.clear()
-            self.table.setRowCount(0)
-            self.update_stats()
+            self.model.clear()
             QMessageBox.information(self, "Logi wyczyszczone", "Wszystkie logi zostały usunięte z tabeli.")
 
 class LogTextWidget(QWidget):
     """Widget tekstowy logów (konsola)"""
     
+    MAX_LINES = 10000
+    
     def __init__(self, parent=None):
         if not PYQT_AVAILABLE:
             return
@@ -796,6 +858,8 @@ class LogTextWidget(QWidget):
         # Obszar tekstowy
         self.text_area = QPlainTextEdit()
         self.text_area.setReadOnly(True)
+        # Konsola trzyma tylko ostatnie linie - starsze usuwa sam widget
+        self.text_area.setMaximumBlockCount(self.MAX_LINES)
         self.text_area.setFont(QFont("Consolas", 9))
         self.text_area.setStyleSheet("""
             QPlainTextEdit {
@@ -811,8 +875,9 @@ class LogTextWidget(QWidget):
         
         layout.addWidget(self.text_area)
     
-    def add_log(self, log: Dict):
-        """Dodaje log do widoku tekstowego"""
+    @staticmethod
+    def format_log(log: Dict) -> str:
+        """Formatuje wpis jako linię konsoli"""
         timestamp = log.get('timestamp', datetime.now())
         if isinstance(timestamp, str):
             timestamp = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
@@ -822,12 +887,18 @@ class LogTextWidget(QWidget):
         bot_id = log.get('bot_id')
         message = log.get('message', '')
         
-        # Formatuj log
         bot_part = f" [Bot #{bot_id}]" if bot_id else ""
-        log_line = f"[{timestamp.strftime('%Y-%m-%d %H:%M:%S')}] {level} {log_type}{bot_part}: {message}"
-        
-        # Dodaj do obszaru tekstowego
-        self.text_area.appendPlainText(log_line)
+        return f"[{timestamp.strftime('%Y-%m-%d %H:%M:%S')}] {level} {log_type}{bot_part}: {message}"
+    
+    def add_log(self, log: Dict):
+        """Dodaje log do widoku tekstowego"""
+        self.append_logs([log])
+    
+    def append_logs(self, logs: List[Dict]):
+        """Dopisuje paczkę logów jednym wywołaniem (bez przebudowy konsoli)"""
+        if not logs:
+            return
+        self.text_area.appendPlainText('\n'.join(self.format_log(log) for log in logs))
         
         # Auto-scroll
         if self.auto_scroll_checkbox.isChecked():
@@ -839,9 +910,7 @@ class LogTextWidget(QWidget):
         """Ładuje logi do widoku tekstowego"""
         self.logs = logs
         self.text_area.clear()
-        
-        for log in logs:
-            self.add_log(log)
+        self.append_logs(logs)
     
     def toggle_wrap_text(self, enabled: bool):
         """Przełącza zawijanie tekstu"""
@@ -1112,6 +1181,7 @@ class LogsWidget(QWidget):
             # Timer odświeżania
             self.refresh_timer = QTimer()
             self.refresh_timer.timeout.connect(self.refresh_logs)
+            self._logs_loaded = False
             
             self.setup_ui()
             self.start_refresh_timer()
@@ -1152,6 +1222,7 @@ class LogsWidget(QWidget):
         
         # Tab: Tabela logów
         self.log_table = LogTableWidget()
+        self.log_table.older_logs_requested.connect(self.load_older_logs)
         self.tabs.addTab(self.log_table, "Tabela Logów")
         
         # Tab: Konsola
@@ -1173,98 +1244,93 @@ class LogsWidget(QWidget):
         self.refresh_logs()
     
     def refresh_logs(self):
-        """Odświeża logi"""
+        """Odświeża logi - pobranie w pętli tła, do widoków trafiają tylko nowe wpisy"""
         try:
-            # Pobierz rzeczywiste logi z DataManager
-            if self.data_manager:
-                try:
-                    # Pobierz logi asynchronicznie
-                    import asyncio
-                    try:
-                        # Jeśli istnieje działająca pętla, uruchom w osobnym wątku
-                        asyncio.get_running_loop()
-                        import concurrent.futures
-                        with concurrent.futures.ThreadPoolExecutor() as executor:
-                            future = executor.submit(asyncio.run, self.data_manager.get_logs(limit=200))
-                            try:
-                                log_entries = future.result(timeout=3)
-                            except concurrent.futures.TimeoutError:
-                                self.logger.warning("Timeout fetching logs from DataManager")
-                                log_entries = []
-                    except RuntimeError:
-                        # Brak pętli – uruchom bezpośrednio
-                        log_entries = asyncio.run(self.data_manager.get_logs(limit=200))
-                    
-                    # Konwertuj LogEntry na format Dict dla UI
-                    logs = []
-                    for entry in log_entries:
-                        logs.append({
-                            'timestamp': entry.timestamp,
-                            'level': entry.level,
-                            'type': entry.type,
-                            'bot_id': entry.bot_id,
-                            'message': entry.message,
-                            'details': entry.details
-                        })
-                    
-                except Exception as e:
-                    self.logger.error(f"Error getting logs from DataManager: {e}")
-                    # Fallback do przykładowych logów
-                    logs = self.load_sample_logs()
-            else:
+            if not self.data_manager:
                 # Fallback gdy DataManager nie jest dostępny
+                self._apply_refresh({'page': None, 'alerts': None})
+                return
+            from ui.async_helper import get_async_bridge
+            get_async_bridge().submit(self._fetch_logs(), 'logs_refresh', self._apply_refresh,
+                                      timeout=LOGS_REFRESH_TIMEOUT)
+        except Exception as e:
+            self.logger.error(f"Error refreshing logs: {e}")
+    
+    async def _fetch_logs(self) -> Dict[str, Any]:
+        """Pobiera najnowszą stronę logów i alerty (w pętli tła)"""
+        result = {'page': None, 'alerts': None}
+        try:
+            result['page'] = await self.data_manager.get_logs_page(limit=200)
+        except Exception as e:
+            self.logger.error(f"Error getting logs from DataManager: {e}")
+        try:
+            alert_entries = await self.data_manager.get_alerts(limit=50)
+            # Konwertuj AlertEntry na format Dict dla UI
+            result['alerts'] = [
+                {
+                    'id': entry.id,
+                    'timestamp': entry.timestamp,
+                    'title': entry.title,
+                    'message': entry.message,
+                    'severity': entry.severity,
+                    'is_read': entry.is_read,
+                    'bot_id': entry.bot_id,
+                    'alert_type': entry.alert_type
+                }
+                for entry in alert_entries
+            ]
+        except Exception as e:
+            self.logger.error(f"Error getting alerts from DataManager: {e}")
+        return result
+    
+    def _apply_refresh(self, result: Dict[str, Any]):
+        """Dopisuje pobrane logi do tabeli i konsoli, podmienia alerty (wątek GUI)"""
+        try:
+            page = result.get('page')
+            if page is not None:
+                logs = page.get('items') or []
+            elif not self._logs_loaded:
+                # Fallback do przykładowych logów
                 logs = self.load_sample_logs()
-            
-            # Pobierz alerty z DataManager
-            if self.data_manager:
-                try:
-                    # Pobierz alerty asynchronicznie
-                    import asyncio
-                    try:
-                        asyncio.get_running_loop()
-                        import concurrent.futures
-                        with concurrent.futures.ThreadPoolExecutor() as executor:
-                            future = executor.submit(asyncio.run, self.data_manager.get_alerts(limit=50))
-                            try:
-                                alert_entries = future.result(timeout=3)
-                            except concurrent.futures.TimeoutError:
-                                self.logger.warning("Timeout fetching alerts from DataManager")
-                                alert_entries = []
-                    except RuntimeError:
-                        alert_entries = asyncio.run(self.data_manager.get_alerts(limit=50))
-                    
-                    # Konwertuj AlertEntry na format Dict dla UI
-                    alerts = []
-                    for entry in alert_entries:
-                        alerts.append({
-                            'id': entry.id,
-                            'timestamp': entry.timestamp,
-                            'title': entry.title,
-                            'message': entry.message,
-                            'severity': entry.severity,
-                            'is_read': entry.is_read,
-                            'bot_id': entry.bot_id,
-                            'alert_type': entry.alert_type
-                        })
-                    
-                except Exception as e:
-                    self.logger.error(f"Error getting alerts from DataManager: {e}")
-                    # Fallback do przykładowych alertów
-                    alerts = self.load_sample_alerts()
             else:
-                # Fallback gdy DataManager nie jest dostępny
-                alerts = self.load_sample_alerts()
+                logs = []
             
-            # Aktualizuj widoki
-            self.log_table.load_logs(logs)
-            self.log_text.load_logs(logs)
-            self.alerts.load_alerts(alerts)
+            added = self.log_table.load_logs(logs)
+            if page is not None and not self._logs_loaded:
+                # Kursor pierwszej strony prowadzi do starszej historii w bazie
+                self.log_table.model.older_cursor = page.get('next_cursor')
+            self._logs_loaded = self._logs_loaded or bool(logs)
+            self.log_text.append_logs(added)
             
-            self.logger.debug("Logs refreshed")
+            alerts = result.get('alerts')
+            if alerts is None:
+                # Fallback do przykładowych alertów
+                alerts = self.load_sample_alerts()
+            self.alerts.load_alerts(alerts)
             
+            self.logger.debug(f"Logs refreshed ({len(added)} new)")
         except Exception as e:
             self.logger.error(f"Error refreshing logs: {e}")
     
+    def load_older_logs(self, cursor: str):
+        """Doczytuje starszą stronę logów z bazy (przewinięcie na koniec tabeli)"""
+        model = self.log_table.model
+        if not self.data_manager or not hasattr(self.data_manager, 'get_logs_page'):
+            model.older_failed()
+            return
+        try:
+            from ui.async_helper import get_async_bridge
+            get_async_bridge().submit(
+                self.data_manager.get_logs_page(cursor=cursor, limit=200),
+                'logs_older',
+                self.log_table.load_older_logs,
+                lambda exc: model.older_failed(),
+                timeout=LOGS_REFRESH_TIMEOUT,
+            )
+        except Exception as e:
+            self.logger.error(f"Error loading older logs: {e}")
+            model.older_failed()
+    
     def load_sample_logs(self) -> List[Dict]:
         """Ładuje przykładowe logi (do usunięcia po implementacji bazy danych)"""
         logs = []
@@ -1353,7 +1419,7 @@ class LogsWidget(QWidget):
         if file_path:
             try:
                 # Pobierz aktualne logi z tabeli
-                current_logs = self.table_widget.filtered_logs if hasattr(self.table_widget, 'filtered_logs') else []
+                current_logs = self.log_table.filtered_logs
                 
                 if not current_logs:
                     QMessageBox.warning(self, "Eksport", "Brak logów do eksportowania.")
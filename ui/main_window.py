@@ -7,8 +7,8 @@ komponentami interfejsu użytkownika.
 """
 
 import sys
-import asyncio
 from datetime import datetime, timedelta
+from types import SimpleNamespace
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 
@@ -73,6 +73,10 @@ from utils.config_manager import get_config_manager, get_ui_setting, get_app_set
 from utils.logger import get_logger, LogType
 from app.production_data_manager import ProductionDataManager, get_production_data_manager
 from core.updated_bot_manager import get_updated_bot_manager
+from utils.async_runtime import get_async_runtime
+
+# Maksymalny czas cyklicznego odświeżenia (s), po którym UI przechodzi na dane domyślne
+REFRESH_TIMEOUT = 2.0
 
 # Import stylów
 try:
@@ -784,6 +788,12 @@ class MainWindow(QMainWindow):
         self.recent_trades = []
         self.risk_metrics = {}
         self.notification_stats = {}
+
+        # Stan dashboardu składany z różnic feedu UI (zamiast odpytywania)
+        self.feed_bridge = None
+        self._feed_portfolio = None
+        self._feed_bots = {}
+        self._feed_trades = []
         
         # Przechowywanie instancji widoków aby uniknąć duplikacji
         self.bot_management_widget = None
@@ -814,18 +824,23 @@ class MainWindow(QMainWindow):
         except Exception:
             pass
 
-    def _run_coroutine_blocking(self, coro):
-        """Uruchamia coroutine w dedykowanej pętli event loop."""
-        loop = asyncio.new_event_loop()
-        try:
-            asyncio.set_event_loop(loop)
-            return loop.run_until_complete(coro)
-        finally:
-            try:
-                asyncio.set_event_loop(None)
-            except Exception:
-                pass
-            loop.close()
+    def _run_coroutine_blocking(self, coro, timeout: float = 30.0):
+        """Wykonuje coroutine we współdzielonej pętli tła i czeka na wynik.
+
+        Używane tylko przy akcjach użytkownika, które potrzebują wyniku od razu;
+        cykliczne odświeżenia idą przez ``_submit_refresh`` i nie blokują GUI.
+        """
+        return get_async_runtime().run(coro, timeout)
+
+    def _submit_refresh(self, task_id: str, coro, on_result, on_error=None, timeout: float = REFRESH_TIMEOUT):
+        """Planuje odświeżenie w pętli tła; wynik trafia do ``on_result`` w wątku GUI.
+
+        Jeśli poprzednie odświeżenie o tym samym ``task_id`` jeszcze trwa,
+        nowe jest pomijane zamiast ustawiać się w kolejce. Odświeżenie dłuższe
+        niż ``timeout`` trafia do ``on_error`` (dane domyślne).
+        """
+        from ui.async_helper import get_async_bridge
+        return get_async_bridge().submit(coro, task_id, on_result, on_error, timeout=timeout)
 
     def setup_ui(self):
         """Konfiguracja głównego interfejsu"""
@@ -2345,6 +2360,9 @@ class MainWindow(QMainWindow):
         """Uruchamia automatyczne odświeżanie danych"""
         interval = get_ui_setting("dashboard.refresh_interval_seconds", 5) * 1000
         self.refresh_timer.start(interval)
+
+        # Portfel, boty i transakcje przychodzą jako różnice z feedu
+        self._connect_ui_feed()
         
         # Pierwsze odświeżenie
         self.refresh_data()
@@ -2364,7 +2382,7 @@ class MainWindow(QMainWindow):
                 
             # Sprawdź czy jesteśmy w widoku dashboard przed aktualizacją
             current_view = getattr(self, 'current_view', 'dashboard')
-            if current_view == 'dashboard':
+            if current_view == 'dashboard' and self.feed_bridge is None:
                 # TODO: Pobierz rzeczywiste dane z backendu
                 self.update_portfolio_data()
                 self.update_bots_data()
@@ -2383,6 +2401,73 @@ class MainWindow(QMainWindow):
         except Exception as e:
             self.logger.error(f"Error refreshing data: {e}")
     
+    def _connect_ui_feed(self):
+        """Subskrybuje feed różnic IntegratedDataManager dla dashboardu"""
+        if not getattr(self, 'integrated_data_manager', None):
+            return
+        try:
+            from ui.async_helper import get_ui_feed_bridge
+            self.feed_bridge = get_ui_feed_bridge(self.integrated_data_manager)
+            self.feed_bridge.connect_widget(self._on_feed_diff)
+        except Exception as e:
+            self.feed_bridge = None
+            self.logger.warning(f"UI feed unavailable, dashboard falls back to polling: {e}")
+
+    def _on_feed_diff(self, diff):
+        """Nakłada różnicę z feedu na stan dashboardu i odświeża zmienione sekcje (wątek GUI)"""
+        if diff.full:
+            self._feed_bots = {}
+            self._feed_trades = []
+        for bot_id in diff.bots_removed:
+            self._feed_bots.pop(bot_id, None)
+        self._feed_bots.update(diff.bots)
+        if diff.trades:
+            self._feed_trades = (list(diff.trades) + self._feed_trades)[:10]
+        if diff.portfolio is not None:
+            self._feed_portfolio = diff.portfolio
+
+        if getattr(self, 'current_view', 'dashboard') != 'dashboard':
+            return
+        if diff.full or diff.portfolio is not None:
+            self._apply_feed_portfolio()
+        if diff.full or diff.bots or diff.bots_removed:
+            self._apply_dashboard_bots([self._feed_bot_view(bot) for bot in self._feed_bots.values()])
+        if diff.full or diff.trades:
+            self._apply_recent_trades(self._feed_trades)
+
+    def _apply_feed_dashboard(self):
+        """Wypełnia świeżo zbudowany dashboard ostatnim stanem z feedu"""
+        if self.feed_bridge is None:
+            return
+        self._apply_feed_portfolio()
+        self._apply_dashboard_bots([self._feed_bot_view(bot) for bot in self._feed_bots.values()])
+        self._apply_recent_trades(self._feed_trades)
+
+    def _apply_feed_portfolio(self):
+        if self._feed_portfolio is None:
+            return
+        summary = self._feed_portfolio
+        portfolio = SimpleNamespace(
+            total_value=summary.get('total_value', 0.0) or 0.0,
+            daily_change=summary.get('daily_change', 0.0) or 0.0,
+            daily_change_percent=summary.get('daily_change_percent', 0.0) or 0.0,
+            profit_loss=summary.get('profit_loss', 0.0) or 0.0,
+            profit_loss_percent=summary.get('profit_loss_percent', 0.0) or 0.0,
+        )
+        self._apply_portfolio_data(portfolio)
+        self._apply_pnl_cards(portfolio)
+
+    @staticmethod
+    def _feed_bot_view(bot: Dict[str, Any]):
+        """Rekord bota z feedu w kształcie oczekiwanym przez ``_apply_dashboard_bots``"""
+        return SimpleNamespace(
+            id=bot['id'],
+            strategy_type=bot.get('strategy_type') or bot.get('strategy'),
+            trading_pair=bot.get('trading_pair') or bot.get('symbol'),
+            status=bot.get('status'),
+            profit_loss=bot.get('profit_loss', bot.get('pnl', 0.0)),
+        )
+
     def update_portfolio_data(self):
         """Aktualizuje dane portfela"""
         try:
@@ -2390,45 +2475,45 @@ class MainWindow(QMainWindow):
             if not hasattr(self, 'portfolio_card') or not self.portfolio_card:
                 return
                 
-            # Sprawdź czy komponent nie został usunięty - bezpieczne sprawdzenie
+            # Pobierz rzeczywiste dane portfela z DataManager w pętli tła
             try:
-                # Sprawdź czy obiekt nadal istnieje w pamięci
-                if hasattr(self.portfolio_card, 'update_value'):
-                    # Pobierz rzeczywiste dane portfela z DataManager
-                    try:
-                        from core.integrated_data_manager import get_integrated_data_manager
-                        data_manager = get_integrated_data_manager()
-                        
-                        # Pobierz dane asynchronicznie
-                        try:
-                            try:
-                                asyncio.get_running_loop()
-                                import concurrent.futures
-                                with concurrent.futures.ThreadPoolExecutor() as executor:
-                                    future = executor.submit(asyncio.run, data_manager.get_portfolio_data())
-                                    portfolio_data = future.result(timeout=2)
-                            except RuntimeError:
-                                portfolio_data = asyncio.run(data_manager.get_portfolio_data())
-                        except Exception:
-                            # Fallback - pobierz synchronicznie
-                            portfolio_data = data_manager._get_sample_portfolio_data()
-                        
-                        self.portfolio_card.update_value(
-                            f"${portfolio_data.total_value:,.2f}",
-                            f"{portfolio_data.daily_change:+.2f} ({portfolio_data.daily_change_percent:+.2f}%)"
-                        )
-                    except Exception as e:
-                        self.logger.error(f"Error getting portfolio data from DataManager: {e}")
-                        # Fallback do domyślnych wartości
-                        self.portfolio_card.update_value("$0.00", "Brak danych")
-                else:
-                    # Obiekt nie ma już metody update_value - został usunięty
-                    self.portfolio_card = None
-                    return
-            except (RuntimeError, AttributeError):
-                # Komponent został usunięty z pamięci
+                from core.integrated_data_manager import get_integrated_data_manager
+                data_manager = get_integrated_data_manager()
+                self._submit_refresh(
+                    'portfolio_data',
+                    data_manager.get_portfolio_data(),
+                    self._apply_portfolio_data,
+                    # Fallback - dane przykładowe
+                    lambda exc: self._apply_portfolio_data(data_manager._get_sample_portfolio_data()),
+                )
+            except Exception as e:
+                self.logger.error(f"Error getting portfolio data from DataManager: {e}")
+                self._apply_portfolio_data(None)
+        except Exception as e:
+            self.logger.error(f"Error updating portfolio data: {e}")
+
+    def _apply_portfolio_data(self, portfolio_data):
+        """Wyświetla dane portfela na karcie (wątek GUI)"""
+        if not getattr(self, 'portfolio_card', None):
+            return
+        # Sprawdź czy komponent nie został usunięty - bezpieczne sprawdzenie
+        try:
+            # Sprawdź czy obiekt nadal istnieje w pamięci
+            if not hasattr(self.portfolio_card, 'update_value'):
+                # Obiekt nie ma już metody update_value - został usunięty
                 self.portfolio_card = None
                 return
+            if portfolio_data is None:
+                # Fallback do domyślnych wartości
+                self.portfolio_card.update_value("$0.00", "Brak danych")
+                return
+            self.portfolio_card.update_value(
+                f"${portfolio_data.total_value:,.2f}",
+                f"{portfolio_data.daily_change:+.2f} ({portfolio_data.daily_change_percent:+.2f}%)"
+            )
+        except (RuntimeError, AttributeError):
+            # Komponent został usunięty z pamięci
+            self.portfolio_card = None
         except Exception as e:
             self.logger.error(f"Error updating portfolio data: {e}")
     
@@ -2475,72 +2560,19 @@ class MainWindow(QMainWindow):
                     self.setup_dashboard()
                     return
                 
-                # Pobierz rzeczywiste dane botów z DataManager
+                # Pobierz rzeczywiste dane botów z DataManager w pętli tła
                 try:
                     from core.integrated_data_manager import get_integrated_data_manager
                     data_manager = get_integrated_data_manager()
-                    
-                    # Pobierz dane asynchronicznie
-                    try:
-                        try:
-                            asyncio.get_running_loop()
-                            import concurrent.futures
-                            with concurrent.futures.ThreadPoolExecutor() as executor:
-                                future = executor.submit(asyncio.run, data_manager.get_bots_data())
-                                bots_data = future.result(timeout=2)
-                        except RuntimeError:
-                            bots_data = asyncio.run(data_manager.get_bots_data())
-                    except Exception as e:
-                        # Fallback: w razie błędu nie używamy danych przykładowych
-                        if hasattr(self, 'logger') and self.logger:
-                            self.logger.warning(f"Fallback: get_bots_data failed, returning empty list due to error: {e}")
-                        bots_data = []
-                    
-                    # Konwertuj BotData do dict dla kompatybilności
-                    sample_bots = []
-                    for bot in bots_data:
-                        sample_bots.append({
-                            "id": bot.id,
-                            "type": bot.strategy_type,
-                            "pair": bot.trading_pair,
-                            "status": bot.status,
-                            "pnl": bot.profit_loss
-                        })
+                    self._submit_refresh(
+                        'dashboard_bots',
+                        data_manager.get_bots_data(),
+                        self._apply_dashboard_bots,
+                        self._on_dashboard_bots_error,
+                    )
                 except Exception as e:
                     self.logger.error(f"Error getting bots data from DataManager: {e}")
-                    # Fallback do pustej listy
-                    sample_bots = []
-                
-                # Bezpiecznie wyczyść obecne boty
-                self.clear_bots_layout()
-                
-                # Dodaj nowe boty
-                for bot_data in sample_bots:
-                    try:
-                        bot_widget = BotStatusWidget(bot_data)
-                        if bot_widget and hasattr(bot_widget, 'isVisible'):
-                            self.bots_layout.addWidget(bot_widget)
-                    except Exception as e:
-                        self.logger.error(f"Error creating bot widget: {e}")
-                
-                # Aktualizuj kartę aktywnych botów
-                active_count = len([b for b in sample_bots if b['status'] == 'running'])
-                stopped_count = len(sample_bots) - active_count
-                
-                if hasattr(self, 'active_bots_card') and self.active_bots_card:
-                    try:
-                        # Bezpieczne sprawdzenie czy obiekt nadal istnieje
-                        if hasattr(self.active_bots_card, 'update_value'):
-                            self.active_bots_card.update_value(
-                                str(active_count),
-                                f"{stopped_count} zatrzymanych"
-                            )
-                        else:
-                            # Obiekt nie ma już metody update_value - został usunięty
-                            self.active_bots_card = None
-                    except (RuntimeError, AttributeError):
-                        # Komponent został usunięty z pamięci
-                        self.active_bots_card = None
+                    self._apply_dashboard_bots([])
             
             # Jeśli jesteśmy w widoku botów, aktualizuj BotManagementWidget
             elif current_view == 'bots' and hasattr(self, 'bot_management_widget') and self.bot_management_widget:
@@ -2559,7 +2591,70 @@ class MainWindow(QMainWindow):
             
         except Exception as e:
             self.logger.error(f"Error updating bots data: {e}")
-    
+
+    def _on_dashboard_bots_error(self, exc):
+        # Fallback: w razie błędu nie używamy danych przykładowych
+        if hasattr(self, 'logger') and self.logger:
+            self.logger.warning(f"Fallback: get_bots_data failed, returning empty list due to error: {exc}")
+        self._apply_dashboard_bots([])
+
+    def _apply_dashboard_bots(self, bots_data):
+        """Wyświetla boty na dashboardzie (wątek GUI)"""
+        # Widok mógł się zmienić, zanim dane wróciły z pętli tła
+        if getattr(self, 'current_view', 'dashboard') != 'dashboard' or getattr(self, 'bots_layout', None) is None:
+            return
+        try:
+            # Konwertuj BotData do dict dla kompatybilności
+            sample_bots = []
+            for bot in bots_data:
+                sample_bots.append({
+                    "id": bot.id,
+                    "type": bot.strategy_type,
+                    "pair": bot.trading_pair,
+                    "status": bot.status,
+                    "pnl": bot.profit_loss
+                })
+        except Exception as e:
+            self.logger.error(f"Error getting bots data from DataManager: {e}")
+            # Fallback do pustej listy
+            sample_bots = []
+
+        try:
+            # Bezpiecznie wyczyść obecne boty
+            self.clear_bots_layout()
+
+            # Dodaj nowe boty
+            for bot_data in sample_bots:
+                try:
+                    bot_widget = BotStatusWidget(bot_data)
+                    if bot_widget and hasattr(bot_widget, 'isVisible'):
+                        self.bots_layout.addWidget(bot_widget)
+                except Exception as e:
+                    self.logger.error(f"Error creating bot widget: {e}")
+        except (RuntimeError, AttributeError):
+            # Layout został usunięty z pamięci
+            self.bots_layout = None
+            return
+
+        # Aktualizuj kartę aktywnych botów
+        active_count = len([b for b in sample_bots if b['status'] == 'running'])
+        stopped_count = len(sample_bots) - active_count
+
+        if hasattr(self, 'active_bots_card') and self.active_bots_card:
+            try:
+                # Bezpieczne sprawdzenie czy obiekt nadal istnieje
+                if hasattr(self.active_bots_card, 'update_value'):
+                    self.active_bots_card.update_value(
+                        str(active_count),
+                        f"{stopped_count} zatrzymanych"
+                    )
+                else:
+                    # Obiekt nie ma już metody update_value - został usunięty
+                    self.active_bots_card = None
+            except (RuntimeError, AttributeError):
+                # Komponent został usunięty z pamięci
+                self.active_bots_card = None
+
     def update_recent_trades(self):
         """Aktualizuje ostatnie transakcje"""
         try:
@@ -2567,90 +2662,85 @@ class MainWindow(QMainWindow):
             if not hasattr(self, 'trades_table') or not self.trades_table:
                 return
                 
-            # Sprawdź czy tabela nie została usunięta - bezpieczne sprawdzenie
+            # Pobierz rzeczywiste transakcje z DataManager w pętli tła
             try:
-                # Sprawdź czy obiekt nadal istnieje w pamięci
-                if hasattr(self.trades_table, 'rowCount') and hasattr(self.trades_table, 'setRowCount'):
-                    # Pobierz rzeczywiste transakcje z DataManager
-                    try:
-                        from core.integrated_data_manager import get_integrated_data_manager
-                        data_manager = get_integrated_data_manager()
-                        
-                        # Pobierz dane asynchronicznie
-                        try:
-                            try:
-                                asyncio.get_running_loop()
-                                import concurrent.futures
-                                with concurrent.futures.ThreadPoolExecutor() as executor:
-                                    future = executor.submit(asyncio.run, data_manager.get_recent_trades(10))
-                                    trades_data = future.result(timeout=2)
-                            except RuntimeError:
-                                trades_data = asyncio.run(data_manager.get_recent_trades(10))
-                        except Exception:
-                            # Fallback - pobierz synchronicznie
-                            trades_data = data_manager._get_sample_trades(10)
-                        
-                        # Konwertuj do formatu tabeli
-                        sample_trades = []
-                        for trade in trades_data:
-                            sample_trades.append([
-                                trade["time"],
-                                trade["bot"],
-                                trade["pair"],
-                                trade["side"],
-                                trade["amount"],
-                                trade["price"]
-                            ])
-                    except Exception as e:
-                        self.logger.error(f"Error getting trades data from DataManager: {e}")
-                        # Fallback do pustej listy
-                        sample_trades = []
-                    
-                    self.trades_table.setRowCount(len(sample_trades))
-                    
-                    for row, trade in enumerate(sample_trades):
-                        for col, value in enumerate(trade):
-                            item = QTableWidgetItem(str(value))
-                            self.trades_table.setItem(row, col, item)
-                else:
-                    # Tabela nie ma już potrzebnych metod - została usunięta
-                    self.trades_table = None
-                    return
-            except (RuntimeError, AttributeError):
-                # Tabela została usunięta z pamięci
+                from core.integrated_data_manager import get_integrated_data_manager
+                data_manager = get_integrated_data_manager()
+                self._submit_refresh(
+                    'recent_trades',
+                    data_manager.get_recent_trades(10),
+                    self._apply_recent_trades,
+                    # Fallback - dane przykładowe
+                    lambda exc: self._apply_recent_trades(data_manager._get_sample_trades(10)),
+                )
+            except Exception as e:
+                self.logger.error(f"Error getting trades data from DataManager: {e}")
+                self._apply_recent_trades([])
+        except Exception as e:
+            self.logger.error(f"Error updating recent trades: {e}")
+
+    def _apply_recent_trades(self, trades_data):
+        """Wypełnia tabelę ostatnich transakcji (wątek GUI)"""
+        if not getattr(self, 'trades_table', None):
+            return
+        try:
+            # Konwertuj do formatu tabeli
+            sample_trades = []
+            for trade in trades_data:
+                sample_trades.append([
+                    trade["time"],
+                    trade["bot"],
+                    trade["pair"],
+                    trade["side"],
+                    trade["amount"],
+                    trade["price"]
+                ])
+        except Exception as e:
+            self.logger.error(f"Error getting trades data from DataManager: {e}")
+            # Fallback do pustej listy
+            sample_trades = []
+
+        # Sprawdź czy tabela nie została usunięta - bezpieczne sprawdzenie
+        try:
+            # Sprawdź czy obiekt nadal istnieje w pamięci
+            if not (hasattr(self.trades_table, 'rowCount') and hasattr(self.trades_table, 'setRowCount')):
+                # Tabela nie ma już potrzebnych metod - została usunięta
                 self.trades_table = None
                 return
+
+            self.trades_table.setRowCount(len(sample_trades))
+
+            for row, trade in enumerate(sample_trades):
+                for col, value in enumerate(trade):
+                    item = QTableWidgetItem(str(value))
+                    self.trades_table.setItem(row, col, item)
+        except (RuntimeError, AttributeError):
+            # Tabela została usunięta z pamięci
+            self.trades_table = None
         except Exception as e:
             self.logger.error(f"Error updating recent trades: {e}")
     
     def update_pnl_cards(self):
         """Aktualizuje karty P&L"""
         try:
-            # Pobierz rzeczywiste dane P&L z DataManager
+            # Pobierz dane portfela dla P&L w pętli tła
+            from core.integrated_data_manager import get_integrated_data_manager
+            data_manager = get_integrated_data_manager()
+            self._submit_refresh(
+                'pnl_portfolio',
+                data_manager.get_portfolio_data(),
+                self._apply_pnl_cards,
+                # Fallback - dane przykładowe
+                lambda exc: self._apply_pnl_cards(data_manager._get_sample_portfolio_data()),
+            )
+        except Exception as e:
+            self.logger.error(f"Error getting P&L data from DataManager: {e}")
+            self._apply_pnl_cards(None)
+
+    def _apply_pnl_cards(self, portfolio_data):
+        """Wyświetla P&L na kartach dashboardu (wątek GUI)"""
+        try:
             try:
-                from core.integrated_data_manager import get_integrated_data_manager
-                data_manager = get_integrated_data_manager()
-                
-                # Pobierz dane portfela dla P&L
-                try:
-                    import asyncio
-                    loop_running = False
-                    try:
-                        asyncio.get_running_loop()
-                        loop_running = True
-                    except RuntimeError:
-                        loop_running = False
-                    if loop_running:
-                        import concurrent.futures
-                        with concurrent.futures.ThreadPoolExecutor() as executor:
-                            future = executor.submit(lambda: asyncio.run(data_manager.get_portfolio_data()))
-                            portfolio_data = future.result(timeout=2)
-                    else:
-                        portfolio_data = asyncio.run(data_manager.get_portfolio_data())
-                except Exception:
-                    # Fallback - pobierz synchronicznie
-                    portfolio_data = data_manager._get_sample_portfolio_data()
-                
                 # Oblicz P&L na podstawie danych portfela
                 daily_pnl = portfolio_data.daily_change
                 daily_trades = 15  # TODO: Dodać do DataManager
@@ -2699,32 +2789,58 @@ class MainWindow(QMainWindow):
     def update_status_bar(self):
         """Aktualizuje pasek statusu"""
         try:
-            connection_text = "🔴 Offline"
             if hasattr(self, 'integrated_data_manager') and self.integrated_data_manager:
                 try:
                     system_status = self.integrated_data_manager.get_cached_system_status() if hasattr(self.integrated_data_manager, 'get_cached_system_status') else None
-                    if not system_status:
-                        system_status = self._run_coroutine_blocking(self.integrated_data_manager.get_system_status())
-                    if system_status and system_status.get('status') in {'ok', 'online'}:
-                        connection_text = "🟢 Połączono"
+                    if system_status:
+                        self._apply_connection_status(system_status)
                     else:
-                        connection_text = "🟡 Ograniczone"
+                        self._submit_refresh(
+                            'system_status',
+                            self.integrated_data_manager.get_system_status(),
+                            self._apply_connection_status,
+                            lambda exc: self._set_connection_text("🟠 Sprawdzanie"),
+                        )
                 except Exception:
-                    connection_text = "🟠 Sprawdzanie"
-
-            if hasattr(self, 'status_connection') and self.status_connection:
-                self.status_connection.setText(connection_text)
+                    self._set_connection_text("🟠 Sprawdzanie")
+            else:
+                self._set_connection_text("🔴 Offline")
 
-            running_bots = 0
-            total_bots = 0
             try:
                 bot_manager = get_updated_bot_manager()
                 if bot_manager:
-                    statuses = self._run_coroutine_blocking(bot_manager.get_all_bots_status())
-                    total_bots = len(statuses)
-                    running_bots = sum(1 for status in statuses if status.get('active'))
+                    self._submit_refresh(
+                        'bots_status_summary',
+                        bot_manager.get_all_bots_status(),
+                        self._apply_bots_summary,
+                        self._on_bots_summary_error,
+                    )
+                else:
+                    self._apply_bots_summary([])
             except Exception as exc:
-                self.logger.warning(f"Unable to fetch bot status summary: {exc}")
+                self._on_bots_summary_error(exc)
+        except Exception as e:
+            self.logger.error(f"Error updating status bar: {e}")
+
+    def _set_connection_text(self, connection_text: str):
+        if hasattr(self, 'status_connection') and self.status_connection:
+            self.status_connection.setText(connection_text)
+
+    def _apply_connection_status(self, system_status):
+        if system_status and system_status.get('status') in {'ok', 'online'}:
+            self._set_connection_text("🟢 Połączono")
+        else:
+            self._set_connection_text("🟡 Ograniczone")
+
+    def _on_bots_summary_error(self, exc):
+        self.logger.warning(f"Unable to fetch bot status summary: {exc}")
+        self._apply_bots_summary([])
+
+    def _apply_bots_summary(self, statuses):
+        """Wyświetla liczbę działających botów w pasku statusu (wątek GUI)"""
+        try:
+            total_bots = len(statuses)
+            running_bots = sum(1 for status in statuses if status.get('active'))
 
             if hasattr(self, 'status_bots') and self.status_bots:
                 self.status_bots.setText(f"Boty: {running_bots}/{total_bots}")
@@ -2784,6 +2900,7 @@ class MainWindow(QMainWindow):
         try:
             if view_key == "dashboard":
                 self.setup_dashboard()
+                self._apply_feed_dashboard()
             elif view_key == "bots":
                 self.setup_bots_view()
             elif view_key == "portfolio":
@@ -3451,46 +3568,17 @@ class MainWindow(QMainWindow):
                 data_manager = get_integrated_data_manager()
                 print("✅ REFRESH_RISK_DATA: DataManager zaimportowany pomyślnie")
                 
-                # Pobierz metryki ryzyka asynchronicznie
-                import asyncio
-                
-                async def get_risk_data():
-                    return await data_manager.get_risk_metrics()
-                
-                # Uruchom w pętli zdarzeń
-                try:
-                    try:
-                        loop = asyncio.get_running_loop()
-                        # Jeśli pętla już działa, utwórz zadanie na istniejącej pętli
-                        task = loop.create_task(get_risk_data())
-                        # Dla synchronicznego wywołania, użyj callback
-                        def update_callback(task):
-                            try:
-                                risk_metrics = task.result()
-                                self.update_risk_metrics_cards_from_data(risk_metrics)
-                                print("✅ REFRESH_RISK_DATA: Dane ryzyka zostały odświeżone z DataManager")
-                            except Exception as e:
-                                print(f"❌ REFRESH_RISK_DATA: Błąd w callback: {e}")
-                                self.update_risk_metrics_cards_with_defaults()
-                        
-                        task.add_done_callback(update_callback)
-                    except RuntimeError:
-                        risk_metrics = asyncio.run(get_risk_data())
-                        self.update_risk_metrics_cards_from_data(risk_metrics)
-                        print("✅ REFRESH_RISK_DATA: Dane ryzyka zostały odświeżone z DataManager")
-                except Exception as e:
-                    print(f"⚠️ REFRESH_RISK_DATA: Błąd uruchamiania coroutine: {e}")
-                    # Brak działającej pętli - uruchom coroutine w osobnym wątku
-                    import threading
-                    def worker():
-                        try:
-                            res = asyncio.run(get_risk_data())
-                            self.update_risk_metrics_cards_from_data(res)
-                            print("✅ REFRESH_RISK_DATA: Dane ryzyka zostały odświeżone z DataManager (thread)")
-                        except Exception as e2:
-                            print(f"❌ REFRESH_RISK_DATA: Błąd aktualizacji kart: {e2}")
-                            self.update_risk_metrics_cards_with_defaults()
-                    threading.Thread(target=worker, daemon=True).start()
+                # Pobierz metryki ryzyka w pętli tła; karty aktualizuje callback w wątku GUI
+                def on_error(exc):
+                    print(f"❌ REFRESH_RISK_DATA: Błąd w callback: {exc}")
+                    self.update_risk_metrics_cards_with_defaults()
+
+                self._submit_refresh(
+                    'risk_metrics',
+                    data_manager.get_risk_metrics(),
+                    self.update_risk_metrics_cards_from_data,
+                    on_error,
+                )
                     
             except ImportError as e:
                 print(f"⚠️ REFRESH_RISK_DATA: DataManager nie jest dostępny: {e}")
@@ -4094,6 +4182,8 @@ class MainWindow(QMainWindow):
                 if hasattr(self, 'refresh_timer') and self.refresh_timer:
                     self.refresh_timer.stop()
                     self.refresh_timer.deleteLater()
+                if getattr(self, 'feed_bridge', None) is not None:
+                    self.feed_bridge.disconnect_widget(self._on_feed_diff)
             except Exception as e:
                 print(f"Error stopping refresh timer: {e}")
             
@@ -4126,14 +4216,8 @@ class MainWindow(QMainWindow):
             # Zatrzymaj pętle danych IntegratedDataManager
             try:
                 if hasattr(self, 'integrated_data_manager') and self.integrated_data_manager:
-                    import asyncio, threading
-                    try:
-                        loop = asyncio.get_running_loop()
-                        # Pętla działa — wykonaj zatrzymanie w tym samym loopie
-                        loop.create_task(self.integrated_data_manager.stop_data_loops())
-                    except RuntimeError:
-                        # Brak działającej pętli — uruchom zatrzymanie w osobnym wątku
-                        threading.Thread(target=lambda: asyncio.run(self.integrated_data_manager.stop_data_loops()), daemon=True).start()
+                    # Pętle danych działają we współdzielonej pętli tła - zatrzymaj je tam
+                    get_async_runtime().submit(self.integrated_data_manager.stop_data_loops())
             except Exception as e:
                 print(f"Error stopping data loops: {e}")
             
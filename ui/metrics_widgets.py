@@ -1,4 +1,6 @@
 from __future__ import annotations
+import inspect
+import weakref
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QSizePolicy
 from PyQt6.QtCore import QTimer, Qt
 from PyQt6.QtGui import QFont
@@ -43,10 +45,69 @@ except Exception:
         def draw_idle(self):
             pass
 
+class _SharedTicker:
+    """Wspólny QTimer dla wszystkich widgetów o danym interwale.
+
+    Zamiast osobnego timera i osobnego ``rt.snapshot()`` w każdym kaflu,
+    ticker robi jedną migawkę na tick i rozsyła ją do zarejestrowanych
+    widgetów (trzymanych słabymi referencjami).
+    """
+    def __init__(self, interval_ms: int):
+        self.interval_ms = interval_ms
+        self._widgets = weakref.WeakSet()
+        self._timer = None
+
+    def register(self, widget):
+        self._widgets.add(widget)
+        if self._timer is None:
+            self._timer = QTimer(); self._timer.setInterval(self.interval_ms); self._timer.timeout.connect(self.tick); self._timer.start()
+
+    def unregister(self, widget):
+        self._widgets.discard(widget)
+
+    def tick(self):
+        widgets = list(self._widgets)
+        if not widgets:
+            return
+        try:
+            snap = rt.snapshot()
+        except Exception:
+            snap = None
+        for widget in widgets:
+            try:
+                widget.refresh(snap)
+            except Exception:
+                pass
+
+_TICKERS: dict[int, _SharedTicker] = {}
+
+def get_shared_ticker(interval_ms: int) -> _SharedTicker:
+    ticker = _TICKERS.get(interval_ms)
+    if ticker is None:
+        ticker = _TICKERS[interval_ms] = _SharedTicker(interval_ms)
+    return ticker
+
+def _accepts_snapshot(getter) -> bool:
+    """Czy getter przyjmuje gotową migawkę ``rt.snapshot()`` jako argument."""
+    try:
+        params = list(inspect.signature(getter).parameters.values())
+    except (TypeError, ValueError):
+        return False
+    return any(
+        p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD, p.VAR_POSITIONAL)
+        for p in params
+    )
+
+def _call_getter(getter, takes_snapshot: bool, snapshot):
+    if takes_snapshot:
+        return getter(snapshot)
+    return getter()
+
 class StatTile(QWidget):
     def __init__(self, title: str, getter, fmt: str = "{:,.0f}", parent=None):
         super().__init__(parent)
         self.getter = getter
+        self._takes_snapshot = _accepts_snapshot(getter)
         self._last_text = "--"
         layout = QVBoxLayout(self)
         layout.setContentsMargins(10,10,10,10)
@@ -65,32 +126,35 @@ class StatTile(QWidget):
             self.value.setFont(f)
         layout.addWidget(self.title); layout.addWidget(self.value)
         self.fmt = fmt
-        self.timer = QTimer(self); self.timer.setInterval(1500); self.timer.timeout.connect(self.refresh); self.timer.start()
+        get_shared_ticker(1500).register(self)
         try:
             self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
         except Exception:
             pass
 
-    def refresh(self):
+    def refresh(self, snapshot=None):
         try:
-            v = self.getter()
+            v = _call_getter(self.getter, self._takes_snapshot, snapshot)
             if v is None: v = 0
             if isinstance(v, float):
                 txt = self.fmt.format(v)
             else:
                 txt = str(v)
-            self._last_text = txt
-            if hasattr(self.value, "setText"):
-                self.value.setText(txt)
         except Exception:
-            self._last_text = "--"
-            if hasattr(self.value, "setText"):
-                self.value.setText("--")
+            txt = "--"
+        # Bez zmiany tekstu nie wymuszaj przerysowania etykiety
+        if txt == self._last_text:
+            return
+        self._last_text = txt
+        if hasattr(self.value, "setText"):
+            self.value.setText(txt)
 
 class LineChart(QWidget):
     def __init__(self, title: str, series_getter, parent=None):
         super().__init__(parent)
         self.series_getter = series_getter
+        self._takes_snapshot = _accepts_snapshot(series_getter)
+        self._last_series = None
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0,0,0,0)
         self.fig = Figure(figsize=(4,2))
@@ -99,46 +163,52 @@ class LineChart(QWidget):
         self.ax = self.fig.add_subplot(111)
         self.ax.set_title(title, color="#C9B6FF", fontsize=10)
         self.ax.grid(True, alpha=0.2)
-        self.timer = QTimer(self); self.timer.setInterval(2000); self.timer.timeout.connect(self.refresh); self.timer.start()
+        get_shared_ticker(2000).register(self)
         self.refresh()
 
-    def refresh(self):
+    def refresh(self, snapshot=None):
         try:
-            data = self.series_getter() or []
+            data = _call_getter(self.series_getter, self._takes_snapshot, snapshot) or []
             xs = [t for (t, v) in data]
             ys = [v for (t, v) in data]
+            # normalize time to last 5 minutes for visual smoothness
+            xsn = [(x - xs[0])/60.0 for x in xs] if xs else []
+            series = (xsn, ys)
+            if series == self._last_series:
+                return  # seria bez zmian - pomiń kosztowne przerysowanie
+            self._last_series = series
             self.ax.clear()
             self.ax.set_title(self.ax.get_title(), color="#C9B6FF", fontsize=10)
             self.ax.grid(True, alpha=0.2)
             if xs and ys:
-                # normalize time to last 5 minutes for visual smoothness
-                t0 = xs[0]
-                xsn = [(x - t0)/60.0 for x in xs]
                 self.ax.plot(xsn, ys, linewidth=1.8)
             self.canvas.draw_idle()
         except Exception:
             pass
 
-# Convenience getters for built-in tiles
-def get_events_total():
-    s = rt.snapshot()["events_total"]
+# Convenience getters for built-in tiles (opcjonalnie przyjmują gotową migawkę)
+def _snap(snap):
+    return rt.snapshot() if snap is None else snap
+
+def get_events_total(snap=None):
+    s = _snap(snap)["events_total"]
     return sum(s.values())
 
-def get_orders_total():
-    s = rt.snapshot()["orders_total"]
+def get_orders_total(snap=None):
+    s = _snap(snap)["orders_total"]
     return sum(s.values())
 
-def get_open_circuits():
-    s = rt.snapshot()["circuit_open"]
+def get_open_circuits(snap=None):
+    s = _snap(snap)["circuit_open"]
     return sum(1 for v in s.values() if v)
 
-def get_rate_drops():
-    s = rt.snapshot()["rate_drops"]
+def get_rate_drops(snap=None):
+    s = _snap(snap)["rate_drops"]
     return sum(s.values())
 
-def get_latency_p95():
+def get_latency_p95(snap=None):
     import numpy as np
-    lat = rt.snapshot()["http_latency_ms"]
+    lat = _snap(snap)["http_latency_ms"]
     if not lat: return 0.0
     return float(np.percentile(lat, 95))
 
@@ -146,8 +216,8 @@ def get_latency_p95():
 class LatencySparkline(LineChart):
     def __init__(self, parent=None):
         super().__init__("Latency Sparkline (ms)", self._series, parent)
-    def _series(self):
-        snap = rt.snapshot()
+    def _series(self, snap=None):
+        snap = _snap(snap)
         lat = snap.get("http_latency_ms", [])
         import time as _t
         t0 = _t.time() - 300
@@ -159,18 +229,18 @@ class LatencySparkline(LineChart):
             ys.append(float(v))
         return list(zip(xs, ys))
 
-def get_bots_list():
-    return rt.snapshot().get("bots", [])
+def get_bots_list(snap=None):
+    return _snap(snap).get("bots", [])
 
-def get_strategies_list():
-    return rt.snapshot().get("strategies", [])
+def get_strategies_list(snap=None):
+    return _snap(snap).get("strategies", [])
 
 def make_bot_equity_getter(bot_id: str):
-    def _g():
-        return rt.snapshot().get("equity_curve_per_bot", {}).get(bot_id, [])
+    def _g(snap=None):
+        return _snap(snap).get("equity_curve_per_bot", {}).get(bot_id, [])
     return _g
 
 def make_strategy_equity_getter(strategy: str):
-    def _g():
-        return rt.snapshot().get("equity_curve_per_strategy", {}).get(strategy, [])
+    def _g(snap=None):
+        return _snap(snap).get("equity_curve_per_strategy", {}).get(strategy, [])
     return _g
@@ -1289,17 +1289,16 @@ class RiskManagementWidget(QWidget):
 
             if self.risk_manager and self.RiskLimits:
                 try:
-                    import asyncio
-                    try:
-                        asyncio.get_running_loop()
-                        import concurrent.futures
-                        with concurrent.futures.ThreadPoolExecutor() as executor:
-                            future = executor.submit(asyncio.run, self.apply_settings_to_bots(settings))
-                            future.result(timeout=5)
-                    except RuntimeError:
-                        asyncio.run(self.apply_settings_to_bots(settings))
-
-                    self.logger.info("Ustawienia zarządzania ryzykiem zostały zaktualizowane w RiskManager")
+                    # Zastosuj ustawienia w pętli tła, wynik zaloguj po powrocie do wątku GUI
+                    from ui.async_helper import get_async_bridge
+                    get_async_bridge().submit(
+                        self.apply_settings_to_bots(settings),
+                        'apply_risk_settings',
+                        lambda _: self.logger.info("Ustawienia zarządzania ryzykiem zostały zaktualizowane w RiskManager"),
+                        lambda exc: self.logger.error(f"Błąd podczas aktualizacji RiskManager: {exc}"),
+                        replace=True,
+                        timeout=5.0,
+                    )
 
                 except Exception as e:
                     self.logger.error(f"Błąd podczas aktualizacji RiskManager: {e}")
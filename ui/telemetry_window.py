@@ -1,9 +1,10 @@
 from pathlib import Path
-import json
 from typing import Dict, Any
 from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QPushButton, QHBoxLayout, QFileDialog, QMessageBox
 from PyQt6.QtCore import Qt
 
+from utils.event_log_reader import get_event_log_reader
+
 LOG_FILE = Path(__file__).resolve().parents[1] / "logs" / "events.jsonl"
 
 class TelemetryWindow(QDialog):
@@ -30,31 +31,10 @@ class TelemetryWindow(QDialog):
         layout.addLayout(btns)
 
     def _parse_log(self, path: Path) -> Dict[str, Any]:
-        stats = {"orders": 0, "fills": 0, "symbols": set(), "bots": set()}
-        if not path.exists():
-            return stats
-        with path.open("r", encoding="utf-8") as f:
-            for line in f:
-                line=line.strip()
-                if not line:
-                    continue
-                try:
-                    rec = json.loads(line)
-                except Exception:
-                    continue
-                ev = rec.get("event","")
-                payload = rec.get("payload",{})
-                if ev in ("ORDER_FILLED","OrderFilled"):
-                    stats["fills"] += 1
-                if "symbol" in payload:
-                    stats["symbols"].add(payload["symbol"])
-                if "bot_id" in payload:
-                    stats["bots"].add(payload["bot_id"])
-                if ev in ("ORDER_SUBMITTED","OrderSubmitted"):
-                    stats["orders"] += 1
-        stats["symbols"] = sorted(list(stats["symbols"]))
-        stats["bots"] = sorted(list(stats["bots"]))
-        return stats
+        # Reader pamięta offset i agregaty - kolejne odświeżenia czytają tylko nowe linie
+        reader = get_event_log_reader(path)
+        reader.poll()
+        return reader.totals.snapshot()
 
     def _refresh_from_log(self):
         stats = self._parse_log(LOG_FILE)
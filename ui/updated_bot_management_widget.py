@@ -951,6 +951,31 @@ class UpdatedBotManagementWidget(QWidget):
             'ai_snapshot', self.on_ai_snapshot
         )
 
+        # Feed różnic z IntegratedDataManager zastępuje cykliczne odpytywanie
+        self.feed_bridge = None
+        try:
+            from ui.async_helper import get_ui_feed_bridge
+            self.feed_bridge = get_ui_feed_bridge(self.integrated_data_manager)
+            self.feed_bridge.connect_widget(self.on_feed_diff)
+        except Exception as e:
+            self.feed_bridge = None
+            self.logger.warning(f"UI feed unavailable, falling back to polling: {e}")
+
+    def on_feed_diff(self, diff):
+        """Stosuje różnicę z feedu UI - odświeża tylko zmienione karty botów"""
+        try:
+            removed = list(diff.bots_removed)
+            if diff.full:
+                removed.extend(bot_id for bot_id in self.bots_data if bot_id not in diff.bots)
+            for bot_id in removed:
+                self._remove_bot(bot_id)
+            for bot_id, bot_data in diff.bots.items():
+                self._upsert_bot(bot_id, bot_data)
+            if removed or diff.bots:
+                self.update_stats()
+        except Exception as e:
+            self.logger.error(f"Error applying UI feed update: {e}")
+
     def on_ai_snapshot(self, snapshot):
         try:
             if snapshot is None:
@@ -1156,17 +1181,7 @@ class UpdatedBotManagementWidget(QWidget):
             if not bot_id:
                 return
             
-            # Aktualizuj dane bota
-            if bot_id in self.bots_data:
-                self.bots_data[bot_id].update(bot_data)
-            else:
-                self.bots_data[bot_id] = bot_data
-            
-            # Aktualizuj kartę bota
-            if bot_id in self.bot_cards:
-                self.bot_cards[bot_id].update_data(self.bots_data[bot_id])
-            else:
-                self.create_bot_card(bot_id, self.bots_data[bot_id])
+            self._upsert_bot(bot_id, bot_data)
             
             # Aktualizuj statystyki
             self.update_stats()
@@ -1176,6 +1191,29 @@ class UpdatedBotManagementWidget(QWidget):
         except Exception as e:
             self.logger.error(f"Error updating bot status: {e}")
     
+    def _upsert_bot(self, bot_id: str, bot_data: Dict[str, Any]):
+        """Aktualizuje dane i kartę bota (tworzy kartę dla nowego bota)"""
+        # Aktualizuj dane bota
+        if bot_id in self.bots_data:
+            self.bots_data[bot_id].update(bot_data)
+        else:
+            self.bots_data[bot_id] = dict(bot_data)
+        
+        # Aktualizuj kartę bota
+        if bot_id in self.bot_cards:
+            self.bot_cards[bot_id].update_data(self.bots_data[bot_id])
+        else:
+            self.create_bot_card(bot_id, self.bots_data[bot_id])
+
+    def _remove_bot(self, bot_id: str):
+        """Usuwa kartę i dane bota"""
+        if bot_id in self.bot_cards:
+            self.bot_cards[bot_id].setParent(None)
+            del self.bot_cards[bot_id]
+        
+        if bot_id in self.bots_data:
+            del self.bots_data[bot_id]
+
     def on_bot_created(self, bot_data):
         """Callback dla utworzenia nowego bota"""
         try:
@@ -1195,13 +1233,7 @@ class UpdatedBotManagementWidget(QWidget):
     def on_bot_deleted(self, bot_id):
         """Callback dla usunięcia bota"""
         try:
-            if bot_id in self.bot_cards:
-                self.bot_cards[bot_id].setParent(None)
-                del self.bot_cards[bot_id]
-            
-            if bot_id in self.bots_data:
-                del self.bots_data[bot_id]
-            
+            self._remove_bot(bot_id)
             self.update_stats()
             
             self.logger.info(f"Bot deleted: {bot_id}")
@@ -1457,6 +1489,12 @@ class UpdatedBotManagementWidget(QWidget):
                 self.logger.warning("IntegratedDataManager not initialized")
                 self._refresh_in_progress = False
                 return
+
+            if self.feed_bridge is not None:
+                # Dane wrócą jako różnica przez feed
+                self._refresh_in_progress = False
+                self.feed_bridge.request_refresh()
+                return
             
             # Uruchom asynchroniczne odświeżanie danych, uwzględniając brak działającej pętli
             import asyncio, threading
@@ -1632,6 +1670,11 @@ class UpdatedBotManagementWidget(QWidget):
     def start_refresh_timer(self):
         """Uruchom timer odświeżania"""
         try:
+            if self.feed_bridge is not None:
+                # Dane są wypychane przez feed IntegratedDataManager - bez odpytywania
+                self.logger.info("Bot management widget receives pushed updates from UI feed")
+                return
+
             # Odśwież dane natychmiast
             self.refresh_data()
             
@@ -1650,6 +1693,8 @@ class UpdatedBotManagementWidget(QWidget):
             # Zatrzymaj timer
             if self.refresh_timer.isActive():
                 self.refresh_timer.stop()
+            if self.feed_bridge is not None:
+                self.feed_bridge.disconnect_widget(self.on_feed_diff)
             
             self.logger.info("Bot management widget closed")
             event.accept()
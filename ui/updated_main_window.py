@@ -51,6 +51,7 @@ except Exception as exc:  # pragma: no cover - zależne od środowiska (np. brak
 from utils.logger import get_logger
 from utils.config_manager import get_config_manager
 from ui.async_helper import get_async_manager
+from utils.async_runtime import get_async_runtime
 
 # Import additional widgets for tabs
 from ui.updated_bot_management_widget import UpdatedBotManagementWidget
@@ -1568,18 +1569,8 @@ class UpdatedMainWindow(QMainWindow):
             # Zatrzymaj pętle danych jeśli dostępny IntegratedDataManager
             try:
                 if hasattr(self, 'integrated_data_manager') and self.integrated_data_manager:
-                    import asyncio
-                    try:
-                        asyncio.get_running_loop()
-                        import concurrent.futures
-                        with concurrent.futures.ThreadPoolExecutor() as executor:
-                            future = executor.submit(asyncio.run, self.integrated_data_manager.stop_data_loops())
-                            future.result(timeout=5)
-                    except RuntimeError:
-                        try:
-                            asyncio.run(self.integrated_data_manager.stop_data_loops())
-                        except Exception:
-                            pass
+                    # Pętle danych działają we współdzielonej pętli tła - zatrzymaj je tam
+                    get_async_runtime().run(self.integrated_data_manager.stop_data_loops(), timeout=5)
             except Exception:
                 pass
             logger.info("UpdatedMainWindow cleanup completed (timers, async tasks and data loops stopped)")
@@ -544,6 +544,51 @@ class UpdatedPortfolioWidget(QWidget):
         self.integrated_data_manager.subscribe_to_ui_updates(
             'transaction_update', self.on_transaction_update
         )
+
+        # Feed różnic z IntegratedDataManager zastępuje cykliczne odpytywanie
+        self.feed_bridge = None
+        try:
+            from ui.async_helper import get_ui_feed_bridge
+            self.feed_bridge = get_ui_feed_bridge(self.integrated_data_manager)
+            self.feed_bridge.connect_widget(self.on_feed_diff)
+        except Exception as e:
+            self.feed_bridge = None
+            self.logger.warning(f"UI feed unavailable, falling back to polling: {e}")
+
+    def on_feed_diff(self, diff):
+        """Stosuje różnicę z feedu UI - aktualizuje tylko zmienione elementy"""
+        try:
+            if diff.portfolio is not None:
+                self.portfolio_data = diff.portfolio
+                self.portfolio_summary_card.update_data(diff.portfolio)
+            if diff.full or diff.balances or diff.balances_removed:
+                self._apply_balance_diff(diff)
+            if diff.full or diff.trades:
+                new_transactions = [self._normalize_transaction(tx) for tx in diff.trades]
+                if diff.full:
+                    self.transactions = new_transactions
+                else:
+                    self.transactions = (new_transactions + self.transactions)[:100]
+                self.transaction_history.update_transactions(self.transactions)
+        except Exception as e:
+            self.logger.error(f"Error applying UI feed update: {e}")
+
+    def _apply_balance_diff(self, diff):
+        if diff.full:
+            self.balances = dict(diff.balances)
+        else:
+            self.balances = {k: v for k, v in self.balances.items() if k not in diff.balances_removed}
+            self.balances.update(diff.balances)
+
+        visible = {symbol for symbol, data in self.balances.items() if data.get('balance', 0) > 0}
+        if diff.full or visible != set(self.balance_cards):
+            # Zmienił się zestaw kart - przebuduj układ
+            self.update_balance_cards()
+            return
+        for symbol in diff.balances:
+            card = self.balance_cards.get(symbol)
+            if card is not None:
+                card.update_data(self.balances[symbol])
     
     def on_portfolio_update(self, portfolio_data):
         """Callback dla aktualizacji danych portfela"""
@@ -586,43 +631,12 @@ class UpdatedPortfolioWidget(QWidget):
     def on_transaction_update(self, transaction_data):
         """Callback dla aktualizacji transakcji"""
         try:
-            def _normalize(tx: Dict[str, Any]) -> Dict[str, Any]:
-                # Map fields from various possible sources to the expected structure
-                ts = tx.get('timestamp')
-                if not ts:
-                    time_str = tx.get('time')
-                    if isinstance(time_str, str):
-                        try:
-                            today = datetime.now().date()
-                            h, m, s = [int(part) for part in time_str.split(':')]
-                            ts = datetime(today.year, today.month, today.day, h, m, s)
-                        except Exception:
-                            ts = datetime.now()
-                    else:
-                        ts = datetime.now()
-                elif isinstance(ts, str):
-                    try:
-                        ts = datetime.fromisoformat(ts)
-                    except Exception:
-                        ts = datetime.now()
-                symbol = tx.get('symbol') or tx.get('pair') or 'N/A'
-                side = tx.get('side', 'unknown')
-                quantity = tx.get('quantity', tx.get('amount', 0.0)) or 0.0
-                price = tx.get('price', 0.0) or 0.0
-                return {
-                    'timestamp': ts,
-                    'symbol': symbol,
-                    'side': side,
-                    'quantity': float(quantity) if isinstance(quantity, (int, float)) else 0.0,
-                    'price': float(price) if isinstance(price, (int, float)) else 0.0,
-                }
-
             def _apply():
                 try:
                     if isinstance(transaction_data, list):
-                        self.transactions = [_normalize(tx) for tx in transaction_data]
+                        self.transactions = [self._normalize_transaction(tx) for tx in transaction_data]
                     else:
-                        normalized = _normalize(transaction_data)
+                        normalized = self._normalize_transaction(transaction_data)
                         self.transactions.insert(0, normalized)
                         self.transactions = self.transactions[:100]
                     self.transaction_history.update_transactions(self.transactions)
@@ -638,6 +652,38 @@ class UpdatedPortfolioWidget(QWidget):
         except Exception as e:
             self.logger.error(f"Error updating transaction data: {e}")
     
+    @staticmethod
+    def _normalize_transaction(tx: Dict[str, Any]) -> Dict[str, Any]:
+        """Mapuje pola transakcji z różnych źródeł na format tabeli historii"""
+        ts = tx.get('timestamp')
+        if not ts:
+            time_str = tx.get('time')
+            if isinstance(time_str, str):
+                try:
+                    today = datetime.now().date()
+                    h, m, s = [int(part) for part in time_str.split(':')]
+                    ts = datetime(today.year, today.month, today.day, h, m, s)
+                except Exception:
+                    ts = datetime.now()
+            else:
+                ts = datetime.now()
+        elif isinstance(ts, str):
+            try:
+                ts = datetime.fromisoformat(ts)
+            except Exception:
+                ts = datetime.now()
+        symbol = tx.get('symbol') or tx.get('pair') or 'N/A'
+        side = tx.get('side', 'unknown')
+        quantity = tx.get('quantity', tx.get('amount', 0.0)) or 0.0
+        price = tx.get('price', 0.0) or 0.0
+        return {
+            'timestamp': ts,
+            'symbol': symbol,
+            'side': side,
+            'quantity': float(quantity) if isinstance(quantity, (int, float)) else 0.0,
+            'price': float(price) if isinstance(price, (int, float)) else 0.0,
+        }
+
     def update_balance_cards(self):
         """Aktualizuj karty sald"""
         try:
@@ -675,6 +721,11 @@ class UpdatedPortfolioWidget(QWidget):
             if not self.integrated_data_manager.initialized:
                 self.logger.warning("IntegratedDataManager not initialized")
                 return
+
+            if self.feed_bridge is not None:
+                # Dane wrócą jako różnica przez feed
+                self.feed_bridge.request_refresh()
+                return
             
             # Uruchom asynchroniczne odświeżanie danych, uwzględniając brak działającej pętli
             import asyncio, threading
@@ -793,6 +844,11 @@ class UpdatedPortfolioWidget(QWidget):
     def start_refresh_timer(self):
         """Uruchom timer odświeżania"""
         try:
+            if self.feed_bridge is not None:
+                # Dane są wypychane przez feed IntegratedDataManager - bez odpytywania
+                self.logger.info("Portfolio widget receives pushed updates from UI feed")
+                return
+
             # Odśwież dane natychmiast
             self.refresh_data()
             
@@ -811,6 +867,8 @@ class UpdatedPortfolioWidget(QWidget):
             # Zatrzymaj timer
             if self.refresh_timer.isActive():
                 self.refresh_timer.stop()
+            if self.feed_bridge is not None:
+                self.feed_bridge.disconnect_widget(self.on_feed_diff)
             
             self.logger.info("Portfolio widget closed")
             event.accept()
@@ -0,0 +1,225 @@
+"""Współdzielony, nieblokujący klient HTTP dla warstwy danych rynkowych.
+
+Klient utrzymuje jedną sesję aiohttp na pętlę zdarzeń (keep-alive, pula
+połączeń), ogranicza liczbę równoległych żądań per host i opcjonalnie
+przepuszcza każde żądanie przez ``net_guard`` (rate limit + circuit breaker +
+metryki). Bez aiohttp żądania wykonywane są przez ``requests`` w wątku
+roboczym, więc pętla zdarzeń nigdy nie jest blokowana.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Mapping, Optional
+from urllib.parse import urlsplit
+
+from utils.json_codec import loads as json_loads
+from utils.net_wrappers import net_guard
+
+try:  # pragma: no cover - optional dependency
+    import aiohttp  # type: ignore
+except Exception:  # pragma: no cover - fallback below
+    aiohttp = None  # type: ignore
+
+try:  # pragma: no cover - optional dependency
+    import requests  # type: ignore
+except Exception:  # pragma: no cover
+    requests = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HttpResponse:
+    """Odpowiedź HTTP odczytana w całości (body w bajtach)."""
+    status: int
+    body: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+    url: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    def json(self) -> Any:
+        return json_loads(self.body)
+
+    @property
+    def text(self) -> str:
+        return self.body.decode("utf-8", errors="replace")
+
+
+def http_available() -> bool:
+    """Czy dostępny jest jakikolwiek transport HTTP (aiohttp lub requests)."""
+    return aiohttp is not None or requests is not None
+
+
+class AsyncHttpClient:
+    """Klient HTTP z pulą połączeń keep-alive i limitem współbieżności per host."""
+
+    def __init__(
+        self,
+        *,
+        limit: int = 100,
+        limit_per_host: int = 8,
+        timeout: float = 5.0,
+        keepalive_timeout: float = 30.0,
+        host_limits: Optional[Mapping[str, int]] = None,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self.keepalive_timeout = keepalive_timeout
+        self.host_limits: Dict[str, int] = dict(host_limits or {})
+        self._session = None
+        self._session_lock: Optional[asyncio.Lock] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._guarded: Dict[str, Callable[..., Any]] = {}
+        self.requests_total = 0
+        self.in_flight: Dict[str, int] = {}
+
+    # --- sesja ----------------------------------------------------------
+    async def _get_session(self):
+        if self._session is not None and not self._session.closed:
+            return self._session
+        if self._session_lock is None:
+            self._session_lock = asyncio.Lock()
+        async with self._session_lock:
+            if self._session is None or self._session.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                    keepalive_timeout=self.keepalive_timeout,
+                    ttl_dns_cache=300,
+                )
+                self._session = aiohttp.ClientSession(
+                    connector=connector,
+                    timeout=aiohttp.ClientTimeout(total=self.timeout),
+                )
+        return self._session
+
+    async def close(self) -> None:
+        """Zamyka sesję i zwalnia połączenia z puli."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _semaphore(self, host: str) -> asyncio.Semaphore:
+        sem = self._host_semaphores.get(host)
+        if sem is None:
+            sem = asyncio.Semaphore(self.host_limits.get(host, self.limit_per_host))
+            self._host_semaphores[host] = sem
+        return sem
+
+    # --- żądania --------------------------------------------------------
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Mapping[str, Any]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        json_body: Any = None,
+    ) -> HttpResponse:
+        host = urlsplit(url).netloc
+        async with self._semaphore(host):
+            self.in_flight[host] = self.in_flight.get(host, 0) + 1
+            self.requests_total += 1
+            try:
+                if aiohttp is not None:
+                    session = await self._get_session()
+                    async with session.request(method, url, params=params, headers=headers, json=json_body) as resp:
+                        body = await resp.read()
+                        return HttpResponse(resp.status, body, dict(resp.headers), str(resp.url))
+                if requests is None:
+                    raise RuntimeError("no HTTP transport available (install aiohttp)")
+
+                def _blocking() -> HttpResponse:
+                    resp = requests.request(method, url, params=params, headers=headers, json=json_body, timeout=self.timeout)
+                    return HttpResponse(resp.status_code, resp.content, dict(resp.headers), resp.url)
+
+                return await asyncio.to_thread(_blocking)
+            finally:
+                self.in_flight[host] -= 1
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Mapping[str, Any]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        json_body: Any = None,
+        guard: Optional[str] = None,
+    ) -> HttpResponse:
+        """Wykonuje żądanie; ``guard`` to nazwa limitu net_guard, np. ``binance:rest:/api/v3/depth``."""
+        if guard is None:
+            return await self._send(method.upper(), url, params, headers, json_body)
+        guarded = self._guarded.get(guard)
+        if guarded is None:
+            guarded = net_guard(guard)(self._send)
+            self._guarded[guard] = guarded
+        return await guarded(method.upper(), url, params, headers, json_body)
+
+    async def get(self, url: str, **kwargs) -> HttpResponse:
+        return await self.request("GET", url, **kwargs)
+
+    async def get_json(self, url: str, **kwargs) -> Any:
+        """GET i dekodowanie JSON; dla statusu innego niż 2xx rzuca ``HttpStatusError``."""
+        response = await self.get(url, **kwargs)
+        if not response.ok:
+            raise HttpStatusError(response)
+        return response.json()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests_total": self.requests_total,
+            "in_flight": dict(self.in_flight),
+            "transport": "aiohttp" if aiohttp is not None else "requests-thread",
+        }
+
+
+class HttpStatusError(RuntimeError):
+    """Odpowiedź HTTP ze statusem innym niż 2xx."""
+
+    def __init__(self, response: HttpResponse):
+        super().__init__(f"HTTP {response.status} for {response.url}: {response.text[:200]}")
+        self.response = response
+        self.status = response.status
+
+
+# Jeden klient na pętlę zdarzeń (sesje aiohttp są związane z pętlą)
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncHttpClient]" = weakref.WeakKeyDictionary()
+_clients_lock = threading.Lock()
+
+
+def get_http_client() -> AsyncHttpClient:
+    """Zwraca współdzielony klient HTTP dla bieżącej pętli zdarzeń."""
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        client = _clients.get(loop)
+        if client is None:
+            client = AsyncHttpClient()
+            _clients[loop] = client
+        return client
+
+
+async def close_http_client() -> None:
+    """Zamyka klienta przypisanego do bieżącej pętli (np. przy zamykaniu aplikacji)."""
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        client = _clients.pop(loop, None)
+    if client is not None:
+        await client.close()
+
+
+__all__ = [
+    "AsyncHttpClient",
+    "HttpResponse",
+    "HttpStatusError",
+    "get_http_client",
+    "close_http_client",
+    "http_available",
+]
@@ -0,0 +1,159 @@
+"""Długożyjąca pętla asyncio uruchomiona w wątku tła.
+
+UI (PyQt) nie ma własnej pętli asyncio, więc dotąd każde odświeżenie
+tworzyło nowy wątek i nową pętlę (``asyncio.run``), a wraz z nią zimne
+połączenia aiosqlite/HTTP. ``AsyncRuntime`` utrzymuje jedną pętlę przez cały
+czas życia aplikacji - komponenty zainicjalizowane na niej (menedżery danych,
+sesje HTTP, połączenia z bazą) są potem wielokrotnie używane przez kolejne
+wywołania ``submit``/``run``.
+"""
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from typing import Any, Awaitable, Coroutine, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class AsyncRuntime:
+    """Pętla asyncio w wątku-demonie z bezpiecznym przekazywaniem coroutine."""
+
+    def __init__(self, name: str = "async-runtime") -> None:
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0}
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Pętla runtime'u (uruchamiana przy pierwszym użyciu)."""
+        self.start()
+        assert self._loop is not None
+        return self._loop
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def in_runtime_thread(self) -> bool:
+        """Czy bieżący kod wykonuje się w wątku pętli runtime'u."""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def start(self) -> None:
+        """Uruchamia wątek pętli, jeśli jeszcze nie działa."""
+        with self._lock:
+            if self.is_running:
+                return
+            ready = threading.Event()
+            loop = asyncio.new_event_loop()
+
+            def _run() -> None:
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                try:
+                    loop.run_forever()
+                finally:
+                    try:
+                        self._cancel_pending(loop)
+                        loop.run_until_complete(loop.shutdown_asyncgens())
+                    finally:
+                        loop.close()
+
+            self._loop = loop
+            self._thread = threading.Thread(target=_run, name=self.name, daemon=True)
+            self._thread.start()
+            ready.wait()
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> "concurrent.futures.Future[T]":
+        """Planuje coroutine w pętli runtime'u i zwraca ``concurrent.futures.Future``."""
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        self.stats["submitted"] += 1
+        future.add_done_callback(self._count)
+        return future
+
+    def run(self, coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+        """Wykonuje coroutine w pętli runtime'u i czeka na wynik.
+
+        Raises:
+            RuntimeError: przy wywołaniu z wątku pętli (zakleszczenie).
+            TimeoutError: gdy wynik nie pojawi się w ``timeout`` sekund;
+                coroutine jest wtedy anulowana.
+        """
+        if self.in_runtime_thread():
+            close = getattr(coro, "close", None)
+            if close:
+                close()
+            raise RuntimeError("AsyncRuntime.run() called from the runtime loop thread")
+        future = self.submit(_as_coroutine(coro))
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError(f"coroutine did not finish within {timeout}s") from None
+
+    def call_soon(self, callback, *args) -> None:
+        """Wywołuje funkcję w wątku pętli runtime'u."""
+        self.loop.call_soon_threadsafe(callback, *args)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Anuluje zaległe zadania, zatrzymuje pętlę i czeka na wątek."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+        if loop is None or thread is None or not thread.is_alive():
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if threading.current_thread() is not thread:
+            thread.join(timeout)
+
+    def _count(self, future: concurrent.futures.Future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            self.stats["failed"] += 1
+        else:
+            self.stats["completed"] += 1
+
+    @staticmethod
+    def _cancel_pending(loop: asyncio.AbstractEventLoop) -> None:
+        pending = [task for task in asyncio.all_tasks(loop) if not task.done()]
+        if not pending:
+            return
+        for task in pending:
+            task.cancel()
+        loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+
+
+async def _as_coroutine(awaitable: Awaitable[T]) -> T:
+    return await awaitable
+
+
+_runtime: Optional[AsyncRuntime] = None
+_runtime_lock = threading.Lock()
+
+
+def get_async_runtime() -> AsyncRuntime:
+    """Zwraca (i w razie potrzeby uruchamia) współdzielony runtime aplikacji."""
+    global _runtime
+    with _runtime_lock:
+        if _runtime is None:
+            _runtime = AsyncRuntime("engine-loop")
+    _runtime.start()
+    return _runtime
+
+
+def shutdown_async_runtime(timeout: float = 5.0) -> None:
+    """Zatrzymuje współdzielony runtime (przy zamykaniu aplikacji)."""
+    global _runtime
+    with _runtime_lock:
+        runtime, _runtime = _runtime, None
+    if runtime is not None:
+        runtime.stop(timeout)
+
+
+__all__ = ["AsyncRuntime", "get_async_runtime", "shutdown_async_runtime"]
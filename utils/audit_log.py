@@ -1,8 +1,9 @@
 from pathlib import Path
-import json, time
-from typing import Any, Dict
+import atexit, json, os, queue, threading, time
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Optional, Tuple
 
-from utils.http_logging import sanitize_mapping
+from utils.http_logging import SENSITIVE_KEYS, _mask_value
 from utils.logger import get_logger, LogType
 logger = get_logger(__name__, LogType.SECURITY)
 
@@ -10,15 +11,31 @@ LOG_DIR = Path(__file__).resolve().parents[1] / "logs"
 LOG_DIR.mkdir(parents=True, exist_ok=True)
 LOG_FILE = LOG_DIR / "events.jsonl"
 
+# Domyślne progi writera audytu (nadpisywalne zmiennymi środowiskowymi)
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "256"))
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "0.5"))
+AUDIT_MAX_BYTES = int(os.getenv("AUDIT_MAX_BYTES", str(50 * 1024 * 1024)))
+AUDIT_BACKUP_COUNT = int(os.getenv("AUDIT_BACKUP_COUNT", "5"))
+AUDIT_MAX_QUEUE = int(os.getenv("AUDIT_MAX_QUEUE", "100000"))
+
+
+@lru_cache(maxsize=4096)
+def _sensitive_keys(keys: Tuple[Any, ...]) -> FrozenSet[Any]:
+    """Zwraca podzbiór kluczy wymagających maskowania (decyzja cache'owana per zestaw kluczy)."""
+    return frozenset(k for k in keys if SENSITIVE_KEYS.search(str(k)))
+
 
 def _sanitize_deep(obj: Any) -> Any:
     try:
         if isinstance(obj, dict):
-            # Najpierw zsanityzuj klucze na tym poziomie
-            sanitized = sanitize_mapping(obj)
-            # Następnie rekurencyjnie zsanityzuj wartości
-            for k, v in list(sanitized.items()):
-                sanitized[k] = _sanitize_deep(v)
+            # Klucze wrażliwe na tym poziomie - regex liczony raz dla danego zestawu kluczy
+            try:
+                masked = _sensitive_keys(tuple(obj))
+            except TypeError:
+                masked = frozenset(k for k in obj if SENSITIVE_KEYS.search(str(k)))
+            sanitized = {}
+            for k, v in obj.items():
+                sanitized[k] = _mask_value(v) if k in masked else _sanitize_deep(v)
             return sanitized
         if isinstance(obj, (list, tuple)):
             return type(obj)(_sanitize_deep(it) for it in obj)
@@ -33,19 +50,200 @@ def _sanitize_deep(obj: Any) -> Any:
             return None
 
 
+def _encode(rec: Dict[str, Any]) -> str:
+    try:
+        return json.dumps(rec, ensure_ascii=False, default=str) + "\n"
+    except Exception as e:
+        logger.debug(f"Audit record encode failed: {e}", exc_info=True)
+        return json.dumps({"ts": rec.get("ts"), "event": str(rec.get("event")), "payload": {"_log_error": True}}) + "\n"
+
+
+class AuditWriter:
+    """Writer audytu JSONL w tle.
+
+    Rekordy trafiają do kolejki i są zapisywane paczkami przez jeden wątek,
+    który trzyma otwarty uchwyt pliku, zrzuca bufor po przekroczeniu
+    rozmiaru paczki lub interwału i rotuje plik po osiągnięciu limitu.
+    """
+
+    def __init__(
+        self,
+        path: Path = LOG_FILE,
+        *,
+        batch_size: int = AUDIT_BATCH_SIZE,
+        flush_interval: float = AUDIT_FLUSH_INTERVAL,
+        max_bytes: int = AUDIT_MAX_BYTES,
+        backup_count: int = AUDIT_BACKUP_COUNT,
+        max_queue: int = AUDIT_MAX_QUEUE,
+    ):
+        self.path = Path(path)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._file = None
+        self._stopped = False
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.rotations = 0
+
+    # --- API wydawcy --------------------------------------------------
+    def submit(self, rec: Dict[str, Any]) -> None:
+        """Dodaje rekord do kolejki; nigdy nie blokuje (nadmiar jest liczony jako dropped)."""
+        if self._stopped:
+            return
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(rec)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout: float = 2.0) -> bool:
+        """Czeka, aż wszystkie dotychczas zgłoszone rekordy trafią na dysk."""
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 2.0) -> None:
+        """Zrzuca kolejkę i zatrzymuje wątek writera."""
+        if self._stopped:
+            return
+        self.flush(timeout)
+        self._stopped = True
+        if self._thread is not None and self._thread.is_alive():
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                pass
+            self._thread.join(timeout)
+        self._close_file()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "rotations": self.rotations,
+        }
+
+    # --- wątek writera ------------------------------------------------
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        batch = []
+        waiters = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            timeout = max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = ...
+            stop = item is None
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+            elif isinstance(item, dict):
+                batch.append(item)
+            if stop or waiters or len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                if batch:
+                    self._write_batch(batch)
+                    batch = []
+                for w in waiters:
+                    w.set()
+                waiters = []
+                deadline = time.monotonic() + self.flush_interval
+            if stop:
+                return
+
+    def _open(self):
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("a", encoding="utf-8")
+        return self._file
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            try:
+                self._file.close()
+            except Exception as e:
+                logger.debug(f"Audit log close failed: {e}", exc_info=True)
+            self._file = None
+
+    def _write_batch(self, batch) -> None:
+        try:
+            f = self._open()
+            f.write("".join(_encode(rec) for rec in batch))
+            f.flush()
+            self.written += len(batch)
+            self.batches += 1
+            if self.max_bytes > 0 and f.tell() >= self.max_bytes:
+                self._rotate()
+        except Exception as e:
+            # Never let audit logging crash the app
+            logger.debug(f"Audit log write failed: {e}", exc_info=True)
+            self._close_file()
+
+    def _rotate(self) -> None:
+        self._close_file()
+        try:
+            if self.backup_count > 0:
+                for i in range(self.backup_count - 1, 0, -1):
+                    src = self.path.with_name(f"{self.path.name}.{i}")
+                    if src.exists():
+                        os.replace(src, self.path.with_name(f"{self.path.name}.{i + 1}"))
+                os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+            else:
+                self.path.unlink()
+            self.rotations += 1
+        except Exception as e:
+            logger.debug(f"Audit log rotation failed: {e}", exc_info=True)
+
+
+_writer: Optional[AuditWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_audit_writer() -> AuditWriter:
+    """Zwraca globalny writer audytu (singleton)."""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = AuditWriter()
+                atexit.register(_writer.close)
+    return _writer
+
+
+def flush(timeout: float = 2.0) -> bool:
+    """Wymusza zapis zaległych rekordów audytu na dysk."""
+    return get_audit_writer().flush(timeout)
+
+
 def log_event(event: str, payload: Dict[str, Any]) -> None:
     try:
         safe_payload = _sanitize_deep(payload or {})
         rec = {"ts": int(time.time()*1000), "event": event, "payload": safe_payload}
-        with LOG_FILE.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    except Exception as e:
+        logger.debug(f"Audit log sanitize failed: {e}", exc_info=True)
+        rec = {"ts": int(time.time()*1000), "event": str(event), "payload": {"_log_error": True}}
+    try:
+        get_audit_writer().submit(rec)
     except Exception as e:
         # Never let audit logging crash the app
-        logger.debug(f"Audit log write failed: {e}", exc_info=True)
-        try:
-            rec = {"ts": int(time.time()*1000), "event": str(event), "payload": {"_log_error": True}}
-            with LOG_FILE.open("a", encoding="utf-8") as f:
-                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
-        except Exception as se:
-            # swallow ultimate failure but log
-            logger.debug(f"Audit log ultimate failure: {se}", exc_info=True)
+        logger.debug(f"Audit log enqueue failed: {e}", exc_info=True)
@@ -0,0 +1,312 @@
+"""Kolumnowy magazyn świec OHLCV na dysku z odczytem przez mmap.
+
+Każda para (symbol, timeframe) ma własny katalog z sześcioma plikami
+dopisywanymi na końcu (``t.bin`` - int64 ms, ``o/h/l/c/v.bin`` - float64).
+Odczyt mapuje kolumny przez ``np.memmap``, więc zakres świec to wycinek bez
+kopiowania i bez parsowania; zapytania po czasie korzystają z
+``np.searchsorted`` na posortowanej kolumnie ``t``. Dopisywane są tylko świece
+nowsze od ostatniej zapisanej - ponowny zapis tej samej historii jest no-opem.
+
+Przerwany zapis może zostawić kolumny różnej długości; za obowiązującą
+uznawana jest najkrótsza, a nadmiar jest obcinany przy następnym dopisaniu.
+"""
+from __future__ import annotations
+
+import csv
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from utils.indicators import normalise_symbol, timeframe_to_ms
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROOT = Path(__file__).resolve().parents[1] / "data" / "candles"
+
+COLUMNS = ('t', 'o', 'h', 'l', 'c', 'v')
+_DTYPES = {'t': np.dtype('<i8'), 'o': np.dtype('<f8'), 'h': np.dtype('<f8'),
+           'l': np.dtype('<f8'), 'c': np.dtype('<f8'), 'v': np.dtype('<f8')}
+
+_CSV_COLUMNS = {
+    't': ('timestamp', 'time'),
+    'o': ('open',),
+    'h': ('high',),
+    'l': ('low',),
+    'c': ('close',),
+    'v': ('volume',),
+}
+
+# Klucze świec w formacie backtestera, MarketDataManager i CCXT
+_DICT_KEYS = {
+    't': ('t', 'timestamp', 'time'),
+    'o': ('o', 'open'),
+    'h': ('h', 'high'),
+    'l': ('l', 'low'),
+    'c': ('c', 'close'),
+    'v': ('v', 'volume'),
+}
+
+Candle = Dict[str, Any]
+
+
+@dataclass
+class OHLCVArrays:
+    """Kolumnowe OHLCV (float64, znaczniki czasu int64)."""
+    t: np.ndarray
+    o: np.ndarray
+    h: np.ndarray
+    l: np.ndarray
+    c: np.ndarray
+    v: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.c)
+
+    def window(self, start: int, end: int) -> 'OHLCVArrays':
+        """Widok (bez kopiowania) świec ``[start, end)``."""
+        return OHLCVArrays(self.t[start:end], self.o[start:end], self.h[start:end],
+                           self.l[start:end], self.c[start:end], self.v[start:end])
+
+    @classmethod
+    def empty(cls) -> 'OHLCVArrays':
+        return cls(*(np.empty(0, dtype=_DTYPES[name]) for name in COLUMNS))
+
+    @classmethod
+    def from_candles(cls, candles: Sequence[Candle]) -> 'OHLCVArrays':
+        """Z listy świec w formacie ``backtester`` (klucze t/o/h/l/c/v)."""
+        def col(key: str, dtype=np.float64) -> np.ndarray:
+            return np.fromiter((c.get(key, 0) for c in candles), dtype=dtype, count=len(candles))
+        return cls(col('t', np.int64), col('o'), col('h'), col('l'), col('c'), col('v'))
+
+    def to_candles(self) -> List[Candle]:
+        """Lista świec w formacie ``backtester`` (kopiuje dane)."""
+        columns = [getattr(self, name).tolist() for name in COLUMNS]
+        return [dict(zip(COLUMNS, row)) for row in zip(*columns)]
+
+    def decimate(self, max_bars: int) -> 'OHLCVArrays':
+        """Agreguje kolejne świece tak, by było ich najwyżej ``max_bars``.
+
+        Grupy liczone są od początku serii, więc dopisanie świecy zmienia
+        wyłącznie ostatnią grupę. Grupa dostaje czas i open pierwszej świecy,
+        close ostatniej, ekstrema high/low i sumę wolumenu.
+        """
+        n = len(self)
+        if max_bars <= 0 or n <= max_bars:
+            return self
+        group = -(-n // max_bars)
+        starts = np.arange(0, n, group)
+        ends = np.minimum(starts + group, n) - 1
+        return OHLCVArrays(self.t[starts], self.o[starts],
+                           np.maximum.reduceat(self.h, starts), np.minimum.reduceat(self.l, starts),
+                           self.c[ends], np.add.reduceat(self.v, starts))
+
+    def merge_tail(self, newer: 'OHLCVArrays', limit: Optional[int] = None) -> 'OHLCVArrays':
+        """Nakłada najnowsze świece (np. ostatnie 2 z API) na serię.
+
+        Świece od czasu pierwszej z ``newer`` są zastępowane - bieżąca świeca
+        jest aktualizowana w miejscu, a nowe są dopisywane na końcu. Z
+        ``limit`` zostaje tylko ostatnie ``limit`` świec.
+        """
+        if not len(newer):
+            return self
+        cut = int(np.searchsorted(self.t, newer.t[0], side='left'))
+        merged = OHLCVArrays(*(np.concatenate((getattr(self, name)[:cut], getattr(newer, name)))
+                               for name in COLUMNS))
+        if limit is not None and len(merged) > limit:
+            merged = merged.window(len(merged) - max(0, int(limit)), len(merged))
+        return merged
+
+
+def load_ohlcv_arrays(path: Path) -> OHLCVArrays:
+    """Wczytuje CSV (timestamp/time, open, high, low, close, volume) bezpośrednio do kolumn."""
+    with Path(path).open('r', encoding='utf-8') as f:
+        header = next(csv.reader(f), [])
+        names = [h.strip().lower() for h in header]
+        usecols: List[Optional[int]] = []
+        for aliases in _CSV_COLUMNS.values():
+            usecols.append(next((names.index(a) for a in aliases if a in names), None))
+        present = [i for i in usecols if i is not None]
+        data = np.loadtxt(f, delimiter=',', usecols=present, ndmin=2) if present else np.empty((0, 0))
+    n = data.shape[0]
+    cols = []
+    for idx in usecols:
+        cols.append(data[:, present.index(idx)] if idx is not None else np.zeros(n))
+    t, o, h, l, c, v = cols
+    return OHLCVArrays(t.astype(np.int64), o, h, l, c, v)
+
+
+def _timestamp_ms(value: Any) -> int:
+    if isinstance(value, datetime):
+        return int(value.timestamp() * 1000)
+    return int(value)
+
+
+def _candle_row(candle: Any) -> Tuple[Any, ...]:
+    if isinstance(candle, dict):
+        row = []
+        for name in COLUMNS:
+            key = next((k for k in _DICT_KEYS[name] if k in candle), None)
+            row.append(candle[key] if key is not None else 0)
+        return tuple(row)
+    # Lista CCXT: [timestamp, open, high, low, close, volume]
+    return tuple(candle[:6])
+
+
+def to_arrays(data: Union[OHLCVArrays, Iterable[Any]]) -> OHLCVArrays:
+    """``OHLCVArrays`` ze świec w dowolnym obsługiwanym formacie (dict lub lista CCXT)."""
+    if isinstance(data, OHLCVArrays):
+        return data
+    rows = [_candle_row(candle) for candle in data]
+    if not rows:
+        return OHLCVArrays.empty()
+    t = np.fromiter((_timestamp_ms(r[0]) for r in rows), dtype=np.int64, count=len(rows))
+    values = np.array([r[1:] for r in rows], dtype=np.float64).reshape(len(rows), 5)
+    return OHLCVArrays(t, *(values[:, k] for k in range(5)))
+
+
+class CandleStore:
+    """Magazyn świec: katalog ``<root>/<SYMBOL>/<timeframe>/`` na serię, plik na kolumnę."""
+
+    def __init__(self, root: Optional[Union[str, Path]] = None):
+        self.root = Path(root) if root is not None else DEFAULT_ROOT
+        self._lock = threading.Lock()
+        # Zmapowane kolumny per seria: (liczba świec, OHLCVArrays)
+        self._maps: Dict[Tuple[str, str], Tuple[int, OHLCVArrays]] = {}
+
+    def _key(self, symbol: str, timeframe: str) -> Tuple[str, str]:
+        timeframe_to_ms(timeframe)  # walidacja oznaczenia interwału
+        return normalise_symbol(symbol), str(timeframe).strip()
+
+    def _dir(self, key: Tuple[str, str]) -> Path:
+        return self.root / key[0] / key[1]
+
+    def _length(self, directory: Path) -> int:
+        lengths = []
+        for name in COLUMNS:
+            path = directory / f"{name}.bin"
+            lengths.append(path.stat().st_size // _DTYPES[name].itemsize if path.exists() else 0)
+        return min(lengths)
+
+    def length(self, symbol: str, timeframe: str) -> int:
+        return self._length(self._dir(self._key(symbol, timeframe)))
+
+    def series(self) -> List[Tuple[str, str]]:
+        """Zapisane pary (symbol, timeframe)."""
+        if not self.root.exists():
+            return []
+        return sorted((d.parent.name, d.name) for d in self.root.glob('*/*') if (d / 't.bin').exists())
+
+    def _arrays(self, key: Tuple[str, str]) -> OHLCVArrays:
+        directory = self._dir(key)
+        n = self._length(directory)
+        cached = self._maps.get(key)
+        if cached is not None and cached[0] == n:
+            return cached[1]
+        if n == 0:
+            arrays = OHLCVArrays.empty()
+        else:
+            arrays = OHLCVArrays(*(
+                np.memmap(directory / f"{name}.bin", dtype=_DTYPES[name], mode='r', shape=(n,))
+                for name in COLUMNS
+            ))
+        self._maps[key] = (n, arrays)
+        return arrays
+
+    def read(
+        self,
+        symbol: str,
+        timeframe: str,
+        start: Optional[Any] = None,
+        end: Optional[Any] = None,
+    ) -> OHLCVArrays:
+        """Świece z przedziału ``[start, end)`` (ms lub ``datetime``) jako widok mmap bez kopiowania."""
+        arrays = self._arrays(self._key(symbol, timeframe))
+        lo = 0 if start is None else int(np.searchsorted(arrays.t, _timestamp_ms(start), side='left'))
+        hi = len(arrays) if end is None else int(np.searchsorted(arrays.t, _timestamp_ms(end), side='left'))
+        return arrays.window(lo, max(lo, hi))
+
+    def tail(self, symbol: str, timeframe: str, n: int) -> OHLCVArrays:
+        """Ostatnie ``n`` świec."""
+        arrays = self._arrays(self._key(symbol, timeframe))
+        return arrays.window(max(0, len(arrays) - max(0, int(n))), len(arrays))
+
+    def last_timestamp(self, symbol: str, timeframe: str) -> Optional[int]:
+        arrays = self._arrays(self._key(symbol, timeframe))
+        return int(arrays.t[-1]) if len(arrays) else None
+
+    def append(self, symbol: str, timeframe: str, candles: Union[OHLCVArrays, Iterable[Any]]) -> int:
+        """Dopisuje świece nowsze od ostatniej zapisanej; zwraca liczbę dopisanych.
+
+        Wejście może być nieposortowane i zawierać duplikaty (wygrywa ostatnie
+        wystąpienie znacznika czasu). Wywołujący odpowiada za przekazywanie
+        wyłącznie zamkniętych świec.
+        """
+        key = self._key(symbol, timeframe)
+        arrays = to_arrays(candles)
+        if not len(arrays):
+            return 0
+        # Ostatnie wystąpienie każdego znacznika, rosnąco po czasie
+        order = np.argsort(arrays.t, kind='stable')
+        t_sorted = arrays.t[order]
+        keep = np.append(t_sorted[1:] != t_sorted[:-1], True)
+        index = order[keep]
+
+        with self._lock:
+            directory = self._dir(key)
+            directory.mkdir(parents=True, exist_ok=True)
+            n = self._length(directory)
+            self._truncate(directory, n)
+            if n:
+                last = int(np.fromfile(directory / 't.bin', dtype=_DTYPES['t'], count=1, offset=(n - 1) * 8)[0])
+                index = index[arrays.t[index] > last]
+            if not len(index):
+                return 0
+            for name in COLUMNS:
+                column = np.ascontiguousarray(getattr(arrays, name)[index], dtype=_DTYPES[name])
+                with open(directory / f"{name}.bin", 'ab') as f:
+                    f.write(column.tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+            self._maps.pop(key, None)
+        return len(index)
+
+    def _truncate(self, directory: Path, n: int) -> None:
+        for name in COLUMNS:
+            path = directory / f"{name}.bin"
+            size = n * _DTYPES[name].itemsize
+            if path.exists() and path.stat().st_size != size:
+                logger.warning("Candle store: obcinam niespójną kolumnę %s do %d świec", path, n)
+                with open(path, 'r+b') as f:
+                    f.truncate(size)
+
+    def import_csv(self, path: Union[str, Path], symbol: str, timeframe: str) -> int:
+        """Importuje CSV (jak ``backtester.load_ohlcv_csv``) do magazynu."""
+        return self.append(symbol, timeframe, load_ohlcv_arrays(Path(path)))
+
+
+_store: Optional[CandleStore] = None
+_store_lock = threading.Lock()
+
+
+def get_candle_store() -> CandleStore:
+    """Domyślny magazyn (``data/candles`` lub katalog z ``CANDLE_STORE_DIR``)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = CandleStore(os.environ.get('CANDLE_STORE_DIR') or None)
+        return _store
+
+
+__all__ = [
+    'OHLCVArrays',
+    'CandleStore',
+    'get_candle_store',
+    'load_ohlcv_arrays',
+    'to_arrays',
+]
@@ -74,7 +74,17 @@ class ConfigManager:
                 "backup_interval_hours": 24,
                 "max_backups": 7,
                 "auto_backup": True,
-                "backup_path": "data/backup"
+                "backup_path": "data/backup",
+                "write_behind": False,
+                "sqlite_pragmas": {},
+                "read_pool_size": 2,
+                "retention": {
+                    "enabled": False,
+                    "archive_dir": "data/archive",
+                    "interval_minutes": 60,
+                    "batch_size": 500,
+                    "policies": {}
+                }
             },
             "logging": {
                 "level": "INFO",
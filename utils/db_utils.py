@@ -1,4 +1,6 @@
 
+import base64
+import json
 import sqlite3
 import re
 
@@ -57,6 +59,37 @@ def build_set_clause(updates: dict, allowed_columns: set | None = None) -> tuple
         params.append(val)
     return ", ".join(sets), params
 
+def encode_cursor(*values) -> str:
+    """Zakoduj pozycję paginacji keyset (np. timestamp i id) jako nieprzezroczysty token."""
+    raw = json.dumps(list(values), separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(token: str, size: int = 2) -> list:
+    """Odkoduj token z ``encode_cursor``; zły token -> ValueError."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except Exception as exc:
+        raise ValueError(f"Invalid pagination cursor: {token!r}") from exc
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError(f"Invalid pagination cursor: {token!r}")
+    return values
+
+def build_keyset_clause(order_column: str, cursor_values: list | None = None,
+                        descending: bool = True, tie_breaker: str = 'id') -> tuple[str, list, str]:
+    """Zbuduj predykat i ORDER BY paginacji keyset po (order_column, tie_breaker).
+    - Zwraca (clause, params, order_by); clause to '1=1' dla pierwszej strony
+    - Porównanie wartości wierszy pozwala SQLite zejść indeksem (kolumna, rowid)
+    """
+    validate_identifiers(order_column, tie_breaker)
+    direction = " DESC" if descending else " ASC"
+    order_by = order_column + direction + ", " + tie_breaker + direction
+    if not cursor_values:
+        return "1=1", [], order_by
+    op = " < " if descending else " > "
+    clause = "(" + order_column + ", " + tie_breaker + ")" + op + "(?, ?)"
+    return clause, list(cursor_values), order_by
+
 # Uwaga: Helpery budują tylko tekst SQL i parametry; wartości ZAWSZE muszą być
 # przekazywane jako parametry do execute/ executemany. Nigdy nie używaj f-stringów
 # w zapytaniach SQL. Korzystaj z tych helperów w miejscach, gdzie powstaje dynamiczny
@@ -1,18 +1,246 @@
 """
 EventBus - prosty system pub/sub dla komunikacji między komponentami
 """
+import asyncio
+import inspect
 import logging
-from typing import Dict, List, Callable, Any
+import time
+from collections import OrderedDict, deque
+from enum import Enum
+from typing import Dict, List, Callable, Any, Optional, Tuple
 from threading import Lock
 
 logger = logging.getLogger(__name__)
 
+
+class OverflowPolicy(str, Enum):
+    """Polityka zachowania kolejki subskrybenta po osiągnięciu limitu"""
+    DROP_OLDEST = "drop_oldest"
+    COALESCE = "coalesce"
+    BLOCK = "block"
+
+
+class AsyncSubscription:
+    """Subskrybent asynchroniczny z własną, ograniczoną kolejką.
+
+    Każdy subskrybent ma dedykowane zadanie na swojej pętli asyncio, więc
+    wolny konsument nie blokuje wydawcy ani pozostałych subskrybentów.
+    """
+
+    def __init__(
+        self,
+        event_type: str,
+        callback: Callable[[Any], Any],
+        loop: asyncio.AbstractEventLoop,
+        *,
+        maxsize: int = 1000,
+        policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        key_func: Optional[Callable[[Any], Any]] = None,
+        block_timeout: float = 1.0,
+    ):
+        if maxsize <= 0:
+            raise ValueError("maxsize musi być dodatni")
+        policy = OverflowPolicy(policy)
+        if policy is OverflowPolicy.COALESCE and key_func is None:
+            raise ValueError("Polityka COALESCE wymaga key_func")
+        self.event_type = event_type
+        self.callback = callback
+        self.loop = loop
+        self.maxsize = maxsize
+        self.policy = policy
+        self.key_func = key_func
+        self.block_timeout = block_timeout
+        # FIFO (DROP_OLDEST/BLOCK) albo mapa klucz -> najnowszy wpis (COALESCE)
+        self._buffer: deque = deque()
+        self._coalesced: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._wakeup = asyncio.Event()
+        self._space = asyncio.Event()
+        self._space.set()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+
+    # --- stan kolejki -------------------------------------------------
+    def pending(self) -> int:
+        """Liczba zdarzeń oczekujących na dostarczenie"""
+        return len(self._coalesced) if self.policy is OverflowPolicy.COALESCE else len(self._buffer)
+
+    def stats(self) -> Dict[str, Any]:
+        """Zwraca liczniki subskrybenta (opóźnienie, odrzucenia, głębokość kolejki)"""
+        return {
+            "event_type": self.event_type,
+            "callback": getattr(self.callback, "__qualname__", repr(self.callback)),
+            "policy": self.policy.value,
+            "maxsize": self.maxsize,
+            "pending": self.pending(),
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "last_lag_ms": round(self.last_lag_ms, 3),
+            "max_lag_ms": round(self.max_lag_ms, 3),
+        }
+
+    def _in_loop_thread(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
+
+    # --- wstawianie (wywoływane w wątku pętli) ------------------------
+    def _offer_nowait(self, item: Tuple[float, Any]) -> None:
+        if self._closed:
+            return
+        if self.policy is OverflowPolicy.COALESCE:
+            key = self._safe_key(item[1])
+            if key in self._coalesced:
+                # Zachowaj znacznik czasu najstarszego wpisu, by lag był uczciwy
+                self._coalesced[key] = (self._coalesced[key][0], item[1])
+                self.coalesced += 1
+            else:
+                if len(self._coalesced) >= self.maxsize:
+                    self._coalesced.popitem(last=False)
+                    self.dropped += 1
+                self._coalesced[key] = item
+        elif len(self._buffer) >= self.maxsize:
+            if self.policy is OverflowPolicy.DROP_OLDEST:
+                self._buffer.popleft()
+                self._buffer.append(item)
+            # BLOCK bez możliwości czekania (wydawca w wątku pętli) - odrzuć najnowsze
+            self.dropped += 1
+        else:
+            self._buffer.append(item)
+        self._idle.clear()
+        self._wakeup.set()
+        if self.policy is OverflowPolicy.BLOCK and len(self._buffer) >= self.maxsize:
+            self._space.clear()
+
+    async def put(self, item: Tuple[float, Any]) -> None:
+        """Wstawia zdarzenie czekając na miejsce (backpressure dla polityki BLOCK)"""
+        if self.policy is OverflowPolicy.BLOCK:
+            while not self._closed and len(self._buffer) >= self.maxsize:
+                self._space.clear()
+                await self._space.wait()
+        self._offer_nowait(item)
+
+    def _safe_key(self, payload: Any) -> Any:
+        try:
+            return self.key_func(payload)
+        except Exception:
+            return None
+
+    def offer(self, payload: Any) -> None:
+        """Przekazuje zdarzenie z dowolnego wątku bez blokowania (poza BLOCK z obcego wątku)"""
+        if self._closed or self.loop.is_closed():
+            return
+        item = (time.monotonic(), payload)
+        if self._in_loop_thread():
+            self._offer_nowait(item)
+        elif self.policy is OverflowPolicy.BLOCK:
+            future = asyncio.run_coroutine_threadsafe(self.put(item), self.loop)
+            try:
+                future.result(timeout=self.block_timeout)
+            except Exception:
+                future.cancel()
+                self.dropped += 1
+        else:
+            self.loop.call_soon_threadsafe(self._offer_nowait, item)
+
+    # --- konsument ---------------------------------------------------
+    def _pop(self) -> Tuple[float, Any]:
+        if self.policy is OverflowPolicy.COALESCE:
+            return self._coalesced.popitem(last=False)[1]
+        item = self._buffer.popleft()
+        if not self._space.is_set() and len(self._buffer) < self.maxsize:
+            self._space.set()
+        return item
+
+    async def _run(self) -> None:
+        while not self._closed:
+            if not self.pending():
+                self._wakeup.clear()
+                self._idle.set()
+                await self._wakeup.wait()
+                continue
+            enqueued_at, payload = self._pop()
+            lag_ms = (time.monotonic() - enqueued_at) * 1000.0
+            self.last_lag_ms = lag_ms
+            if lag_ms > self.max_lag_ms:
+                self.max_lag_ms = lag_ms
+            try:
+                result = self.callback(payload)
+                if inspect.isawaitable(result):
+                    await result
+                self.delivered += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Błąd w async callback dla {self.event_type}: {e}")
+
+    def start(self) -> None:
+        """Uruchamia zadanie konsumenta na pętli subskrybenta"""
+        if self._task is not None:
+            return
+        if self._in_loop_thread():
+            self._task = self.loop.create_task(self._run())
+        else:
+            def _create() -> None:
+                if not self._closed and self._task is None:
+                    self._task = self.loop.create_task(self._run())
+            self.loop.call_soon_threadsafe(_create)
+
+    def close(self) -> None:
+        """Zatrzymuje konsumenta; niedostarczone zdarzenia są porzucane"""
+        self._closed = True
+
+        def _cancel() -> None:
+            self._space.set()
+            self._idle.set()
+            if self._task is not None:
+                self._task.cancel()
+
+        if self.loop.is_closed():
+            return
+        if self._in_loop_thread():
+            _cancel()
+        else:
+            self.loop.call_soon_threadsafe(_cancel)
+
+    async def join(self, timeout: Optional[float] = None) -> bool:
+        """Czeka aż kolejka zostanie opróżniona. Zwraca False po przekroczeniu timeout."""
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+class _TopicShard:
+    """Shard jednego tematu - lista subskrybentów podmieniana atomowo (copy-on-write)"""
+
+    __slots__ = ("lock", "subscribers")
+
+    def __init__(self):
+        self.lock = Lock()
+        self.subscribers: Tuple[AsyncSubscription, ...] = ()
+
+
 class EventBus:
     """Prosty system pub/sub dla komunikacji między komponentami"""
     
     def __init__(self):
         self._listeners: Dict[str, List[Callable]] = {}
         self._lock = Lock()
+        self._shards: Dict[str, _TopicShard] = {}
+        self._shards_lock = Lock()
     
     def subscribe(self, event_type: str, callback: Callable[[Any], None]) -> None:
         """
@@ -70,12 +298,118 @@ class EventBus:
                 callback(payload)
             except Exception as e:
                 logger.error(f"Błąd w callback dla {event_type}: {e}")
+
+        shard = self._shards.get(event_type)
+        if shard is not None:
+            for subscription in shard.subscribers:
+                subscription.offer(payload)
+
+    async def publish_async(self, event_type: str, data: Any = None, **kwargs) -> None:
+        """
+        Publikuje zdarzenie z poziomu korutyny
+
+        Listenery synchroniczne są wywoływane jak w publish(), natomiast dla
+        subskrybentów z polityką BLOCK na bieżącej pętli wydawca czeka na
+        wolne miejsce w kolejce (backpressure).
+        """
+        payload = data
+        if payload is None and kwargs:
+            payload = kwargs
+
+        with self._lock:
+            listeners = self._listeners.get(event_type, []).copy()
+
+        for callback in listeners:
+            try:
+                callback(payload)
+            except Exception as e:
+                logger.error(f"Błąd w callback dla {event_type}: {e}")
+
+        shard = self._shards.get(event_type)
+        if shard is None:
+            return
+        loop = asyncio.get_running_loop()
+        for subscription in shard.subscribers:
+            if subscription.policy is OverflowPolicy.BLOCK and subscription.loop is loop:
+                await subscription.put((time.monotonic(), payload))
+            else:
+                subscription.offer(payload)
+
+    def subscribe_async(
+        self,
+        event_type: str,
+        callback: Callable[[Any], Any],
+        *,
+        maxsize: int = 1000,
+        policy: OverflowPolicy | str = OverflowPolicy.DROP_OLDEST,
+        key_func: Optional[Callable[[Any], Any]] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        block_timeout: float = 1.0,
+    ) -> AsyncSubscription:
+        """
+        Subskrybuje zdarzenie w trybie asynchronicznym
+
+        Args:
+            event_type: Typ zdarzenia
+            callback: Funkcja lub korutyna wywoływana na pętli subskrybenta
+            maxsize: Pojemność kolejki subskrybenta
+            policy: Polityka przepełnienia (drop_oldest, coalesce, block)
+            key_func: Klucz koalescencji (wymagany dla COALESCE), np. symbol
+            loop: Pętla konsumenta (domyślnie bieżąca pętla)
+            block_timeout: Maks. czas blokowania wydawcy z innego wątku (BLOCK)
+
+        Returns:
+            AsyncSubscription z licznikami opóźnienia i odrzuceń
+        """
+        if loop is None:
+            loop = asyncio.get_running_loop()
+        subscription = AsyncSubscription(
+            event_type,
+            callback,
+            loop,
+            maxsize=maxsize,
+            policy=policy,
+            key_func=key_func,
+            block_timeout=block_timeout,
+        )
+        with self._shards_lock:
+            shard = self._shards.setdefault(event_type, _TopicShard())
+        with shard.lock:
+            shard.subscribers = shard.subscribers + (subscription,)
+        subscription.start()
+        logger.debug(f"Dodano async listener dla {event_type} ({subscription.policy.value})")
+        return subscription
+
+    def unsubscribe_async(self, subscription: AsyncSubscription) -> None:
+        """Usuwa subskrypcję asynchroniczną i zatrzymuje jej konsumenta"""
+        shard = self._shards.get(subscription.event_type)
+        if shard is not None:
+            with shard.lock:
+                shard.subscribers = tuple(s for s in shard.subscribers if s is not subscription)
+        subscription.close()
+
+    def get_subscriber_stats(self, event_type: str = None) -> List[Dict[str, Any]]:
+        """Zwraca liczniki subskrybentów asynchronicznych (lag, drop, pending)"""
+        with self._shards_lock:
+            shards = dict(self._shards)
+        stats: List[Dict[str, Any]] = []
+        for topic, shard in shards.items():
+            if event_type and topic != event_type:
+                continue
+            stats.extend(s.stats() for s in shard.subscribers)
+        return stats
     
     def clear(self) -> None:
         """Usuwa wszystkich listenerów"""
         with self._lock:
             self._listeners.clear()
             logger.debug("Wyczyszczono wszystkich listenerów")
+        with self._shards_lock:
+            shards = list(self._shards.values())
+            self._shards.clear()
+        for shard in shards:
+            for subscription in shard.subscribers:
+                subscription.close()
         # hook: allow re-installing default subscribers after clear
         try:
             _hook = get_on_cleared_hook()
@@ -99,6 +433,13 @@ class EventBus:
                 return len(self._listeners.get(event_type, []))
             return sum(len(listeners) for listeners in self._listeners.values())
 
+    def get_async_listeners_count(self, event_type: str = None) -> int:
+        """Zwraca liczbę subskrybentów asynchronicznych"""
+        if event_type:
+            shard = self._shards.get(event_type)
+            return len(shard.subscribers) if shard else 0
+        return sum(len(shard.subscribers) for shard in list(self._shards.values()))
+
 # Globalna instancja EventBus
 _global_event_bus = None
 
@@ -205,3 +546,18 @@ if hasattr(get_event_bus(), "publish"):
                 pass
         return _orig_publish(event_name, payload, *args, **kwargs)
     get_event_bus().publish = _wrapped_publish
+
+    _orig_publish_async = get_event_bus().publish_async
+    async def _wrapped_publish_async(event_name, payload=None, *args, **kwargs):
+        if _audit_log_event is not None:
+            try:
+                audit_payload = payload
+                if audit_payload is None and kwargs:
+                    audit_payload = kwargs
+                if not isinstance(audit_payload, dict):
+                    audit_payload = {"data": str(audit_payload)}
+                _audit_log_event(str(event_name), audit_payload)
+            except Exception:
+                pass
+        return await _orig_publish_async(event_name, payload, *args, **kwargs)
+    get_event_bus().publish_async = _wrapped_publish_async
@@ -0,0 +1,268 @@
+"""Przyrostowy odczyt logu audytu ``logs/events.jsonl``.
+
+Plik rośnie bez ograniczeń (do rotacji przez ``AuditWriter``), więc
+ponowne czytanie go w całości przy każdym odświeżeniu telemetrii czy
+eksporcie robi się coraz wolniejsze. ``EventLogReader`` pamięta offset
+bajtowy i tożsamość pliku, parsuje wyłącznie nowo dopisane linie,
+utrzymuje bieżące agregaty i rzadki indeks ``ts -> offset`` pozwalający
+zacząć eksport zakresu czasu od właściwego miejsca w pliku.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from utils.audit_log import LOG_FILE
+from utils.logger import get_logger, LogType
+
+logger = get_logger(__name__, LogType.SYSTEM)
+
+# Rozmiar porcji odczytu i odstęp (w bajtach) między punktami indeksu
+READ_CHUNK = 1024 * 1024
+INDEX_INTERVAL = 64 * 1024
+
+# Rekordy są zapisywane w kolejności zgłoszeń; znaczniki czasu z różnych
+# wątków mogą się minimalnie przeplatać, więc skan zakresu kończy się dopiero
+# po przekroczeniu końca zakresu o ten margines
+ORDER_SLACK_MS = 5000
+
+ORDER_EVENTS = ("ORDER_SUBMITTED", "OrderSubmitted")
+FILL_EVENTS = ("ORDER_FILLED", "OrderFilled")
+
+
+class EventTotals:
+    """Bieżące agregaty zdarzeń (zlecenia, realizacje, symbole, boty)."""
+
+    def __init__(self) -> None:
+        self.events = 0
+        self.orders = 0
+        self.fills = 0
+        self.symbols: set = set()
+        self.bots: set = set()
+
+    def add(self, rec: Dict[str, Any]) -> None:
+        self.events += 1
+        ev = rec.get("event", "")
+        payload = rec.get("payload") or {}
+        if ev in FILL_EVENTS:
+            self.fills += 1
+        if ev in ORDER_EVENTS:
+            self.orders += 1
+        if isinstance(payload, dict):
+            if "symbol" in payload:
+                self.symbols.add(payload["symbol"])
+            if "bot_id" in payload:
+                self.bots.add(payload["bot_id"])
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "orders": self.orders,
+            "fills": self.fills,
+            "symbols": sorted(self.symbols, key=str),
+            "bots": sorted(self.bots, key=str),
+        }
+
+
+class EventLogReader:
+    """Czyta tylko nowe linie pliku JSONL i przeżywa rotację.
+
+    Rotacja jest wykrywana po zmianie tożsamości pliku (``st_dev``/``st_ino``)
+    - reader dokańcza wtedy przeniesiony plik (``events.jsonl.1``) od
+    zapamiętanego offsetu i zaczyna nowy od zera. Plik krótszy niż offset
+    traktowany jest jak obcięty. Niedokończona ostatnia linia (zapis w toku)
+    jest odczytywana dopiero przy następnym wywołaniu.
+    """
+
+    def __init__(self, path: Union[str, Path] = LOG_FILE, index_interval: int = INDEX_INTERVAL) -> None:
+        self.path = Path(path)
+        self.index_interval = max(1, index_interval)
+        self.offset = 0
+        self.totals = EventTotals()
+        self.stats = {"polls": 0, "bytes": 0, "records": 0, "bad_lines": 0, "rotations": 0}
+        self._identity: Optional[Tuple[int, int]] = None
+        # Punkty (największy ts przed offsetem, offset początku linii) - rosnące
+        self._index: List[Tuple[float, int]] = []
+        self._max_ts = float("-inf")
+        self._last_indexed: Optional[int] = None
+        self._lock = threading.RLock()
+
+    def poll(self) -> int:
+        """Parsuje linie dopisane od ostatniego wywołania; zwraca liczbę nowych rekordów."""
+        with self._lock:
+            self.stats["polls"] += 1
+            try:
+                st = os.stat(self.path)
+            except FileNotFoundError:
+                return 0
+            identity = (st.st_dev, st.st_ino)
+            count = 0
+            if self._identity is not None and (identity != self._identity or st.st_size < self.offset):
+                if identity != self._identity:
+                    count += self._drain_rotated()
+                    self.stats["rotations"] += 1
+                self._reset_file()
+            self._identity = identity
+            if st.st_size > self.offset:
+                count += self._scan(self.path, self.offset, track=True)
+            return count
+
+    def iter_range(self, start_ts: Optional[float] = None, end_ts: Optional[float] = None,
+                   raw: bool = False) -> Iterator[Union[Dict[str, Any], str]]:
+        """Rekordy bieżącego pliku z ``start_ts <= ts <= end_ts`` (ms).
+
+        Odczyt zaczyna się od punktu indeksu poprzedzającego ``start_ts``;
+        ``raw=True`` zwraca oryginalne linie (bez ponownego kodowania JSON).
+        """
+        self.poll()
+        with self._lock:
+            identity, end_offset = self._identity, self.offset
+            start_offset = 0
+            if start_ts is not None and self._index:
+                keys = [max_ts for max_ts, _ in self._index]
+                position = bisect_left(keys, start_ts) - 1
+                if position >= 0:
+                    start_offset = self._index[position][1]
+        filtered = start_ts is not None or end_ts is not None
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            st = os.fstat(f.fileno())
+            if (st.st_dev, st.st_ino) != identity:
+                # Plik zrotowano między odczytem indeksu a otwarciem
+                start_offset, end_offset = 0, st.st_size
+            f.seek(start_offset)
+            position = start_offset
+            for line in f:
+                position += len(line)
+                if position > end_offset:
+                    break
+                if not line.strip():
+                    continue
+                if filtered:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue
+                    ts = rec.get("ts") if isinstance(rec, dict) else None
+                    if not isinstance(ts, (int, float)):
+                        continue
+                    if start_ts is not None and ts < start_ts:
+                        continue
+                    if end_ts is not None and ts > end_ts:
+                        if ts > end_ts + ORDER_SLACK_MS:
+                            break
+                        continue
+                    if not raw:
+                        yield rec
+                        continue
+                elif not raw:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue
+                    if isinstance(rec, dict):
+                        yield rec
+                    continue
+                text = line.decode("utf-8")
+                yield text if text.endswith("\n") else text + "\n"
+
+    def reset(self) -> None:
+        """Zapomina offset, indeks i agregaty (następny ``poll`` czyta plik od początku)."""
+        with self._lock:
+            self._identity = None
+            self._reset_file()
+            self.totals = EventTotals()
+
+    # --- wewnętrzne -----------------------------------------------------
+    def _reset_file(self) -> None:
+        self.offset = 0
+        self._index = []
+        self._max_ts = float("-inf")
+        self._last_indexed = None
+
+    def _drain_rotated(self) -> int:
+        """Dokańcza plik przeniesiony przez rotację (ta sama tożsamość, nowa nazwa)."""
+        for candidate in sorted(self.path.parent.glob(self.path.name + ".*")):
+            try:
+                st = os.stat(candidate)
+            except OSError:
+                continue
+            if (st.st_dev, st.st_ino) == self._identity:
+                return self._scan(candidate, self.offset, track=False)
+        return 0
+
+    def _scan(self, path: Path, offset: int, track: bool) -> int:
+        count = 0
+        pending = b""
+        base = offset
+        try:
+            with open(path, "rb") as f:
+                f.seek(offset)
+                while True:
+                    chunk = f.read(READ_CHUNK)
+                    if not chunk:
+                        break
+                    data = pending + chunk
+                    end = data.rfind(b"\n") + 1
+                    if end:
+                        count += self._parse(data, end, base, track)
+                    pending = data[end:]
+                    base += end
+        except OSError as e:
+            logger.debug(f"Event log read failed: {e}", exc_info=True)
+        if track:
+            self.offset = base
+        self.stats["bytes"] += base - offset
+        self.stats["records"] += count
+        return count
+
+    def _parse(self, data: bytes, end: int, base: int, track: bool) -> int:
+        count = 0
+        pos = 0
+        while pos < end:
+            newline = data.index(b"\n", pos)
+            line = data[pos:newline]
+            if line.strip():
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    rec = None
+                if isinstance(rec, dict):
+                    if track:
+                        self._index_line(base + pos, rec.get("ts"))
+                    self.totals.add(rec)
+                    count += 1
+                else:
+                    self.stats["bad_lines"] += 1
+            pos = newline + 1
+        return count
+
+    def _index_line(self, offset: int, ts: Any) -> None:
+        if self._last_indexed is None or offset - self._last_indexed >= self.index_interval:
+            self._index.append((self._max_ts, offset))
+            self._last_indexed = offset
+        if isinstance(ts, (int, float)) and ts > self._max_ts:
+            self._max_ts = ts
+
+
+_readers: Dict[Path, EventLogReader] = {}
+_readers_lock = threading.Lock()
+
+
+def get_event_log_reader(path: Union[str, Path] = LOG_FILE) -> EventLogReader:
+    """Współdzielony reader dla danego pliku (telemetria i eksport korzystają z jednego)."""
+    key = Path(path).resolve()
+    with _readers_lock:
+        reader = _readers.get(key)
+        if reader is None:
+            reader = _readers[key] = EventLogReader(key)
+        return reader
+
+
+__all__ = ["EventLogReader", "EventTotals", "get_event_log_reader"]
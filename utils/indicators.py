@@ -0,0 +1,690 @@
+"""Strumieniowe wskaźniki techniczne współdzielone przez strategie.
+
+Każdy wskaźnik aktualizuje się w O(1) na nową świecę: sumy kroczące (SMA),
+rekurencyjne EMA/MACD z prawdziwą linią sygnału, RSI i ATR wygładzane metodą
+Wildera, krocząca wariancja Welforda dla wstęg Bollingera oraz deki
+monotoniczne dla oscylatora stochastycznego. ``revise()`` koryguje ostatnią,
+jeszcze niezamkniętą świecę, również w O(1) - kolejne ticki tej samej świecy
+nie wymagają przeliczania historii.
+
+Rejestr (``get_indicator_registry``) trzyma jeden ``IndicatorFeed`` na parę
+(symbol, timeframe) i jedną instancję wskaźnika na zestaw parametrów, więc boty
+obserwujące tę samą parę współdzielą obliczenia zamiast powtarzać je osobno.
+"""
+from __future__ import annotations
+
+import math
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+DEFAULT_HISTORY = 1000
+# Co tyle operacji sumy kroczące są przeliczane od nowa (ogranicza dryf float)
+_RESYNC_EVERY = 1024
+
+_TIMEFRAME_MS = {
+    "s": 1_000,
+    "m": 60_000,
+    "h": 3_600_000,
+    "d": 86_400_000,
+    "w": 604_800_000,
+    "M": 2_592_000_000,
+}
+
+
+def timeframe_to_ms(timeframe: str) -> int:
+    """Zamienia oznaczenie interwału ('1m', '4h', '1d') na milisekundy."""
+    tf = str(timeframe).strip()
+    try:
+        return max(1, int(tf[:-1] or 1)) * _TIMEFRAME_MS[tf[-1]]
+    except (KeyError, ValueError, IndexError):
+        raise ValueError(f"Nieznany timeframe: {timeframe!r}") from None
+
+
+def normalise_symbol(symbol: str) -> str:
+    """Klucz symbolu niezależny od zapisu ('BTC/USDT', 'btc-usdt' -> 'BTCUSDT')."""
+    return re.sub(r"[^A-Z0-9]", "", str(symbol).upper())
+
+
+def _check_period(period: Any) -> int:
+    period = int(period)
+    if period <= 0:
+        raise ValueError(f"Okres wskaźnika musi być > 0 (otrzymano {period})")
+    return period
+
+
+class StreamingIndicator:
+    """Bazowa klasa wskaźnika strumieniowego.
+
+    ``update`` dodaje nową świecę, ``revise`` zastępuje ostatnią. Podklasy o
+    wyłącznie skalarnym stanie deklarują go w ``_STATE``: przed każdym krokiem
+    zapamiętywana jest jego kopia, a korekta to przywrócenie stanu i powtórzenie
+    kroku z nową wartością.
+    """
+
+    kind = ""
+    _STATE: Tuple[str, ...] = ("value",)
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.value: Optional[float] = None
+        self._saved: Tuple[Any, ...] = ()
+
+    @property
+    def ready(self) -> bool:
+        return self.value is not None
+
+    def update(self, close: float, high: Optional[float] = None, low: Optional[float] = None) -> Optional[float]:
+        close = float(close)
+        self._saved = tuple(getattr(self, name) for name in self._STATE)
+        self.count += 1
+        self._step(close, close if high is None else float(high), close if low is None else float(low))
+        return self.value
+
+    def revise(self, close: float, high: Optional[float] = None, low: Optional[float] = None) -> Optional[float]:
+        if self.count == 0:
+            return self.update(close, high, low)
+        close = float(close)
+        for name, saved in zip(self._STATE, self._saved):
+            setattr(self, name, saved)
+        self._step(close, close if high is None else float(high), close if low is None else float(low))
+        return self.value
+
+    def _step(self, close: float, high: float, low: float) -> None:
+        raise NotImplementedError
+
+    def snapshot(self) -> Dict[str, Optional[float]]:
+        return {"value": self.value}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(count={self.count}, value={self.value})"
+
+
+class SMA(StreamingIndicator):
+    """Prosta średnia krocząca na sumie kroczącej."""
+
+    kind = "sma"
+
+    def __init__(self, period: int = 20) -> None:
+        super().__init__()
+        self.period = _check_period(period)
+        self._window: Deque[float] = deque()
+        self._sum = 0.0
+        self._ops = 0
+
+    def update(self, close: float, high: Optional[float] = None, low: Optional[float] = None) -> Optional[float]:
+        close = float(close)
+        self.count += 1
+        self._window.append(close)
+        self._sum += close
+        if len(self._window) > self.period:
+            self._sum -= self._window.popleft()
+        return self._finish()
+
+    def revise(self, close: float, high: Optional[float] = None, low: Optional[float] = None) -> Optional[float]:
+        if not self._window:
+            return self.update(close)
+        close = float(close)
+        self._sum += close - self._window[-1]
+        self._window[-1] = close
+        return self._finish()
+
+    def _finish(self) -> Optional[float]:
+        self._ops += 1
+        if self._ops >= _RESYNC_EVERY:
+            self._sum = math.fsum(self._window)
+            self._ops = 0
+        self.value = self._sum / self.period if len(self._window) == self.period else None
+        return self.value
+
+
+class EMA(StreamingIndicator):
+    """Wykładnicza średnia krocząca zasiana średnią z pierwszych ``period`` wartości."""
+
+    kind = "ema"
+    _STATE = ("value", "_seed")
+
+    def __init__(self, period: int = 20) -> None:
+        super().__init__()
+        self.period = _check_period(period)
+        self.alpha = 2.0 / (self.period + 1)
+        self._seed = 0.0
+
+    def _step(self, close: float, high: float, low: float) -> None:
+        if self.count <= self.period:
+            self._seed += close
+            if self.count == self.period:
+                self.value = self._seed / self.period
+        else:
+            self.value += self.alpha * (close - self.value)
+
+
+class RSI(StreamingIndicator):
+    """RSI z wygładzaniem Wildera (pierwsza średnia prosta, dalej rekurencyjna)."""
+
+    kind = "rsi"
+    _STATE = ("value", "_last", "_gain", "_loss")
+
+    def __init__(self, period: int = 14) -> None:
+        super().__init__()
+        self.period = _check_period(period)
+        self._last: Optional[float] = None
+        self._gain = 0.0
+        self._loss = 0.0
+
+    def _step(self, close: float, high: float, low: float) -> None:
+        prev, self._last = self._last, close
+        if prev is None:
+            return
+        change = close - prev
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+        period = self.period
+        deltas = self.count - 1
+        if deltas <= period:
+            self._gain += gain
+            self._loss += loss
+            if deltas < period:
+                return
+            self._gain /= period
+            self._loss /= period
+        else:
+            self._gain = (self._gain * (period - 1) + gain) / period
+            self._loss = (self._loss * (period - 1) + loss) / period
+        self.value = 100.0 if self._loss == 0 else 100.0 - 100.0 / (1.0 + self._gain / self._loss)
+
+
+class ATR(StreamingIndicator):
+    """Average True Range z wygładzaniem Wildera (bez high/low liczony z zamknięć)."""
+
+    kind = "atr"
+    _STATE = ("value", "_prev_close", "_seed")
+
+    def __init__(self, period: int = 14) -> None:
+        super().__init__()
+        self.period = _check_period(period)
+        self._prev_close: Optional[float] = None
+        self._seed = 0.0
+
+    def _step(self, close: float, high: float, low: float) -> None:
+        prev, self._prev_close = self._prev_close, close
+        if prev is None:
+            return
+        true_range = max(high - low, abs(high - prev), abs(low - prev))
+        period = self.period
+        ranges = self.count - 1
+        if ranges <= period:
+            self._seed += true_range
+            if ranges == period:
+                self.value = self._seed / period
+        else:
+            self.value = (self.value * (period - 1) + true_range) / period
+
+
+class BollingerBands(StreamingIndicator):
+    """Wstęgi Bollingera na kroczącej wariancji Welforda (odchylenie populacyjne).
+
+    ``value`` to linia środkowa; ``upper``/``lower``/``std`` są dostępne po
+    zebraniu pełnego okna.
+    """
+
+    kind = "bollinger"
+
+    def __init__(self, period: int = 20, std_dev: float = 2.0) -> None:
+        super().__init__()
+        self.period = _check_period(period)
+        self.std_dev = float(std_dev)
+        self._window: Deque[float] = deque()
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._ops = 0
+        self.upper: Optional[float] = None
+        self.lower: Optional[float] = None
+        self.std: Optional[float] = None
+
+    def update(self, close: float, high: Optional[float] = None, low: Optional[float] = None) -> Optional[float]:
+        close = float(close)
+        self.count += 1
+        window = self._window
+        if len(window) == self.period:
+            old = window.popleft()
+            n = len(window)
+            if n == 0:
+                self._mean = self._m2 = 0.0
+            else:
+                delta = old - self._mean
+                self._mean -= delta / n
+                self._m2 -= delta * (old - self._mean)
+        window.append(close)
+        delta = close - self._mean
+        self._mean += delta / len(window)
+        self._m2 += delta * (close - self._mean)
+        return self._finish()
+
+    def revise(self, close: float, high: Optional[float] = None, low: Optional[float] = None) -> Optional[float]:
+        if not self._window:
+            return self.update(close)
+        close = float(close)
+        old = self._window[-1]
+        self._window[-1] = close
+        delta = close - old
+        old_mean = self._mean
+        self._mean += delta / len(self._window)
+        self._m2 += delta * (close - self._mean + old - old_mean)
+        return self._finish()
+
+    def _finish(self) -> Optional[float]:
+        window = self._window
+        self._ops += 1
+        if self._ops >= _RESYNC_EVERY:
+            self._mean = math.fsum(window) / len(window)
+            self._m2 = math.fsum((x - self._mean) ** 2 for x in window)
+            self._ops = 0
+        if self._m2 < 0:
+            self._m2 = 0.0
+        if len(window) < self.period:
+            self.value = self.upper = self.lower = self.std = None
+            return None
+        self.std = math.sqrt(self._m2 / self.period)
+        self.value = self._mean
+        self.upper = self._mean + self.std_dev * self.std
+        self.lower = self._mean - self.std_dev * self.std
+        return self.value
+
+    def position(self, price: float) -> Optional[float]:
+        """Położenie ceny w kanale (0 = dolna wstęga, 1 = górna)."""
+        if self.upper is None or self.lower is None:
+            return None
+        width = self.upper - self.lower
+        if width == 0:
+            return 0.5
+        return (float(price) - self.lower) / width
+
+    def snapshot(self) -> Dict[str, Optional[float]]:
+        return {"upper": self.upper, "middle": self.value, "lower": self.lower, "std": self.std}
+
+
+class MACD(StreamingIndicator):
+    """MACD: różnica dwóch EMA i EMA tej różnicy jako linia sygnału."""
+
+    kind = "macd"
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9) -> None:
+        super().__init__()
+        self._fast = EMA(fast)
+        self._slow = EMA(slow)
+        self._signal = EMA(signal)
+        self.signal: Optional[float] = None
+        self.histogram: Optional[float] = None
+
+    def update(self, close: float, high: Optional[float] = None, low: Optional[float] = None) -> Optional[float]:
+        self.count += 1
+        self._fast.update(close)
+        self._slow.update(close)
+        return self._emit(revise=False)
+
+    def revise(self, close: float, high: Optional[float] = None, low: Optional[float] = None) -> Optional[float]:
+        if self.count == 0:
+            return self.update(close)
+        self._fast.revise(close)
+        self._slow.revise(close)
+        return self._emit(revise=True)
+
+    def _emit(self, revise: bool) -> Optional[float]:
+        fast, slow = self._fast.value, self._slow.value
+        if fast is None or slow is None:
+            return None
+        line = fast - slow
+        if revise and self._signal.count:
+            signal = self._signal.revise(line)
+        else:
+            signal = self._signal.update(line)
+        self.value = line
+        self.signal = signal
+        self.histogram = line - signal if signal is not None else None
+        return self.value
+
+    def snapshot(self) -> Dict[str, Optional[float]]:
+        return {"macd": self.value, "signal": self.signal, "histogram": self.histogram}
+
+
+class Stochastic(StreamingIndicator):
+    """Oscylator stochastyczny %K/%D.
+
+    Ekstrema zamkniętych świec z okna trzymane są w dekach monotonicznych,
+    a bieżąca (korygowana) świeca jest porównywana z nimi dopiero przy odczycie.
+    """
+
+    kind = "stochastic"
+
+    def __init__(self, k_period: int = 14, d_period: int = 3) -> None:
+        super().__init__()
+        self.k_period = _check_period(k_period)
+        self._highs: Deque[Tuple[int, float]] = deque()
+        self._lows: Deque[Tuple[int, float]] = deque()
+        self._live: Optional[Tuple[float, float, float]] = None
+        self._d = SMA(d_period)
+        self.k: Optional[float] = None
+        self.d: Optional[float] = None
+
+    def update(self, close: float, high: Optional[float] = None, low: Optional[float] = None) -> Optional[float]:
+        if self._live is not None:
+            _, live_high, live_low = self._live
+            highs, lows = self._highs, self._lows
+            while highs and highs[-1][1] <= live_high:
+                highs.pop()
+            highs.append((self.count, live_high))
+            while lows and lows[-1][1] >= live_low:
+                lows.pop()
+            lows.append((self.count, live_low))
+        self.count += 1
+        oldest = self.count - self.k_period + 1
+        while self._highs and self._highs[0][0] < oldest:
+            self._highs.popleft()
+        while self._lows and self._lows[0][0] < oldest:
+            self._lows.popleft()
+        self._set_live(close, high, low)
+        return self._emit(revise=False)
+
+    def revise(self, close: float, high: Optional[float] = None, low: Optional[float] = None) -> Optional[float]:
+        if self._live is None:
+            return self.update(close, high, low)
+        self._set_live(close, high, low)
+        return self._emit(revise=True)
+
+    def _set_live(self, close: float, high: Optional[float], low: Optional[float]) -> None:
+        close = float(close)
+        self._live = (
+            close,
+            close if high is None else float(high),
+            close if low is None else float(low),
+        )
+
+    def _emit(self, revise: bool) -> Optional[float]:
+        if self.count < self.k_period:
+            return None
+        close, high, low = self._live
+        highest = max(self._highs[0][1], high) if self._highs else high
+        lowest = min(self._lows[0][1], low) if self._lows else low
+        k = 50.0 if highest == lowest else (close - lowest) / (highest - lowest) * 100.0
+        self.d = self._d.revise(k) if revise else self._d.update(k)
+        self.value = self.k = k
+        return self.value
+
+    def snapshot(self) -> Dict[str, Optional[float]]:
+        return {"k": self.k, "d": self.d}
+
+
+INDICATORS: Dict[str, Type[StreamingIndicator]] = {
+    cls.kind: cls for cls in (SMA, EMA, RSI, ATR, BollingerBands, MACD, Stochastic)
+}
+
+
+def create_indicator(kind: str, **params: Any) -> StreamingIndicator:
+    """Tworzy nowy (pusty) wskaźnik danego rodzaju."""
+    try:
+        cls = INDICATORS[kind]
+    except KeyError:
+        raise ValueError(f"Nieznany wskaźnik: {kind!r}") from None
+    return cls(**params)
+
+
+def compute(
+    kind: str,
+    closes: Iterable[float],
+    highs: Optional[Sequence[float]] = None,
+    lows: Optional[Sequence[float]] = None,
+    **params: Any,
+) -> StreamingIndicator:
+    """Jednorazowo przelicza wskaźnik po całej serii (O(n)) i zwraca go w stanie końcowym."""
+    indicator = create_indicator(kind, **params)
+    for idx, close in enumerate(closes):
+        indicator.update(
+            close,
+            highs[idx] if highs is not None else None,
+            lows[idx] if lows is not None else None,
+        )
+    return indicator
+
+
+def series(
+    kind: str,
+    closes: Iterable[float],
+    highs: Optional[Sequence[float]] = None,
+    lows: Optional[Sequence[float]] = None,
+    **params: Any,
+) -> List[float]:
+    """Kolejne wartości ``value`` wskaźnika od chwili, gdy jest gotowy."""
+    indicator = create_indicator(kind, **params)
+    values: List[float] = []
+    for idx, close in enumerate(closes):
+        value = indicator.update(
+            close,
+            highs[idx] if highs is not None else None,
+            lows[idx] if lows is not None else None,
+        )
+        if value is not None:
+            values.append(value)
+    return values
+
+
+def _candle_fields(candle: Any) -> Tuple[Any, float, float, float]:
+    """(timestamp, close, high, low) ze świecy ccxt ``[ts, o, h, l, c, v]`` lub dict."""
+    if isinstance(candle, dict):
+        close = float(candle["close"])
+        return (
+            candle.get("timestamp"),
+            close,
+            float(candle.get("high", close)),
+            float(candle.get("low", close)),
+        )
+    return candle[0], float(candle[4]), float(candle[2]), float(candle[3])
+
+
+class IndicatorFeed:
+    """Strumień świec jednej pary (symbol, timeframe) z podpiętymi wskaźnikami.
+
+    Obserwacje są przypisywane do świec po znaczniku czasu: pierwsza obserwacja
+    w nowym interwale zamyka poprzednią świecę (``update``), kolejne korygują
+    bieżącą (``revise``), a starsze od bieżącej są pomijane. Dzięki temu kilka
+    botów zasilających ten sam strumień nie dubluje danych.
+    """
+
+    def __init__(self, symbol: str, timeframe: str = "1m", history: int = DEFAULT_HISTORY) -> None:
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.bar_ms = timeframe_to_ms(timeframe)
+        self._bars: Deque[List[float]] = deque(maxlen=history)
+        self._bar_id: Optional[int] = None
+        self._indicators: Dict[Tuple[str, Tuple[Tuple[str, Any], ...]], StreamingIndicator] = {}
+        self._lock = threading.RLock()
+        self.bars_closed = 0
+        self.revisions = 0
+        self.stale = 0
+
+    def __len__(self) -> int:
+        return len(self._bars)
+
+    @property
+    def last_close(self) -> Optional[float]:
+        return self._bars[-1][0] if self._bars else None
+
+    def _bar_of(self, ts: Any) -> int:
+        if ts is None:
+            ts = time.time() * 1000
+        elif isinstance(ts, datetime):
+            ts = ts.timestamp() * 1000
+        else:
+            ts = float(ts)
+            if ts < 1e11:  # sekundy zamiast milisekund
+                ts *= 1000
+        return int(ts // self.bar_ms)
+
+    def push(
+        self,
+        close: float,
+        high: Optional[float] = None,
+        low: Optional[float] = None,
+        ts: Any = None,
+    ) -> bool:
+        """Dodaje obserwację (tick lub świecę); ``ts`` w ms, s lub ``datetime``, domyślnie teraz.
+
+        Zwraca ``False`` dla obserwacji starszej niż bieżąca świeca.
+        """
+        return self._apply(self._bar_of(ts), close, high, low)
+
+    def _apply(self, bar_id: Optional[int], close: float, high: Optional[float], low: Optional[float]) -> bool:
+        close = float(close)
+        high = close if high is None else float(high)
+        low = close if low is None else float(low)
+        with self._lock:
+            if bar_id is None:
+                # Świeca bez znacznika czasu - zawsze kolejna
+                bar_id = 0 if self._bar_id is None else self._bar_id + 1
+            if self._bar_id is not None and bar_id < self._bar_id:
+                self.stale += 1
+                return False
+            if bar_id == self._bar_id:
+                bar = self._bars[-1]
+                bar[0] = close
+                bar[1] = max(bar[1], high)
+                bar[2] = min(bar[2], low)
+                for indicator in self._indicators.values():
+                    indicator.revise(*bar)
+                self.revisions += 1
+            else:
+                bar = [close, high, low]
+                self._bars.append(bar)
+                self._bar_id = bar_id
+                for indicator in self._indicators.values():
+                    indicator.update(*bar)
+                self.bars_closed += 1
+        return True
+
+    def extend(self, candles: Sequence[Any]) -> int:
+        """Wczytuje świece OHLCV (ccxt lub dict); pomija te starsze niż bieżąca świeca.
+
+        Świece bez znacznika czasu są zawsze dokładane jako kolejne.
+        """
+        start = 0
+        if self._bar_id is not None:
+            # Od końca do pierwszej już znanej świecy - przy cyklicznym pobieraniu
+            # tych samych 200 świec przetwarzane są tylko nowe
+            start = len(candles)
+            while start > 0:
+                ts = _candle_fields(candles[start - 1])[0]
+                if ts is None or self._bar_of(ts) < self._bar_id:
+                    break
+                start -= 1
+            if start and _candle_fields(candles[start - 1])[0] is None:
+                start = 0
+        pushed = 0
+        for candle in candles[start:]:
+            ts, close, high, low = _candle_fields(candle)
+            if self._apply(None if ts is None else self._bar_of(ts), close, high, low):
+                pushed += 1
+        return pushed
+
+    def get(self, kind: str, **params: Any) -> StreamingIndicator:
+        """Zwraca współdzieloną instancję wskaźnika; nowa jest zasiewana historią strumienia."""
+        key = (kind, tuple(sorted(params.items())))
+        indicator = self._indicators.get(key)
+        if indicator is None:
+            with self._lock:
+                indicator = self._indicators.get(key)
+                if indicator is None:
+                    indicator = create_indicator(kind, **params)
+                    for bar in self._bars:
+                        indicator.update(*bar)
+                    self._indicators[key] = indicator
+        return indicator
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "symbol": self.symbol,
+            "timeframe": self.timeframe,
+            "bars": len(self._bars),
+            "bars_closed": self.bars_closed,
+            "revisions": self.revisions,
+            "stale": self.stale,
+            "indicators": len(self._indicators),
+        }
+
+
+class IndicatorRegistry:
+    """Rejestr strumieni kluczowany (symbol, timeframe); parametry wskaźnika dopełniają klucz."""
+
+    def __init__(self, history: int = DEFAULT_HISTORY) -> None:
+        self.history = history
+        self._feeds: Dict[Tuple[str, str], IndicatorFeed] = {}
+        self._lock = threading.Lock()
+
+    def feed(self, symbol: str, timeframe: str = "1m") -> IndicatorFeed:
+        key = (normalise_symbol(symbol), str(timeframe))
+        feed = self._feeds.get(key)
+        if feed is None:
+            with self._lock:
+                feed = self._feeds.get(key)
+                if feed is None:
+                    feed = IndicatorFeed(key[0], key[1], history=self.history)
+                    self._feeds[key] = feed
+        return feed
+
+    def get(self, symbol: str, timeframe: str, kind: str, **params: Any) -> StreamingIndicator:
+        return self.feed(symbol, timeframe).get(kind, **params)
+
+    def push(
+        self,
+        symbol: str,
+        timeframe: str,
+        close: float,
+        high: Optional[float] = None,
+        low: Optional[float] = None,
+        ts: Any = None,
+    ) -> bool:
+        return self.feed(symbol, timeframe).push(close, high, low, ts=ts)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._feeds.clear()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [feed.stats() for feed in list(self._feeds.values())]
+
+
+_registry: Optional[IndicatorRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_indicator_registry() -> IndicatorRegistry:
+    """Zwraca globalny rejestr wskaźników (singleton współdzielony przez boty)."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = IndicatorRegistry()
+    return _registry
+
+
+__all__ = [
+    "StreamingIndicator",
+    "SMA",
+    "EMA",
+    "RSI",
+    "ATR",
+    "BollingerBands",
+    "MACD",
+    "Stochastic",
+    "INDICATORS",
+    "create_indicator",
+    "compute",
+    "series",
+    "IndicatorFeed",
+    "IndicatorRegistry",
+    "get_indicator_registry",
+    "normalise_symbol",
+    "timeframe_to_ms",
+]
@@ -0,0 +1,89 @@
+"""Wymienny dekoder JSON dla gorącej ścieżki (WebSocket, REST).
+
+Wybiera najszybszą dostępną implementację: orjson, msgspec, a w ostateczności
+stdlib ``json``. Kolejność można wymusić zmienną ``CRYPTOBOT_JSON_DECODER``.
+"""
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Callable, Dict, Optional, Union
+
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
+
+try:
+    import msgspec  # type: ignore
+except Exception:
+    msgspec = None
+
+JsonInput = Union[str, bytes, bytearray, memoryview]
+
+
+class JsonDecoder:
+    """Para (nazwa, loads) dla wybranej implementacji JSON."""
+
+    __slots__ = ("name", "loads", "decode_error")
+
+    def __init__(self, name: str, loads: Callable[[JsonInput], Any], decode_error: type):
+        self.name = name
+        self.loads = loads
+        self.decode_error = decode_error
+
+    def __repr__(self) -> str:
+        return f"JsonDecoder({self.name})"
+
+
+def _stdlib_loads(data: JsonInput) -> Any:
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def _build_decoders() -> Dict[str, JsonDecoder]:
+    decoders: Dict[str, JsonDecoder] = {}
+    if orjson is not None:
+        def _orjson_loads(data: JsonInput) -> Any:
+            return orjson.loads(data)
+        decoders["orjson"] = JsonDecoder("orjson", _orjson_loads, orjson.JSONDecodeError)
+    if msgspec is not None:
+        _msgspec_decoder = msgspec.json.Decoder()
+        decoders["msgspec"] = JsonDecoder("msgspec", _msgspec_decoder.decode, msgspec.DecodeError)
+    decoders["json"] = JsonDecoder("json", _stdlib_loads, json.JSONDecodeError)
+    return decoders
+
+
+DECODERS: Dict[str, JsonDecoder] = _build_decoders()
+_PREFERENCE = ("orjson", "msgspec", "json")
+
+
+def available_decoders() -> list[str]:
+    """Zwraca nazwy dostępnych dekoderów w kolejności preferencji."""
+    return [name for name in _PREFERENCE if name in DECODERS]
+
+
+def get_decoder(name: Optional[str] = None) -> JsonDecoder:
+    """Zwraca dekoder o podanej nazwie lub najszybszy dostępny.
+
+    Nieznana lub niedostępna nazwa powoduje powrót do domyślnego wyboru.
+    """
+    name = name or os.getenv("CRYPTOBOT_JSON_DECODER")
+    if name and name in DECODERS:
+        return DECODERS[name]
+    for candidate in _PREFERENCE:
+        if candidate in DECODERS:
+            return DECODERS[candidate]
+    return DECODERS["json"]
+
+
+_default = get_decoder()
+
+
+def loads(data: JsonInput) -> Any:
+    """Dekoduje JSON domyślnym (najszybszym) dekoderem."""
+    return _default.loads(data)
+
+
+__all__ = ["JsonDecoder", "DECODERS", "available_decoders", "get_decoder", "loads"]
@@ -5,14 +5,17 @@ Provides rotating file logging, console logging and optional DB logging.
 
 from __future__ import annotations
 
+import json
 import logging
 import logging.handlers
-import asyncio
+import sqlite3
+import threading
+import time
+from collections import deque
 from enum import Enum
 from pathlib import Path
 from typing import Optional, List, Dict
 from datetime import datetime, timedelta, timezone
-from utils.helpers import schedule_coro_safely
 
 # --- added: sanitizer ---
 import re
@@ -58,67 +61,137 @@ class LogLevel(Enum):
 
 
 class DatabaseLogHandler(logging.Handler):
-    """Async-friendly handler that writes logs to an async database manager (if provided)."""
-    def __init__(self, database_manager=None):
+    """Writes log records to the ``logs`` table in bulk from a single writer thread.
+
+    ``emit`` only formats the record and appends it to a bounded, lock-protected
+    queue, so it is safe from any thread and never touches the database. One
+    daemon thread drains the queue and inserts up to ``batch_size`` rows with a
+    single ``executemany`` transaction on its own ``sqlite3`` connection. When
+    the queue is full the oldest records are discarded and counted in
+    ``stats()['dropped']``. ``flush()`` waits for everything queued so far and
+    ``close()`` (also called by ``logging.shutdown``) drains the queue before
+    returning.
+    """
+
+    INSERT_SQL = (
+        "INSERT INTO logs (bot_id, user_id, type, level, message, details, timestamp) "
+        "VALUES (NULL, NULL, ?, ?, ?, ?, ?)"
+    )
+    _LEVELS = {"DEBUG": "debug", "INFO": "info", "WARNING": "warning", "ERROR": "error", "CRITICAL": "critical"}
+
+    def __init__(self, database_manager=None, db_path: Optional[str] = None, max_queue_size: int = 10000,
+                 batch_size: int = 500, flush_interval: float = 0.5):
         super().__init__()
         self.database_manager = database_manager
-        self.log_queue: List[Dict] = []
-        self.max_queue_size = 100
+        self.db_path = db_path or getattr(database_manager, "db_path", None)
+        self.max_queue_size = max(1, int(max_queue_size))
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = max(0.0, float(flush_interval))
+        self.log_queue: deque = deque()
+        self._cond = threading.Condition()
+        self._enqueued = 0      # sequence number of the last queued record
+        self._completed = 0     # sequence number of the last written/failed record
+        self._closing = False
+        self._thread: Optional[threading.Thread] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._stats = {"queued": 0, "written": 0, "dropped": 0, "failed": 0, "batches": 0, "max_batch": 0}
+        if self.db_path and self.db_path != ":memory:":
+            self._thread = threading.Thread(target=self._run, name="db-log-writer", daemon=True)
+            self._thread.start()
 
     def emit(self, record: logging.LogRecord) -> None:
+        if self._thread is None or threading.current_thread() is self._thread:
+            # No database to write to, or a record raised by the writer itself
+            return
         try:
-            entry = {
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "level": record.levelname,
-                "message": self.format(record),
-            }
-            self.log_queue.append(entry)
-            if len(self.log_queue) >= self.max_queue_size:
-                try:
-                    # Schedule flush safely: in running loop create task, otherwise run in background thread
-                    schedule_coro_safely(lambda: self._flush_to_db(), run_in_thread_if_no_loop=True)
-                except Exception:
-                    # best-effort, swallow
-                    pass
+            row = (
+                "system",
+                self._LEVELS.get(record.levelname, "info"),
+                self.format(record),
+                json.dumps({"logger": record.name}),
+                datetime.fromtimestamp(record.created, timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+            )
+            with self._cond:
+                if self._closing:
+                    return
+                if len(self.log_queue) >= self.max_queue_size:
+                    self.log_queue.popleft()
+                    self._stats["dropped"] += 1
+                    self._completed += 1
+                self.log_queue.append(row)
+                self._enqueued += 1
+                self._stats["queued"] += 1
+                if len(self.log_queue) >= self.batch_size:
+                    self._cond.notify_all()
         except Exception:
             # Never let logging crash the app
-            pass
+            self.handleError(record)
 
-    async def _flush_to_db(self) -> None:
-        if not self.database_manager or not self.log_queue:
-            return
-        try:
-            items = list(self.log_queue)
-            self.log_queue.clear()
-            for it in items:
-                try:
-                    await self.database_manager.add_log(
-                        message=it.get("message", ""),
-                        log_type="system",
-                        level=it.get("level", "INFO"),
-                        timestamp=it.get("timestamp"),
-                    )
-                except Exception:
-                    # isolate single row failure
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self.log_queue and not self._closing:
+                    self._cond.wait(self.flush_interval)
+                if not self.log_queue:
+                    if self._closing:
+                        break
                     continue
+                count = min(len(self.log_queue), self.batch_size)
+                batch = [self.log_queue.popleft() for _ in range(count)]
+            self._write(batch)
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _write(self, batch: List[tuple]) -> None:
+        ok = False
+        try:
+            if self._conn is None:
+                self._conn = sqlite3.connect(self.db_path, timeout=5.0)
+            with self._conn:
+                self._conn.executemany(self.INSERT_SQL, batch)
+            ok = True
         except Exception:
-            # swallow handler internal errors
+            # The batch is accounted as failed; the writer keeps going
             pass
+        with self._cond:
+            if ok:
+                self._stats["written"] += len(batch)
+                self._stats["batches"] += 1
+                self._stats["max_batch"] = max(self._stats["max_batch"], len(batch))
+            else:
+                self._stats["failed"] += len(batch)
+            self._completed += len(batch)
+            self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """Wait until every record queued before the call has been written (or failed)."""
+        if self._thread is None or threading.current_thread() is self._thread:
+            return True
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._cond:
+            target = self._enqueued
+            self._cond.notify_all()
+            while self._completed < target and self._thread.is_alive():
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        """Counters: queued, written, dropped (overflow), failed, batches, max_batch, queue_depth."""
+        with self._cond:
+            return {**self._stats, "queue_depth": len(self.log_queue)}
 
     def close(self) -> None:
         try:
-            if self.log_queue and self.database_manager:
-                try:
-                    # If a loop is running, avoid scheduling flush during close to prevent interference
-                    asyncio.get_running_loop()
-                    # can't await here safely; drop on close
-                    pass
-                except RuntimeError:
-                    try:
-                        # No running loop: perform flush in background thread using safe scheduler
-                        schedule_coro_safely(lambda: self._flush_to_db(), run_in_thread_if_no_loop=True)
-                    except Exception:
-                        pass
+            if self._thread is not None:
+                with self._cond:
+                    self._closing = True
+                    self._cond.notify_all()
+                if threading.current_thread() is not self._thread:
+                    self._thread.join(timeout=10.0)
         except Exception:
             pass
         finally:
@@ -2,6 +2,8 @@ import math
 from statistics import mean, pstdev
 from typing import List, Tuple
 
+import numpy as np
+
 def equity_curve(returns: List[float], start_equity: float = 1.0) -> List[float]:
     eq = [start_equity]
     for r in returns:
@@ -32,3 +34,28 @@ def win_rate(trades: List[Tuple[float, float]]) -> float:
         return 0.0
     wins = sum(1 for e,x in trades if x > e)
     return wins / len(trades)
+
+
+# --- Wersje NumPy (działają też na partiach: ostatnia oś to kolejne zwroty) ---
+
+def equity_curve_np(returns: np.ndarray, start_equity: float = 1.0) -> np.ndarray:
+    returns = np.asarray(returns, dtype=np.float64)
+    start = np.full(returns.shape[:-1] + (1,), start_equity, dtype=np.float64)
+    return np.concatenate((start, start_equity * np.cumprod(1.0 + returns, axis=-1)), axis=-1)
+
+def max_drawdown_np(equity: np.ndarray) -> np.ndarray:
+    equity = np.asarray(equity, dtype=np.float64)
+    peak = np.maximum.accumulate(equity, axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dd = np.where(peak > 0, (peak - equity) / peak, 0.0)
+    return np.maximum(dd.max(axis=-1), 0.0)
+
+def sharpe_ratio_np(returns: np.ndarray, risk_free: float = 0.0, periods_per_year: int = 365) -> np.ndarray:
+    returns = np.asarray(returns, dtype=np.float64)
+    if returns.shape[-1] < 2:
+        return np.zeros(returns.shape[:-1])
+    excess = returns - risk_free / periods_per_year
+    sigma = excess.std(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sr = np.where(sigma > 0, excess.mean(axis=-1) / sigma * math.sqrt(periods_per_year), 0.0)
+    return sr
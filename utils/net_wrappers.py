@@ -7,7 +7,16 @@ from functools import wraps
 from typing import Callable, Dict, Tuple
 import logging
 from pathlib import Path
-from .rate_limit import TokenBucket
+from .rate_limit import (
+    AdaptiveRateLimiter,
+    RateLimitTimeout,
+    endpoint_cost,
+    exchange_limit_config,
+    get_exchange_limiter,
+    load_rate_limit_config,
+    mark_prepaid,
+    reset_prepaid,
+)
 from .circuit_breaker import CircuitBreaker
 from .yaml_loader import safe_load
 import inspect
@@ -28,49 +37,47 @@ def _resolve_endpoint_from_fn(exch: str, fn: str) -> tuple[str,str]:
         pass
     return "NA", fn
 
-_buckets: Dict[str, TokenBucket] = {}
 _breakers: Dict[str, CircuitBreaker] = {}
 _lock = threading.Lock()
+# Domyślny maksymalny czas czekania na limit, zanim wywołanie zostanie odrzucone
+DEFAULT_MAX_WAIT = 30.0
+# Wywołania synchroniczne blokują wątek (również wątek GUI) - czekają krótko
+DEFAULT_SYNC_MAX_WAIT = 0.5
 
 def _load_limits():
-    cfg_path = Path(__file__).resolve().parents[1] / "config" / "rate_limits.yaml"
-    if not cfg_path.exists():
-        return {}
-    return safe_load(cfg_path.read_text(encoding="utf-8")) or {}
+    return load_rate_limit_config()
 
-def get_guard(name: str) -> Tuple[TokenBucket, CircuitBreaker]:
+def get_guard(name: str) -> Tuple[AdaptiveRateLimiter, CircuitBreaker]:
     # name may be 'exchange:op' or 'exchange:rest:/api/v3/order'
+    # The limiter is shared per exchange (weights/lanes per endpoint come from
+    # endpoint_cost); the circuit breaker stays per guard name.
     key = name.lower()
+    exch = key.split(":", 1)[0]
+    limiter = get_exchange_limiter(exch)
     with _lock:
-        if key in _buckets and key in _breakers:
-            return _buckets[key], _breakers[key]
-        cfg = _load_limits()
-        parts = key.split(":", 1)
-        exch = parts[0]
-        ex_all = (cfg.get('exchanges') or {}).get(exch) or {}
-        ex_cfg = ex_all.get('default') or {}
-        rate = float(ex_cfg.get("rate_per_sec", 10))
-        cap = float(ex_cfg.get("capacity", rate))
+        if key in _breakers:
+            return limiter, _breakers[key]
+        ex_cfg = exchange_limit_config(exch).get('default') or {}
         failure_threshold = int(ex_cfg.get("failure_threshold", 5))
         recovery_time = float(ex_cfg.get("recovery_time", 30.0))
-        
-        # endpoint override (if name contains ':rest:' or ':ws:' with a path)
-        endpoint = None
-        if ':' in key:
-            parts2 = key.split(':', 2)
-            if len(parts2) >= 3:
-                endpoint = parts2[2]
-        if endpoint and ex_all.get('patterns'):
-            for pat in ex_all['patterns']:
-                if str(pat.get('path')) == endpoint:
-                    ex_cfg = {**ex_cfg, **{k: v for k, v in pat.items() if k in ('rate_per_sec','capacity')}} 
-                    break
-    
-        tb = TokenBucket(rate, cap)
         br = CircuitBreaker(failure_threshold, recovery_time)
-        _buckets[key] = tb
         _breakers[key] = br
-        return tb, br
+        return limiter, br
+
+def _max_wait(exch: str) -> float:
+    ex_cfg = exchange_limit_config(exch).get('default') or {}
+    return float(ex_cfg.get("max_wait", DEFAULT_MAX_WAIT))
+
+def _sync_max_wait(exch: str) -> float:
+    ex_cfg = exchange_limit_config(exch).get('default') or {}
+    return min(_max_wait(exch), float(ex_cfg.get("sync_max_wait", DEFAULT_SYNC_MAX_WAIT)))
+
+def _record_rate_drop(ex: str, endpoint_label: str) -> None:
+    try:
+        inc_rate_drop(ex, endpoint_label)
+        rt.record_rate_drop(ex, endpoint_label)
+    except Exception:
+        pass
 
 def _resolve_guard_name(base_name: str, args: tuple) -> str:
     if base_name.startswith("exchange:") and args:
@@ -92,7 +99,7 @@ def net_guard(name: str) -> Callable:
         @wraps(fn)
         async def async_wrapper(*args, **kwargs):
             resolved_name = _resolve_guard_name(name, args)
-            bucket, breaker = get_guard(resolved_name)
+            limiter, breaker = get_guard(resolved_name)
             # Rate limit
             ex = resolved_name.split(':', 1)[0]
             method_label = 'NA'
@@ -109,13 +116,14 @@ def net_guard(name: str) -> Callable:
             except Exception:
                 pass
 
-            if not bucket.consume(1.0):
-                try:
-                    inc_rate_drop(ex, endpoint_label)
-                    rt.record_rate_drop(ex, endpoint_label)
-                except Exception:
-                    pass
-                raise RuntimeError(f"rate_limited:{resolved_name}")
+            weight, lane = endpoint_cost(ex, endpoint_label)
+            try:
+                await limiter.acquire(weight, lane, max_wait=_max_wait(ex))
+            except RateLimitTimeout as exc:
+                _record_rate_drop(ex, endpoint_label)
+                raise RuntimeError(f"rate_limited:{resolved_name}") from exc
+            # The first HTTP request of this call is already paid for
+            prepaid = mark_prepaid()
             status_label = 'OK'
             t0 = time.monotonic()
             try:
@@ -125,6 +133,7 @@ def net_guard(name: str) -> Callable:
                 status_label = 'ERR'
                 raise
             finally:
+                reset_prepaid(prepaid)
                 dt = (time.monotonic() - t0) * 1000.0
                 try:
                     inc_http(ex, method_label, endpoint_label, status_label)
@@ -143,7 +152,7 @@ def net_guard(name: str) -> Callable:
         @wraps(fn)
         def sync_wrapper(*args, **kwargs):
             resolved_name = _resolve_guard_name(name, args)
-            bucket, breaker = get_guard(resolved_name)
+            limiter, breaker = get_guard(resolved_name)
             # Rate limit
             ex = resolved_name.split(':', 1)[0]
             method_label = 'NA'
@@ -160,13 +169,12 @@ def net_guard(name: str) -> Callable:
             except Exception:
                 pass
 
-            if not bucket.consume(1.0):
-                try:
-                    inc_rate_drop(ex, endpoint_label)
-                    rt.record_rate_drop(ex, endpoint_label)
-                except Exception:
-                    pass
-                raise RuntimeError(f"rate_limited:{resolved_name}")
+            weight, lane = endpoint_cost(ex, endpoint_label)
+            try:
+                limiter.acquire_blocking(weight, lane, max_wait=_sync_max_wait(ex))
+            except RateLimitTimeout as exc:
+                _record_rate_drop(ex, endpoint_label)
+                raise RuntimeError(f"rate_limited:{resolved_name}") from exc
             status_label = 'OK'
             t0 = time.monotonic()
             try:
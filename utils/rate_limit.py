@@ -1,19 +1,328 @@
+"""Wspólny silnik limitowania zapytań (GCRA) dla wszystkich wywołań giełd.
+
+``AdaptiveRateLimiter`` realizuje kubełek tokenów w wariancie GCRA
+(theoretical arrival time): stała pamięć, bez list znaczników czasu.
+Żądania mają wagę (koszt w jednostkach limitu) i kolejkę priorytetu - niższe
+kolejki mogą wykorzystać tylko część pojemności, więc zlecenia zawsze mają
+zapas i wyprzedzają odpytywanie danych rynkowych. ``acquire()`` czeka na
+miejsce zamiast zgłaszać błąd. Nagłówki wykorzystania limitu (np. Binance
+``X-MBX-USED-WEIGHT-1M``) oraz ``Retry-After``/HTTP 429 spowalniają limiter.
+
+Limity, wagi i kolejki pochodzą z ``config/rate_limits.yaml``;
+``get_exchange_limiter`` zwraca jeden limiter na giełdę, współdzielony przez
+``net_guard`` i ``BaseExchange.rate_limit``.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
 import time
-from typing import Optional
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Tuple
+
+from .yaml_loader import safe_load
+
+# Udział pojemności dostępny dla kolejki - reszta to zapas dla wyższych kolejek
+LANE_HEADROOM: Dict[str, float] = {
+    'order': 1.0,
+    'account': 0.85,
+    'market_data': 0.7,
+}
+DEFAULT_LANE = 'market_data'
+
+_CONFIG_PATH = Path(__file__).resolve().parents[1] / "config" / "rate_limits.yaml"
+
+
+class RateLimitTimeout(RuntimeError):
+    """Czekanie na miejsce w limiterze przekroczyłoby ``max_wait``."""
+
+    def __init__(self, name: str, wait: float) -> None:
+        super().__init__(f"rate_limited:{name} (wait {wait:.2f}s)")
+        self.name = name
+        self.wait = wait
+
+
+class AdaptiveRateLimiter:
+    """Limiter GCRA z wagami, kolejkami priorytetu i adaptacją do nagłówków giełdy."""
+
+    def __init__(
+        self,
+        rate_per_sec: float,
+        capacity: Optional[float] = None,
+        *,
+        name: str = "",
+        usage_headers: Iterable[Mapping[str, Any]] = (),
+        soft_usage: float = 0.7,
+        min_factor: float = 0.1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if rate_per_sec <= 0:
+            raise ValueError("rate_per_sec must be positive")
+        self.name = name
+        self.rate = float(rate_per_sec)
+        self.capacity = float(capacity if capacity is not None else rate_per_sec)
+        self.usage_headers = [dict(spec) for spec in usage_headers]
+        self.soft_usage = float(soft_usage)
+        self.min_factor = float(min_factor)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tat = clock()
+        self._factor = 1.0
+        self._factor_until = 0.0
+        self._blocked_until = 0.0
+        self.stats: Dict[str, float] = {'acquired': 0, 'waited': 0, 'wait_time': 0.0, 'rejected': 0, 'throttled': 0}
+
+    # --- Rdzeń GCRA ---
+    def _interval(self, now: float) -> float:
+        if self._factor < 1.0 and now >= self._factor_until:
+            self._factor = 1.0
+        return 1.0 / (self.rate * self._factor)
+
+    def try_acquire(self, weight: float = 1.0, lane: str = DEFAULT_LANE, now: Optional[float] = None) -> float:
+        """Pobiera ``weight`` jednostek; zwraca 0.0 albo czas (s) do ponownej próby."""
+        with self._lock:
+            now = self._clock() if now is None else now
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            interval = self._interval(now)
+            headroom = LANE_HEADROOM.get(lane, LANE_HEADROOM[DEFAULT_LANE])
+            tolerance = max(self.capacity * headroom, weight) * interval
+            new_tat = max(self._tat, now) + weight * interval
+            excess = new_tat - now - tolerance
+            if excess > 1e-9:
+                return excess
+            self._tat = new_tat
+            self.stats['acquired'] += 1
+            return 0.0
+
+    def refund(self, weight: float = 1.0) -> None:
+        """Zwraca ``weight`` jednostek pobranych przez ``try_acquire``/``acquire``."""
+        with self._lock:
+            self._tat -= weight * self._interval(self._clock())
+            self.stats['acquired'] -= 1
+
+    def available(self, now: Optional[float] = None) -> float:
+        """Liczba jednostek, które można pobrać od razu (pełna pojemność)."""
+        with self._lock:
+            now = self._clock() if now is None else now
+            interval = self._interval(now)
+            return max(0.0, self.capacity - max(0.0, self._tat - now) / interval)
+
+    async def acquire(self, weight: float = 1.0, lane: str = DEFAULT_LANE,
+                      max_wait: Optional[float] = None) -> float:
+        """Czeka na miejsce w limiterze; zwraca czas oczekiwania w sekundach."""
+        started = self._clock()
+        while True:
+            delay = self.try_acquire(weight, lane)
+            waited = self._clock() - started
+            if delay <= 0:
+                self._record_wait(waited)
+                return waited
+            self._check_max_wait(waited + delay, max_wait)
+            await asyncio.sleep(delay)
+
+    def acquire_blocking(self, weight: float = 1.0, lane: str = DEFAULT_LANE,
+                         max_wait: Optional[float] = None) -> float:
+        """Wariant ``acquire`` dla kodu synchronicznego (blokuje wątek)."""
+        started = self._clock()
+        while True:
+            delay = self.try_acquire(weight, lane)
+            waited = self._clock() - started
+            if delay <= 0:
+                self._record_wait(waited)
+                return waited
+            self._check_max_wait(waited + delay, max_wait)
+            time.sleep(delay)
+
+    def _record_wait(self, waited: float) -> None:
+        if waited > 0:
+            with self._lock:
+                self.stats['waited'] += 1
+                self.stats['wait_time'] += waited
+
+    def _check_max_wait(self, wait: float, max_wait: Optional[float]) -> None:
+        if max_wait is not None and wait > max_wait:
+            with self._lock:
+                self.stats['rejected'] += 1
+            raise RateLimitTimeout(self.name, wait)
+
+    # --- Adaptacja do odpowiedzi giełdy ---
+    def penalize(self, seconds: float) -> None:
+        """Wstrzymuje wszystkie kolejki na ``seconds`` (np. po HTTP 429)."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, self._clock() + max(0.0, float(seconds)))
+            self.stats['throttled'] += 1
+
+    def update_from_headers(self, headers: Mapping[str, Any], status: Optional[int] = None) -> None:
+        """Dostosowuje tempo do nagłówków wykorzystania limitu z odpowiedzi giełdy."""
+        lookup = {str(key).lower(): value for key, value in (headers or {}).items()}
+        retry_after = _to_float(lookup.get('retry-after'))
+        if status in (418, 429) or retry_after:
+            self.penalize(retry_after or 1.0)
+
+        for spec in self.usage_headers:
+            value = _to_float(lookup.get(str(spec.get('header', '')).lower()))
+            limit = _to_float(lookup.get(str(spec.get('limit_header', '')).lower())) or _to_float(spec.get('limit'))
+            if value is None or not limit:
+                continue
+            used = limit - value if spec.get('kind') == 'remaining' else value
+            window = float(spec.get('window', 60))
+            self._apply_usage(used / limit, window)
+
+    def _apply_usage(self, usage: float, window: float) -> None:
+        if usage >= 1.0:
+            # Limit giełdy wyczerpany - czekamy do końca jej okna
+            self.penalize(window - (time.time() % window))
+            return
+        with self._lock:
+            if usage <= self.soft_usage:
+                self._factor = 1.0
+                return
+            self._factor = max(self.min_factor, (1.0 - usage) / (1.0 - self.soft_usage))
+            self._factor_until = self._clock() + window
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = self._clock()
+        available = self.available(now)
+        with self._lock:
+            return {
+                'rate': self.rate,
+                'capacity': self.capacity,
+                'available': available,
+                'factor': self._factor,
+                'blocked_for': max(0.0, self._blocked_until - now),
+                **self.stats,
+            }
+
 
 class TokenBucket:
-    def __init__(self, rate_per_sec: float, capacity: Optional[float]=None):
-        self.rate = rate_per_sec
-        self.capacity = capacity if capacity is not None else rate_per_sec
-        self.tokens = self.capacity
-        self.last = time.monotonic()
-
-    def consume(self, amount: float=1.0) -> bool:
-        now = time.monotonic()
-        elapsed = now - self.last
-        self.last = now
-        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
-        if self.tokens >= amount:
-            self.tokens -= amount
-            return True
-        return False
+    """Synchroniczny kubełek bez czekania - nakładka na ``AdaptiveRateLimiter``."""
+
+    def __init__(self, rate_per_sec: float, capacity: Optional[float] = None):
+        self._limiter = AdaptiveRateLimiter(rate_per_sec, capacity)
+        self.rate = self._limiter.rate
+        self.capacity = self._limiter.capacity
+
+    @property
+    def tokens(self) -> float:
+        return self._limiter.available()
+
+    def consume(self, amount: float = 1.0) -> bool:
+        return self._limiter.try_acquire(amount, lane='order') == 0.0
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value is not None and value != '' else None
+    except (TypeError, ValueError):
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Rejestr limiterów giełd
+# ---------------------------------------------------------------------------
+_limiters: Dict[str, AdaptiveRateLimiter] = {}
+_config: Optional[Dict[str, Any]] = None
+_registry_lock = threading.Lock()
+_prepaid: ContextVar[int] = ContextVar('rate_limit_prepaid', default=0)
+
+
+def load_rate_limit_config() -> Dict[str, Any]:
+    """Zawartość ``config/rate_limits.yaml`` (wczytywana raz)."""
+    global _config
+    if _config is None:
+        try:
+            _config = safe_load(_CONFIG_PATH.read_text(encoding="utf-8")) or {}
+        except Exception:
+            _config = {}
+    return _config
+
+
+def exchange_limit_config(exchange: str) -> Dict[str, Any]:
+    return ((load_rate_limit_config().get('exchanges') or {}).get(str(exchange).lower()) or {})
+
+
+def get_exchange_limiter(exchange: str, *, default_rate: float = 10.0,
+                         default_capacity: Optional[float] = None) -> AdaptiveRateLimiter:
+    """Jeden limiter na giełdę (limity z konfiguracji, w przeciwnym razie domyślne)."""
+    key = str(exchange).lower()
+    with _registry_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            cfg = exchange_limit_config(key).get('default') or {}
+            rate = float(cfg.get('rate_per_sec', default_rate))
+            capacity = cfg.get('capacity', default_capacity)
+            limiter = AdaptiveRateLimiter(
+                rate,
+                float(capacity) if capacity is not None else None,
+                name=key,
+                usage_headers=cfg.get('usage_headers') or (),
+            )
+            _limiters[key] = limiter
+        return limiter
+
+
+def endpoint_cost(exchange: str, endpoint: Optional[str]) -> Tuple[float, str]:
+    """Waga i kolejka dla operacji (``get_balance``) albo ścieżki REST (``/api/v3/order``)."""
+    if not endpoint:
+        return 1.0, DEFAULT_LANE
+    cfg = load_rate_limit_config()
+    ex_cfg = exchange_limit_config(exchange)
+    name = str(endpoint)
+    entry: Dict[str, Any] = dict((cfg.get('operations') or {}).get(name) or {})
+    entry.update((ex_cfg.get('operations') or {}).get(name) or {})
+    if not entry and name.startswith('/'):
+        # Najdłuższy pasujący prefiks ścieżki
+        lowered = name.lower()
+        best = -1
+        for pattern in ex_cfg.get('patterns') or ():
+            path = str(pattern.get('path', '')).lower()
+            if path and lowered.startswith(path) and len(path) > best:
+                best = len(path)
+                entry = pattern
+    weight = float(entry.get('weight', 1) or 1)
+    lane = str(entry.get('lane') or DEFAULT_LANE)
+    return weight, lane
+
+
+def mark_prepaid() -> Any:
+    """Oznacza, że bieżące wywołanie ma już pobrany limit (zwraca token do ``reset_prepaid``)."""
+    return _prepaid.set(_prepaid.get() + 1)
+
+
+def reset_prepaid(token: Any) -> None:
+    _prepaid.reset(token)
+
+
+def consume_prepaid() -> bool:
+    """Zużywa limit pobrany wcześniej przez ``net_guard`` (pierwsze żądanie HTTP operacji)."""
+    remaining = _prepaid.get()
+    if remaining > 0:
+        _prepaid.set(remaining - 1)
+        return True
+    return False
+
+
+def reset_limiters() -> None:
+    """Czyści rejestr i konfigurację (testy, przeładowanie konfiguracji)."""
+    global _config
+    with _registry_lock:
+        _limiters.clear()
+        _config = None
+
+
+__all__ = [
+    'AdaptiveRateLimiter',
+    'DEFAULT_LANE',
+    'LANE_HEADROOM',
+    'RateLimitTimeout',
+    'TokenBucket',
+    'consume_prepaid',
+    'endpoint_cost',
+    'get_exchange_limiter',
+    'load_rate_limit_config',
+    'mark_prepaid',
+    'reset_limiters',
+    'reset_prepaid',
+]
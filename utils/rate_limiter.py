@@ -1,12 +1,16 @@
-"""Prosty limiter zapytań wykorzystywany przez TradingEngine i adaptery."""
+"""Limiter zapytań per zakres wykorzystywany przez TradingEngine i adaptery.
+
+Każdy zakres (``global``, ``symbol:BTC/USDT`` ...) jest obsługiwany przez
+``AdaptiveRateLimiter`` z ``utils.rate_limit`` - ``limit`` żądań na ``period``
+sekund to tempo ``limit/period`` z pojemnością ``limit``.
+"""
 from __future__ import annotations
 
-import time
-from collections import defaultdict, deque
 from dataclasses import dataclass
-from typing import Deque, Dict, Optional
+from typing import Dict, Iterable, Optional
 
 from utils.event_bus import get_event_bus, EventTypes
+from utils.rate_limit import AdaptiveRateLimiter, RateLimitTimeout
 
 
 @dataclass
@@ -32,7 +36,7 @@ class RateLimiter:
     def __init__(self, event_bus=None) -> None:
         self._event_bus = event_bus or get_event_bus()
         self._limits: Dict[str, _LimitConfig] = {}
-        self._hits: Dict[str, Deque[float]] = defaultdict(deque)
+        self._limiters: Dict[str, AdaptiveRateLimiter] = {}
 
     def configure_scope(
         self,
@@ -48,13 +52,14 @@ class RateLimiter:
             raise ValueError("Limit i okres muszą być dodatnie")
         threshold = warning_threshold if warning_threshold is not None else 0.8
         self._limits[scope] = _LimitConfig(limit=limit, period=period, warning_threshold=threshold)
+        self._limiters[scope] = AdaptiveRateLimiter(limit / period, limit, name=scope)
 
     def clear_scope(self, scope: str) -> None:
         self._limits.pop(scope, None)
-        self._hits.pop(scope, None)
+        self._limiters.pop(scope, None)
 
-    def check(self, scope: str, *, metadata: Optional[dict] = None) -> None:
-        """Sprawdza i rejestruje użycie limitu.
+    def check(self, scope: str, *, metadata: Optional[dict] = None, lane: str = "order") -> None:
+        """Sprawdza i rejestruje użycie limitu bez czekania.
 
         Raises:
             RateLimitExceeded: gdy limit został przekroczony.
@@ -64,38 +69,101 @@ class RateLimiter:
         if not config:
             return
 
-        now = time.monotonic()
-        bucket = self._hits[scope]
-        while bucket and now - bucket[0] > config.period:
-            bucket.popleft()
+        limiter = self._limiters[scope]
+        payload = self._payload(scope, config, limiter, metadata)
+        if limiter.try_acquire(1.0, lane) > 0:
+            self._event_bus.publish(EventTypes.RATE_LIMIT_BLOCKED, payload)
+            raise RateLimitExceeded(scope, config.limit, config.period)
+        self._warn_if_needed(config, payload)
+
+    async def acquire(
+        self,
+        scope: str,
+        *,
+        metadata: Optional[dict] = None,
+        lane: str = "order",
+        max_wait: Optional[float] = None,
+    ) -> float:
+        """Czeka na miejsce w limicie zakresu; zwraca czas oczekiwania.
+
+        Raises:
+            RateLimitExceeded: gdy czekanie przekroczyłoby ``max_wait`` sekund.
+        """
+
+        config = self._limits.get(scope)
+        if not config:
+            return 0.0
+
+        limiter = self._limiters[scope]
+        payload = self._payload(scope, config, limiter, metadata)
+        if limiter.try_acquire(1.0, lane) > 0:
+            self._event_bus.publish(EventTypes.RATE_LIMIT_BLOCKED, {**payload, "waiting": True})
+            try:
+                waited = await limiter.acquire(1.0, lane, max_wait=max_wait)
+            except RateLimitTimeout as exc:
+                raise RateLimitExceeded(scope, config.limit, config.period) from exc
+        else:
+            waited = 0.0
+        self._warn_if_needed(config, payload)
+        return waited
+
+    async def acquire_all(
+        self,
+        scopes: Iterable[str],
+        *,
+        metadata: Optional[dict] = None,
+        lane: str = "order",
+        max_wait: Optional[float] = None,
+    ) -> float:
+        """Pobiera miejsce we wszystkich zakresach albo w żadnym; zwraca łączny czas oczekiwania.
+
+        Gdy któryś zakres się nie zmieści (lub czekanie zostanie anulowane),
+        jednostki pobrane z wcześniejszych zakresów są zwracane.
+        """
 
-        usage = (len(bucket) + 1) / config.limit
+        acquired = []
+        waited = 0.0
+        try:
+            for scope in scopes:
+                waited += await self.acquire(scope, metadata=metadata, lane=lane, max_wait=max_wait)
+                acquired.append(scope)
+        except BaseException:
+            for scope in acquired:
+                self.refund(scope)
+            raise
+        return waited
+
+    def refund(self, scope: str) -> None:
+        """Zwraca jednostkę pobraną z zakresu przez ``acquire``/``check``."""
+
+        limiter = self._limiters.get(scope)
+        if limiter is not None:
+            limiter.refund(1.0)
+
+    def _payload(self, scope: str, config: _LimitConfig, limiter: AdaptiveRateLimiter,
+                 metadata: Optional[dict]) -> dict:
+        used = config.limit - limiter.available()
+        usage = (used + 1) / config.limit
         payload = {"scope": scope, "usage": min(usage, 1.0), "limit": config.limit, "period": config.period}
         if metadata:
             payload.update(metadata)
+        return payload
 
-        if len(bucket) >= config.limit:
-            self._event_bus.publish(EventTypes.RATE_LIMIT_BLOCKED, payload)
-            raise RateLimitExceeded(scope, config.limit, config.period)
-
-        bucket.append(now)
-
-        if usage >= config.warning_threshold:
+    def _warn_if_needed(self, config: _LimitConfig, payload: dict) -> None:
+        if payload["usage"] >= config.warning_threshold:
             self._event_bus.publish(EventTypes.RATE_LIMIT_WARNING, payload)
 
     def snapshot(self) -> Dict[str, dict]:
         """Zwraca aktualny stan wykorzystania limitów."""
 
         snapshot: Dict[str, dict] = {}
-        now = time.monotonic()
         for scope, config in self._limits.items():
-            bucket = self._hits.get(scope, deque())
-            valid_hits = [hit for hit in bucket if now - hit <= config.period]
+            used = max(0.0, config.limit - self._limiters[scope].available())
             snapshot[scope] = {
                 "limit": config.limit,
                 "period": config.period,
-                "usage": len(valid_hits) / config.limit,
-                "count": len(valid_hits),
+                "usage": used / config.limit,
+                "count": int(round(used)),
             }
         return snapshot
 